@@ -12,14 +12,17 @@ Model + RAG index load once at import time per the project's perf rules.
 
 from __future__ import annotations
 
+import asyncio
 import gc
 import logging
 import os
 import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable
 
 import torch
 
@@ -35,18 +38,23 @@ from prthinker.backends.local import LocalHFBackend
 from prthinker.config import LocalBackendConfig
 from prthinker.dismissed import DismissedExamplesStore, DismissedFilter
 from prthinker.gpu_lock import gpu_serialized, gpu_serialized_nowait
+from prthinker.job_scheduler import JobScheduler
 from prthinker.pipeline import CoTPipeline, ReviewCancelledError
 from prthinker.rag import FaissRAGRetriever
 from prthinker.schemas import (
     AskJobStatusResponse,
     AskJobSubmitResponse,
     AskRequest,
+    AskStreamStatusResponse,
     JobStatus,
     RagRequest,
     RagResponse,
     RetrievalEvalRequest,
     RetrievalEvalResponse,
     ReviewAttestationRequest,
+    ReviewBatchItem,
+    ReviewBatchRequest,
+    ReviewBatchStatusResponse,
     ReviewJobStatusResponse,
     ReviewJobSubmitResponse,
     ReviewRequest,
@@ -98,27 +106,55 @@ except ImportError:
 # One-time module-level initialization (per project perf rules).
 # ---------------------------------------------------------------------------
 
+# PRTHINKER_MAX_BATCH_SIZE > 1 lets concurrent jobs share one batched
+# model.generate (see prthinker.gpu_batching); PRTHINKER_BATCH_TOKEN_BUDGET
+# caps a batch's padded prompt+output tokens so KV cache stays within VRAM.
+# The default of 1 keeps strict one-generate-at-a-time serving.
+# PRTHINKER_PREFIX_CACHE_MIB reserves VRAM for shared-prompt-prefix KV
+# reuse across CoT steps (see prthinker.prefix_cache); 0 disables it.
 _backend = LocalHFBackend(
     LocalBackendConfig(
         model_name=RUN_ON,
         lora_path=os.environ.get("PRTHINKER_LORA_PATH")
         or _LORA_BY_MODEL.get(RUN_ON, _DEFAULT_LORA),
+        max_batch_size=int(os.environ.get("PRTHINKER_MAX_BATCH_SIZE", "1") or "1"),
+        batch_token_budget=int(
+            os.environ.get("PRTHINKER_BATCH_TOKEN_BUDGET", "65536") or "65536"
+        ),
+        prefix_cache_mib=int(
+            os.environ.get("PRTHINKER_PREFIX_CACHE_MIB", "0") or "0"
+        ),
     )
 )
 
+# Every review / ask waits in _scheduler for a run slot before touching the
+# backend: interactive before normal before bulk, fair share between
+# client_ids, shortest estimated job first, and anything queued longer
+# than PRTHINKER_SCHEDULER_MAX_WAIT_SECONDS jumps ahead. Slots default to
+# the backend's batch width so batched generation still fills up.
+_scheduler = JobScheduler(
+    slots=int(
+        os.environ.get("PRTHINKER_SCHEDULER_SLOTS", "")
+        or _backend.max_concurrency()
+    ),
+    max_wait_seconds=float(
+        os.environ.get("PRTHINKER_SCHEDULER_MAX_WAIT_SECONDS", "900") or "900"
+    ),
+)
+
 
 def _warm_rag_index() -> None:
-    """Build the FAISS index at boot instead of on the first request.
-
-    Constructing a ``FaissRAGRetriever`` imports ``codes.util.faiss_util``,
-    whose module body loads the embedding model and builds the rule index
-    exactly once. Triggering that here means the boot probe exercises the
-    embedding stack and the first ``/review`` / ``/rag`` does not pay the
-    one-off index-build cost. The retriever instance is intentionally
-    discarded — every request builds its own with the request's threshold;
-    only the import-time side effect is wanted.
+    """Load the FAISS index at boot instead of on the first request.
+
+    Constructing a ``FaissRAGRetriever`` imports ``codes.util.faiss_util``
+    (which loads the embedding model); ``warm()`` then memory-maps the
+    persisted rule index, or builds and persists it when the rule set or
+    model changed. Triggering that here means the boot probe exercises
+    the embedding stack and the first ``/review`` / ``/rag`` does not pay
+    the one-off load. The retriever instance is intentionally discarded —
+    every request builds its own with the request's threshold.
     """
-    FaissRAGRetriever(threshold=0.7)
+    FaissRAGRetriever(threshold=0.7).warm()
 
 
 _warm_rag_index()
@@ -177,7 +213,8 @@ def healthz() -> dict[str, str]:
 @app.post("/ask", response_class=PlainTextResponse)
 def ask(req: AskRequest) -> str:
     try:
-        return _backend.generate(req.prompt, max_new_tokens=req.max_new_tokens)
+        with _scheduler.admitted(uuid.uuid4().hex, **_ask_ticket(req)):
+            return _backend.generate(req.prompt, max_new_tokens=req.max_new_tokens)
     except Exception as exc:
         _exit_if_cuda_poisoned(exc)
         raise
@@ -242,6 +279,38 @@ def _truncate_diff(diff: str) -> str:
     return kept + _TRUNCATION_NOTICE
 
 
+def _estimate_tokens(text: str) -> int:
+    """Token count for scheduling, at ~4 chars/token.
+
+    Only orders the queue, so it never tokenizes: a multi-MB diff would
+    be encoded on the request thread just to be clamped, through the
+    tokenizer the GPU path is using.
+    """
+    return max(1, len(text) // 4)
+
+
+def _review_ticket(req: ReviewRequest, cancel_event=None) -> dict:
+    """Scheduler ``submit`` kwargs for one review request."""
+    return {
+        "priority": req.priority,
+        "tenant": req.client_id,
+        # The diff is truncated to _MAX_DIFF_TOKENS before it reaches the
+        # pipeline, so that is also the largest a review can cost.
+        "cost": min(_estimate_tokens(req.code_diff), _MAX_DIFF_TOKENS),
+        "cancel_event": cancel_event,
+    }
+
+
+def _ask_ticket(req: AskRequest, cancel_event=None) -> dict:
+    """Scheduler ``submit`` kwargs for one ask request."""
+    return {
+        "priority": req.priority,
+        "tenant": req.client_id,
+        "cost": _estimate_tokens(req.prompt),
+        "cancel_event": cancel_event,
+    }
+
+
 @observe_review
 def _execute_review(
     req: ReviewRequest,
@@ -269,21 +338,21 @@ def _execute_review(
         ),
     )
 
-    if req.file_path is not None:
-        file_result = pipeline.run_for_file(
-            req.file_path,
-            code_diff,
-            step_plan=req.step_plan,
-        )
-        return ReviewResponse(
-            code_diff=code_diff,
-            rag_docs=file_result.rag_docs,
-            steps=[StepOutput(name=k, output=v)
-                   for k, v in file_result.step_outputs.items()],
-            inline_findings=file_result.inline_findings,
-        )
-
-    result = pipeline.run(code_diff)
+    with pipeline:
+        if req.file_path is not None:
+            file_result = pipeline.run_for_file(
+                req.file_path,
+                code_diff,
+                step_plan=req.step_plan,
+            )
+            return ReviewResponse(
+                code_diff=code_diff,
+                rag_docs=file_result.rag_docs,
+                steps=[StepOutput(name=k, output=v)
+                       for k, v in file_result.step_outputs.items()],
+                inline_findings=file_result.inline_findings,
+            )
+        result = pipeline.run(code_diff)
     return ReviewResponse(
         code_diff=result.code_diff,
         rag_docs=result.rag_docs,
@@ -297,7 +366,8 @@ def review(req: ReviewRequest) -> ReviewResponse:
     if not req.code_diff.strip():
         raise HTTPException(status_code=400, detail="code_diff is empty")
     try:
-        return _execute_review(req)
+        with _scheduler.admitted(uuid.uuid4().hex, **_review_ticket(req)):
+            return _execute_review(req)
     except Exception as exc:
         _exit_if_cuda_poisoned(exc)
         raise
@@ -319,13 +389,13 @@ _JOB_TTL_SECONDS = 3600
 # Bound queued requests and retained responses.  Each worker owns the full
 # Pydantic request (often a multi-megabyte diff) and each completed job keeps
 # its full model output, so an unbounded table also means unbounded threads and
-# host RAM.  The GPU lock serializes inference; creating more workers cannot
-# increase throughput.
+# host RAM.  The GPU lock serializes inference and the batcher caps how many
+# prompts share one generate; workers beyond that cannot increase throughput.
 _MAX_JOBS_PER_KIND = int(os.environ.get("PRTHINKER_MAX_JOBS", "32") or "32")
 if _MAX_JOBS_PER_KIND < 1:
     raise ValueError("PRTHINKER_MAX_JOBS must be at least 1")
-# A running job whose result endpoint has not been polled for this long
-# is presumed abandoned (matrix runner was cancelled, lost network, etc.).
+# A pending or running job whose result endpoint has not been polled for
+# this long is presumed abandoned (matrix runner was cancelled, lost network, etc.).
 # The sweeper sets its cancel_event so the worker bails out at the next
 # step boundary instead of finishing inference no one will read.
 _IDLE_TIMEOUT_SECONDS = 180
@@ -374,8 +444,12 @@ def _make_job_slot_locked(jobs: dict, now: float) -> bool:
 
 
 def _cancel_if_idle(jid: str, job: "_Job | _AskJob", now: float, label: str) -> None:
-    """Set a running job's cancel_event if it has been idle past the timeout."""
-    if job.status != "running":
+    """Set a pending / running job's cancel_event if it has been idle past the timeout.
+
+    A pending job's worker is waiting in ``_scheduler.slot``, which sees the
+    event and leaves the queue, so an abandoned job never reaches the GPU.
+    """
+    if job.status not in ("pending", "running"):
         return
     if job.cancel_event.is_set():
         return
@@ -404,7 +478,7 @@ def _sweep_table_once(
 
 
 def _sweep_idle_jobs() -> None:
-    """Background sweeper: cancel running jobs that nobody is polling.
+    """Background sweeper: cancel queued / running jobs that nobody is polling.
 
     The matrix runner polls every 5 seconds, so 180 s of silence almost
     certainly means the runner was cancelled (concurrency
@@ -417,11 +491,51 @@ def _sweep_idle_jobs() -> None:
         now = time.time()
         _sweep_table_once(_JOBS_LOCK, _JOBS, "Review", now)
         _sweep_table_once(_ASK_JOBS_LOCK, _ASK_JOBS, "Ask", now)
+        _sweep_table_once(_BATCH_JOBS_LOCK, _BATCH_JOBS, "Batch", now)
 
 
 threading.Thread(target=_sweep_idle_jobs, daemon=True).start()
 
 
+# The result endpoints accept ``?wait=<seconds>`` and hold the request
+# until the job has news (a terminal status, or newly finished batch
+# files) instead of answering "running" at once, so a client learns of
+# completion within one tick rather than one poll interval. The cap keeps
+# a held poll far below the 100 s proxy limit above.
+_MAX_LONG_POLL_SECONDS = 25.0
+_LONG_POLL_TICK_SECONDS = 0.1
+_TERMINAL_STATUSES = ("done", "error", "cancelled")
+
+
+async def _hold_until(
+    lock: threading.Lock, has_news: Callable[[], bool], wait: float
+) -> None:
+    """Return once ``has_news()`` (checked under ``lock``) or ``wait`` elapses.
+
+    Sleeps on the event loop between checks, so a held poll costs no
+    threadpool worker.
+    """
+    deadline = time.monotonic() + min(max(wait, 0.0), _MAX_LONG_POLL_SECONDS)
+    while True:
+        with lock:
+            if has_news():
+                return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(min(_LONG_POLL_TICK_SECONDS, remaining))
+
+
+def _job_settled(jobs: dict, job_id: str) -> Callable[[], bool]:
+    """News predicate: the job is terminal or gone. Caller holds the lock."""
+
+    def check() -> bool:
+        job = jobs.get(job_id)
+        return job is None or job.status in _TERMINAL_STATUSES
+
+    return check
+
+
 def _release_gpu_memory() -> None:
     """Drop intermediate tensors and return reserved CUDA blocks to the OS.
 
@@ -523,24 +637,37 @@ def _start_job_worker(
     jobs: dict,
     job_id: str,
 ) -> None:
-    """Start a worker, rolling back its table entry if thread startup fails."""
+    """Start a worker, rolling back its table and queue entries if startup fails."""
     try:
         worker.start()
     except Exception:
         with lock:
             jobs.pop(job_id, None)
+        _scheduler.withdraw(job_id)
         raise
 
 
+def _mark_running(lock: threading.Lock, jobs: dict, job_id: str) -> None:
+    """Flip a dispatched job from pending to running (idle sweeper scope)."""
+    with lock:
+        job = jobs.get(job_id)
+        if job is not None and job.status == "pending":
+            job.status = "running"
+            # Queue time is not idle time: restart the sweeper's clock.
+            job.last_polled_at = time.time()
+
+
 def _run_review_job(job_id: str, req: ReviewRequest) -> None:
     with _JOBS_LOCK:
         job = _JOBS.get(job_id)
         if job is None:
+            _scheduler.withdraw(job_id)
             return
-        job.status = "running"
         cancel_event = job.cancel_event
     try:
-        result = _execute_review(req, cancel_event=cancel_event)
+        with _scheduler.slot(job_id):
+            _mark_running(_JOBS_LOCK, _JOBS, job_id)
+            result = _execute_review(req, cancel_event=cancel_event)
         with _JOBS_LOCK:
             job = _JOBS.get(job_id)
             if job is not None:
@@ -575,7 +702,8 @@ def review_submit(req: ReviewRequest) -> ReviewJobSubmitResponse:
                 status_code=503,
                 detail="review queue is full; retry after an active job finishes",
             )
-        _JOBS[job_id] = _Job()
+        job = _JOBS[job_id] = _Job()
+    _scheduler.submit(job_id, **_review_ticket(req, job.cancel_event))
     worker = threading.Thread(
         target=_run_review_job,
         args=(job_id, req),
@@ -586,7 +714,8 @@ def review_submit(req: ReviewRequest) -> ReviewJobSubmitResponse:
 
 
 @app.get("/review/result/{job_id}", response_model=ReviewJobStatusResponse)
-def review_result(job_id: str) -> ReviewJobStatusResponse:
+async def review_result(job_id: str, wait: float = 0.0) -> ReviewJobStatusResponse:
+    await _hold_until(_JOBS_LOCK, _job_settled(_JOBS, job_id), wait)
     with _JOBS_LOCK:
         job = _JOBS.get(job_id)
         if job is None:
@@ -594,11 +723,14 @@ def review_result(job_id: str) -> ReviewJobStatusResponse:
         # Heartbeat for the idle sweeper — as long as a client polls
         # within _IDLE_TIMEOUT_SECONDS the worker keeps running.
         job.last_polled_at = time.time()
+        position, depth = _scheduler.position(job_id) or (None, None)
         return ReviewJobStatusResponse(
             job_id=job_id,
             status=job.status,
             result=job.result,
             error=job.error,
+            queue_position=position,
+            queue_depth=depth,
         )
 
 
@@ -621,6 +753,180 @@ def review_cancel(job_id: str) -> dict[str, str | bool]:
         return {"job_id": job_id, "cancelled": True, "status": job.status}
 
 
+# ---------------------------------------------------------------------------
+# Batch review jobs.
+#
+# A per-file PR review used to be one /review job per file, each paying a
+# submit round-trip plus up to one poll interval of dead time. A batch job
+# takes every file of the PR at once, runs them through the scheduler
+# (each file is its own ticket, so priorities and fair share still apply
+# file by file) and exposes results as they finish: the client passes the
+# ``cursor`` from its last poll and receives only the newly finished files.
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _BatchJob:
+    total: int
+    status: JobStatus = "pending"
+    # Finished files in completion order; a poll cursor indexes this list.
+    finished: list[ReviewBatchItem] = field(default_factory=list)
+    error: str | None = None
+    created_at: float = field(default_factory=time.time)
+    last_polled_at: float = field(default_factory=time.time)
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+
+
+_BATCH_JOBS: dict[str, _BatchJob] = {}
+_BATCH_JOBS_LOCK = threading.Lock()
+
+
+def _batch_ticket(job_id: str, index: int) -> str:
+    return f"{job_id}/{index}"
+
+
+def _review_batch_item(
+    job_id: str, index: int, req: ReviewRequest, cancel_event: threading.Event
+) -> ReviewBatchItem:
+    """Review one file of a batch; failures become the item's status."""
+    try:
+        with _scheduler.admitted(
+            _batch_ticket(job_id, index), **_review_ticket(req, cancel_event)
+        ):
+            _mark_running(_BATCH_JOBS_LOCK, _BATCH_JOBS, job_id)
+            result = _execute_review(req, cancel_event=cancel_event)
+        return ReviewBatchItem(
+            index=index, file_path=req.file_path, status="done", result=result
+        )
+    except ReviewCancelledError:
+        return ReviewBatchItem(index=index, file_path=req.file_path, status="cancelled")
+    except Exception as exc:
+        log.exception("Batch job %s file %s failed", job_id, req.file_path)
+        _exit_if_cuda_poisoned(exc)
+        return ReviewBatchItem(
+            index=index,
+            file_path=req.file_path,
+            status="error",
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    finally:
+        _release_gpu_memory()
+
+
+def _run_batch_job(job_id: str, requests: list[ReviewRequest]) -> None:
+    with _BATCH_JOBS_LOCK:
+        job = _BATCH_JOBS.get(job_id)
+        if job is None:
+            return
+        cancel_event = job.cancel_event
+
+    def review_one(index: int) -> None:
+        item = _review_batch_item(job_id, index, requests[index], cancel_event)
+        with _BATCH_JOBS_LOCK:
+            live = _BATCH_JOBS.get(job_id)
+            if live is not None:
+                live.finished.append(item)
+
+    # One pool thread per run slot keeps every slot fed without parking a
+    # thread per file in the scheduler queue.
+    workers = min(len(requests), _scheduler.stats()["slots"])
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(review_one, range(len(requests))))
+    except Exception as exc:
+        log.exception("Batch job %s failed", job_id)
+        with _BATCH_JOBS_LOCK:
+            job = _BATCH_JOBS.get(job_id)
+            if job is not None:
+                job.status = "error"
+                job.error = f"{type(exc).__name__}: {exc}"
+        return
+    with _BATCH_JOBS_LOCK:
+        job = _BATCH_JOBS.get(job_id)
+        if job is not None:
+            job.status = "cancelled" if cancel_event.is_set() else "done"
+
+
+@app.post("/review/batch/submit", response_model=ReviewJobSubmitResponse)
+def review_batch_submit(req: ReviewBatchRequest) -> ReviewJobSubmitResponse:
+    empty = [i for i, item in enumerate(req.requests) if not item.code_diff.strip()]
+    if empty:
+        raise HTTPException(
+            status_code=400, detail=f"code_diff is empty for request(s) {empty}"
+        )
+    job_id = uuid.uuid4().hex
+    with _BATCH_JOBS_LOCK:
+        if not _make_job_slot_locked(_BATCH_JOBS, time.time()):
+            raise HTTPException(
+                status_code=503,
+                detail="batch queue is full; retry after an active job finishes",
+            )
+        _BATCH_JOBS[job_id] = _BatchJob(total=len(req.requests))
+    worker = threading.Thread(
+        target=_run_batch_job,
+        args=(job_id, list(req.requests)),
+        daemon=True,
+    )
+    _start_job_worker(worker, _BATCH_JOBS_LOCK, _BATCH_JOBS, job_id)
+    return ReviewJobSubmitResponse(job_id=job_id)
+
+
+def _batch_queue_position(job_id: str, job: _BatchJob) -> tuple[int | None, int | None]:
+    """Queue place of the batch's best-placed file while nothing has started."""
+    if job.status != "pending":
+        return None, None
+    places = [
+        place for place in (
+            _scheduler.position(_batch_ticket(job_id, index))
+            for index in range(job.total)
+        )
+        if place is not None
+    ]
+    return min(places) if places else (None, None)
+
+
+@app.get("/review/batch/result/{job_id}", response_model=ReviewBatchStatusResponse)
+async def review_batch_result(
+    job_id: str, cursor: int = 0, wait: float = 0.0
+) -> ReviewBatchStatusResponse:
+    settled = _job_settled(_BATCH_JOBS, job_id)
+
+    def has_news() -> bool:
+        job = _BATCH_JOBS.get(job_id)
+        return settled() or len(job.finished) > cursor
+
+    await _hold_until(_BATCH_JOBS_LOCK, has_news, wait)
+    with _BATCH_JOBS_LOCK:
+        job = _BATCH_JOBS.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="job not found")
+        job.last_polled_at = time.time()
+        position, depth = _batch_queue_position(job_id, job)
+        return ReviewBatchStatusResponse(
+            job_id=job_id,
+            status=job.status,
+            total=job.total,
+            completed=len(job.finished),
+            cursor=len(job.finished),
+            items=job.finished[max(0, cursor):],
+            error=job.error,
+            queue_position=position,
+            queue_depth=depth,
+        )
+
+
+@app.post("/review/batch/cancel/{job_id}")
+def review_batch_cancel(job_id: str) -> dict[str, str | bool]:
+    with _BATCH_JOBS_LOCK:
+        job = _BATCH_JOBS.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="job not found")
+        if job.status in ("done", "error", "cancelled"):
+            return {"job_id": job_id, "cancelled": False, "status": job.status}
+        job.cancel_event.set()
+        return {"job_id": job_id, "cancelled": True, "status": job.status}
+
+
 # ---------------------------------------------------------------------------
 # Async job pattern for /ask.
 #
@@ -630,6 +936,11 @@ def review_cancel(job_id: str) -> dict[str, str | bool]:
 # 100 s Cloudflare idle timeout that the synchronous /ask cannot
 # survive. /ask/submit returns a job id; /ask/result/{id} is polled
 # every few seconds so each round-trip fits inside the proxy budget.
+#
+# /ask/stream/* is the same job decoded incrementally: the worker appends
+# each text chunk to the job as the model produces it and
+# /ask/stream/result/{id}?cursor=N returns the chunks after N, so a
+# client sees a long step's first words instead of waiting minutes.
 # ---------------------------------------------------------------------------
 
 
@@ -641,25 +952,52 @@ class _AskJob:
     created_at: float = field(default_factory=time.time)
     last_polled_at: float = field(default_factory=time.time)
     cancel_event: threading.Event = field(default_factory=threading.Event)
+    # Text chunks published so far by a streamed job (/ask/stream/*).
+    chunks: list[str] = field(default_factory=list)
 
 
 _ASK_JOBS: dict[str, _AskJob] = {}
 _ASK_JOBS_LOCK = threading.Lock()
 
 
-def _run_ask_job(job_id: str, req: AskRequest) -> None:
+def _stream_ask(job_id: str, req: AskRequest, cancel_event: threading.Event) -> str:
+    """Generate incrementally, publishing each chunk to the job as it decodes."""
+    stream = _backend.stream_generate(
+        req.prompt,
+        max_new_tokens=req.max_new_tokens,
+        cancel_event=cancel_event,
+    )
+    parts: list[str] = []
+    try:
+        for chunk in stream:
+            parts.append(chunk)
+            with _ASK_JOBS_LOCK:
+                job = _ASK_JOBS.get(job_id)
+                if job is not None:
+                    job.chunks.append(chunk)
+    finally:
+        stream.close()
+    return "".join(parts)
+
+
+def _run_ask_job(job_id: str, req: AskRequest, stream: bool = False) -> None:
     with _ASK_JOBS_LOCK:
         job = _ASK_JOBS.get(job_id)
         if job is None:
+            _scheduler.withdraw(job_id)
             return
-        job.status = "running"
         cancel_event = job.cancel_event
     try:
-        text = _backend.generate(
-            req.prompt,
-            max_new_tokens=req.max_new_tokens,
-            cancel_event=cancel_event,
-        )
+        with _scheduler.slot(job_id):
+            _mark_running(_ASK_JOBS_LOCK, _ASK_JOBS, job_id)
+            if stream:
+                text = _stream_ask(job_id, req, cancel_event)
+            else:
+                text = _backend.generate(
+                    req.prompt,
+                    max_new_tokens=req.max_new_tokens,
+                    cancel_event=cancel_event,
+                )
         with _ASK_JOBS_LOCK:
             job = _ASK_JOBS.get(job_id)
             if job is not None:
@@ -683,8 +1021,7 @@ def _run_ask_job(job_id: str, req: AskRequest) -> None:
         _release_gpu_memory()
 
 
-@app.post("/ask/submit", response_model=AskJobSubmitResponse)
-def ask_submit(req: AskRequest) -> AskJobSubmitResponse:
+def _submit_ask_job(req: AskRequest, stream: bool) -> AskJobSubmitResponse:
     if not req.prompt.strip():
         raise HTTPException(status_code=400, detail="prompt is empty")
     job_id = uuid.uuid4().hex
@@ -694,31 +1031,75 @@ def ask_submit(req: AskRequest) -> AskJobSubmitResponse:
                 status_code=503,
                 detail="ask queue is full; retry after an active job finishes",
             )
-        _ASK_JOBS[job_id] = _AskJob()
+        job = _ASK_JOBS[job_id] = _AskJob()
+    _scheduler.submit(job_id, **_ask_ticket(req, job.cancel_event))
     worker = threading.Thread(
         target=_run_ask_job,
-        args=(job_id, req),
+        args=(job_id, req, stream),
         daemon=True,
     )
     _start_job_worker(worker, _ASK_JOBS_LOCK, _ASK_JOBS, job_id)
     return AskJobSubmitResponse(job_id=job_id)
 
 
+@app.post("/ask/submit", response_model=AskJobSubmitResponse)
+def ask_submit(req: AskRequest) -> AskJobSubmitResponse:
+    return _submit_ask_job(req, stream=False)
+
+
+@app.post("/ask/stream/submit", response_model=AskJobSubmitResponse)
+def ask_stream_submit(req: AskRequest) -> AskJobSubmitResponse:
+    return _submit_ask_job(req, stream=True)
+
+
 @app.get("/ask/result/{job_id}", response_model=AskJobStatusResponse)
-def ask_result(job_id: str) -> AskJobStatusResponse:
+async def ask_result(job_id: str, wait: float = 0.0) -> AskJobStatusResponse:
+    await _hold_until(_ASK_JOBS_LOCK, _job_settled(_ASK_JOBS, job_id), wait)
     with _ASK_JOBS_LOCK:
         job = _ASK_JOBS.get(job_id)
         if job is None:
             raise HTTPException(status_code=404, detail="job not found")
         job.last_polled_at = time.time()
+        position, depth = _scheduler.position(job_id) or (None, None)
         return AskJobStatusResponse(
             job_id=job_id,
             status=job.status,
             result=job.result,
             error=job.error,
+            queue_position=position,
+            queue_depth=depth,
+        )
+
+
+@app.get("/ask/stream/result/{job_id}", response_model=AskStreamStatusResponse)
+async def ask_stream_result(
+    job_id: str, cursor: int = 0, wait: float = 0.0
+) -> AskStreamStatusResponse:
+    settled = _job_settled(_ASK_JOBS, job_id)
+
+    def has_news() -> bool:
+        job = _ASK_JOBS.get(job_id)
+        return settled() or len(job.chunks) > cursor
+
+    await _hold_until(_ASK_JOBS_LOCK, has_news, wait)
+    with _ASK_JOBS_LOCK:
+        job = _ASK_JOBS.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="job not found")
+        job.last_polled_at = time.time()
+        position, depth = _scheduler.position(job_id) or (None, None)
+        return AskStreamStatusResponse(
+            job_id=job_id,
+            status=job.status,
+            cursor=len(job.chunks),
+            items=job.chunks[max(0, cursor):],
+            error=job.error,
+            queue_position=position,
+            queue_depth=depth,
         )
 
 
+@app.post("/ask/stream/cancel/{job_id}")
 @app.post("/ask/cancel/{job_id}")
 def ask_cancel(job_id: str) -> dict[str, str | bool]:
     with _ASK_JOBS_LOCK:
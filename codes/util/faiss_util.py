@@ -7,9 +7,17 @@ stack appends Dense projections and query/document prompts after pooling;
 the legacy Qwen path keeps the original bare-AutoModel mean pooling so
 ``EMB_MODEL=Qwen/Qwen3-Embedding-4B`` reproduces the historical index
 exactly (cosine threshold 0.7 era).
+
+The rule index is built lazily on the first search (or an explicit
+:func:`get_index` warm-up) and persisted under ``RAG_INDEX_DIR`` keyed by
+model, rule-set hash and dimension — see ``codes.util.rag_index_store``.
+A later start memory-maps the stored index instead of re-embedding every
+rule, and a changed rule set only embeds the rules that are new.
 """
 
 import os
+import threading
+from pathlib import Path
 from typing import List, Tuple
 
 import faiss
@@ -21,6 +29,16 @@ from codes.util.embedding_config import (
     recommended_threshold,
     uses_sentence_transformers,
 )
+from codes.util.rag_index_store import (
+    artifact_stem,
+    doc_hash,
+    doc_set_hash,
+    find_donor,
+    index_dir,
+    plan_reuse,
+    read_manifest,
+    write_manifest,
+)
 from datas.RAG_data.rag_data import rule_docs
 
 # =========================
@@ -35,6 +53,9 @@ DEVICE = "cuda" if USE_GPU else "cpu"
 MODEL_NAME = active_emb_model()
 RECOMMENDED_THRESHOLD = recommended_threshold(MODEL_NAME)
 MAX_LENGTH = 2048
+# Texts per padded forward pass on the legacy path; bounds activation
+# memory when a large PR embeds hundreds of file diffs at once.
+EMBED_BATCH_SIZE = max(1, int(os.getenv("RAG_EMBED_BATCH_SIZE", "16")))
 
 print(f"[RAG] FAISS GPU = {USE_FAISS_GPU}, torch cuda = {TORCH_USE_CUDA}")
 print(f"[RAG] Using device: {DEVICE}")
@@ -57,13 +78,23 @@ if uses_sentence_transformers(MODEL_NAME):
         """
         return _encode_documents([text])[0]
 
+    def get_embeddings(texts: List[str]) -> np.ndarray:
+        """Batched :func:`get_embedding`: one ``(len(texts), dim)`` matrix."""
+        return _encode_documents(texts)
+
     def _encode_documents(texts: List[str]) -> np.ndarray:
         emb = _st_model.encode_document(list(texts))
         return np.asarray(emb, dtype="float32")
 
     def _encode_query(text: str) -> np.ndarray:
-        emb = _st_model.encode_query([text])
-        return np.asarray(emb, dtype="float32")[0]
+        return _encode_queries([text])[0]
+
+    def _encode_queries(texts: List[str]) -> np.ndarray:
+        emb = _st_model.encode_query(list(texts), batch_size=EMBED_BATCH_SIZE)
+        return np.asarray(emb, dtype="float32")
+
+    def _embedding_dim() -> int:
+        return int(_st_model.get_sentence_embedding_dimension())
 
 else:
     from transformers import AutoModel, AutoTokenizer
@@ -80,51 +111,151 @@ else:
     emb_model.eval()
 
     @torch.no_grad()
-    def get_embedding(text: str) -> np.ndarray:
-        inputs = emb_tokenizer(
-            text,
-            return_tensors="pt",
-            padding=True,
-            truncation=True,
-            max_length=MAX_LENGTH,
-        ).to(DEVICE)
-
-        outputs = emb_model(**inputs)
-        last_hidden = outputs.last_hidden_state
-        attention_mask = inputs["attention_mask"].unsqueeze(-1)
-
-        pooled = (last_hidden * attention_mask).sum(dim=1) / attention_mask.sum(dim=1)
-        emb = pooled[0].float().cpu().numpy().astype("float32")
+    def _embed_batch(texts: List[str]) -> np.ndarray:
+        """Mean-pooled, L2-normalised embeddings, one padded forward per chunk.
 
+        Pooling is masked, so padding does not leak into a row's mean and a
+        batched row matches the same text embedded alone.
+        """
+        chunks = []
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            inputs = emb_tokenizer(
+                list(texts[start:start + EMBED_BATCH_SIZE]),
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=MAX_LENGTH,
+            ).to(DEVICE)
+
+            outputs = emb_model(**inputs)
+            last_hidden = outputs.last_hidden_state
+            attention_mask = inputs["attention_mask"].unsqueeze(-1)
+
+            pooled = (last_hidden * attention_mask).sum(dim=1) / attention_mask.sum(dim=1)
+            chunks.append(pooled.float().cpu().numpy().astype("float32"))
+
+        emb = np.ascontiguousarray(np.concatenate(chunks, axis=0))
         # cosine similarity
-        faiss.normalize_L2(emb.reshape(1, -1))
+        faiss.normalize_L2(emb)
         return emb
 
+    def get_embedding(text: str) -> np.ndarray:
+        return _embed_batch([text])[0]
+
+    def get_embeddings(texts: List[str]) -> np.ndarray:
+        return _embed_batch(list(texts))
+
     def _encode_documents(texts: List[str]) -> np.ndarray:
-        return np.stack([get_embedding(t) for t in texts])
+        return _embed_batch(list(texts))
 
     def _encode_query(text: str) -> np.ndarray:
         return get_embedding(text)
 
+    def _encode_queries(texts: List[str]) -> np.ndarray:
+        return _embed_batch(list(texts))
+
+    def _embedding_dim() -> int:
+        return int(emb_model.config.hidden_size)
+
 
 
 # =========================
 # Build FAISS index
 # =========================
-doc_embeddings = _encode_documents(list(rule_docs))
-dim = doc_embeddings.shape[1]
-
-cpu_index = faiss.IndexFlatIP(dim)
-
-if USE_GPU:
-    res = faiss.StandardGpuResources()
-    index = faiss.index_cpu_to_gpu(res, 0, cpu_index)
-else:
-    index = cpu_index
-
-index.add(doc_embeddings)
-
-print(f"[RAG] FAISS index ready, total docs = {index.ntotal}")
+# Flat codes of a stored index are memory-mapped where faiss supports it
+# (IO_FLAG_MMAP_IFC, faiss >= 1.9), so worker processes on one host share
+# the same page-cache pages instead of each holding a private copy.
+_MMAP_FLAG = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP)
+
+_index = None
+_gpu_res = None  # must outlive the GPU index it backs
+_index_lock = threading.Lock()
+
+
+def _flat_index(embeddings: np.ndarray):
+    cpu_index = faiss.IndexFlatIP(embeddings.shape[1])
+    cpu_index.add(np.ascontiguousarray(embeddings, dtype="float32"))
+    return cpu_index
+
+
+def _read_index(path: Path, expected_rows: int, dim: int):
+    """mmap-load a stored index, or None when it is unusable."""
+    try:
+        stored = faiss.read_index(str(path), _MMAP_FLAG)
+    except RuntimeError as exc:
+        print(f"[RAG] Ignoring unreadable index {path}: {exc}")
+        return None
+    if stored.ntotal != expected_rows or stored.d != dim:
+        print(f"[RAG] Ignoring index {path}: shape does not match its manifest")
+        return None
+    return stored
+
+
+def _embed_reusing_donor(directory: Path, hashes: List[str], dim: int) -> np.ndarray:
+    """Embeddings for every rule, copying rows a previous artifact holds."""
+    donor = find_donor(directory, MODEL_NAME, dim)
+    stored = (
+        _read_index(donor[0], len(donor[1]["doc_hashes"]), dim)
+        if donor is not None else None
+    )
+    if stored is None:
+        return _encode_documents(list(rule_docs))
+    reuse, embed = plan_reuse(donor[1]["doc_hashes"], hashes)
+    embeddings = np.empty((len(hashes), dim), dtype="float32")
+    for pos, row in reuse.items():
+        embeddings[pos] = stored.reconstruct(row)
+    if embed:
+        embeddings[embed] = _encode_documents([rule_docs[i] for i in embed])
+    print(f"[RAG] Reused {len(reuse)} stored embeddings, embedded {len(embed)} new rules")
+    return embeddings
+
+
+def _persist(cpu_index, directory: Path, index_path: Path, hashes: List[str], dim: int) -> None:
+    """Write index then manifest; a manifest on disk implies its index."""
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = index_path.with_name(index_path.name + ".tmp")
+        faiss.write_index(cpu_index, str(tmp))
+        os.replace(tmp, index_path)
+        write_manifest(index_path.with_suffix(".json"), MODEL_NAME, dim, hashes)
+    except (OSError, RuntimeError) as exc:
+        print(f"[RAG] Could not persist index to {directory}: {exc}")
+
+
+def _load_or_build_cpu_index():
+    hashes = [doc_hash(doc) for doc in rule_docs]
+    dim = _embedding_dim()
+    directory = index_dir()
+    if directory is None:
+        return _flat_index(_encode_documents(list(rule_docs)))
+
+    index_path = directory / f"{artifact_stem(MODEL_NAME, doc_set_hash(hashes), dim)}.faiss"
+    manifest = read_manifest(index_path.with_suffix(".json"))
+    if manifest is not None and manifest["doc_hashes"] == hashes and index_path.exists():
+        stored = _read_index(index_path, len(hashes), dim)
+        if stored is not None:
+            print(f"[RAG] Loaded stored index {index_path}")
+            return stored
+
+    cpu_index = _flat_index(_embed_reusing_donor(directory, hashes, dim))
+    _persist(cpu_index, directory, index_path, hashes, dim)
+    return cpu_index
+
+
+def get_index():
+    """The rule index, loaded or built once per process on first use."""
+    global _index, _gpu_res
+    if _index is not None:
+        return _index
+    with _index_lock:
+        if _index is None:
+            cpu_index = _load_or_build_cpu_index()
+            if USE_GPU:
+                _gpu_res = faiss.StandardGpuResources()
+                cpu_index = faiss.index_cpu_to_gpu(_gpu_res, 0, cpu_index)
+            _index = cpu_index
+            print(f"[RAG] FAISS index ready, total docs = {_index.ntotal}")
+    return _index
 
 
 # =========================
@@ -135,20 +266,37 @@ def search_docs(
     k: int = 15,
     threshold: float | None = None
 ) -> Tuple[List[str], List[dict]]:
-    q_emb = _encode_query(query).reshape(1, -1)
-
-    scores, indices = index.search(q_emb, k)
+    return search_docs_many([query], k=k, threshold=threshold)[0]
 
-    results = []
-    for score, idx in zip(scores[0], indices[0]):
-        if idx == -1:
-            continue
-        if threshold is not None and score < threshold:
-            continue
 
-        results.append({
-            "doc": rule_docs[idx],
-            "score": float(score)
-        })
-
-    return [r["doc"] for r in results], results
+def search_docs_many(
+    queries: List[str],
+    k: int = 15,
+    threshold: float | None = None
+) -> List[Tuple[List[str], List[dict]]]:
+    """Batched :func:`search_docs`: one encode pass, one ``index.search``.
+
+    Returns one ``(docs, scored)`` pair per query, in input order.
+    """
+    if not queries:
+        return []
+    q_emb = _encode_queries(list(queries)).reshape(len(queries), -1)
+
+    scores, indices = get_index().search(q_emb, k)
+
+    out = []
+    for row_scores, row_indices in zip(scores, indices):
+        results = []
+        for score, idx in zip(row_scores, row_indices):
+            if idx == -1:
+                continue
+            if threshold is not None and score < threshold:
+                continue
+
+            results.append({
+                "doc": rule_docs[idx],
+                "score": float(score)
+            })
+        out.append(([r["doc"] for r in results], results))
+
+    return out
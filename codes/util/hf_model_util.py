@@ -2,6 +2,8 @@ import contextlib
 import datetime
 import logging
 import os
+import queue
+import threading
 
 import torch
 import transformers
@@ -28,6 +30,7 @@ from codes.util.quant_guard import (
     densification_risk,
     normalize_quant_mode,
 )
+from codes.util.stream_decode import ContentStreamDecoder
 from codes.util.think_split import think_end_token_id, thinking_boundary
 from prthinker.pipeline import ReviewCancelledError
 
@@ -451,18 +454,141 @@ def _sampling_enabled() -> bool:
     return os.environ.get("PRTHINKER_SAMPLING", "") == "1"
 
 
-def hf_generate(prompt: str, model, tokenizer, max_new_tokens: int = 16784, cancel_event=None):
-    if cancel_event is not None and cancel_event.is_set():
-        raise ReviewCancelledError("Generation cancelled before tokenization")
-
+def _render_chat(tokenizer, prompt: str) -> str:
+    """Wrap ``prompt`` as a single user turn in the model's chat template."""
     messages = [
         {"role": "user", "content": prompt}
     ]
-    text = tokenizer.apply_chat_template(
+    return tokenizer.apply_chat_template(
         messages,
         tokenize=False,
         add_generation_prompt=True,
     )
+
+
+def _sampling_kwargs() -> dict:
+    """Explicit sampling knobs: greedy by default (see _sampling_enabled).
+
+    The Nones unset the checkpoint generation-config's temperature /
+    top_p / top_k so transformers does not warn about ignored values.
+    """
+    if _sampling_enabled():
+        return {}
+    return {
+        "do_sample": False,
+        "temperature": None,
+        "top_p": None,
+        "top_k": None,
+    }
+
+
+def _oom_error(model, input_len: int, max_new_tokens: int, exc) -> RuntimeError:
+    """Build the diagnostic RuntimeError raised for a CUDA OOM in generate."""
+    impl = getattr(model.config, "_attn_implementation", "unknown")
+    load = _describe_load(model)
+    # Do NOT assert "eager attention" here. Two distinct failure modes
+    # produce a giant "Tried to allocate N GiB":
+    #   * O(N^2) in input length  -> eager attention materialising the
+    #     score matrix; verify flash-attn / SDPA is dispatched.
+    #   * O(N)   in input length  -> NOT attention. Seen with
+    #     transformers>=5 on Qwen3-*-A3B: the MoE forward densifies to
+    #     an fp32 [seq, hidden, intermediate] tensor (~48 MiB/token),
+    #     or 4-bit quantization silently failed and the model is in
+    #     bf16. Pin transformers<5 and confirm load is 4-bit.
+    # Compare the allocation size across two different input lengths to
+    # tell them apart (linear => MoE/quant, quadratic => eager).
+    return RuntimeError(
+        f"CUDA OOM during generate (input={input_len} tokens, "
+        f"max_new_tokens={max_new_tokens}, "
+        f"attn_implementation={impl!r}, {load}). If the attempted "
+        "allocation grows LINEARLY with input length it is NOT "
+        "attention — suspect transformers>=5 MoE densification or "
+        "4-bit quantization not applied (pin transformers<5, verify "
+        "load_in_4bit). If it grows QUADRATICALLY, attention is "
+        "running eager — verify flash-attn/SDPA. Original: " + str(exc)
+    )
+
+
+def _split_output(tokenizer, output_ids: list[int]) -> tuple[str, str]:
+    """Decode generated ids into ``(content, thinking)``.
+
+    Model-aware reasoning split: resolve the closing marker from the
+    tokenizer's own vocabulary (151668 on Qwen3) instead of hardcoding
+    the Qwen id. Vocabularies without the marker (e.g. Gemma) get
+    boundary 0 — the whole generation is content.
+    """
+    index = thinking_boundary(output_ids, think_end_token_id(tokenizer))
+
+    thinking_content = tokenizer.decode(output_ids[:index], skip_special_tokens=True).strip("\n")
+    content = tokenizer.decode(output_ids[index:], skip_special_tokens=True).strip("\n")
+    return content, thinking_content
+
+
+def kv_bytes_per_token(model) -> int:
+    """KV-cache bytes one cached token costs on ``model`` (all layers, K+V).
+
+    Read from the (text) config so the prefix cache can budget VRAM
+    before anything is cached; multimodal checkpoints (Gemma 4) keep the
+    language model's shape under ``text_config``.
+    """
+    config = getattr(model, "config", None)
+    config = getattr(config, "text_config", None) or config
+    heads = getattr(config, "num_attention_heads", 1) or 1
+    kv_heads = getattr(config, "num_key_value_heads", None) or heads
+    head_dim = getattr(config, "head_dim", None) or (
+        getattr(config, "hidden_size", heads) // heads
+    )
+    layers = getattr(config, "num_hidden_layers", 1) or 1
+    dtype = getattr(model, "dtype", None)
+    dtype_bytes = getattr(dtype, "itemsize", 2) or 2
+    return max(1, 2 * layers * kv_heads * head_dim * dtype_bytes)
+
+
+def _generate_with_prefix_cache(model, model_inputs, prefix_cache, **generate_kwargs):
+    """``model.generate`` that reuses / records a shared-prefix KV cache.
+
+    On a hit the stored cache is cropped to the shared prefix and passed
+    as ``past_key_values`` so only the uncached suffix is prefilled.
+    Either way the prompt's cache is kept afterwards — cropped to the
+    prompt, without the generated tail (generate appends to it in place)
+    — for the following steps. Caches without ``crop`` are never stored.
+    """
+    tokens = tuple(model_inputs["input_ids"][0].tolist())
+    entry, matched = prefix_cache.match(tokens)
+    if entry is None:
+        outputs = model.generate(
+            **model_inputs, return_dict_in_generate=True, **generate_kwargs
+        )
+        cache = getattr(outputs, "past_key_values", None)
+        if hasattr(cache, "crop"):
+            cache.crop(len(tokens))
+            prefix_cache.store(tokens, cache)
+        return outputs.sequences
+
+    cache = entry.payload
+    if matched < entry.length:
+        cache.crop(matched)
+    try:
+        outputs = model.generate(
+            **model_inputs,
+            past_key_values=cache,
+            return_dict_in_generate=True,
+            **generate_kwargs,
+        )
+    except BaseException:
+        # A failed generate may leave the cache at any length; don't reuse it.
+        prefix_cache.discard(entry)
+        raise
+    cache.crop(len(tokens))
+    prefix_cache.rekey(entry, tokens)
+    return outputs.sequences
+
+
+def hf_generate(prompt: str, model, tokenizer, max_new_tokens: int = 16784, cancel_event=None, prefix_cache=None):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ReviewCancelledError("Generation cancelled before tokenization")
+
+    text = _render_chat(tokenizer, prompt)
     model_inputs = tokenizer([text], return_tensors="pt")
     _validate_generation_budget(
         model_inputs["input_ids"].shape[-1], max_new_tokens,
@@ -475,52 +601,26 @@ def hf_generate(prompt: str, model, tokenizer, max_new_tokens: int = 16784, canc
             [_CancelStoppingCriteria(cancel_event)]
         )
 
+    generate_kwargs = {
+        "max_new_tokens": max_new_tokens,
+        "stopping_criteria": stopping_criteria,
+        **_sampling_kwargs(),
+    }
     try:
-        # Explicit sampling knobs: greedy by default (see _sampling_enabled).
-        # The Nones unset the checkpoint generation-config's temperature /
-        # top_p / top_k so transformers does not warn about ignored values.
-        sampling_kwargs = (
-            {}
-            if _sampling_enabled()
-            else {
-                "do_sample": False,
-                "temperature": None,
-                "top_p": None,
-                "top_k": None,
-            }
-        )
         with torch.inference_mode():
             with _force_efficient_sdpa():
-                generated_ids = model.generate(
-                    **model_inputs,
-                    max_new_tokens=max_new_tokens,
-                    stopping_criteria=stopping_criteria,
-                    **sampling_kwargs,
-                )
+                if prefix_cache is not None:
+                    generated_ids = _generate_with_prefix_cache(
+                        model, model_inputs, prefix_cache, **generate_kwargs
+                    )
+                else:
+                    generated_ids = model.generate(**model_inputs, **generate_kwargs)
     except torch.cuda.OutOfMemoryError as exc:
-        impl = getattr(model.config, "_attn_implementation", "unknown")
-        input_len = model_inputs["input_ids"].shape[-1]
-        load = _describe_load(model)
-        # Do NOT assert "eager attention" here. Two distinct failure modes
-        # produce a giant "Tried to allocate N GiB":
-        #   * O(N^2) in input length  -> eager attention materialising the
-        #     score matrix; verify flash-attn / SDPA is dispatched.
-        #   * O(N)   in input length  -> NOT attention. Seen with
-        #     transformers>=5 on Qwen3-*-A3B: the MoE forward densifies to
-        #     an fp32 [seq, hidden, intermediate] tensor (~48 MiB/token),
-        #     or 4-bit quantization silently failed and the model is in
-        #     bf16. Pin transformers<5 and confirm load is 4-bit.
-        # Compare the allocation size across two different input lengths to
-        # tell them apart (linear => MoE/quant, quadratic => eager).
-        raise RuntimeError(
-            f"CUDA OOM during generate (input={input_len} tokens, "
-            f"max_new_tokens={max_new_tokens}, "
-            f"attn_implementation={impl!r}, {load}). If the attempted "
-            "allocation grows LINEARLY with input length it is NOT "
-            "attention — suspect transformers>=5 MoE densification or "
-            "4-bit quantization not applied (pin transformers<5, verify "
-            "load_in_4bit). If it grows QUADRATICALLY, attention is "
-            "running eager — verify flash-attn/SDPA. Original: " + str(exc)
+        if prefix_cache is not None:
+            # Cached prefixes pin VRAM; hand it back before the next request.
+            prefix_cache.clear()
+        raise _oom_error(
+            model, model_inputs["input_ids"].shape[-1], max_new_tokens, exc,
         ) from exc
 
     # If the stopping criterion fired because the cancel_event was set,
@@ -533,14 +633,306 @@ def hf_generate(prompt: str, model, tokenizer, max_new_tokens: int = 16784, canc
         )
 
     output_ids = generated_ids[0][len(model_inputs.input_ids[0]):].tolist()
+    content, thinking_content = _split_output(tokenizer, output_ids)
+    print(datetime.datetime.now(), "Generation completed.")
+    return content, thinking_content
 
-    # Model-aware reasoning split: resolve the closing marker from the
-    # tokenizer's own vocabulary (151668 on Qwen3) instead of hardcoding
-    # the Qwen id. Vocabularies without the marker (e.g. Gemma) get
-    # boundary 0 — the whole generation is content.
-    index = thinking_boundary(output_ids, think_end_token_id(tokenizer))
 
-    thinking_content = tokenizer.decode(output_ids[:index], skip_special_tokens=True).strip("\n")
-    content = tokenizer.decode(output_ids[index:], skip_special_tokens=True).strip("\n")
+def _shared_prefill(model, model_inputs, rows: int):
+    """KV cache of all but the prompt's last token, repeated to ``rows`` rows.
+
+    Returns None when the prompt is a single token or the cache cannot be
+    repeated in place; generate then prefills every row itself.
+    """
+    input_ids = model_inputs["input_ids"]
+    if input_ids.shape[-1] < 2:
+        return None
+    outputs = model(
+        input_ids=input_ids[:, :-1],
+        attention_mask=model_inputs["attention_mask"][:, :-1],
+        use_cache=True,
+    )
+    cache = getattr(outputs, "past_key_values", None)
+    if not hasattr(cache, "batch_repeat_interleave"):
+        return None
+    cache.batch_repeat_interleave(rows)
+    return cache
+
+
+def hf_generate_samples(prompt: str, model, tokenizer, n: int, max_new_tokens: int = 16784, cancel_event=None):
+    """Return ``n`` ``(content, thinking)`` samples for one prompt.
+
+    The prompt is prefilled once and its KV cache repeated across ``n``
+    rows that decode as one batch, so each extra sample costs decode
+    steps but no second prompt encode. Under greedy decoding (the default,
+    see ``_sampling_enabled``) every row would be identical, so a single
+    generation is returned ``n`` times instead.
+    """
+    if n < 1:
+        raise ValueError(f"n must be >= 1, got {n}")
+    if n == 1 or not _sampling_enabled():
+        sample = hf_generate(
+            prompt, model, tokenizer,
+            max_new_tokens=max_new_tokens, cancel_event=cancel_event,
+        )
+        return [sample] * n
+    if cancel_event is not None and cancel_event.is_set():
+        raise ReviewCancelledError("Generation cancelled before tokenization")
+
+    text = _render_chat(tokenizer, prompt)
+    model_inputs = tokenizer([text], return_tensors="pt")
+    input_len = model_inputs["input_ids"].shape[-1]
+    _validate_generation_budget(input_len, max_new_tokens)
+    model_inputs = model_inputs.to(model.device)
+
+    stopping_criteria = None
+    if cancel_event is not None:
+        stopping_criteria = StoppingCriteriaList(
+            [_CancelStoppingCriteria(cancel_event)]
+        )
+
+    rows = {key: value.repeat(n, 1) for key, value in model_inputs.items()}
+    try:
+        with torch.inference_mode():
+            with _force_efficient_sdpa():
+                cache = _shared_prefill(model, model_inputs, n)
+                if cache is not None:
+                    rows["past_key_values"] = cache
+                generated_ids = model.generate(
+                    **rows,
+                    max_new_tokens=max_new_tokens,
+                    stopping_criteria=stopping_criteria,
+                    **_sampling_kwargs(),
+                )
+    except torch.cuda.OutOfMemoryError as exc:
+        raise _oom_error(model, input_len, max_new_tokens, exc) from exc
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise ReviewCancelledError(
+            "Generation interrupted mid-stream by cancel_event"
+        )
+
+    samples = [
+        _split_output(tokenizer, row[input_len:].tolist()) for row in generated_ids
+    ]
+    print(datetime.datetime.now(), f"Generated {n} samples.")
+    return samples
+
+
+class _TokenQueueStreamer:
+    """Hands each decode step's new ids from generate's thread to the reader.
+
+    Implements the ``put`` / ``end`` streamer protocol ``generate`` calls.
+    It first puts the prompt ids, which are skipped; ``None`` on the
+    queue marks the end of the generation.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._prompt_seen = False
+
+    def put(self, value):
+        if not self._prompt_seen:
+            self._prompt_seen = True
+            return
+        self._queue.put(value.reshape(-1).tolist())
+
+    def end(self):
+        self._queue.put(None)
+
+    def get(self):
+        return self._queue.get()
+
+
+def hf_generate_stream(prompt: str, model, tokenizer, max_new_tokens: int = 16784, cancel_event=None, prefix_cache=None):
+    """Yield the content of one generation as text chunks while it decodes.
+
+    Same prompt rendering, budget check and decoding knobs as
+    ``hf_generate``; ``model.generate`` runs on a helper thread that feeds
+    token ids to a ``ContentStreamDecoder``, so reasoning before the
+    ``</think>`` marker is not streamed. ``cancel_event`` raises
+    ``ReviewCancelledError`` like ``hf_generate``; closing the iterator
+    early stops generation within about one token. Either way the helper
+    thread has finished before this returns, so a caller holding the GPU
+    lock around the iteration never releases it under a live generate.
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise ReviewCancelledError("Generation cancelled before tokenization")
+
+    text = _render_chat(tokenizer, prompt)
+    model_inputs = tokenizer([text], return_tensors="pt")
+    input_len = model_inputs["input_ids"].shape[-1]
+    _validate_generation_budget(input_len, max_new_tokens)
+    model_inputs = model_inputs.to(model.device)
+
+    closed = threading.Event()
+    criteria = [_CancelStoppingCriteria(closed)]
+    if cancel_event is not None:
+        criteria.append(_CancelStoppingCriteria(cancel_event))
+    streamer = _TokenQueueStreamer()
+    generate_kwargs = {
+        "max_new_tokens": max_new_tokens,
+        "stopping_criteria": StoppingCriteriaList(criteria),
+        "streamer": streamer,
+        **_sampling_kwargs(),
+    }
+    failure = []
+
+    def run():
+        try:
+            with torch.inference_mode():
+                with _force_efficient_sdpa():
+                    if prefix_cache is not None:
+                        _generate_with_prefix_cache(
+                            model, model_inputs, prefix_cache, **generate_kwargs
+                        )
+                    else:
+                        model.generate(**model_inputs, **generate_kwargs)
+        except BaseException as exc:  # pylint: disable=broad-exception-caught  # re-raised on the reader's thread
+            failure.append(exc)
+        finally:
+            streamer.end()
+
+    worker = threading.Thread(target=run, name="hf-generate-stream", daemon=True)
+    worker.start()
+    decoder = ContentStreamDecoder(tokenizer, think_end_token_id(tokenizer))
+    try:
+        while (token_ids := streamer.get()) is not None:
+            chunk = decoder.push(token_ids)
+            if chunk:
+                yield chunk
+        worker.join()
+        if failure:
+            exc = failure[0]
+            if isinstance(exc, torch.cuda.OutOfMemoryError):
+                if prefix_cache is not None:
+                    prefix_cache.clear()
+                raise _oom_error(model, input_len, max_new_tokens, exc) from exc
+            raise exc
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReviewCancelledError(
+                "Generation interrupted mid-stream by cancel_event"
+            )
+        tail = decoder.finish()
+        if tail:
+            yield tail
+    finally:
+        closed.set()
+        worker.join()
     print(datetime.datetime.now(), "Generation completed.")
-    return content, thinking_content
+
+
+class _RowStoppingCriteria(StoppingCriteria):
+    """Per-row stop for a batched generate: own budget reached or cancelled.
+
+    Returns a ``[batch]`` bool tensor so transformers finishes each row
+    independently — a short-budget or cancelled row stops decoding (and is
+    padded from then on) while its batch-mates keep going.
+    """
+
+    def __init__(self, prompt_len: int, budgets: list[int], cancel_events: list):
+        super().__init__()
+        self._prompt_len = prompt_len
+        self._budgets = budgets
+        self._cancel_events = cancel_events
+
+    def __call__(self, input_ids, scores, **kwargs):
+        generated = input_ids.shape[-1] - self._prompt_len
+        done = [
+            generated >= budget
+            or (event is not None and event.is_set())
+            for budget, event in zip(self._budgets, self._cancel_events)
+        ]
+        return torch.tensor(done, dtype=torch.bool, device=input_ids.device)
+
+
+def _batch_pad_token_id(tokenizer) -> int:
+    """Pad id for a batch: the tokenizer's own, else EOS (never assigned back)."""
+    if tokenizer.pad_token_id is not None:
+        return tokenizer.pad_token_id
+    return tokenizer.eos_token_id
+
+
+def _left_padded_batch(rows: list[list[int]], pad_token_id: int) -> dict:
+    """Left-pad token id rows into one batch so every row decodes from the end.
+
+    Decoder-only generation appends to the right edge of each row, so the
+    padding must sit on the left. Padding is done here rather than by the
+    tokenizer: flipping the shared tokenizer's ``padding_side`` / ``pad_token``
+    would race every other thread encoding with it.
+    """
+    width = max(len(row) for row in rows)
+    input_ids = torch.full((len(rows), width), pad_token_id, dtype=torch.long)
+    attention_mask = torch.zeros((len(rows), width), dtype=torch.long)
+    for index, row in enumerate(rows):
+        if row:
+            input_ids[index, width - len(row):] = torch.tensor(row, dtype=torch.long)
+            attention_mask[index, width - len(row):] = 1
+    return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+def hf_generate_batch(prompts: list[str], model, tokenizer, max_new_tokens: list[int], cancel_events: list):
+    """Generate for several prompts in ONE padded ``model.generate`` call.
+
+    Returns one outcome per prompt, in order: a ``(content, thinking)``
+    tuple, or the exception instance that prompt alone should raise
+    (budget violation, cancellation). Rows share the prefill and every
+    decode step, which is where single-sequence decode leaves the GPU
+    idle; each row still stops at its own ``max_new_tokens`` or
+    ``cancel_event``. A CUDA OOM fails the whole batch, as it would have
+    failed the largest request alone.
+    """
+    outcomes: list = [None] * len(prompts)
+    live: list[int] = []
+    rows: list[list[int]] = []
+    for index, prompt in enumerate(prompts):
+        event = cancel_events[index]
+        if event is not None and event.is_set():
+            outcomes[index] = ReviewCancelledError("Generation cancelled before tokenization")
+            continue
+        input_ids = list(tokenizer(_render_chat(tokenizer, prompt)).input_ids)
+        try:
+            _validate_generation_budget(len(input_ids), max_new_tokens[index])
+        except ValueError as exc:
+            outcomes[index] = exc
+            continue
+        live.append(index)
+        rows.append(input_ids)
+    if not live:
+        return outcomes
+
+    pad_token_id = _batch_pad_token_id(tokenizer)
+    model_inputs = {
+        name: tensor.to(model.device)
+        for name, tensor in _left_padded_batch(rows, pad_token_id).items()
+    }
+    prompt_len = model_inputs["input_ids"].shape[-1]
+    budgets = [max_new_tokens[i] for i in live]
+    events = [cancel_events[i] for i in live]
+    stopping_criteria = StoppingCriteriaList(
+        [_RowStoppingCriteria(prompt_len, budgets, events)]
+    )
+    try:
+        with torch.inference_mode():
+            with _force_efficient_sdpa():
+                generated_ids = model.generate(
+                    **model_inputs,
+                    max_new_tokens=max(budgets),
+                    stopping_criteria=stopping_criteria,
+                    pad_token_id=pad_token_id,
+                    **_sampling_kwargs(),
+                )
+    except torch.cuda.OutOfMemoryError as exc:
+        raise _oom_error(model, prompt_len, max(budgets), exc) from exc
+
+    for row, index in enumerate(live):
+        event = cancel_events[index]
+        if event is not None and event.is_set():
+            outcomes[index] = ReviewCancelledError(
+                "Generation interrupted mid-stream by cancel_event"
+            )
+            continue
+        output_ids = generated_ids[row][prompt_len:prompt_len + budgets[row]].tolist()
+        outcomes[index] = _split_output(tokenizer, output_ids)
+    print(datetime.datetime.now(), f"Batched generation of {len(live)} completed.")
+    return outcomes
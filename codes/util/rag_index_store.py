@@ -0,0 +1,130 @@
+"""On-disk bookkeeping for the persisted FAISS rule index.
+
+Re-embedding every rule document on each server start or CLI run costs
+minutes with the legacy 4B embedding model. ``codes.util.faiss_util``
+instead writes the built index next to a small JSON manifest and reuses
+it on the next start. This module is the pure half — artifact naming,
+document hashing and the reuse plan — with no ML imports, so the runner
+test suite covers it without torch / faiss installed (the same split as
+``codes.util.embedding_config``).
+
+An artifact is keyed by the embedding model name, the hash of the
+ordered document set and the embedding dimension::
+
+    <RAG_INDEX_DIR>/<model-slug>-<set-hash>-d<dim>.faiss
+    <RAG_INDEX_DIR>/<model-slug>-<set-hash>-d<dim>.json
+
+An exact key match is loaded as-is. When the rule set changed, the
+newest artifact for the same model and dimension donates the vectors of
+every document whose hash it already holds, and only the new documents
+are embedded.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_INDEX_DIR = Path.home() / ".cache" / "prthinker" / "rag_index"
+
+_SLUG_UNSAFE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def index_dir() -> Optional[Path]:
+    """Artifact directory; ``RAG_INDEX_DIR=""`` disables persistence."""
+    raw = os.environ.get("RAG_INDEX_DIR")
+    if raw is None:
+        return DEFAULT_INDEX_DIR
+    raw = raw.strip()
+    return Path(raw) if raw else None
+
+
+def model_slug(model_name: str) -> str:
+    """Filesystem-safe form of a Hugging Face model id."""
+    return _SLUG_UNSAFE.sub("_", model_name).strip("_") or "model"
+
+
+def doc_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def doc_set_hash(doc_hashes: List[str]) -> str:
+    """Order-sensitive hash of a document set (row i is document i)."""
+    return hashlib.sha256("\n".join(doc_hashes).encode("ascii")).hexdigest()
+
+
+def artifact_stem(model_name: str, set_hash: str, dim: int) -> str:
+    return f"{model_slug(model_name)}-{set_hash[:16]}-d{dim}"
+
+
+def read_manifest(path: Path) -> Optional[dict]:
+    """Parse one manifest, or None when it is missing or unreadable."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or not isinstance(
+        manifest.get("doc_hashes"), list
+    ):
+        return None
+    return manifest
+
+
+def write_manifest(
+    path: Path, model_name: str, dim: int, doc_hashes: List[str]
+) -> None:
+    """Atomically write the manifest describing one index artifact."""
+    payload = {
+        "model": model_name,
+        "dim": dim,
+        "set_hash": doc_set_hash(doc_hashes),
+        "doc_hashes": list(doc_hashes),
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def find_donor(
+    directory: Path, model_name: str, dim: int
+) -> Optional[Tuple[Path, dict]]:
+    """Newest readable artifact for the same model and dimension."""
+    pattern = f"{model_slug(model_name)}-*-d{dim}.json"
+    candidates = sorted(
+        directory.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True
+    )
+    for manifest_path in candidates:
+        manifest = read_manifest(manifest_path)
+        index_path = manifest_path.with_suffix(".faiss")
+        if (
+            manifest is not None
+            and manifest.get("model") == model_name
+            and manifest.get("dim") == dim
+            and index_path.exists()
+        ):
+            return index_path, manifest
+    return None
+
+
+def plan_reuse(
+    old_hashes: List[str], new_hashes: List[str]
+) -> Tuple[Dict[int, int], List[int]]:
+    """Split the new document set into reusable rows and rows to embed.
+
+    Returns ``(reuse, embed)``: ``reuse`` maps a new row position to the
+    donor row holding the same document; ``embed`` lists the positions
+    whose documents the donor never embedded.
+    """
+    old_rows: Dict[str, int] = {}
+    for row, h in enumerate(old_hashes):
+        old_rows.setdefault(h, row)
+    reuse: Dict[int, int] = {}
+    embed: List[int] = []
+    for pos, h in enumerate(new_hashes):
+        if h in old_rows:
+            reuse[pos] = old_rows[h]
+        else:
+            embed.append(pos)
+    return reuse, embed
@@ -0,0 +1,94 @@
+"""Incremental decoding of generated ids into streamed content text.
+
+Torch-free (the tokenizer is duck-typed) so the chunking rules are
+unit-testable without the GPU stack, like ``think_split``. The streaming
+generate feeds token ids in as the model produces them; the decoder
+hands back text deltas whose concatenation matches the ``content`` half
+of ``_split_output`` for the same ids:
+
+- Reasoning is not streamed. With a reasoning-close marker in the
+  vocabulary, ids are held until the marker appears and only what
+  follows it is content. A generation that never emits the marker is
+  all content (``thinking_boundary`` returns 0), released by ``finish``.
+- Text is released at word boundaries (after a space or newline), the
+  same rule as transformers' ``TextStreamer``, so a multi-token word or
+  a multi-byte character is never emitted half-decoded.
+- Leading and trailing newlines are dropped, matching the
+  ``.strip("\\n")`` of the one-shot decode.
+
+The stream treats the *first* marker as the boundary, where the one-shot
+split uses the last; a model that emits a second ``</think>`` inside its
+answer streams the text between the two as content.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+_REPLACEMENT_CHAR = "\ufffd"
+
+
+class ContentStreamDecoder:
+    """Turn generated token ids into content text deltas as they arrive."""
+
+    def __init__(self, tokenizer, think_end_id: int | None) -> None:
+        self._tokenizer = tokenizer
+        self._think_end_id = think_end_id
+        self._in_content = think_end_id is None
+        self._thinking: list[int] = []
+        # Content ids since the last line break, and how many characters
+        # of their decoded text were already released.
+        self._pending: list[int] = []
+        self._released = 0
+        self._started = False
+        self._held_newlines = ""
+
+    def push(self, token_ids: Iterable[int]) -> str:
+        """Feed newly generated ids; return the content text now complete."""
+        for token_id in token_ids:
+            if self._in_content:
+                self._pending.append(token_id)
+            elif token_id == self._think_end_id:
+                self._in_content = True
+                self._thinking = []
+            else:
+                self._thinking.append(token_id)
+        return self._release(final=False) if self._pending else ""
+
+    def finish(self) -> str:
+        """Release whatever is left once generation has ended."""
+        if not self._in_content:
+            # No marker at all: the whole generation was content.
+            self._pending = self._thinking + self._pending
+            self._thinking = []
+            self._in_content = True
+        return self._release(final=True)
+
+    def _release(self, *, final: bool) -> str:
+        text = self._tokenizer.decode(self._pending, skip_special_tokens=True)
+        if final or text.endswith("\n"):
+            ready = text
+        elif text.endswith(_REPLACEMENT_CHAR):
+            return ""
+        else:
+            ready = text[: max(text.rfind(" ") + 1, self._released)]
+        delta = ready[self._released:]
+        if final or text.endswith("\n"):
+            self._pending = []
+            self._released = 0
+        else:
+            self._released = len(ready)
+        return self._trim_newlines(delta, final=final)
+
+    def _trim_newlines(self, delta: str, *, final: bool) -> str:
+        if not self._started:
+            delta = delta.lstrip("\n")
+            self._started = bool(delta)
+        delta = self._held_newlines + delta
+        body = delta.rstrip("\n")
+        # Newlines are only released once more text follows them.
+        self._held_newlines = "" if final else delta[len(body):]
+        return body
+
+
+__all__ = ["ContentStreamDecoder"]
@@ -20,12 +20,9 @@ import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterable
+from typing import Iterable
 
-from prthinker.corpora_base import JsonlCorpusStore, embed_store_comments
-
-if TYPE_CHECKING:
-    import numpy as np
+from prthinker.corpora_base import CommentIndex, JsonlCorpusStore, embed_comments
 
 log = logging.getLogger(__name__)
 
@@ -79,32 +76,21 @@ class AcceptedExamplesRetriever:
         self._k = k
         self._threshold = threshold
         self._path_scoped = path_scoped
-        self._embeddings: list[tuple[AcceptedExample, np.ndarray]] = []
+        self._index: CommentIndex[AcceptedExample] | None = None
 
-    def _ensure_embeddings(self) -> None:
-        if self._embeddings or len(self._store) == 0:
-            return
-        self._embeddings = embed_store_comments(self._store)
+    def _ensure_index(self) -> CommentIndex[AcceptedExample]:
+        if self._index is None:
+            self._index = CommentIndex(self._store, cache=self._store.embedding_cache())
+            self._store.on_append(self._index.add)
+        return self._index
 
     def top_k(self, query: str, path: str | None = None) -> list[AcceptedExample]:
         if len(self._store) == 0:
             return []
-        self._ensure_embeddings()
-        # Lazy imports keep the runner profile (httpx + pydantic only)
-        # importable on machines without numpy / faiss.
-        import numpy as np
-        from codes.util.faiss_util import get_embedding
-
-        q = get_embedding(query)
-        scored: list[tuple[float, AcceptedExample]] = []
-        for ex, emb in self._embeddings:
-            if self._path_scoped and path is not None and ex.path != path:
-                continue
-            score = float(np.dot(q, emb))
-            if score >= self._threshold:
-                scored.append((score, ex))
-        scored.sort(key=lambda pair: pair[0], reverse=True)
-        return [ex for _score, ex in scored[: self._k]]
+        index = self._ensure_index()
+        scope = [path] if self._path_scoped and path is not None else None
+        hits = index.search(embed_comments([query]), self._k, scope)[0]
+        return [index.rows[row] for score, row in hits if score >= self._threshold]
 
 
 def format_examples_block(examples: Iterable[AcceptedExample]) -> str:
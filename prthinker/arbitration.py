@@ -15,6 +15,11 @@ flakiness:
 * a finding that collected **zero countable votes is kept**;
 * the whole layer is skipped when there are no findings or no arbiters.
 
+Arbiters are queried concurrently (each backend bounded by its
+``max_concurrency()``), long finding lists are split into chunks sent as
+separate prompts, and once the strategy reports that every finding in a
+chunk is final the chunk's outstanding calls are cancelled.
+
 Runner-safe: stdlib + pydantic only; inference lives entirely in the
 injected :class:`~prthinker.backends.base.InferenceBackend` strategies.
 """
@@ -23,6 +28,8 @@ from __future__ import annotations
 
 import json
 import logging
+import queue
+import threading
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from dataclasses import dataclass
@@ -37,6 +44,7 @@ _VERDICT_CONFIRM = "confirm"
 _VERDICT_REJECT = "reject"
 
 DEFAULT_ARBITRATION_MAX_NEW_TOKENS = 4096
+DEFAULT_ARBITRATION_CHUNK_SIZE = 40
 
 
 # --- prompt template ------------------------------------------------------
@@ -144,6 +152,24 @@ class ArbitrationStrategy(ABC):
         zero-vote fail-open path is handled by the arbitrator itself.
         """
 
+    def survives(self, confirms: int, rejects: int) -> bool:
+        """The arbitrator's verdict: :meth:`keep`, with zero votes failing open."""
+        return confirms + rejects == 0 or self.keep(confirms, rejects)
+
+    def is_final(self, confirms: int, rejects: int, pending: int) -> bool:
+        """Return True when ``pending`` more arbiters cannot change the verdict.
+
+        Each outstanding arbiter may confirm, reject or abstain, so the
+        verdict is final when every reachable tally agrees with the current
+        one. Strategies with a closed form may override this.
+        """
+        verdict = self.survives(confirms, rejects)
+        return all(
+            self.survives(confirms + more_confirms, rejects + more_rejects) == verdict
+            for more_confirms in range(pending + 1)
+            for more_rejects in range(pending + 1 - more_confirms)
+        )
+
 
 class MajorityStrategy(ArbitrationStrategy):
     """Drop a finding only when rejects outnumber confirms (ties keep)."""
@@ -208,20 +234,59 @@ class ArbitrationOutcome:
     tallies: dict[int, tuple[int, int]]
 
 
+class _ChunkCancel:
+    """Event-like flag for one chunk's arbiter calls, also tripped by the caller's."""
+
+    def __init__(self, parent: object | None) -> None:
+        self._parent = parent
+        self._event = threading.Event()
+
+    def set(self) -> None:
+        self._event.set()
+
+    def is_set(self) -> bool:
+        if self._event.is_set():
+            return True
+        is_set = getattr(self._parent, "is_set", None)
+        return bool(is_set()) if callable(is_set) else False
+
+
+@dataclass(frozen=True)
+class _Chunk:
+    """A slice of the findings sent to every arbiter as one prompt."""
+
+    offset: int
+    count: int
+    prompt: str
+    cancel: _ChunkCancel
+
+
 class FindingArbitrator:
-    """Fan findings out to arbiter backends and apply the vote strategy."""
+    """Fan findings out to arbiter backends and apply the vote strategy.
+
+    With ``short_circuit`` (the default) a chunk stops collecting votes as
+    soon as the strategy reports every verdict in it final, so its
+    ``tallies`` only count the votes received up to that point.
+    """
 
     def __init__(
         self,
         backends: Sequence[InferenceBackend],
         strategy: ArbitrationStrategy,
         max_new_tokens: int = DEFAULT_ARBITRATION_MAX_NEW_TOKENS,
+        *,
+        chunk_size: int = DEFAULT_ARBITRATION_CHUNK_SIZE,
+        short_circuit: bool = True,
     ) -> None:
         if not backends:
             raise ValueError("FindingArbitrator requires at least one backend")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
         self._backends = tuple(backends)
         self._strategy = strategy
         self._max_new_tokens = max_new_tokens
+        self._chunk_size = chunk_size
+        self._short_circuit = short_circuit
 
     def arbitrate(
         self,
@@ -234,38 +299,112 @@ class FindingArbitrator:
         items = list(findings)
         if not items:
             return ArbitrationOutcome(kept=[], dropped=[], tallies={})
-        prompt = build_arbitration_prompt(diff_text, items)
-        tallies = self._collect_tallies(prompt, len(items), cancel_event)
+        chunks = [
+            _Chunk(
+                offset=offset,
+                count=len(part),
+                prompt=build_arbitration_prompt(diff_text, part),
+                cancel=_ChunkCancel(cancel_event),
+            )
+            for offset in range(0, len(items), self._chunk_size)
+            for part in (items[offset:offset + self._chunk_size],)
+        ]
+        tallies = self._collect_tallies(chunks)
         return self._partition(items, tallies)
 
     def _collect_tallies(
-        self,
-        prompt: str,
-        count: int,
-        cancel_event: "object | None",
+        self, chunks: list[_Chunk]
     ) -> dict[int, tuple[int, int]]:
-        """Query each arbiter, skipping (and logging) the ones that raise."""
+        """Query every arbiter on every chunk concurrently and tally the votes.
+
+        Each backend gets ``min(max_concurrency(), len(chunks))`` worker
+        threads. Votes for a chunk that is already final are ignored.
+        """
+        answers: queue.Queue = queue.Queue()
+        for backend_index, backend in enumerate(self._backends):
+            todo: queue.SimpleQueue = queue.SimpleQueue()
+            for chunk in chunks:
+                todo.put(chunk)
+            workers = min(max(1, backend.max_concurrency()), len(chunks))
+            for worker in range(workers):
+                threading.Thread(
+                    target=self._call_arbiter,
+                    args=(backend, todo, answers),
+                    name=f"arbiter-{backend_index}-{worker}",
+                    daemon=True,
+                ).start()
+
         tallies: dict[int, tuple[int, int]] = {}
-        for backend in self._backends:
-            try:
-                raw = backend.generate(
-                    prompt, self._max_new_tokens, cancel_event=cancel_event
-                )
-            except Exception:  # noqa: BLE001 — one flaky arbiter must not kill the review
-                log.warning(
-                    "Arbiter backend %s failed; it abstains",
-                    backend.backend_kind(),
-                    exc_info=True,
-                )
-                continue
-            for index, confirmed in parse_votes(raw, count).items():
-                confirms, rejects = tallies.get(index, (0, 0))
-                tallies[index] = (
-                    (confirms + 1, rejects) if confirmed
-                    else (confirms, rejects + 1)
-                )
+        pending = {chunk.offset: len(self._backends) for chunk in chunks}
+        try:
+            while pending:
+                chunk, votes = answers.get()
+                if chunk.offset not in pending:
+                    continue
+                pending[chunk.offset] -= 1
+                for index, confirmed in votes.items():
+                    global_index = chunk.offset + index
+                    confirms, rejects = tallies.get(global_index, (0, 0))
+                    tallies[global_index] = (
+                        (confirms + 1, rejects) if confirmed
+                        else (confirms, rejects + 1)
+                    )
+                if pending[chunk.offset] == 0 or self._chunk_final(
+                    chunk, tallies, pending[chunk.offset]
+                ):
+                    del pending[chunk.offset]
+                    chunk.cancel.set()
+        finally:
+            for chunk in chunks:
+                chunk.cancel.set()
         return tallies
 
+    def _chunk_final(
+        self,
+        chunk: _Chunk,
+        tallies: dict[int, tuple[int, int]],
+        pending: int,
+    ) -> bool:
+        """Whether no outstanding arbiter can flip a verdict in ``chunk``."""
+        if not self._short_circuit:
+            return False
+        return all(
+            self._strategy.is_final(*tallies.get(index, (0, 0)), pending)
+            for index in range(chunk.offset + 1, chunk.offset + chunk.count + 1)
+        )
+
+    def _call_arbiter(
+        self,
+        backend: InferenceBackend,
+        todo: queue.SimpleQueue,
+        answers: queue.Queue,
+    ) -> None:
+        """Worker body: one ``(chunk, votes)`` per chunk onto ``answers``.
+
+        A chunk that is already final (or cancelled by the caller) is not
+        sent; it and a failing call both report ``{}`` — an abstention.
+        """
+        while True:
+            try:
+                chunk: _Chunk = todo.get_nowait()
+            except queue.Empty:
+                return
+            votes: dict[int, bool] = {}
+            if not chunk.cancel.is_set():
+                try:
+                    raw = backend.generate(
+                        chunk.prompt, self._max_new_tokens, cancel_event=chunk.cancel
+                    )
+                    votes = parse_votes(raw, chunk.count)
+                except Exception:  # noqa: BLE001 — one flaky arbiter must not kill the review
+                    if not chunk.cancel.is_set():
+                        log.warning(
+                            "Arbiter backend %s failed; it abstains",
+                            backend.backend_kind(),
+                            exc_info=True,
+                        )
+            answers.put((chunk, votes))
+
     def _partition(
         self,
         items: list[InlineFinding],
@@ -276,7 +415,7 @@ class FindingArbitrator:
         dropped: list[InlineFinding] = []
         for index, finding in enumerate(items, start=1):
             confirms, rejects = tallies.get(index, (0, 0))
-            if confirms + rejects == 0 or self._strategy.keep(confirms, rejects):
+            if self._strategy.survives(confirms, rejects):
                 kept.append(finding)
                 continue
             log.info(
@@ -291,6 +430,7 @@ __all__ = [
     "ArbitrationOutcome",
     "ArbitrationStrategy",
     "AnyConfirmStrategy",
+    "DEFAULT_ARBITRATION_CHUNK_SIZE",
     "DEFAULT_ARBITRATION_MAX_NEW_TOKENS",
     "FindingArbitrator",
     "MajorityStrategy",
@@ -144,7 +144,17 @@ def _wrap(inner: InferenceBackend, config: Config) -> InferenceBackend:
             if config.cache.ttl_days is None
             else config.cache.ttl_days * 86400.0
         )
-        cache = PromptCache(Path(config.cache.path), ttl_seconds=ttl)
+        max_bytes = (
+            None
+            if config.cache.max_mb is None
+            else int(config.cache.max_mb * 1024 * 1024)
+        )
+        cache = PromptCache(
+            Path(config.cache.path),
+            ttl_seconds=ttl,
+            max_bytes=max_bytes,
+            eviction=config.cache.eviction,
+        )
         wrapped = CachingBackend(wrapped, cache)
 
     if config.telemetry.enabled:
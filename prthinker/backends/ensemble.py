@@ -1,15 +1,27 @@
 """Ensemble backend that queries several backends and picks one answer.
 
 Pure composition over :class:`InferenceBackend`: it fans a single prompt
-out to every wrapped backend, tolerates individual failures (logging and
-skipping them), and selects one result according to a configurable policy.
+out to every wrapped backend *concurrently*, tolerates individual
+failures (logging and skipping them), and selects one result according
+to a configurable policy. Each member is limited to its own
+``max_concurrency()`` in-flight calls across every caller of the
+ensemble, so fanning out never overloads a rate-limited provider.
 
 Policies:
 
-- ``"longest"`` — return the longest output (most detailed reviewer wins).
-- ``"first"`` — return the first backend's output that did not raise.
-- ``"majority"`` — return the most common normalized output; ties resolve
-  to the earliest such output in call order.
+- ``"longest"`` — wait for every member, return the longest output
+  (most detailed reviewer wins).
+- ``"first"`` — return the first successful output to *arrive*; the
+  remaining members are cancelled.
+- ``"majority"`` — return as soon as a strict majority of members agree
+  on the normalized output, cancelling the rest. Without a quorum, the
+  most common output wins once every member has answered; ties resolve
+  to the earliest such output in member order.
+
+Cancellation is best effort: members get a per-call ``cancel_event``
+that fires once the answer is decided (or the caller's own event fires),
+which the local backend honours mid-generation. Members that ignore it
+finish in the background and their output is discarded.
 
 The selector is runner-safe: stdlib only, no heavy ML imports, and it
 never runs inference itself — that lives entirely in the wrapped backends.
@@ -18,6 +30,8 @@ never runs inference itself — that lives entirely in the wrapped backends.
 from __future__ import annotations
 
 import logging
+import queue
+import threading
 from collections import Counter
 from typing import Iterator
 
@@ -31,6 +45,23 @@ _POLICY_MAJORITY = "majority"
 _VALID_POLICIES = (_POLICY_LONGEST, _POLICY_FIRST, _POLICY_MAJORITY)
 
 
+class _CallCancel:
+    """Event-like flag for one ensemble call, also tripped by the caller's."""
+
+    def __init__(self, parent: object | None) -> None:
+        self._parent = parent
+        self._event = threading.Event()
+
+    def set(self) -> None:
+        self._event.set()
+
+    def is_set(self) -> bool:
+        if self._event.is_set():
+            return True
+        is_set = getattr(self._parent, "is_set", None)
+        return bool(is_set()) if callable(is_set) else False
+
+
 class EnsembleBackend(InferenceBackend):
     """Fan a prompt out to several backends and select one answer."""
 
@@ -47,6 +78,14 @@ class EnsembleBackend(InferenceBackend):
             )
         self._backends = backends
         self._policy = policy
+        self._limits = tuple(
+            threading.BoundedSemaphore(backend.max_concurrency())
+            for backend in backends
+        )
+
+    def max_concurrency(self) -> int:
+        """Every call reaches every member, so the tightest member bounds it."""
+        return min(backend.max_concurrency() for backend in self._backends)
 
     def generate(
         self,
@@ -55,7 +94,7 @@ class EnsembleBackend(InferenceBackend):
         *,
         cancel_event: object | None = None,
     ) -> str:
-        """Query every backend and select one output per the policy."""
+        """Query every backend concurrently and select one output per the policy."""
         results = self._collect(prompt, max_new_tokens, cancel_event)
         if not results:
             raise RuntimeError("all ensemble backends failed to generate")
@@ -67,22 +106,73 @@ class EnsembleBackend(InferenceBackend):
         max_new_tokens: int,
         cancel_event: object | None,
     ) -> list[str]:
-        """Call each backend, skipping (and logging) the ones that raise."""
-        results: list[str] = []
-        for backend in self._backends:
-            try:
-                output = backend.generate(
-                    prompt, max_new_tokens, cancel_event=cancel_event
-                )
-            except Exception:  # noqa: BLE001 — tolerate one bad backend
-                log.warning(
-                    "ensemble backend %s failed; skipping",
-                    backend.backend_kind(),
-                    exc_info=True,
-                )
-                continue
-            results.append(output)
-        return results
+        """Run every backend in parallel until the policy can decide.
+
+        Returns the successful outputs in member order, or only the
+        deciding output when the policy exits early.
+        """
+        call_cancel = _CallCancel(cancel_event)
+        answers: queue.Queue = queue.Queue()
+        for index in range(len(self._backends)):
+            threading.Thread(
+                target=self._call_member,
+                args=(index, prompt, max_new_tokens, call_cancel, answers),
+                name=f"ensemble-{index}",
+                daemon=True,
+            ).start()
+
+        outputs: dict[int, str] = {}
+        try:
+            for _ in self._backends:
+                index, output = answers.get()
+                if output is None:
+                    continue
+                outputs[index] = output
+                decided = self._decided(outputs)
+                if decided is not None:
+                    return [decided]
+        finally:
+            call_cancel.set()
+        return [outputs[index] for index in sorted(outputs)]
+
+    def _call_member(
+        self,
+        index: int,
+        prompt: str,
+        max_new_tokens: int,
+        call_cancel: _CallCancel,
+        answers: queue.Queue,
+    ) -> None:
+        """Worker body: one member's answer (None on failure) onto ``answers``."""
+        backend = self._backends[index]
+        output: str | None = None
+        with self._limits[index]:
+            if not call_cancel.is_set():
+                try:
+                    output = backend.generate(
+                        prompt, max_new_tokens, cancel_event=call_cancel
+                    )
+                except Exception:  # noqa: BLE001 — tolerate one bad backend
+                    if not call_cancel.is_set():
+                        log.warning(
+                            "ensemble backend %s failed; skipping",
+                            backend.backend_kind(),
+                            exc_info=True,
+                        )
+        answers.put((index, output))
+
+    def _decided(self, outputs: dict[int, str]) -> str | None:
+        """The early answer the policy settles on, or None to keep waiting."""
+        if self._policy == _POLICY_FIRST:
+            return next(iter(outputs.values()))
+        if self._policy == _POLICY_MAJORITY:
+            quorum = len(self._backends) // 2 + 1
+            ordered = [outputs[index] for index in sorted(outputs)]
+            counts = Counter(text.strip() for text in ordered)
+            for text in ordered:
+                if counts[text.strip()] >= quorum:
+                    return text
+        return None
 
     def _select(self, results: list[str]) -> str:
         """Apply the configured policy to the successful outputs."""
@@ -103,8 +193,82 @@ class EnsembleBackend(InferenceBackend):
     def stream_generate(
         self, prompt: str, max_new_tokens: int
     ) -> Iterator[str]:
-        """Delegate streaming to the first wrapped backend."""
-        return self._backends[0].stream_generate(prompt, max_new_tokens)
+        """Stream from whichever member produces its first chunk first.
+
+        Every member starts streaming at once; the first to yield a chunk
+        (or to finish with an empty stream) wins and the others are told
+        to stop. Members that fail before the winner is chosen are
+        skipped; a failure of the winner mid-stream propagates.
+        """
+        chunks: queue.Queue = queue.Queue()
+        stop = [threading.Event() for _ in self._backends]
+        for index in range(len(self._backends)):
+            threading.Thread(
+                target=self._pump_member,
+                args=(index, prompt, max_new_tokens, stop[index], chunks),
+                name=f"ensemble-stream-{index}",
+                daemon=True,
+            ).start()
+
+        winner: int | None = None
+        failed = 0
+        try:
+            while True:
+                index, kind, payload = chunks.get()
+                if winner is None and kind != "error":
+                    winner = index
+                    for other, event in enumerate(stop):
+                        if other != winner:
+                            event.set()
+                if winner is None:
+                    failed += 1
+                    log.warning(
+                        "ensemble backend %s failed to stream; skipping",
+                        self._backends[index].backend_kind(),
+                        exc_info=payload,
+                    )
+                    if failed == len(self._backends):
+                        raise RuntimeError("all ensemble backends failed to stream")
+                    continue
+                if index != winner:
+                    continue
+                if kind == "chunk":
+                    yield payload
+                elif kind == "done":
+                    return
+                else:
+                    raise payload
+        finally:
+            for event in stop:
+                event.set()
+
+    def _pump_member(
+        self,
+        index: int,
+        prompt: str,
+        max_new_tokens: int,
+        stop: threading.Event,
+        chunks: queue.Queue,
+    ) -> None:
+        """Worker body: forward one member's stream until told to stop."""
+        with self._limits[index]:
+            if stop.is_set():
+                return
+            stream = None
+            try:
+                stream = self._backends[index].stream_generate(prompt, max_new_tokens)
+                for chunk in stream:
+                    if stop.is_set():
+                        return
+                    chunks.put((index, "chunk", chunk))
+            except Exception as exc:  # noqa: BLE001 — reported to the consumer
+                chunks.put((index, "error", exc))
+                return
+            finally:
+                close = getattr(stream, "close", None)
+                if callable(close):
+                    close()
+        chunks.put((index, "done", None))
 
     def backend_kind(self) -> str:
         return "ensemble"
@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
+from typing import Iterator
+
 from prthinker.backends.base import InferenceBackend
 from prthinker.config import LocalBackendConfig
+from prthinker.gpu_batching import GenerationBatcher
 from prthinker.gpu_lock import gpu_serialized
+from prthinker.prefix_cache import PrefixCache
+
+# Conservative characters-per-token for the batcher's token budget.
+_CHARS_PER_TOKEN = 3
 
 
 class LocalHFBackend(InferenceBackend):
@@ -18,6 +25,22 @@ class LocalHFBackend(InferenceBackend):
     LoRA adapter and 4-bit / 8-bit quantization come from the
     `codes/util/hf_model_util.load_hf_model` factory (model-agnostic;
     it accepts any HF id).
+
+    With ``config.max_batch_size > 1`` concurrent callers are coalesced by
+    a :class:`~prthinker.gpu_batching.GenerationBatcher` into padded
+    batched generates; ``max_concurrency`` then reports the batch size so
+    per-file parallelism can actually keep a batch full.
+
+    With ``config.prefix_cache_mib > 0`` the unbatched path reuses the
+    KV cache of the longest previously-seen prompt prefix (see
+    :mod:`prthinker.prefix_cache`). Batched generates left-pad rows with
+    different prefixes and do not use it.
+
+    ``generate_samples`` returns several samples of one prompt from a
+    single prefill (see :func:`prthinker.self_consistency.self_consistent_generate`).
+
+    ``stream_generate`` decodes incrementally (content only, reasoning is
+    held back) and always runs unbatched under the GPU lock.
     """
 
     def __init__(self, config: LocalBackendConfig) -> None:
@@ -32,6 +55,21 @@ class LocalHFBackend(InferenceBackend):
         model.eval()
         self._model = model
         self._tokenizer = tokenizer
+        self._prefix_cache = (
+            self._build_prefix_cache(config.prefix_cache_mib)
+            if config.prefix_cache_mib > 0
+            else None
+        )
+        self._batcher = (
+            GenerationBatcher(
+                self._generate_batch,
+                count_tokens=self._count_tokens,
+                max_batch_size=config.max_batch_size,
+                token_budget=config.batch_token_budget,
+            )
+            if config.max_batch_size > 1
+            else None
+        )
 
     def backend_kind(self) -> str:
         return "local"
@@ -39,6 +77,10 @@ class LocalHFBackend(InferenceBackend):
     def model_name(self) -> str:
         return self._config.model_name
 
+    def max_concurrency(self) -> int:
+        batcher = getattr(self, "_batcher", None)
+        return batcher.max_batch_size if batcher is not None else 1
+
     def generate(
         self,
         prompt: str,
@@ -46,6 +88,13 @@ class LocalHFBackend(InferenceBackend):
         *,
         cancel_event: "object | None" = None,
     ) -> str:
+        batcher = getattr(self, "_batcher", None)
+        if batcher is not None:
+            content, _thinking = batcher.submit(
+                prompt, max_new_tokens, cancel_event=cancel_event
+            )
+            return content
+
         from codes.util.hf_model_util import hf_generate
 
         # Serialize the forward pass: the server runs many request threads
@@ -57,9 +106,89 @@ class LocalHFBackend(InferenceBackend):
                 self._tokenizer,
                 max_new_tokens=max_new_tokens,
                 cancel_event=cancel_event,
+                prefix_cache=getattr(self, "_prefix_cache", None),
             )
         return content
 
+    def generate_samples(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        n: int,
+        *,
+        cancel_event: "object | None" = None,
+    ) -> list[str]:
+        """``n`` samples decoded as one batch over a shared prompt prefill."""
+        from codes.util.hf_model_util import hf_generate_samples
+
+        with gpu_serialized():
+            samples = hf_generate_samples(
+                prompt,
+                self._model,
+                self._tokenizer,
+                n,
+                max_new_tokens=max_new_tokens,
+                cancel_event=cancel_event,
+            )
+        return [content for content, _thinking in samples]
+
+    def stream_generate(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        *,
+        cancel_event: "object | None" = None,
+    ) -> Iterator[str]:
+        """Yield content text as the model decodes it.
+
+        The GPU lock is held until the generation has stopped. Closing
+        the iterator early ends the generation within about a token, so
+        a caller that has seen enough frees the GPU for the next job.
+        """
+        from codes.util.hf_model_util import hf_generate_stream
+
+        with gpu_serialized():
+            yield from hf_generate_stream(
+                prompt,
+                self._model,
+                self._tokenizer,
+                max_new_tokens=max_new_tokens,
+                cancel_event=cancel_event,
+                prefix_cache=getattr(self, "_prefix_cache", None),
+            )
+
+    def _build_prefix_cache(self, budget_mib: int) -> PrefixCache:
+        from codes.util.hf_model_util import kv_bytes_per_token
+
+        return PrefixCache(
+            budget_mib * 1024 * 1024,
+            bytes_per_token=kv_bytes_per_token(self._model),
+        )
+
+    @staticmethod
+    def _count_tokens(prompt: str) -> int:
+        """Prompt size the batcher budgets with, estimated from its length.
+
+        Runs on every request thread, so it must not touch the shared
+        tokenizer the batch dispatcher encodes with. Code runs about three
+        characters per token; erring high keeps a batch inside its budget.
+        """
+        return max(1, len(prompt) // _CHARS_PER_TOKEN)
+
+    def _generate_batch(self, items) -> list:
+        """Batch body run by the batcher's dispatcher, already under the GPU lock."""
+        from codes.util.hf_model_util import hf_generate_batch
+
+        return hf_generate_batch(
+            [item.prompt for item in items],
+            self._model,
+            self._tokenizer,
+            max_new_tokens=[item.max_new_tokens for item in items],
+            cancel_events=[item.cancel_event for item in items],
+        )
+
     def close(self) -> None:
+        self._batcher = None
+        self._prefix_cache = None
         self._model = None
         self._tokenizer = None
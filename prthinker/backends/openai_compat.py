@@ -164,6 +164,45 @@ class OpenAICompatBackend(InferenceBackend):
             self._usage.set(usage)
         return text
 
+    def generate_samples(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        n: int,
+        *,
+        cancel_event: "object | None" = None,
+    ) -> list[str]:
+        """Up to ``n`` samples from one request via the ``n`` parameter.
+
+        The prompt is billed once; servers that ignore ``n`` (llama.cpp,
+        Ollama) answer with a single choice, so callers must accept a
+        shorter list.
+        """
+        del cancel_event
+        self._usage.set(None)
+        payload = {
+            "model": self._config.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_new_tokens,
+            "temperature": self._config.temperature,
+            "n": n,
+            "stream": False,
+        }
+        response = self._client.post("/chat/completions", json=payload)
+        response.raise_for_status()
+        body = response.json()
+        choices = body.get("choices") if isinstance(body, dict) else None
+        if not choices:
+            raise RuntimeError(f"Unexpected OpenAI-compat response shape: {body!r}")
+        texts = [
+            extract_chat_text({"choices": [choice]}, "OpenAI-compat")
+            for choice in choices[:n]
+        ]
+        usage = usage_from_payload(body.get("usage") or {})
+        if usage is not None:
+            self._usage.set(usage)
+        return texts
+
     def stream_generate(self, prompt: str, max_new_tokens: int) -> Iterator[str]:
         """Native SSE streaming via ``stream: true``.
 
@@ -5,13 +5,17 @@ Two thin clients of the FastAPI server:
 - RemoteHttpBackend       - runs a single prompt through the async /ask job
                             (submit + poll). Plugs into CoTPipeline like
                             LocalHFBackend, so the pipeline orchestration
-                            stays on the runner.
+                            stays on the runner. ``stream_generate`` uses
+                            the /ask/stream job and relays text chunks as
+                            the server's model decodes them.
 
 - RemotePipelineClient    - calls /review once and gets the full structured
                             result. Saves N-1 HTTP round-trips per review
                             and lets the server own RAG + step orchestration.
                             Not an InferenceBackend (it returns ReviewResponse,
-                            not a raw string).
+                            not a raw string). ``review_batch`` submits every
+                            file of a per-file review as one /review/batch job
+                            and yields each file's result as it finishes.
 
 Both go through the async job pattern (``/{kind}/submit`` for a job id, then
 poll ``/{kind}/result/{id}``). A 30B MoE generation runs for minutes, far
@@ -19,20 +23,26 @@ longer than Cloudflare's ~100s edge timeout that a synchronous call cannot
 survive (the 504 the synchronous /ask returned on slow PR summaries). Each
 individual call fits inside the proxy timeout; the overall wait is bounded by
 ``config.timeout_seconds``.
+
+Polls are long polls (``?wait=``): the server holds each one open until the
+job changes state or ``_LONG_POLL_SECONDS`` pass, so a result arrives the
+moment the job finishes instead of up to one poll interval later. A server
+that predates long-polling answers at once and is paced by
+``_POLL_INTERVAL_SECONDS`` as before.
 """
 
 from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Sequence
 from typing import TypeVar
 
 import httpx
 
 from prthinker.backends.base import InferenceBackend
 from prthinker.config import RemoteBackendConfig
-from prthinker.schemas import ReviewRequest, ReviewResponse
+from prthinker.schemas import MAX_BATCH_FILES, ReviewRequest, ReviewResponse
 
 log = logging.getLogger("prthinker.backends.remote")
 
@@ -47,6 +57,9 @@ _STATUS_CANCELLED = "cancelled"
 # so keep per-call timeout well below.
 _PER_CALL_TIMEOUT_SECONDS = 30.0
 _POLL_INTERVAL_SECONDS = 5.0
+# Server-side hold per poll. Must stay below _PER_CALL_TIMEOUT_SECONDS (and
+# so well below the proxy's ~100s cap) with room for the response itself.
+_LONG_POLL_SECONDS = 20.0
 # A poll occasionally trips the per-call timeout (backend GIL pause
 # during a heavy generate step, Cloudflare edge hiccup, runner network
 # blip). One slow poll should not crash a multi-minute review; retry
@@ -90,10 +103,13 @@ class _AsyncJobClient:
         self._kind = kind
         self._timeout_seconds = timeout_seconds
 
-    def run(self, submit_body: dict, parse_done: Callable[[dict], T]) -> T:
+    def submit(self, submit_body: dict) -> str:
         submit_resp = self._client.post(f"/{self._kind}/submit", json=submit_body)
         submit_resp.raise_for_status()
-        job_id = submit_resp.json()["job_id"]
+        return submit_resp.json()["job_id"]
+
+    def run(self, submit_body: dict, parse_done: Callable[[dict], T]) -> T:
+        job_id = self.submit(submit_body)
         completed_cleanly = False
         try:
             result = self._poll_until_done(job_id, parse_done)
@@ -107,6 +123,16 @@ class _AsyncJobClient:
                 # exception.
                 self._send_cancel(job_id)
 
+    @staticmethod
+    def _idle_sleep_seconds(poll_started: float) -> float:
+        """Pause after a poll that brought nothing new.
+
+        A long-polling server only says "not yet" after holding the request,
+        so this is ~0; an older server answers immediately and is paced to
+        one poll per ``_POLL_INTERVAL_SECONDS``.
+        """
+        return max(0.0, _POLL_INTERVAL_SECONDS - (time.monotonic() - poll_started))
+
     @staticmethod
     def _poll_sleep_seconds(consecutive_failures: int) -> float:
         """Compute the back-off sleep before the next poll attempt."""
@@ -138,24 +164,87 @@ class _AsyncJobClient:
     def _poll_until_done(self, job_id: str, parse_done: Callable[[dict], T]) -> T:
         deadline = time.monotonic() + self._timeout_seconds
         consecutive_failures = 0
+        pause = 0.0
         while True:
             if time.monotonic() >= deadline:
                 raise TimeoutError(
                     f"Remote {self._kind} job {job_id} did not finish within "
                     f"{self._timeout_seconds}s"
                 )
-            time.sleep(self._poll_sleep_seconds(consecutive_failures))
+            time.sleep(pause)
+            started = time.monotonic()
             try:
-                poll_resp = self._client.get(f"/{self._kind}/result/{job_id}")
+                poll_resp = self._client.get(
+                    f"/{self._kind}/result/{job_id}?wait={_LONG_POLL_SECONDS:g}"
+                )
                 poll_resp.raise_for_status()
             except _TRANSIENT_POLL_ERRORS as exc:
                 consecutive_failures += 1
                 self._note_poll_failure(job_id, consecutive_failures, exc)
+                pause = self._poll_sleep_seconds(consecutive_failures)
                 continue
             consecutive_failures = 0
             result = self._terminal_result_or_none(job_id, poll_resp.json(), parse_done)
             if result is not None:
                 return result
+            pause = self._idle_sleep_seconds(started)
+
+    def stream_items(
+        self, job_id: str, parse_item: Callable[[dict], T]
+    ) -> Iterator[T]:
+        """Poll a cursor job (a review batch, a streamed ask), yielding
+        each new item once.
+
+        Each poll sends the cursor from the previous one, so the server
+        returns only items produced since. ``timeout_seconds`` bounds the
+        wait for the *next* item rather than the whole job. The job is
+        cancelled server-side if the caller stops early or an error
+        escapes.
+        """
+        cursor = 0
+        deadline = time.monotonic() + self._timeout_seconds
+        consecutive_failures = 0
+        pause = 0.0
+        completed_cleanly = False
+        try:
+            while True:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f"Remote {self._kind} job {job_id} made no progress within "
+                        f"{self._timeout_seconds}s"
+                    )
+                time.sleep(pause)
+                started = time.monotonic()
+                try:
+                    poll_resp = self._client.get(
+                        f"/{self._kind}/result/{job_id}"
+                        f"?cursor={cursor}&wait={_LONG_POLL_SECONDS:g}"
+                    )
+                    poll_resp.raise_for_status()
+                except _TRANSIENT_POLL_ERRORS as exc:
+                    consecutive_failures += 1
+                    self._note_poll_failure(job_id, consecutive_failures, exc)
+                    pause = self._poll_sleep_seconds(consecutive_failures)
+                    continue
+                consecutive_failures = 0
+                payload = poll_resp.json()
+                items = payload.get("items") or []
+                if items:
+                    deadline = time.monotonic() + self._timeout_seconds
+                    pause = 0.0
+                else:
+                    pause = self._idle_sleep_seconds(started)
+                for item in items:
+                    yield parse_item(item)
+                cursor = payload.get("cursor", cursor + len(items))
+                if payload.get("status") == _STATUS_DONE:
+                    completed_cleanly = True
+                    return
+                # Raises on error / cancelled; pending and running keep polling.
+                self._terminal_result_or_none(job_id, payload, parse_item)
+        finally:
+            if not completed_cleanly:
+                self._send_cancel(job_id)
 
     def _note_poll_failure(
         self, job_id: str, consecutive_failures: int, exc: Exception
@@ -197,6 +286,20 @@ def _parse_review_done(payload: dict) -> ReviewResponse:
     return ReviewResponse.model_validate(payload["result"])
 
 
+def _parse_batch_item(item: dict) -> tuple[int, ReviewResponse]:
+    """Map one finished /review/batch item to ``(index, review)``.
+
+    A file that failed server-side fails the review, exactly as the
+    per-file /review call it replaces did.
+    """
+    if item.get("status") != _STATUS_DONE:
+        raise RuntimeError(
+            f"Remote review of {item.get('file_path')} ended with status "
+            f"{item.get('status')}: {item.get('error')}"
+        )
+    return int(item["index"]), ReviewResponse.model_validate(item["result"])
+
+
 class RemoteHttpBackend(InferenceBackend):
     concurrency_limit = 4
     """Runs prompts through the async /ask job (submit + poll)."""
@@ -225,10 +328,37 @@ class RemoteHttpBackend(InferenceBackend):
         # abnormal exit); the runner does not stream tokens, so the local
         # cancel_event is not wired into the poll loop.
         del cancel_event
-        return self._job.run(
-            {"prompt": prompt, "max_new_tokens": max_new_tokens},
-            _parse_ask_done,
+        return self._job.run(self._ask_body(prompt, max_new_tokens), _parse_ask_done)
+
+    def stream_generate(self, prompt: str, max_new_tokens: int) -> Iterator[str]:
+        """Relay the server's text chunks as its model decodes them.
+
+        Polls the /ask/stream job with a cursor, like ``review_batch``.
+        Closing the iterator early cancels the job server-side, which
+        frees the GPU within about a token. A server without /ask/stream
+        (404 on submit) answers with one whole-text chunk from /ask.
+        """
+        body = self._ask_body(prompt, max_new_tokens)
+        stream = _AsyncJobClient(
+            self._job._client, "ask/stream", self._config.timeout_seconds
         )
+        try:
+            job_id = stream.submit(body)
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code != 404:
+                raise
+            log.info("Server has no /ask/stream; waiting for the whole answer")
+            yield self._job.run(body, _parse_ask_done)
+            return
+        yield from stream.stream_items(job_id, str)
+
+    def _ask_body(self, prompt: str, max_new_tokens: int) -> dict:
+        return {
+            "prompt": prompt,
+            "max_new_tokens": max_new_tokens,
+            "priority": self._config.priority,
+            "client_id": self._config.client_id,
+        }
 
     def close(self) -> None:
         self._job.close()
@@ -254,5 +384,35 @@ class RemotePipelineClient:
     def review(self, request: ReviewRequest) -> ReviewResponse:
         return self._job.run(request.model_dump(), _parse_review_done)
 
+    def review_batch(
+        self, requests: Sequence[ReviewRequest]
+    ) -> Iterator[tuple[int, ReviewResponse]]:
+        """Review several files as batch jobs; yield ``(index, review)`` as
+        each finishes, in completion order.
+
+        One submit per :data:`MAX_BATCH_FILES` files and one poll loop for
+        all of them, instead of a submit + poll cycle per file. A server
+        without ``/review/batch`` (404 on submit) is reviewed file by file.
+        """
+        batch = _AsyncJobClient(
+            self._job._client, "review/batch", self._config.timeout_seconds
+        )
+        for start in range(0, len(requests), MAX_BATCH_FILES):
+            chunk = requests[start:start + MAX_BATCH_FILES]
+            try:
+                job_id = batch.submit({"requests": [r.model_dump() for r in chunk]})
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code != 404:
+                    raise
+                log.info(
+                    "Server has no /review/batch; reviewing %d file(s) one by one",
+                    len(chunk),
+                )
+                for offset, request in enumerate(chunk):
+                    yield start + offset, self.review(request)
+                continue
+            for index, response in batch.stream_items(job_id, _parse_batch_item):
+                yield start + index, response
+
     def close(self) -> None:
         self._job.close()
@@ -4,10 +4,15 @@ Two Decorators that can be stacked at the factory level:
 
 - ``CachingBackend(inner, cache)`` — looks up the prompt in the cache
   before delegating; writes the response back on miss. Honors the cache's
-  TTL config (set when the ``PromptCache`` was constructed).
+  TTL config (set when the ``PromptCache`` was constructed). Concurrent
+  misses on the same ``(kind, model, prompt, max_new_tokens)`` are
+  coalesced: one call generates, the others wait for its response.
 - ``InstrumentedBackend(inner, telemetry)`` — records every call's tokens,
   latency, cache-hit status, and estimated cost.
 
+Both forward ``generate_samples`` when the wrapped backend has it:
+uncached, and as one telemetry row per batch of samples.
+
 A common usage pattern is ``InstrumentedBackend(CachingBackend(real, cache),
 telemetry)`` so the telemetry layer sees the cache outcome via the inner
 wrapper's ``last_cache_hit`` flag.
@@ -16,28 +21,68 @@ wrapper's ``last_cache_hit`` flag.
 from __future__ import annotations
 
 import logging
+import threading
 import time
-from typing import Iterator
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
 
 from prthinker.backends.base import GenerationResult, InferenceBackend, Usage
 from prthinker.cache import PromptCache
+from prthinker.pipeline_types import ReviewCancelledError
 from prthinker.telemetry import CallRecord, TelemetrySink, estimate_tokens
 from prthinker.otel import inference_span
 
 log = logging.getLogger(__name__)
 
+# How often a caller waiting on another's identical generation re-checks
+# its own cancel_event.
+_CANCEL_POLL_SECONDS = 0.1
+
+
+def _forward_generate_samples(wrapper: InferenceBackend, inner: InferenceBackend) -> None:
+    """Expose ``generate_samples`` only when ``inner`` offers it.
+
+    Callers duck-type on the attribute (see
+    :mod:`prthinker.self_consistency`), so a wrapper must not claim a
+    capability its backend lacks, nor hide one it has.
+    """
+    if callable(getattr(inner, "generate_samples", None)):
+        wrapper.generate_samples = wrapper._generate_samples
+
+
+@dataclass
+class _Flight:
+    """One in-progress generation that identical requests wait on."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    text: str | None = None
+
 
 class CachingBackend(InferenceBackend):
-    """Read-through cache wrapper."""
+    """Read-through cache wrapper with single-flight misses.
+
+    The first caller to miss on a key generates; callers arriving with the
+    same key while it runs block until it finishes and return its text
+    as a cache hit. If the generating call fails or is cancelled, one of
+    the waiters takes over instead of inheriting the error. A waiter whose
+    own ``cancel_event`` fires stops waiting with ``ReviewCancelledError``.
+    """
 
     def __init__(self, inner: InferenceBackend, cache: PromptCache) -> None:
         self._inner = inner
         self._cache = cache
-        self._last_cache_hit = False
+        self._hit = threading.local()
+        self._lock = threading.Lock()
+        self._flights: dict[tuple[str, str, str, int], _Flight] = {}
+        _forward_generate_samples(self, inner)
 
     @property
     def last_cache_hit(self) -> bool:
-        return self._last_cache_hit
+        """Whether this thread's most recent call was served without generating."""
+        return getattr(self._hit, "value", False)
+
+    def _set_hit(self, value: bool) -> None:
+        self._hit.value = value
 
     def backend_kind(self) -> str:
         return self._inner.backend_kind()
@@ -51,6 +96,80 @@ class CachingBackend(InferenceBackend):
     def max_concurrency(self) -> int:
         return self._inner.max_concurrency()
 
+    def _key(self, prompt: str, max_new_tokens: int) -> tuple[str, str, str, int]:
+        return (
+            self._inner.backend_kind(), self._inner.model_name(), prompt, max_new_tokens,
+        )
+
+    def _lookup(
+        self, key: tuple[str, str, str, int], cancel_event: "object | None" = None
+    ) -> tuple[str | None, _Flight | None]:
+        """A cached / coalesced response, or the flight this caller now leads.
+
+        Returns ``(text, None)`` on a hit and ``(None, flight)`` when the
+        caller must generate and then :meth:`_land` the flight.
+        """
+        while True:
+            cached = self._cache.get(*key)
+            if cached is not None:
+                return cached, None
+            with self._lock:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    break
+            while not flight.done.wait(_CANCEL_POLL_SECONDS):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReviewCancelledError(
+                        "Generation cancelled while waiting on an identical request"
+                    )
+            if flight.text is not None:
+                return flight.text, None
+        # Another leader may have landed between our miss and taking the lead.
+        cached = self._cache.get(*key)
+        if cached is not None:
+            self._land(key, flight, cached, store=False)
+            return cached, None
+        return None, flight
+
+    def _land(
+        self,
+        key: tuple[str, str, str, int],
+        flight: _Flight,
+        text: str | None,
+        *,
+        store: bool = True,
+    ) -> None:
+        """Finish a flight: cache ``text`` (None = failed) and wake waiters."""
+        try:
+            if text is not None and store:
+                self._cache.put(*key, text)
+        finally:
+            flight.text = text
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _coalesced(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        produce: Callable[[], GenerationResult],
+        cancel_event: "object | None" = None,
+    ) -> GenerationResult:
+        key = self._key(prompt, max_new_tokens)
+        text, flight = self._lookup(key, cancel_event)
+        if flight is None:
+            self._set_hit(True)
+            return GenerationResult(text)
+        self._set_hit(False)
+        result = None
+        try:
+            result = produce()
+        finally:
+            self._land(key, flight, result.text if result is not None else None)
+        return result
+
     def generate(
         self,
         prompt: str,
@@ -58,54 +177,69 @@ class CachingBackend(InferenceBackend):
         *,
         cancel_event: "object | None" = None,
     ) -> str:
-        kind = self._inner.backend_kind()
-        model = self._inner.model_name()
-        cached = self._cache.get(kind, model, prompt, max_new_tokens)
-        if cached is not None:
-            self._last_cache_hit = True
-            return cached
-
-        self._last_cache_hit = False
-        text = self._inner.generate(prompt, max_new_tokens, cancel_event=cancel_event)
-        self._cache.put(kind, model, prompt, max_new_tokens, text)
-        return text
+        return self._coalesced(
+            prompt,
+            max_new_tokens,
+            lambda: GenerationResult(
+                self._inner.generate(prompt, max_new_tokens, cancel_event=cancel_event)
+            ),
+            cancel_event,
+        ).text
 
     def stream_generate(self, prompt: str, max_new_tokens: int) -> Iterator[str]:
         """Stream from the inner backend, then write the full text to cache.
 
-        Cache hits short-circuit to a single chunk so the caller does not
-        need to special-case the hit path.
+        Cache hits (and coalesced waits) short-circuit to a single chunk so
+        the caller does not need to special-case the hit path. A stream
+        abandoned part-way caches nothing and hands the key to a waiter.
         """
-        kind = self._inner.backend_kind()
-        model = self._inner.model_name()
-        cached = self._cache.get(kind, model, prompt, max_new_tokens)
-        if cached is not None:
-            self._last_cache_hit = True
-            yield cached
+        key = self._key(prompt, max_new_tokens)
+        text, flight = self._lookup(key)
+        if flight is None:
+            self._set_hit(True)
+            yield text
             return
 
-        self._last_cache_hit = False
+        self._set_hit(False)
         chunks: list[str] = []
-        for chunk in self._inner.stream_generate(prompt, max_new_tokens):
-            chunks.append(chunk)
-            yield chunk
-        self._cache.put(kind, model, prompt, max_new_tokens, "".join(chunks))
+        complete = False
+        try:
+            for chunk in self._inner.stream_generate(prompt, max_new_tokens):
+                chunks.append(chunk)
+                yield chunk
+            complete = True
+        finally:
+            self._land(key, flight, "".join(chunks) if complete else None)
+
+    def _generate_samples(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        n: int,
+        *,
+        cancel_event: "object | None" = None,
+    ) -> list[str]:
+        """Never cached or coalesced: distinct samples are the point."""
+        self._set_hit(False)
+        return self._inner.generate_samples(
+            prompt, max_new_tokens, n, cancel_event=cancel_event
+        )
 
     def generate_result(self, prompt, max_new_tokens, *, cancel_event=None):
-        kind, model = self._inner.backend_kind(), self._inner.model_name()
-        cached = self._cache.get(kind, model, prompt, max_new_tokens)
-        if cached is not None:
-            self._last_cache_hit = True
-            return GenerationResult(cached)
-        self._last_cache_hit = False
-        result = self._inner.generate_result(
-            prompt, max_new_tokens, cancel_event=cancel_event
+        return self._coalesced(
+            prompt,
+            max_new_tokens,
+            lambda: self._inner.generate_result(
+                prompt, max_new_tokens, cancel_event=cancel_event
+            ),
+            cancel_event,
         )
-        self._cache.put(kind, model, prompt, max_new_tokens, result.text)
-        return result
 
     def close(self) -> None:
-        self._inner.close()
+        try:
+            self._cache.close()
+        finally:
+            self._inner.close()
 
 
 class InstrumentedBackend(InferenceBackend):
@@ -118,6 +252,7 @@ class InstrumentedBackend(InferenceBackend):
     ) -> None:
         self._inner = inner
         self._telemetry = telemetry
+        _forward_generate_samples(self, inner)
 
     def backend_kind(self) -> str:
         return self._inner.backend_kind()
@@ -160,6 +295,30 @@ class InstrumentedBackend(InferenceBackend):
         finally:
             self._record(prompt, text, start, error, usage)
 
+    def _generate_samples(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        n: int,
+        *,
+        cancel_event: "object | None" = None,
+    ) -> list[str]:
+        """One telemetry row for the whole batch of samples."""
+        start = time.perf_counter()
+        error: str | None = None
+        samples: list[str] = []
+        try:
+            with inference_span(self.backend_kind(), self.model_name(), max_new_tokens):
+                samples = self._inner.generate_samples(
+                    prompt, max_new_tokens, n, cancel_event=cancel_event
+                )
+            return samples
+        except Exception as exc:
+            error = repr(exc)
+            raise
+        finally:
+            self._record(prompt, "".join(samples), start, error)
+
     def stream_generate(self, prompt: str, max_new_tokens: int) -> Iterator[str]:
         start = time.perf_counter()
         error: str | None = None
@@ -208,7 +367,10 @@ class InstrumentedBackend(InferenceBackend):
             log.warning("Telemetry write failed: %s", telemetry_exc)
 
     def close(self) -> None:
-        self._inner.close()
+        try:
+            self._telemetry.close()
+        finally:
+            self._inner.close()
 
 
 __all__ = ["CachingBackend", "InstrumentedBackend"]
@@ -8,6 +8,15 @@ no aggregate numbers** — scoring belongs to a separate evaluation paper
 that has actually run the experiments. :class:`BenchmarkOutcome`
 therefore carries the raw output only; there is no numeric score field.
 
+Cases run concurrently, up to the backend's ``max_concurrency()``.
+Given an :class:`OutcomeLog`, each outcome is appended to the run
+directory's ``outcomes.jsonl`` the moment its case finishes — together
+with the case's latency and token counts in ``case_stats.jsonl`` — and
+case ids already in the log are skipped, so a crashed run resumes where
+it stopped instead of starting over. ``run_fingerprint.json`` records
+what the logged outcomes were produced by; a log is only resumed by a
+run with the same fingerprint.
+
 Runner-safe: depends on stdlib + the injected backend only (no torch /
 numpy / faiss / httpx / transformers).
 """
@@ -16,9 +25,14 @@ from __future__ import annotations
 
 import json
 import hashlib
+import logging
+import os
 import platform
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from pathlib import Path
@@ -27,8 +41,13 @@ from typing import Callable, Sequence
 from prthinker.backends.base import InferenceBackend
 from prthinker.repo_retrieval import RepoContextRetriever
 
+log = logging.getLogger(__name__)
+
 _CASE_ID_KEY = "case_id"
 _RAW_OUTPUT_KEY = "raw_output"
+OUTCOMES_FILENAME = "outcomes.jsonl"
+CASE_STATS_FILENAME = "case_stats.jsonl"
+FINGERPRINT_FILENAME = "run_fingerprint.json"
 
 DEFAULT_MAX_NEW_TOKENS = 1024
 
@@ -65,30 +84,225 @@ class BenchmarkOutcome:
         )
 
 
+@dataclass(frozen=True)
+class CaseStats:
+    """How one case ran — wall-clock latency and token counts, never a score.
+
+    Token counts are ``None`` when the backend does not report usage
+    (local / remote-HTTP backends) and for retrieval cases.
+    """
+
+    case_id: str
+    latency_seconds: float
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            _CASE_ID_KEY: self.case_id,
+            "latency_seconds": round(self.latency_seconds, 6),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CaseStats":
+        return cls(
+            case_id=data[_CASE_ID_KEY],
+            latency_seconds=float(data.get("latency_seconds") or 0.0),
+            prompt_tokens=data.get("prompt_tokens"),
+            completion_tokens=data.get("completion_tokens"),
+        )
+
+
+def _read_jsonl(path: Path) -> list[dict]:
+    """Parsed rows of ``path``; a torn row left by a crash is skipped."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return []
+    rows = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError:
+            log.warning("skipping torn row in %s", path)
+    return rows
+
+
+class OutcomeLog:
+    """Append-as-you-go outcomes of one run directory, for resumable runs.
+
+    ``outcomes.jsonl`` receives each outcome as its case finishes and
+    ``case_stats.jsonl`` the matching :class:`CaseStats`. Rows are
+    flushed one at a time, so a crash loses at most the cases in flight.
+    Call :meth:`begin` before running so outcomes from a different model,
+    backend, token budget or case file are never resumed as this run's.
+    """
+
+    def __init__(self, output_dir: str | Path) -> None:
+        self._dir = Path(output_dir)
+        self.outcomes_path = self._dir / OUTCOMES_FILENAME
+        self.stats_path = self._dir / CASE_STATS_FILENAME
+        self.fingerprint_path = self._dir / FINGERPRINT_FILENAME
+        self._lock = threading.Lock()
+
+    def begin(self, fingerprint: dict[str, object]) -> None:
+        """Pin the log to ``fingerprint``; raise ``ValueError`` on a mismatch.
+
+        An empty log takes the fingerprint. A log with outcomes resumes
+        only when its stored fingerprint is equal — outcomes without one
+        (a finished run bundle, or a log from before fingerprints) are
+        never taken as this run's.
+        """
+        if not _read_jsonl(self.outcomes_path):
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.fingerprint_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(fingerprint, sort_keys=True) + "\n", encoding="utf-8")
+            os.replace(tmp, self.fingerprint_path)
+            return
+        try:
+            stored = json.loads(self.fingerprint_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            stored = None
+        if stored != fingerprint:
+            raise ValueError(
+                f"{self.outcomes_path} holds outcomes of a different run "
+                f"(recorded {stored}, this run {fingerprint})"
+            )
+
+    def completed(self) -> dict[str, BenchmarkOutcome]:
+        """Outcomes already recorded, by case id."""
+        outcomes = {}
+        for row in _read_jsonl(self.outcomes_path):
+            try:
+                outcome = BenchmarkOutcome.from_dict(row)
+            except (KeyError, TypeError):
+                continue
+            outcomes[outcome.case_id] = outcome
+        return outcomes
+
+    def case_stats(self) -> list[CaseStats]:
+        """Recorded per-case stats, latest row per case id."""
+        stats: dict[str, CaseStats] = {}
+        for row in _read_jsonl(self.stats_path):
+            try:
+                entry = CaseStats.from_dict(row)
+            except (KeyError, TypeError, ValueError):
+                continue
+            stats[entry.case_id] = entry
+        return list(stats.values())
+
+    def clear(self) -> None:
+        """Forget earlier outcomes so the next run starts from scratch."""
+        for path in (self.outcomes_path, self.stats_path, self.fingerprint_path):
+            path.unlink(missing_ok=True)
+
+    def record(self, outcome: BenchmarkOutcome, stats: CaseStats) -> None:
+        with self._lock:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            _append_row(self.outcomes_path, outcome.to_dict())
+            _append_row(self.stats_path, stats.to_dict())
+
+
+def _append_row(path: Path, row: dict) -> None:
+    with path.open("a+", encoding="utf-8") as handle:
+        if handle.tell() and not _ends_with_newline(path):
+            handle.write("\n")  # seal a row torn by a crashed run
+        handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+        handle.flush()
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as handle:
+        handle.seek(-1, os.SEEK_END)
+        return handle.read(1) == b"\n"
+
+
+def _run_concurrently(
+    cases: Sequence[BenchmarkCase],
+    solve: Callable[[BenchmarkCase], tuple[str, CaseStats]],
+    *,
+    max_workers: int,
+    outcome_log: OutcomeLog | None,
+) -> list[BenchmarkOutcome]:
+    """Solve ``cases`` on ``max_workers`` threads; outcomes in input order.
+
+    Cases already in ``outcome_log`` are not run again. The first case
+    that raises cancels the cases not yet started and the error
+    propagates; finished cases stay recorded for the resumed run.
+    """
+    done = outcome_log.completed() if outcome_log is not None else {}
+    pending = [case for case in cases if case.case_id not in done]
+    if done:
+        log.info("resuming: %d of %d case(s) already recorded", len(cases) - len(pending), len(cases))
+    results: dict[int, BenchmarkOutcome] = {}
+
+    def run(index: int) -> tuple[int, BenchmarkOutcome, CaseStats]:
+        case = pending[index]
+        raw_output, stats = solve(case)
+        return index, BenchmarkOutcome(case.case_id, raw_output), stats
+
+    workers = max(1, min(max_workers, len(pending)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run, index) for index in range(len(pending))]
+        try:
+            for future in as_completed(futures):
+                index, outcome, stats = future.result()
+                results[index] = outcome
+                if outcome_log is not None:
+                    outcome_log.record(outcome, stats)
+        except BaseException:
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+    fresh = iter(results[index] for index in range(len(pending)))
+    return [
+        done[case.case_id] if case.case_id in done else next(fresh)
+        for case in cases
+    ]
+
+
 def run_cases(
     backend: InferenceBackend,
     cases: Sequence[BenchmarkCase],
     *,
     max_new_tokens: int = DEFAULT_MAX_NEW_TOKENS,
+    outcome_log: OutcomeLog | None = None,
 ) -> list[BenchmarkOutcome]:
     """Run each case's prompt through ``backend``, recording raw output in order.
 
-    No scoring or aggregation is performed: the harness records what the
-    backend returned for every case, preserving input order.
+    Up to ``backend.max_concurrency()`` cases are in flight at once. No
+    scoring or aggregation is performed: the harness records what the
+    backend returned for every case, preserving input order. With an
+    ``outcome_log``, outcomes are appended as they finish and cases it
+    already holds are skipped.
     """
-    outcomes: list[BenchmarkOutcome] = []
-    for case in cases:
-        raw_output = backend.generate(case.prompt, max_new_tokens)
-        outcomes.append(
-            BenchmarkOutcome(case_id=case.case_id, raw_output=raw_output)
+
+    def solve(case: BenchmarkCase) -> tuple[str, CaseStats]:
+        started = time.perf_counter()
+        result = backend.generate_result(case.prompt, max_new_tokens)
+        usage = result.usage
+        return result.text, CaseStats(
+            case.case_id,
+            time.perf_counter() - started,
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
         )
-    return outcomes
+
+    return _run_concurrently(
+        cases, solve, max_workers=backend.max_concurrency(), outcome_log=outcome_log,
+    )
 
 
 def run_retrieval_cases(
     retriever: RepoContextRetriever,
     cases: Sequence[BenchmarkCase],
     resolve_workdir: Callable[[BenchmarkCase], "Path | None"],
+    *,
+    max_workers: int = 1,
+    outcome_log: OutcomeLog | None = None,
 ) -> list[BenchmarkOutcome]:
     """Answer repository-context cases by retrieving from each case's work-tree.
 
@@ -98,25 +312,36 @@ def run_retrieval_cases(
     repository and the retrieved file ids become the ``{"retrieved": [...]}``
     payload the scorer already consumes. A case whose work-tree cannot be
     resolved yields an empty retrieval instead of aborting the run.
+    ``max_workers`` and ``outcome_log`` behave as in :func:`run_cases`.
     """
-    outcomes: list[BenchmarkOutcome] = []
-    for case in cases:
+
+    def solve(case: BenchmarkCase) -> tuple[str, CaseStats]:
+        started = time.perf_counter()
         workdir = resolve_workdir(case)
         files = list(retriever.retrieve(case.prompt, workdir).files) if workdir else []
         raw_output = json.dumps({"retrieved": files}, ensure_ascii=False)
-        outcomes.append(BenchmarkOutcome(case_id=case.case_id, raw_output=raw_output))
-    return outcomes
+        return raw_output, CaseStats(case.case_id, time.perf_counter() - started)
+
+    return _run_concurrently(
+        cases, solve, max_workers=max_workers, outcome_log=outcome_log,
+    )
 
 
 def write_outcomes(
     outcomes: Sequence[BenchmarkOutcome], path: str | Path
 ) -> None:
-    """Write ``outcomes`` to ``path`` as one JSON object per line (JSONL)."""
+    """Write ``outcomes`` to ``path`` as one JSON object per line (JSONL).
+
+    The file is replaced atomically, so rewriting a run's streamed
+    ``outcomes.jsonl`` in input order never leaves it half-written.
+    """
     target = Path(path)
-    with target.open("w", encoding="utf-8") as handle:
+    tmp = target.with_name(target.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as handle:
         for outcome in outcomes:
             handle.write(json.dumps(outcome.to_dict(), ensure_ascii=False))
             handle.write("\n")
+    os.replace(tmp, target)
 
 
 def load_cases(path: str | Path) -> list[BenchmarkCase]:
@@ -136,6 +361,18 @@ def load_cases(path: str | Path) -> list[BenchmarkCase]:
     return cases
 
 
+def run_fingerprint(
+    cases_path: str | Path, *, backend: str, model: str, max_new_tokens: int
+) -> dict[str, object]:
+    """What a resumable run's outcomes depend on, for :meth:`OutcomeLog.begin`."""
+    return {
+        "backend": backend,
+        "model": model,
+        "max_new_tokens": max_new_tokens,
+        "cases_sha256": _sha256(Path(cases_path)),
+    }
+
+
 def _sha256(path: Path) -> str:
     digest = hashlib.sha256()
     with path.open("rb") as handle:
@@ -166,12 +403,19 @@ def write_run_bundle(
     model: str,
     seed: int | None = None,
     parameters: dict[str, object] | None = None,
+    case_stats: Sequence[CaseStats] | None = None,
 ) -> Path:
-    """Write outcomes plus an immutable-input manifest for reproducibility."""
+    """Write outcomes plus an immutable-input manifest for reproducibility.
+
+    ``outcomes.jsonl`` is (re)written in the order of ``outcomes`` — a
+    streamed :class:`OutcomeLog` file is in completion order — and
+    ``case_stats`` (per-case latency / token counts) are listed in the
+    manifest in the same order.
+    """
     source = Path(cases_path)
     target = Path(output_dir)
     target.mkdir(parents=True, exist_ok=True)
-    outcomes_path = target / "outcomes.jsonl"
+    outcomes_path = target / OUTCOMES_FILENAME
     write_outcomes(outcomes, outcomes_path)
     manifest = {
         "schema_version": 1,
@@ -186,6 +430,7 @@ def write_run_bundle(
         "model": model,
         "seed": seed,
         "parameters": parameters or {},
+        "case_stats": _ordered_stats(outcomes, case_stats or ()),
         "git_commit": _git_commit(),
         "runtime": {
             "python": sys.version,
@@ -198,3 +443,14 @@ def write_run_bundle(
         encoding="utf-8",
     )
     return manifest_path
+
+
+def _ordered_stats(
+    outcomes: Sequence[BenchmarkOutcome], case_stats: Sequence[CaseStats]
+) -> list[dict[str, object]]:
+    by_id = {stats.case_id: stats for stats in case_stats}
+    return [
+        by_id[outcome.case_id].to_dict()
+        for outcome in outcomes
+        if outcome.case_id in by_id
+    ]
@@ -36,6 +36,11 @@ def add_benchmark_parser(sub, common=None) -> None:
     run.add_argument("output_dir", type=Path)
     run.add_argument("--benchmark-model", default="")
     run.add_argument("--seed", type=int, default=None)
+    run.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Discard outcomes already in OUTPUT_DIR instead of resuming",
+    )
     score = actions.add_parser("score")
     score.add_argument("cases", type=Path)
     score.add_argument("outcomes", type=Path)
@@ -67,14 +72,39 @@ def _run_convert(args: argparse.Namespace) -> int:
 def _run_benchmark(args: argparse.Namespace) -> int:
     """Handle ``benchmark run`` by executing cases against a backend."""
     from prthinker.backends import create_backend
-    from prthinker.benchmark import load_cases, run_cases, write_run_bundle
+    from prthinker.benchmark import (
+        OutcomeLog,
+        load_cases,
+        run_cases,
+        run_fingerprint,
+        write_run_bundle,
+    )
     from prthinker.cli_review import _build_config
 
     config = _build_config(args)
     backend = create_backend(config)
+    outcome_log = OutcomeLog(args.output_dir)
+    if getattr(args, "no_resume", False):
+        outcome_log.clear()
     try:
+        try:
+            outcome_log.begin(
+                run_fingerprint(
+                    args.cases,
+                    backend=backend.backend_kind(),
+                    model=backend.model_name(),
+                    max_new_tokens=config.max_new_tokens,
+                )
+            )
+        except ValueError as exc:
+            raise SystemExit(
+                f"benchmark run: {exc}; pass --no-resume to start over"
+            ) from exc
         outcomes = run_cases(
-            backend, load_cases(args.cases), max_new_tokens=config.max_new_tokens
+            backend,
+            load_cases(args.cases),
+            max_new_tokens=config.max_new_tokens,
+            outcome_log=outcome_log,
         )
         manifest = write_run_bundle(
             args.cases,
@@ -84,6 +114,7 @@ def _run_benchmark(args: argparse.Namespace) -> int:
             model=args.benchmark_model or backend.model_name(),
             seed=args.seed,
             parameters={"max_new_tokens": config.max_new_tokens},
+            case_stats=outcome_log.case_stats(),
         )
     finally:
         backend.close()
@@ -6,10 +6,24 @@ input that can change the response, so prompt-template edits, model
 swaps, and token-cap changes all naturally invalidate the cache (no
 explicit ``bust`` operation required).
 
-The cache is process-local: SQLite handles concurrent readers fine; we
-open a fresh connection per call to avoid sharing a connection across
-threads (which sqlite3 forbids by default). Throughput is fine for our
-volume — at most a few thousand calls per PR.
+The cache is process-local: SQLite handles concurrent readers fine. Each
+thread keeps one persistent connection (sqlite3 forbids sharing one
+across threads by default), and every write — a put together with the
+evictions it triggers, or a batch of hit counters — is one transaction.
+
+Responses of ``_COMPRESS_MIN_BYTES`` or more are stored zlib-compressed.
+With ``max_bytes`` the store is byte-budgeted: once the stored payloads
+exceed the budget, entries are evicted down to ``_LOW_WATER`` of it,
+least-recently-used first (``eviction="lru"``) or fewest ``hits`` first
+(``eviction="lfu"``). Without it only the TTL bounds the store.
+
+Hot entries are also kept in a bounded in-process LRU in front of
+SQLite, so a repeated prompt is answered without a query. Hit counters
+are write-behind: they accumulate in memory and reach the ``hits``
+column in one batched ``UPDATE`` every ``_HIT_FLUSH_EVERY`` lookups, on
+:meth:`PromptCache.stats` / :meth:`PromptCache.close`, before an
+eviction, and when the cache is garbage-collected or the interpreter
+exits.
 """
 
 from __future__ import annotations
@@ -18,54 +32,278 @@ import contextlib
 import hashlib
 import logging
 import sqlite3
+import threading
 import time
+import weakref
+import zlib
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 
 log = logging.getLogger(__name__)
 
+DEFAULT_MEMORY_ENTRIES = 512
+EVICTION_POLICIES = ("lru", "lfu")
+_HIT_FLUSH_EVERY = 64
+_COMPRESS_MIN_BYTES = 1024
+_ZLIB = "zlib"
+# A budgeted store evicts down to this fraction of ``max_bytes`` so a
+# full cache does not pay for an eviction on every put.
+_LOW_WATER = 0.9
+_EVICT_BATCH = 256
 
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS prompt_cache (
     key         TEXT PRIMARY KEY,
     response    TEXT NOT NULL,
     created_at  REAL NOT NULL,
-    hits        INTEGER NOT NULL DEFAULT 0
+    hits        INTEGER NOT NULL DEFAULT 0,
+    size        INTEGER NOT NULL DEFAULT 0,
+    last_used   REAL NOT NULL DEFAULT 0,
+    codec       TEXT NOT NULL DEFAULT ''
 );
+CREATE TABLE IF NOT EXISTS cache_meta (
+    name   TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL
+);
+"""
+
+# Columns added after the first release; older cache files gain them on open.
+_MIGRATED_COLUMNS = (
+    ("size", "INTEGER NOT NULL DEFAULT 0"),
+    ("last_used", "REAL NOT NULL DEFAULT 0"),
+    ("codec", "TEXT NOT NULL DEFAULT ''"),
+)
+
+_INDEXES = """
 CREATE INDEX IF NOT EXISTS idx_prompt_cache_created
     ON prompt_cache (created_at);
+CREATE INDEX IF NOT EXISTS idx_prompt_cache_last_used
+    ON prompt_cache (last_used);
+CREATE INDEX IF NOT EXISTS idx_prompt_cache_hits
+    ON prompt_cache (hits, last_used);
 """
 
+_EVICTION_ORDER = {"lru": "last_used", "lfu": "hits, last_used"}
+
 
 def _hash_key(backend_kind: str, model: str, prompt: str, max_new_tokens: int) -> str:
     payload = f"{backend_kind}|{model}|{max_new_tokens}|{prompt}".encode("utf-8")
     return hashlib.sha256(payload).hexdigest()
 
 
+def _encode(response: str) -> tuple[str | bytes, str, int]:
+    """``(stored value, codec, stored size)`` for one response."""
+    raw = response.encode("utf-8")
+    if len(raw) >= _COMPRESS_MIN_BYTES:
+        packed = zlib.compress(raw, 6)
+        if len(packed) < len(raw):
+            return packed, _ZLIB, len(packed)
+    return response, "", len(raw)
+
+
+def _decode(stored: str | bytes, codec: str) -> str:
+    if codec == _ZLIB:
+        return zlib.decompress(stored).decode("utf-8")
+    return str(stored)
+
+
+def _bump(conn: sqlite3.Connection, name: str, delta: int) -> None:
+    conn.execute(
+        "INSERT INTO cache_meta (name, value) VALUES (?, ?)"
+        " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+        (name, delta),
+    )
+
+
+class _HitBuffer:
+    """Write-behind lookup / hit counters for one cache file.
+
+    Held apart from :class:`PromptCache` so a ``weakref.finalize`` can
+    flush it after the cache object itself is gone.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._hits: dict[str, tuple[int, float]] = {}
+        self._lookups = 0
+
+    def add(self, key: str | None, now: float) -> bool:
+        """Count one lookup (a hit when ``key`` is set); True when due to flush."""
+        with self._lock:
+            self._lookups += 1
+            if key is not None:
+                count, _ = self._hits.get(key, (0, 0.0))
+                self._hits[key] = (count + 1, now)
+            return self._lookups >= _HIT_FLUSH_EVERY
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def drain_into(self, conn: sqlite3.Connection) -> None:
+        """Apply the buffered counters inside the caller's transaction."""
+        with self._lock:
+            hits, self._hits = self._hits, {}
+            lookups, self._lookups = self._lookups, 0
+        if hits:
+            conn.executemany(
+                "UPDATE prompt_cache SET hits = hits + ?,"
+                " last_used = MAX(last_used, ?) WHERE key = ?",
+                [(count, used, key) for key, (count, used) in hits.items()],
+            )
+            _bump(conn, "hits", sum(count for count, _ in hits.values()))
+        if lookups:
+            _bump(conn, "lookups", lookups)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._lookups and not self._hits:
+                return
+        try:
+            conn = sqlite3.connect(str(self._path), isolation_level=None)
+        except sqlite3.Error as exc:
+            log.debug("prompt-cache hit counters not flushed: %s", exc)
+            return
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self.drain_into(conn)
+            conn.execute("COMMIT")
+        except sqlite3.Error as exc:
+            log.debug("prompt-cache hit counters not flushed: %s", exc)
+        finally:
+            conn.close()
+
+
+def _shutdown(hits: _HitBuffer, connections: list[sqlite3.Connection]) -> None:
+    hits.flush()
+    while connections:
+        connections.pop().close()
+
+
 @dataclass(frozen=True)
 class CacheStats:
     total_entries: int
     total_hits: int
+    bytes_stored: int = 0
+    lookups: int = 0
+    lookup_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Lifetime share of lookups answered from the cache."""
+        return self.lookup_hits / self.lookups if self.lookups else 0.0
 
 
 class PromptCache:
-    """SQLite store of prompt -> response with optional TTL eviction."""
+    """SQLite store of prompt -> response with TTL and byte-budget eviction.
+
+    ``memory_entries`` bounds the in-process LRU tier (0 disables it);
+    ``max_bytes`` caps the stored (compressed) payload bytes, evicting
+    by ``eviction`` (``"lru"`` or ``"lfu"``) once exceeded.
+    """
 
-    def __init__(self, path: Path, ttl_seconds: float | None = None) -> None:
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float | None = None,
+        *,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_bytes: int | None = None,
+        eviction: str = "lru",
+    ) -> None:
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(
+                f"eviction must be one of {EVICTION_POLICIES}, got {eviction!r}"
+            )
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
         self._ttl_seconds = ttl_seconds
-        with self._connect() as conn:
-            conn.executescript(_SCHEMA)
+        self._max_bytes = max_bytes if max_bytes and max_bytes > 0 else None
+        self._eviction = eviction
+        self._memory_entries = max(0, memory_entries)
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._hits = _HitBuffer(self._path)
+        weakref.finalize(self, _shutdown, self._hits, self._connections)
+        self._connection().execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as conn:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            self._migrate(conn)
+            for statement in _INDEXES.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Bring a cache file written by an older release up to the schema."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(prompt_cache)")}
+        missing = [(name, decl) for name, decl in _MIGRATED_COLUMNS if name not in columns]
+        for name, decl in missing:
+            conn.execute(f"ALTER TABLE prompt_cache ADD COLUMN {name} {decl}")
+        if missing:
+            conn.execute(
+                "UPDATE prompt_cache SET size = length(CAST(response AS BLOB)),"
+                " last_used = created_at"
+            )
+        # Recount on open so rows deleted by hand (``sqlite3 ... DELETE``)
+        # do not leave the byte budget permanently skewed.
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_meta (name, value)"
+            " SELECT 'bytes', COALESCE(SUM(size), 0) FROM prompt_cache"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's persistent connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() may close it from
+            # another thread; each connection is used by its own thread.
+            conn = sqlite3.connect(
+                str(self._path), isolation_level=None, check_same_thread=False
+            )
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
 
     @contextlib.contextmanager
-    def _connect(self):
-        conn = sqlite3.connect(str(self._path), isolation_level=None)
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
         try:
-            conn.execute("PRAGMA journal_mode=WAL")
             yield conn
-        finally:
-            conn.close()
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self._ttl_seconds is not None and now - created_at > self._ttl_seconds
+
+    def _remember(self, key: str, response: str, created_at: float) -> None:
+        """Insert into the LRU tier; caller holds ``self._lock``."""
+        if not self._memory_entries:
+            return
+        self._memory[key] = (response, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _forget(self, keys: list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._memory.pop(key, None)
+
+    def _count_lookup(self, key: str | None, now: float) -> None:
+        if self._hits.add(key, now):
+            self._hits.flush()
 
     def get(
         self,
@@ -76,22 +314,35 @@ class PromptCache:
     ) -> str | None:
         key = _hash_key(backend_kind, model, prompt, max_new_tokens)
         now = time.time()
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT response, created_at FROM prompt_cache WHERE key = ?",
-                (key,),
-            ).fetchone()
-            if row is None:
-                return None
-            response, created_at = row
-            if self._ttl_seconds is not None and now - created_at > self._ttl_seconds:
-                conn.execute("DELETE FROM prompt_cache WHERE key = ?", (key,))
-                return None
-            conn.execute(
-                "UPDATE prompt_cache SET hits = hits + 1 WHERE key = ?",
-                (key,),
-            )
-            return str(response)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._expired(entry[1], now):
+                del self._memory[key]
+                entry = None
+            elif entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None:
+            self._count_lookup(key, now)
+            return entry[0]
+        row = self._connection().execute(
+            "SELECT response, created_at, codec, size FROM prompt_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            self._count_lookup(None, now)
+            return None
+        stored, created_at, codec, size = row
+        if self._expired(created_at, now):
+            with self._transaction() as conn:
+                if conn.execute("DELETE FROM prompt_cache WHERE key = ?", (key,)).rowcount:
+                    _bump(conn, "bytes", -size)
+            self._count_lookup(None, now)
+            return None
+        response = _decode(stored, codec)
+        with self._lock:
+            self._remember(key, response, created_at)
+        self._count_lookup(key, now)
+        return response
 
     def put(
         self,
@@ -102,31 +353,121 @@ class PromptCache:
         response: str,
     ) -> None:
         key = _hash_key(backend_kind, model, prompt, max_new_tokens)
-        with self._connect() as conn:
+        now = time.time()
+        stored, codec, size = _encode(response)
+        self._hits.discard(key)
+        with self._lock:
+            self._remember(key, response, now)
+        if self._max_bytes is not None and size > self._max_bytes:
+            log.debug("prompt-cache entry of %d bytes exceeds the budget; not stored", size)
+            return
+        evicted: list[str] = []
+        with self._transaction() as conn:
+            old = conn.execute(
+                "SELECT size FROM prompt_cache WHERE key = ?", (key,)
+            ).fetchone()
             conn.execute(
-                "INSERT OR REPLACE INTO prompt_cache (key, response, created_at, hits)"
-                " VALUES (?, ?, ?, 0)",
-                (key, response, time.time()),
+                "INSERT OR REPLACE INTO prompt_cache"
+                " (key, response, created_at, hits, size, last_used, codec)"
+                " VALUES (?, ?, ?, 0, ?, ?, ?)",
+                (key, stored, now, size, now, codec),
             )
+            _bump(conn, "bytes", size - (old[0] if old else 0))
+            if self._max_bytes is not None:
+                evicted = self._evict(conn, keep=key)
+        if evicted:
+            self._forget(evicted)
+
+    def _evict(self, conn: sqlite3.Connection, *, keep: str) -> list[str]:
+        """Evict down to the low-water mark if over budget; the evicted keys."""
+        stored = self._meta(conn).get("bytes", 0)
+        if stored <= self._max_bytes:
+            return []
+        # Fold in this process's buffered hits so LRU / LFU order is current.
+        self._hits.drain_into(conn)
+        excess = stored - int(self._max_bytes * _LOW_WATER)
+        order = _EVICTION_ORDER[self._eviction]
+        evicted: list[str] = []
+        freed = 0
+        while freed < excess:
+            rows = conn.execute(
+                f"SELECT key, size FROM prompt_cache WHERE key != ?"  # nosec B608 - order is a fixed column list
+                f" ORDER BY {order} LIMIT ?",
+                (keep, _EVICT_BATCH),
+            ).fetchall()
+            if not rows:
+                break
+            batch = []
+            for key, size in rows:
+                batch.append(key)
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany(
+                "DELETE FROM prompt_cache WHERE key = ?", [(key,) for key in batch]
+            )
+            evicted.extend(batch)
+        _bump(conn, "bytes", -freed)
+        _bump(conn, "evictions", len(evicted))
+        return evicted
+
+    @staticmethod
+    def _meta(conn: sqlite3.Connection) -> dict[str, int]:
+        return dict(conn.execute("SELECT name, value FROM cache_meta").fetchall())
+
+    def flush(self) -> None:
+        """Write the buffered hit counters to SQLite in one transaction."""
+        with self._transaction() as conn:
+            self._hits.drain_into(conn)
+
+    def close(self) -> None:
+        """Flush hit counters and close every thread's connection.
+
+        The cache stays usable afterwards; connections reopen lazily.
+        """
+        self.flush()
+        self._local = threading.local()
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
 
     def stats(self) -> CacheStats:
-        with self._connect() as conn:
-            row = conn.execute(
-                "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM prompt_cache"
-            ).fetchone()
-        return CacheStats(total_entries=int(row[0]), total_hits=int(row[1]))
+        self.flush()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM prompt_cache"
+        ).fetchone()
+        meta = self._meta(conn)
+        return CacheStats(
+            total_entries=int(row[0]),
+            total_hits=int(row[1]),
+            bytes_stored=int(meta.get("bytes", 0)),
+            lookups=int(meta.get("lookups", 0)),
+            lookup_hits=int(meta.get("hits", 0)),
+            evictions=int(meta.get("evictions", 0)),
+        )
 
     def prune(self) -> int:
         """Drop entries older than TTL. Returns number removed."""
         if self._ttl_seconds is None:
             return 0
         cutoff = time.time() - self._ttl_seconds
-        with self._connect() as conn:
+        with self._lock:
+            for key in [k for k, (_r, at) in self._memory.items() if at < cutoff]:
+                del self._memory[key]
+        with self._transaction() as conn:
+            (freed,) = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM prompt_cache WHERE created_at < ?",
+                (cutoff,),
+            ).fetchone()
             cur = conn.execute(
                 "DELETE FROM prompt_cache WHERE created_at < ?",
                 (cutoff,),
             )
+            _bump(conn, "bytes", -freed)
             return cur.rowcount
 
 
-__all__ = ["PromptCache", "CacheStats"]
+__all__ = ["EVICTION_POLICIES", "PromptCache", "CacheStats"]
@@ -19,6 +19,7 @@ from prthinker.checks import (
 from prthinker.dismissed import DismissedExamplesStore
 from prthinker.formatters import CommentOptions, format_pr_comment_pages
 from prthinker.harvest import harvest, harvest_accepted
+from prthinker.harvest_engine import HarvestCheckpoint
 from prthinker import gitea_harvest, gitlab_harvest
 from prthinker.kg_visualize import build_graph_data, render_html
 from prthinker.repo_kg import (
@@ -155,7 +156,16 @@ def _cmd_aggregate(args: argparse.Namespace) -> int:
         return 0
 
     adapter = build_platform_adapter(args)
+    try:
+        return _publish_aggregate(args, adapter, merged)
+    finally:
+        adapter.close()
+
 
+def _publish_aggregate(
+    args: argparse.Namespace, adapter: object, merged: ReviewResult
+) -> int:
+    """Post the merged review through an open ``adapter``."""
     if _withhold_partial_review(args, adapter, merged):
         return 0
 
@@ -251,7 +261,10 @@ def _cmd_post_status(args: argparse.Namespace) -> int:
     if args.dry_run:
         sys.stdout.write(body)
         return 0
-    adapter.upsert_summary_comments([body])
+    try:
+        adapter.upsert_summary_comments([body])
+    finally:
+        adapter.close()
     log.info("Posted review-in-progress placeholder")
     return 0
 
@@ -275,10 +288,18 @@ def _gitlab_harvest_base_url(args: argparse.Namespace) -> str:
     )
 
 
+def _harvest_checkpoint(args: argparse.Namespace) -> HarvestCheckpoint | None:
+    """The ``<out>.harvest.json`` checkpoint, unless ``--full-rescan`` is set."""
+    if getattr(args, "full_rescan", False):
+        return None
+    return HarvestCheckpoint.beside(args.out)
+
+
 def _harvest_platform_stats(
     args: argparse.Namespace, store: object, *, accepted: bool
 ):
     """Dispatch to the platform's harvester and return its stats."""
+    checkpoint = _harvest_checkpoint(args)
     if args.platform == "gitlab":
         harvester = gitlab_harvest.harvest_accepted if accepted else gitlab_harvest.harvest
         return harvester(
@@ -288,6 +309,7 @@ def _harvest_platform_stats(
             mr_iid=args.pr_number,
             max_mrs=args.max_prs,
             base_url=_gitlab_harvest_base_url(args),
+            checkpoint=checkpoint,
         )
     if args.platform == "gitea":
         harvester = gitea_harvest.harvest_accepted if accepted else gitea_harvest.harvest
@@ -298,6 +320,7 @@ def _harvest_platform_stats(
             pr_number=args.pr_number,
             max_prs=args.max_prs,
             base_url=args.platform_base_url or gitea_harvest.DEFAULT_BASE_URL,
+            checkpoint=checkpoint,
         )
     harvester = harvest_accepted if accepted else harvest
     return harvester(
@@ -306,6 +329,7 @@ def _harvest_platform_stats(
         store=store,
         pr_number=args.pr_number,
         max_prs=args.max_prs,
+        checkpoint=checkpoint,
     )
 
 
@@ -446,10 +470,7 @@ def _cmd_visualize_kg(args: argparse.Namespace) -> int:
 
 def _cmd_discover_rules(args: argparse.Namespace) -> int:
     """List finding clusters above the configured size threshold."""
-    from prthinker.finding_clusters import (
-        FindingClusterStore,
-        greedy_cluster,
-    )
+    from prthinker.finding_clusters import FindingClusterStore
 
     store = FindingClusterStore(args.cluster_store)
     if len(store) == 0:
@@ -458,12 +479,16 @@ def _cmd_discover_rules(args: argparse.Namespace) -> int:
             "--cluster-store-path set on a few PRs first to populate it.\n"
         )
         return 0
-    fingerprints = store.load(repo=args.repo or None)
-    clusters = greedy_cluster(
-        fingerprints,
+    clusters = store.clusters(
+        repo=args.repo or None,
         similarity_threshold=args.similarity_threshold,
         min_cluster_size=args.min_cluster_size,
     )
+    if getattr(args, "drop_other_thresholds", False):
+        dropped = store.drop_clusterings(
+            repo=args.repo or None, keep_threshold=args.similarity_threshold
+        )
+        sys.stdout.write(f"discover-rules: dropped {dropped} other clustering(s).\n")
     if not clusters:
         sys.stdout.write(
             f"discover-rules: no clusters of size >= "
@@ -754,6 +779,8 @@ def _write_cache_summary(cache_path: Path) -> None:
     sys.stdout.write(
         f"\nCache: {cstats.total_entries} entries stored, "
         f"{cstats.total_hits} lifetime hits at {cache_path}\n"
+        f"       {cstats.bytes_stored / 1_048_576:.1f} MB stored, "
+        f"{cstats.hit_ratio:.1%} hit ratio, {cstats.evictions} evicted\n"
     )
 
 
@@ -453,6 +453,12 @@ def _add_harvest_common_args(p_harvest: argparse.ArgumentParser) -> None:
         type=int,
         default=50,
     )
+    p_harvest.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="Ignore the <out>.harvest.json checkpoint and rescan the "
+        "--max-prs most recent PRs/MRs, including ones already harvested",
+    )
     p_harvest.add_argument(
         "--calibration-store", default="",
         help="Also append deduplicated aggregate feedback events to this SQLite store",
@@ -630,7 +636,8 @@ def add_discover_rules_parser(sub, common: argparse.ArgumentParser) -> None:
         parents=[common],
         help="Cluster persisted finding fingerprints across PRs and "
         "print the families that recur ≥ N times. Use to identify "
-        "candidate rules for --rules-dir.",
+        "candidate rules for --rules-dir. Findings join the most similar "
+        "cluster in the order they were stored.",
     )
     p_discover.add_argument(
         "--cluster-store",
@@ -652,6 +659,12 @@ def add_discover_rules_parser(sub, common: argparse.ArgumentParser) -> None:
         default=env_str("GITHUB_REPOSITORY", ""),
         help="Filter to one repo. Empty (default) clusters across all.",
     )
+    p_discover.add_argument(
+        "--drop-other-thresholds",
+        action="store_true",
+        help="Forget this repo scope's clusterings persisted at any other "
+        "--similarity-threshold, so review-pr stops maintaining them.",
+    )
 
 
 def add_derive_lessons_parser(sub, common: argparse.ArgumentParser) -> None:
@@ -201,6 +201,12 @@ def add_per_file_args(common: argparse.ArgumentParser) -> None:
         default="",
         help="JSON object mapping step names to dependency lists",
     )
+    common.add_argument(
+        "--step-cache-path",
+        default=env_str("PRTHINKER_STEP_CACHE_PATH", ""),
+        help="SQLite file persisting results of --step-dag steps marked "
+        "cache across runs; empty keeps them in memory only.",
+    )
     common.add_argument(
         "--trajectory-out",
         default="",
@@ -798,6 +804,20 @@ def add_cache_telemetry_args(common: argparse.ArgumentParser) -> None:
         default=env_float("PRTHINKER_CACHE_TTL_DAYS", 7.0),
         help="Drop cache entries older than this many days; set to 0 to disable TTL",
     )
+    common.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=env_float("PRTHINKER_CACHE_MAX_MB", 0.0),
+        help="Cap the stored (compressed) responses at this many MB, evicting "
+        "per --cache-eviction; 0 = unbounded",
+    )
+    common.add_argument(
+        "--cache-eviction",
+        choices=["lru", "lfu"],
+        default=env_str("PRTHINKER_CACHE_EVICTION", "lru"),
+        help="What a size-capped cache evicts first: least recently used "
+        "(lru) or least often hit (lfu)",
+    )
     common.add_argument(
         "--telemetry",
         dest="telemetry_enabled",
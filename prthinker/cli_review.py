@@ -23,6 +23,8 @@ from prthinker.cli_review_helpers import (
     build_cache_telemetry,
     build_dialogue_block,
     build_platform_adapter,
+    scheduling_client_id,
+    scheduling_priority,
 )
 
 # The publish flow below calls these helpers; importing them here also
@@ -113,8 +115,9 @@ from prthinker.rag import (
     RemoteRAGRetriever,
 )
 from prthinker.review_cache import ReviewCache
+from prthinker.step_cache import StepResultCache
 from prthinker.rules import load_rules_dir
-from prthinker.schemas import InlineFinding, ReviewRequest
+from prthinker.schemas import InlineFinding, ReviewRequest, ReviewResponse
 
 log = logging.getLogger("prthinker")
 
@@ -400,9 +403,17 @@ def _filter_per_file_targets(files: list, args: argparse.Namespace) -> list:
 
 
 def _server_review_request(
-    config: Config, code_diff: str, extra_rules: list, file_path: str | None = None
+    config: Config,
+    code_diff: str,
+    extra_rules: list,
+    file_path: str | None = None,
+    priority: str = "normal",
 ) -> ReviewRequest:
-    """Build a ReviewRequest for one server-side review call."""
+    """Build a ReviewRequest for one server-side review call.
+
+    ``client_id`` is the repository slug so the server's scheduler shares
+    the GPU fairly between repositories instead of between requests.
+    """
     return ReviewRequest(
         code_diff=code_diff,
         file_path=file_path,
@@ -412,6 +423,8 @@ def _server_review_request(
         steps=list(config.steps) or None,
         extra_rules=extra_rules,
         step_plan=config.step_plan,
+        priority=priority,
+        client_id=scheduling_client_id(),
     )
 
 
@@ -428,27 +441,69 @@ def _review_whole_diff_via_server(
     )
 
 
-def _review_one_file_via_server(
-    client: RemotePipelineClient, config: Config, fd: object, extra_rules: list
+def _file_result_from_response(
+    fd: object, response: ReviewResponse
 ) -> tuple[FileReviewResult, dict[str, str]]:
-    """Review one parsed file via the server; return its result + namespaced steps."""
-    response = client.review(
-        _server_review_request(config, fd.raw, extra_rules, file_path=fd.path)
-    )
+    """Map one file's server review to its result + namespaced steps."""
     step_map = response.step_map()
     namespaced = {f"{fd.path}::{name}": out for name, out in step_map.items()}
-    findings = list(response.inline_findings)
     file_result = FileReviewResult(
         path=fd.path,
         rag_docs=response.rag_docs,
         step_outputs=step_map,
-        inline_findings=findings,
+        inline_findings=list(response.inline_findings),
         is_binary=fd.is_binary,
         is_deleted=fd.is_deleted,
     )
     return file_result, namespaced
 
 
+def _review_one_file_via_server(
+    client: RemotePipelineClient,
+    config: Config,
+    fd: object,
+    extra_rules: list,
+    priority: str = "normal",
+) -> tuple[FileReviewResult, dict[str, str]]:
+    """Review one parsed file via the server; return its result + namespaced steps."""
+    response = client.review(
+        _server_review_request(
+            config, fd.raw, extra_rules, file_path=fd.path, priority=priority
+        )
+    )
+    return _file_result_from_response(fd, response)
+
+
+def _review_files_via_server(
+    client: RemotePipelineClient,
+    config: Config,
+    targets: list,
+    extra_rules: list,
+    priority: str,
+) -> list[tuple[FileReviewResult, dict[str, str]]]:
+    """Review ``targets`` via the server, results in ``targets`` order.
+
+    Several files go out as one batch job whose per-file results stream
+    back as they finish, instead of a submit + poll cycle per file.
+    """
+    if len(targets) <= 1:
+        return [
+            _review_one_file_via_server(client, config, fd, extra_rules, priority)
+            for fd in targets
+        ]
+    requests = [
+        _server_review_request(
+            config, fd.raw, extra_rules, file_path=fd.path, priority=priority
+        )
+        for fd in targets
+    ]
+    results: list = [None] * len(targets)
+    for done, (index, response) in enumerate(client.review_batch(requests), 1):
+        results[index] = _file_result_from_response(targets[index], response)
+        log.info("server review %d/%d: %s", done, len(targets), targets[index].path)
+    return results
+
+
 def _review_per_file_via_server(
     client: RemotePipelineClient,
     args: argparse.Namespace,
@@ -458,9 +513,11 @@ def _review_per_file_via_server(
 ) -> ReviewResult:
     """Run a per-file review against the remote pipeline server."""
     files = _filter_per_file_targets(parse_unified_diff(diff_text), args)
-    all_findings: list[InlineFinding] = []
-    aggregated_steps: dict[str, str] = {}
-    per_file: list[FileReviewResult] = []
+    priority = scheduling_priority(args)
+    # per_file keeps diff order; reviewed files fill their slot afterwards.
+    per_file: list[FileReviewResult | None] = []
+    targets: list = []
+    slots: list[int] = []
     for fd in files:
         if fd.is_binary or fd.is_deleted:
             continue
@@ -477,12 +534,16 @@ def _review_per_file_via_server(
                 )
             )
             continue
-        file_result, namespaced = _review_one_file_via_server(
-            client, config, fd, extra_rules
-        )
+        slots.append(len(per_file))
+        per_file.append(None)
+        targets.append(fd)
+    all_findings: list[InlineFinding] = []
+    aggregated_steps: dict[str, str] = {}
+    reviewed = _review_files_via_server(client, config, targets, extra_rules, priority)
+    for slot, (file_result, namespaced) in zip(slots, reviewed):
         aggregated_steps.update(namespaced)
         all_findings.extend(file_result.inline_findings)
-        per_file.append(file_result)
+        per_file[slot] = file_result
     return ReviewResult(
         code_diff=diff_text,
         rag_docs=[],
@@ -536,6 +597,9 @@ def _review_via_pipeline(
         else None,
         repo_retriever=repo_retriever,
         repo_workdir=repo_workdir,
+        step_cache=StepResultCache(Path(args.step_cache_path))
+        if getattr(args, "step_cache_path", "")
+        else None,
     )
     try:
         if args.per_file:
@@ -544,6 +608,7 @@ def _review_via_pipeline(
             )
         return pipeline.run(diff_text, output_dir=output_dir)
     finally:
+        pipeline.close()
         backend.close()
         if isinstance(retriever, RemoteRAGRetriever):
             retriever.close()
@@ -880,6 +945,7 @@ def _generate_summary_text(backend: object, prompt: str, max_new_tokens: int) ->
 
 def _generate_pr_summary_body(args: argparse.Namespace, adapter: object) -> str:
     """Build the marker-tagged PR-summary comment body, or '' to skip."""
+    adapter.prefetch(commit_messages=True)
     diff = adapter.fetch_diff()
     if not diff.strip():
         log.warning("Empty diff — skipping PR summary")
@@ -917,6 +983,14 @@ def _cmd_pr_summary(args: argparse.Namespace) -> int:
     """
     _validate_pr_args(args)
     adapter = build_platform_adapter(args)
+    try:
+        return _post_pr_summary(args, adapter)
+    finally:
+        adapter.close()
+
+
+def _post_pr_summary(args: argparse.Namespace, adapter: object) -> int:
+    """Generate the PR summary and upsert it; 0 even when skipped."""
     try:
         body = _generate_pr_summary_body(args, adapter)
     except Exception as exc:  # noqa: BLE001 — summary must never block the matrix
@@ -1014,10 +1088,20 @@ def _cmd_review_pr(args: argparse.Namespace) -> int:
 
     platform_kind = PlatformKind(args.platform)
     adapter = build_platform_adapter(args)
+    try:
+        return _review_pr(args, config, adapter, platform_kind)
+    finally:
+        adapter.close()
 
+
+def _review_pr(
+    args: argparse.Namespace, config: Config, adapter: object, platform_kind: object
+) -> int:
+    """Fetch, review and publish one PR through an open ``adapter``."""
     log.info(
         "Fetching diff for %s %s#%d", platform_kind.value, args.repo, args.pr_number
     )
+    adapter.prefetch()
     diff = adapter.fetch_diff()
     if not diff.strip():
         log.warning("Empty diff — skipping review")
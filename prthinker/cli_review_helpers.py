@@ -8,6 +8,7 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 from collections import deque
 from pathlib import Path
 
@@ -43,6 +44,24 @@ from prthinker.repo_kg import (
 log = logging.getLogger("prthinker")
 
 
+def scheduling_client_id() -> str:
+    """Fair-share key for server jobs: the repository slug under CI."""
+    return (
+        os.environ.get("GITHUB_REPOSITORY")
+        or os.environ.get("CI_PROJECT_PATH")
+        or ""
+    )
+
+
+def scheduling_priority(args: argparse.Namespace) -> str:
+    """Server scheduling class for this run's jobs.
+
+    A --target-file run is one shard of a CI matrix: many of them land on
+    the server at once, so let interactive / whole-PR work go first.
+    """
+    return "bulk" if (getattr(args, "target_file", "") or "").strip() else "normal"
+
+
 def _local_backend_config(
     args: argparse.Namespace,
 ) -> tuple[str, LocalBackendConfig]:
@@ -65,6 +84,8 @@ def _remote_backend_config(
         url=args.remote_url,
         timeout_seconds=args.remote_timeout,
         api_key=args.remote_api_key,
+        priority=scheduling_priority(args),
+        client_id=scheduling_client_id(),
     )
 
 
@@ -206,6 +227,8 @@ def build_cache_telemetry(
             if getattr(args, "cache_ttl_days", 7.0) in (None, 0, 0.0)
             else float(getattr(args, "cache_ttl_days", 7.0))
         ),
+        max_mb=float(getattr(args, "cache_max_mb", 0.0) or 0.0) or None,
+        eviction=str(getattr(args, "cache_eviction", "lru") or "lru"),
     )
     telemetry_cfg = TelemetryConfig(
         enabled=bool(getattr(args, "telemetry_enabled", False)),
@@ -36,11 +36,32 @@ class BackendKind(str, Enum):
 
 @dataclass(frozen=True)
 class LocalBackendConfig:
-    """Local in-process HF causal-LM. Works with any chat-tuned HF id."""
+    """Local in-process HF causal-LM. Works with any chat-tuned HF id.
+
+    ``max_batch_size`` > 1 routes concurrent generates through the
+    request batcher (:mod:`prthinker.gpu_batching`); a batch is capped at
+    ``batch_token_budget`` padded prompt+output tokens. The default of 1
+    keeps the strict one-generate-at-a-time behaviour.
+
+    ``prefix_cache_mib`` > 0 keeps past-key-values of recent prompt
+    prefixes in up to that much VRAM (:mod:`prthinker.prefix_cache`) so
+    CoT steps sharing the rules / context block skip re-prefilling it.
+    """
 
     model_name: str = "Qwen/Qwen3-Coder-30B-A3B-Instruct"
     lora_path: str | None = None
     quantization: bool = True
+    max_batch_size: int = 1
+    batch_token_budget: int = 65536
+    prefix_cache_mib: int = 0
+
+    def __post_init__(self) -> None:
+        if self.max_batch_size < 1:
+            raise ValueError("LocalBackendConfig.max_batch_size must be at least 1")
+        if self.batch_token_budget < 1:
+            raise ValueError("LocalBackendConfig.batch_token_budget must be positive")
+        if self.prefix_cache_mib < 0:
+            raise ValueError("LocalBackendConfig.prefix_cache_mib must not be negative")
 
 
 def _normalize_remote_url(url: str) -> str:
@@ -73,6 +94,10 @@ class RemoteBackendConfig:
     url: str
     timeout_seconds: float = 3600.0
     api_key: str | None = None
+    # Sent with every /ask job so the server's scheduler can order and
+    # fair-share it like the runner's /review jobs (see JobPriority).
+    priority: str = "normal"
+    client_id: str = ""
 
     def __post_init__(self) -> None:
         # Normalise the URL at the boundary so every downstream httpx client
@@ -253,6 +278,9 @@ class CacheConfig:
     enabled: bool = False
     path: str = CACHE_DEFAULT
     ttl_days: float | None = 7.0
+    # Byte budget for stored (compressed) responses; None = unbounded.
+    max_mb: float | None = None
+    eviction: str = "lru"  # "lru" | "lfu"
 
 
 @dataclass(frozen=True)
@@ -7,15 +7,27 @@ APPEND-ONLY — corrections are written as new rows; historical rows are
 never rewritten. This module holds that shared skeleton so each store
 only supplies its row dataclass and its malformed-row logging policy.
 
-Runner-safe: ``json`` + ``pathlib`` only. The embedding helper keeps its
-faiss import lazy so the runner profile (httpx + pydantic + PyYAML)
-never pulls numpy / faiss at module load.
+Runner-safe: ``json`` + ``pathlib`` only. The embedding helpers keep
+their numpy / faiss imports lazy so the runner profile (httpx + pydantic
++ PyYAML) never pulls numpy / faiss at module load.
+
+:class:`CommentIndex` is the similarity side shared by the dismissed
+filter and the accepted-examples retriever: every row's comment
+embedding in one contiguous float32 matrix plus a per-row path id, so a
+whole batch of queries is scored with one matrix multiply (path scoping
+is a mask, not a Python loop). Harvested corpora run to tens of
+thousands of rows; past ``FAISS_MIN_ROWS`` unscoped queries go through
+an HNSW index instead when faiss is installed. Vectors come from the
+store's :class:`~prthinker.corpus_embeddings.CorpusEmbeddingCache`
+sidecar, so only rows no earlier process embedded are encoded, and an
+index follows rows appended to its store afterwards.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -24,9 +36,12 @@ from typing import (
     Iterable,
     Iterator,
     Protocol,
+    Sequence,
     TypeVar,
 )
 
+from prthinker.corpus_embeddings import CorpusEmbeddingCache
+
 if TYPE_CHECKING:
     import numpy as np
 
@@ -46,8 +61,15 @@ class CommentRow(Protocol):
     comment: str
 
 
+class PathCommentRow(CommentRow, Protocol):
+    """A comment row that also records the file it was left on."""
+
+    path: str
+
+
 RowT = TypeVar("RowT", bound=JsonlRow)
 CommentRowT = TypeVar("CommentRowT", bound=CommentRow)
+PathCommentRowT = TypeVar("PathCommentRowT", bound=PathCommentRow)
 
 
 class JsonlCorpusStore(Generic[RowT]):
@@ -62,6 +84,7 @@ class JsonlCorpusStore(Generic[RowT]):
         self._path = Path(path)
         self._row_factory = row_factory
         self._rows: list[RowT] = []
+        self._append_hooks: list[Callable[[RowT], None]] = []
         if self._path.exists():
             self._load()
 
@@ -96,6 +119,51 @@ class JsonlCorpusStore(Generic[RowT]):
         self._path.parent.mkdir(parents=True, exist_ok=True)
         with self._path.open("a", encoding="utf-8") as fh:
             fh.write(row.to_jsonl() + "\n")
+        for hook in self._append_hooks:
+            hook(row)
+
+    def extend(self, rows: Iterable[RowT]) -> None:
+        """Append several rows with one file write (harvesters batch per PR)."""
+        rows = list(rows)
+        if not rows:
+            return
+        self._rows.extend(rows)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("a", encoding="utf-8") as fh:
+            fh.write("".join(row.to_jsonl() + "\n" for row in rows))
+        for row in rows:
+            for hook in self._append_hooks:
+                hook(row)
+
+    def on_append(self, hook: Callable[[RowT], None]) -> None:
+        """Call ``hook(row)`` after each future :meth:`append`."""
+        self._append_hooks.append(hook)
+
+    def embedding_cache(self) -> CorpusEmbeddingCache:
+        """The comment-embedding sidecar next to this corpus file.
+
+        Keyed by the active embedding model (``EMB_MODEL``), so switching
+        models rebuilds the sidecar instead of mixing vector spaces.
+        """
+        from codes.util.embedding_config import active_emb_model
+
+        return CorpusEmbeddingCache(self._path, model_key=active_emb_model())
+
+
+def embed_comments(texts: Sequence[str]) -> "np.ndarray":
+    """Embed ``texts`` with one batched call; a float32 ``(len, dim)`` matrix.
+
+    Goes through ``codes.util.faiss_util.get_embeddings`` — the same
+    document-space embedding RAG uses — imported lazily.
+    """
+    import numpy as np
+
+    if not texts:
+        return np.zeros((0, 0), dtype="float32")
+    from codes.util.faiss_util import get_embeddings
+
+    vectors = np.asarray(get_embeddings(list(texts)), dtype="float32")
+    return np.ascontiguousarray(vectors.reshape(len(texts), -1))
 
 
 def embed_store_comments(
@@ -105,17 +173,163 @@ def embed_store_comments(
 
     Embedding targets the advisory ``comment`` text — not the suggestion
     or diff snippet, which can be repo-specific code — so similarity
-    reflects advisory content. The faiss import stays lazy: the runner
-    profile must import this module without numpy / faiss installed.
+    reflects advisory content. All rows are encoded in one batched call.
     """
-    from codes.util.faiss_util import get_embedding
+    rows = list(rows)
+    if not rows:
+        return []
+    return list(zip(rows, embed_comments([row.comment for row in rows])))
+
+
+# Corpus size from which unscoped searches use an approximate faiss
+# index; below it one exact matrix multiply is faster than building one.
+FAISS_MIN_ROWS = 20_000
+_HNSW_NEIGHBOURS = 32
+
+
+class CommentIndex(Generic[PathCommentRowT]):
+    """The rows' comment embeddings as one matrix, searchable in batches.
+
+    Scores are raw inner products of the embeddings (cosine for the
+    unit-length vectors ``get_embeddings`` returns), exactly what the
+    per-row ``np.dot`` loop computed. With a ``cache`` only comments
+    missing from it are encoded; :meth:`add` extends a built index by
+    one row (subscribe it with :meth:`JsonlCorpusStore.on_append`).
+    The matrix and path ids live in buffers that grow geometrically, so
+    appends cost amortised O(1); only their first ``len(rows)`` rows
+    are live.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[PathCommentRowT],
+        *,
+        cache: CorpusEmbeddingCache | None = None,
+        faiss_min_rows: int = FAISS_MIN_ROWS,
+    ) -> None:
+        import numpy as np
+
+        self._cache = cache
+        self._lock = threading.Lock()
+        self.rows = list(rows)
+        self._matrix = self._embed([row.comment for row in self.rows])
+        self._path_ids: dict[str, int] = {}
+        self._row_paths = np.fromiter(
+            (self._path_ids.setdefault(row.path, len(self._path_ids)) for row in self.rows),
+            dtype="int64",
+            count=len(self.rows),
+        )
+        self._ann = (
+            self._build_ann() if len(self.rows) >= faiss_min_rows else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _embed(self, texts: list[str]) -> "np.ndarray":
+        if self._cache is None:
+            return embed_comments(texts)
+        return self._cache.embed(texts, embed_comments)
+
+    def add(self, row: PathCommentRowT) -> None:
+        """Append one row, embedding only its comment."""
+        vector = self._embed([row.comment])
+        with self._lock:
+            count = len(self.rows)
+            self._reserve(count + 1, vector.shape[1])
+            self._matrix[count] = vector[0]
+            self._row_paths[count] = self._path_ids.setdefault(row.path, len(self._path_ids))
+            # Searches slice the buffers to the row count they saw, so
+            # writing past it (or swapping in a grown copy) is safe.
+            self.rows.append(row)
+            if self._ann is not None:
+                self._ann.add(vector)
+
+    def _reserve(self, needed: int, dim: int) -> None:
+        """Make the buffers hold ``needed`` rows, doubling when they are full."""
+        import numpy as np
+
+        count = len(self.rows)
+        matrix = self._matrix
+        if matrix.ndim == 2 and matrix.shape[0] >= needed and matrix.shape[1] == dim:
+            return
+        matrix = np.zeros((max(needed, 2 * count), dim), dtype="float32")
+        row_paths = np.zeros(len(matrix), dtype="int64")
+        if count:
+            matrix[:count] = self._matrix[:count]
+            row_paths[:count] = self._row_paths[:count]
+        self._matrix, self._row_paths = matrix, row_paths
+
+    def _build_ann(self):
+        try:
+            import faiss
+        except ImportError:
+            log.info("faiss not installed; %d-row corpus searched exactly", len(self.rows))
+            return None
+        index = faiss.IndexHNSWFlat(
+            self._matrix.shape[1], _HNSW_NEIGHBOURS, faiss.METRIC_INNER_PRODUCT
+        )
+        index.add(self._matrix[: len(self.rows)])
+        return index
+
+    def search(
+        self,
+        queries: "np.ndarray",
+        k: int,
+        paths: Sequence[str | None] | None = None,
+    ) -> list[list[tuple[float, int]]]:
+        """Top ``k`` ``(score, row)`` pairs per query row, best first.
+
+        ``paths[i]``, when set, restricts query ``i`` to rows on that
+        path. Equal scores keep row order.
+        """
+        import numpy as np
+
+        queries = np.ascontiguousarray(np.asarray(queries, dtype="float32"))
+        queries = queries.reshape(len(queries), -1)
+        with self._lock:
+            count = len(self.rows)
+            matrix, row_paths = self._matrix[:count], self._row_paths[:count]
+            if not count or k < 1 or not len(queries):
+                return [[] for _ in range(len(queries))]
+            scoped = paths is not None and any(p is not None for p in paths)
+            if self._ann is not None and not scoped:
+                scores, ids = self._ann.search(queries, min(k, count))
+                return [
+                    [(float(s), int(r)) for s, r in zip(row_scores, row_ids) if r >= 0]
+                    for row_scores, row_ids in zip(scores, ids)
+                ]
+        scores = queries @ matrix.T
+        if scoped:
+            for i, path in enumerate(paths):
+                if path is not None:
+                    wanted = self._path_ids.get(path, -1)
+                    scores[i, row_paths != wanted] = -np.inf
+        return [self._top(row_scores, k) for row_scores in scores]
+
+    @staticmethod
+    def _top(scores: "np.ndarray", k: int) -> list[tuple[float, int]]:
+        import numpy as np
 
-    return [(row, get_embedding(row.comment)) for row in rows]
+        candidates = np.flatnonzero(np.isfinite(scores))
+        if k < len(candidates):
+            # Keep every row tied with the k-th best so ties resolve by row.
+            kth = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[scores[candidates] >= kth]
+        ranked = sorted(
+            ((float(scores[i]), int(i)) for i in candidates),
+            key=lambda pair: (-pair[0], pair[1]),
+        )
+        return ranked[:k]
 
 
 __all__ = [
+    "FAISS_MIN_ROWS",
+    "CommentIndex",
     "CommentRow",
     "JsonlCorpusStore",
     "JsonlRow",
+    "PathCommentRow",
+    "embed_comments",
     "embed_store_comments",
 ]
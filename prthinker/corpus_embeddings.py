@@ -0,0 +1,223 @@
+"""On-disk embedding sidecar for the append-only JSONL corpora.
+
+Every process that built a :class:`~prthinker.dismissed.DismissedFilter`
+or :class:`~prthinker.accepted.AcceptedExamplesRetriever` — each server
+start, each CI runner — re-embedded the whole corpus, minutes of CPU for
+a harvested corpus of tens of thousands of comments.
+:class:`CorpusEmbeddingCache` keeps the vectors next to the JSONL:
+
+- ``<corpus>.emb.json`` names the embedding model and dimension;
+- ``<corpus>.emb.bin`` holds fixed-size records of (sha256 of the
+  embedded text, float32 vector), memory-mapped on load.
+
+Only texts without a record are encoded, and their records are appended,
+so the sidecar grows with the corpus instead of being rewritten. Each
+record carries its own hash (rather than a parallel hash list), so
+records appended by concurrent processes can never be mismatched, and a
+torn trailing record left by a crash is ignored (and cut off by the next
+append). A header naming another model or dimension is discarded and
+the sidecar rebuilt.
+
+numpy is imported lazily, like :mod:`prthinker.repo_embeddings`, so the
+corpora stores stay runner-safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+log = logging.getLogger(__name__)
+
+_HEADER_SUFFIX = ".emb.json"
+_RECORDS_SUFFIX = ".emb.bin"
+_DIGEST_BYTES = 32
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).digest()
+
+
+def _record_dtype(dim: int) -> "np.dtype":
+    import numpy as np
+
+    # Raw bytes, not an "S" string field: numpy strips trailing NULs from those.
+    return np.dtype([("hash", "u1", (_DIGEST_BYTES,)), ("vec", "<f4", (dim,))])
+
+
+def _record_rows(records: "np.ndarray", start: int = 0) -> dict[bytes, int]:
+    import numpy as np
+
+    raw = np.ascontiguousarray(records["hash"]).tobytes()
+    return {
+        raw[i * _DIGEST_BYTES:(i + 1) * _DIGEST_BYTES]: start + i
+        for i in range(len(records))
+    }
+
+
+def _as_matrix(vectors, rows: int) -> "np.ndarray":
+    import numpy as np
+
+    return np.asarray(vectors, dtype="float32").reshape(rows, -1)
+
+
+class CorpusEmbeddingCache:
+    """text-hash -> vector sidecar of one corpus file, for one embedder.
+
+    The digest -> row map is kept in memory and only extended: by this
+    cache's own appends, and by reading just the records another process
+    appended since. The header is re-read only when it changed on disk.
+    """
+
+    def __init__(self, corpus_path: Path, *, model_key: str) -> None:
+        corpus_path = Path(corpus_path)
+        self._header_path = corpus_path.with_name(corpus_path.name + _HEADER_SUFFIX)
+        self._records_path = corpus_path.with_name(corpus_path.name + _RECORDS_SUFFIX)
+        self._model_key = model_key
+        self._lock = threading.Lock()
+        self._reset_locked()
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        encode: Callable[[list[str]], "np.ndarray"],
+    ) -> "np.ndarray":
+        """Vectors for ``texts`` as a float32 matrix, encoding only misses.
+
+        Misses are encoded with one ``encode`` call and appended to the
+        sidecar. A sidecar that cannot be read or written is logged and
+        bypassed — the vectors are still returned.
+        """
+        import numpy as np
+
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 0), dtype="float32")
+        digests = [_digest(text) for text in texts]
+        with self._lock:
+            self._sync_locked()
+            dim, records, rows = self._dim, self._records, self._rows
+            cached = [i for i, d in enumerate(digests) if d in rows]
+            missing = [i for i, d in enumerate(digests) if d not in rows]
+            vectors = records["vec"][[rows[digests[i]] for i in cached]] if cached else None
+            encoded = None
+            if missing:
+                encoded = _as_matrix(encode([texts[i] for i in missing]), len(missing))
+                if records is not None and encoded.shape[1] != dim:
+                    # Same model key, new output shape: nothing cached is valid.
+                    records, cached, vectors = None, [], None
+                    missing = list(range(len(texts)))
+                    encoded = _as_matrix(encode(texts), len(texts))
+                dim = encoded.shape[1]
+                self._append_locked(
+                    dim, [digests[i] for i in missing], encoded, fresh=records is None
+                )
+        matrix = np.empty((len(texts), dim), dtype="float32")
+        if cached:
+            matrix[cached] = vectors
+        if encoded is not None:
+            matrix[missing] = encoded
+        log.debug(
+            "corpus embeddings %s: %d cached, %d encoded",
+            self._records_path.name, len(cached), len(missing),
+        )
+        return matrix
+
+    def _reset_locked(self) -> None:
+        self._header_stamp: tuple | None = None
+        self._dim = 0
+        self._rows: dict[bytes, int] = {}
+        self._count = 0  # records indexed into _rows (digests may repeat)
+        self._records: "np.ndarray | None" = None
+
+    def _sync_locked(self) -> None:
+        """Catch the in-memory view up with the sidecar on disk.
+
+        Leaves ``_records`` as None when the sidecar is missing, empty or
+        from another embedder.
+        """
+        import numpy as np
+
+        try:
+            stat = self._header_path.stat()
+            size = self._records_path.stat().st_size
+        except OSError:
+            self._reset_locked()
+            return
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._header_stamp:
+            self._reset_locked()
+            try:
+                header = json.loads(self._header_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return
+            dim = int(header.get("dim", 0) or 0)
+            if header.get("model") != self._model_key or dim < 1:
+                log.info("corpus embeddings %s are from another embedder; rebuilding",
+                         self._records_path)
+                return
+            self._header_stamp, self._dim = stamp, dim
+        dtype = _record_dtype(self._dim)
+        count = size // dtype.itemsize  # a torn trailing record is ignored
+        if count < self._count:
+            # Truncated or rewritten under the same header: index it afresh.
+            self._rows, self._count = {}, 0
+        mapped = 0 if self._records is None else len(self._records)
+        if count != mapped:
+            self._records = (
+                np.memmap(self._records_path, dtype=dtype, mode="r", shape=(count,))
+                if count else None
+            )
+        if count > self._count:
+            self._rows.update(_record_rows(self._records[self._count:], self._count))
+            self._count = count
+
+    def _append_locked(
+        self, dim: int, digests: list[bytes], vectors: "np.ndarray", *, fresh: bool
+    ) -> None:
+        import numpy as np
+
+        records = np.empty(len(digests), dtype=_record_dtype(dim))
+        records["hash"] = np.frombuffer(b"".join(digests), dtype="u1").reshape(
+            len(digests), _DIGEST_BYTES
+        )
+        records["vec"] = vectors
+        try:
+            self._records_path.parent.mkdir(parents=True, exist_ok=True)
+            if fresh:
+                header = {"model": self._model_key, "dim": dim}
+                tmp = self._header_path.with_name(self._header_path.name + ".tmp")
+                tmp.write_text(json.dumps(header), encoding="utf-8")
+                os.replace(tmp, self._header_path)
+            with open(self._records_path, "wb" if fresh else "ab") as fh:
+                torn = fh.tell() % records.dtype.itemsize
+                if torn:
+                    # Keep appended records aligned after a crashed writer.
+                    fh.truncate(fh.tell() - torn)
+                start = fh.tell() // records.dtype.itemsize
+                fh.write(records.tobytes())
+            if fresh:
+                stat = self._header_path.stat()
+                self._reset_locked()
+                self._header_stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                self._dim = dim
+        except OSError as exc:
+            log.warning("corpus embeddings not persisted to %s: %s", self._records_path, exc)
+            self._reset_locked()
+            return
+        if start == self._count:
+            # Another process's appends in between are picked up by the
+            # next sync, ours included.
+            self._rows.update((d, start + i) for i, d in enumerate(digests))
+            self._count = start + len(digests)
+
+
+__all__ = ["CorpusEmbeddingCache"]
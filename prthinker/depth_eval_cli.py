@@ -129,6 +129,7 @@ def _pipeline_factory(
         retriever = _build_retriever(args, config)
 
         def close() -> None:
+            pipeline.close()
             backend.close()
             if isinstance(retriever, RemoteRAGRetriever):
                 retriever.close()
@@ -7,6 +7,15 @@ Only the pieces we need:
 * set of new-side line numbers that appear in the diff, so we can validate
   inline comment targets against what GitHub will accept.
 
+:func:`iter_file_diffs` is one pass over the diff — text, bytes, or a
+file (memory-mapped, not read onto the heap): each ``FileDiff`` keeps a
+span of that shared buffer, sliced / decoded the first time ``raw`` is
+read, plus the new-side line set, hunk offsets, change counts and
+content hash recorded during the pass. Lockfile-heavy diffs of hundreds
+of MB no longer become per-file string copies before any review starts,
+and diff text is never re-encoded as a whole: its spans index the
+caller's string.
+
 We intentionally don't pull in ``unidiff`` — keeps runner deps thin and
 the input format is simple enough.
 """
@@ -14,8 +23,10 @@ the input format is simple enough.
 from __future__ import annotations
 
 import hashlib
+import io
+import mmap
 import re
-from collections.abc import Iterator
+from collections.abc import Collection, Iterator
 from dataclasses import dataclass, field
 
 _HUNK_RE = re.compile(
@@ -55,10 +66,51 @@ def _iter_new_side(
             yield new_line, line[1:], False
 
 
+class _RawText:
+    """Descriptor behind ``FileDiff.raw``.
+
+    A diff parsed by :func:`iter_file_diffs` keeps only its span of the
+    shared diff buffer until ``raw`` is first read, then keeps the text,
+    so files nobody reads (a skipped lockfile) never become a string and
+    the rest are sliced / decoded once. Assigning ``raw`` stores the
+    text as before.
+    """
+
+    def __get__(self, obj, objtype=None) -> str:
+        if obj is None:
+            return ""
+        span = obj.__dict__.get("_span")
+        if span is not None:
+            buffer, start, end = span
+            text = buffer[start:end]
+            if not isinstance(text, str):
+                text = _decode(text)
+            obj.__dict__["_raw"] = text
+            obj.__dict__["_span"] = None
+            return text
+        return obj.__dict__.get("_raw", "")
+
+    def __set__(self, obj, value: str) -> None:
+        obj.__dict__["_raw"] = value
+        obj.__dict__["_span"] = None
+        obj.__dict__["_scan"] = None
+
+
+@dataclass(frozen=True)
+class _Scan:
+    """What one pass over a file's diff lines records for its consumers."""
+
+    new_lines: frozenset[int]
+    hunk_offsets: tuple[int, ...]
+    added: int
+    removed: int
+    sha256: str
+
+
 @dataclass
 class FileDiff:
     path: str
-    raw: str
+    raw: str = _RawText()
     new_lines: set[int] = field(default_factory=set)
     is_binary: bool = False
     is_deleted: bool = False
@@ -67,6 +119,36 @@ class FileDiff:
         """Lines on the new side that GitHub will accept for inline review."""
         return set(self.new_lines)
 
+    def _scanned(self) -> _Scan:
+        scan = self.__dict__.get("_scan")
+        if scan is None:
+            raw = self.raw
+            scanner = _FileScanner()
+            for offset, line in _iter_buffer_lines(raw, 0, len(raw)):
+                scanner.feed(line, offset)
+            scan = scanner.finish()
+            self.__dict__["_scan"] = scan
+        return scan
+
+    @property
+    def hunk_offsets(self) -> tuple[int, ...]:
+        """Offset of each ``@@`` header within this file's diff.
+
+        Indexes ``raw`` for a text diff; bytes of the file's span for a
+        diff parsed from a buffer or file.
+        """
+        return self._scanned().hunk_offsets
+
+    @property
+    def added_count(self) -> int:
+        """Added (``+``) lines, ``+++`` headers excluded."""
+        return self._scanned().added
+
+    @property
+    def removed_count(self) -> int:
+        """Removed (``-``) lines, ``---`` headers excluded."""
+        return self._scanned().removed
+
     def content_sha256(self) -> str:
         """Stable hash of the post-change content of this file's diff.
 
@@ -75,19 +157,32 @@ class FileDiff:
         only the lines that survive on the *new* side (added or
         unchanged-context) — formatting whitespace, removed lines and
         diff metadata are excluded so a no-op force-push that only
-        re-orders hunks still hits the cache.
+        re-orders hunks still hits the cache. Computed during the parse
+        (or once, on first use, for a hand-built ``raw``).
         """
-        new_side = [
-            content
-            for _, content, _ in _iter_new_side(self.raw, in_hunks_only=False)
-        ]
-        h = hashlib.sha256()
-        h.update("\n".join(new_side).encode("utf-8"))
-        return h.hexdigest()
+        return self._scanned().sha256
 
 
-def _starts_file(line: str) -> bool:
-    return line.startswith("diff --git ")
+def _decode(data) -> str:
+    return bytes(data).decode("utf-8", errors="replace")
+
+
+def _iter_buffer_lines(buffer, start: int, end: int) -> Iterator[tuple[int, bytes]]:
+    """``(offset, line)`` per ``\n``-terminated line of ``buffer[start:end]``.
+
+    ``line`` is bytes and keeps its terminator; ``offset`` is relative to
+    ``start``. A ``str`` buffer is walked in place, one line encoded at a
+    time, so offsets are characters.
+    """
+    text = isinstance(buffer, str)
+    needle = "\n" if text else b"\n"
+    pos = start
+    while pos < end:
+        newline = buffer.find(needle, pos, end)
+        stop = end if newline == -1 else newline + 1
+        line = buffer[pos:stop]
+        yield pos - start, line.encode("utf-8", errors="surrogatepass") if text else line
+        pos = stop
 
 
 def git_header_b_path(line: str) -> str | None:
@@ -144,100 +239,147 @@ def _apply_header_line(line: str, state: _HeaderState) -> None:
         _apply_path_line(line, state)
 
 
-def _extract_paths(diff_header_lines: list[str]) -> tuple[str | None, bool, bool]:
-    """Return (new_path, is_binary, is_deleted) from the per-file header."""
-    state = _HeaderState()
-    for line in diff_header_lines:
-        _apply_header_line(line, state)
-    return (state.new_path or state.fallback), state.is_binary, state.is_deleted
-
+_HUNK_RE_BYTES = re.compile(_HUNK_RE.pattern.encode())
 
-def _advance_new_side(line: str, new_line_no: int, collected: set[int]) -> int:
-    """Advance the new-side line counter for context and added lines."""
-    if line.startswith(" ") or (line.startswith("+") and not line.startswith("+++")):
-        new_line_no += 1
-        collected.add(new_line_no)
-    return new_line_no
 
+class _FileScanner:
+    """Single-pass accumulator over one file's diff lines.
 
-def _hunk_start_line(line: str, current: int) -> int:
-    """New-side line number just before a hunk, or `current` if unparsable."""
-    match = _HUNK_RE.match(line)
-    if match:
-        return int(match.group("new_start")) - 1
-    return current
-
+    Records exactly what the historical per-consumer walks derived:
+    the in-hunk new-side line numbers (``parse_unified_diff``), the
+    ``+``/``-`` counts (``changed_line_count``) and the new-side content
+    hash (``content_sha256``, which never gated on hunk headers).
+    """
 
-@dataclass
-class _ParseState:
-    """Mutable accumulator threaded through the per-file diff scan."""
-
-    files: list[FileDiff] = field(default_factory=list)
-    current_buf: list[str] = field(default_factory=list)
-    header_buf: list[str] = field(default_factory=list)
-    in_hunks: bool = False
-    new_line_no: int = 0
-    collected_new_lines: set[int] = field(default_factory=set)
-
-    def start_file(self, line: str) -> None:
-        """Flush the pending file and begin a new one at a `diff --git` line."""
-        self.flush()
-        self.current_buf = [line]
-        self.header_buf = [line]
+    def __init__(self) -> None:
+        self.header = _HeaderState()
         self.in_hunks = False
         self.new_line_no = 0
-        self.collected_new_lines = set()
-
-    def flush(self) -> None:
-        """Append the buffered file to `files` when it has a resolvable path."""
-        if not self.current_buf:
+        self.new_lines: set[int] = set()
+        self.hunk_offsets: list[int] = []
+        self.added = 0
+        self.removed = 0
+        self._sha = hashlib.sha256()
+        self._hashed = False
+
+    def feed(self, line: bytes, offset: int) -> None:
+        body = line.rstrip(b"\n")
+        if body.endswith(b"\r"):
+            body = body[:-1]
+        if body.startswith(b"@@"):
+            self.in_hunks = True
+            self.hunk_offsets.append(offset)
+            match = _HUNK_RE_BYTES.match(body)
+            if match:
+                self.new_line_no = int(match.group("new_start")) - 1
+            return
+        marker = body[:1]
+        if body.startswith((b"+++", b"---")) or marker not in (b"+", b"-", b" "):
+            # Metadata: a header line before the first hunk, else
+            # ignored ("\ No newline at end of file", stray "+++").
+            if not self.in_hunks:
+                _apply_header_line(_decode(body), self.header)
             return
-        new_path, is_binary, is_deleted = _extract_paths(self.header_buf)
-        if new_path is None:
+        if marker == b"-":
+            self.removed += 1
             return
-        self.files.append(
-            FileDiff(
-                path=new_path,
-                raw="".join(self.current_buf),
-                new_lines=set(self.collected_new_lines),
-                is_binary=is_binary,
-                is_deleted=is_deleted,
-            )
+        if marker == b"+":
+            self.added += 1
+        if self._hashed:
+            self._sha.update(b"\n")
+        self._sha.update(body[1:])
+        self._hashed = True
+        if self.in_hunks:
+            self.new_line_no += 1
+            self.new_lines.add(self.new_line_no)
+
+    def finish(self) -> _Scan:
+        return _Scan(
+            new_lines=frozenset(self.new_lines),
+            hunk_offsets=tuple(self.hunk_offsets),
+            added=self.added,
+            removed=self.removed,
+            sha256=self._sha.hexdigest(),
         )
 
-    def consume(self, line: str) -> None:
-        """Fold one non-header diff line into the state machine."""
-        self.current_buf.append(line)
-        if line.startswith("@@"):
-            self.in_hunks = True
-            self.header_buf.append(line)
-            self.new_line_no = _hunk_start_line(line, self.new_line_no)
-        elif not self.in_hunks:
-            self.header_buf.append(line)
-        else:
-            # '-' lines and metadata don't advance the new-side counter.
-            self.new_line_no = _advance_new_side(
-                line, self.new_line_no, self.collected_new_lines
-            )
+
+def _diff_buffer(source):
+    """A buffer supporting ``find`` / slicing over the whole diff.
+
+    Text is used as is (the caller already holds it); a real file is
+    memory-mapped so the diff is never copied onto the heap; other file
+    objects are read once.
+    """
+    if isinstance(source, (str, bytes, bytearray, mmap.mmap)):
+        return source
+    if isinstance(source, memoryview):
+        return source.tobytes()
+    try:
+        return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return source.read()
+
+
+def _finish_file(
+    scanner: _FileScanner, buffer, start: int, end: int
+) -> FileDiff | None:
+    header = scanner.header
+    path = header.new_path or header.fallback
+    if path is None:
+        return None
+    scan = scanner.finish()
+    fd = FileDiff(
+        path=path,
+        new_lines=set(scan.new_lines),
+        is_binary=header.is_binary,
+        is_deleted=header.is_deleted,
+    )
+    fd.__dict__["_span"] = (buffer, start, end)
+    fd.__dict__["_scan"] = scan
+    return fd
+
+
+def iter_file_diffs(source) -> Iterator[FileDiff]:
+    """Lazily yield one `FileDiff` per file of a unified diff, in one pass.
+
+    ``source`` is the diff text, a bytes-like buffer, or a file object
+    (memory-mapped when it has a real file descriptor). Every yielded
+    diff references a span of the same buffer instead of holding its
+    own copy, and carries the new-side line set, hunk offsets, change
+    counts and content hash computed during the pass, so consumers do
+    not re-walk the text.
+    """
+    buffer = _diff_buffer(source)
+    scanner: _FileScanner | None = None
+    start = 0
+    for offset, line in _iter_buffer_lines(buffer, 0, len(buffer)):
+        if line.startswith(b"diff --git "):
+            if scanner is not None:
+                fd = _finish_file(scanner, buffer, start, offset)
+                if fd is not None:
+                    yield fd
+            scanner = _FileScanner()
+            start = offset
+            _apply_header_line(_decode(line.rstrip(b"\r\n")), scanner.header)
+        elif scanner is not None:
+            # Anything before the first `diff --git` is preamble; skip it.
+            scanner.feed(line, offset - start)
+    if scanner is not None:
+        fd = _finish_file(scanner, buffer, start, len(buffer))
+        if fd is not None:
+            yield fd
 
 
 def parse_unified_diff(diff_text: str) -> list[FileDiff]:
     """Split `diff_text` into one `FileDiff` per file.
 
     The raw text per file preserves the original `diff --git`/`@@` headers
-    so the model still sees full context.
+    so the model still sees full context. See :func:`iter_file_diffs`
+    for the lazy form over bytes or a file.
     """
     if not diff_text.strip():
         return []
-    state = _ParseState()
-    for line in diff_text.splitlines(keepends=True):
-        if _starts_file(line):
-            state.start_file(line)
-        elif state.current_buf:
-            # Anything before the first `diff --git` is preamble; skip it.
-            state.consume(line)
-    state.flush()
-    return state.files
+    return list(iter_file_diffs(diff_text))
 
 
 def _content_from_raw(raw: str) -> dict[int, str]:
@@ -260,15 +402,20 @@ def iter_added_lines(raw: str) -> list[tuple[int, str]]:
     ]
 
 
-def new_side_content(diff_text: str) -> dict[str, dict[int, str]]:
+def new_side_content(
+    diff_text: str, paths: Collection[str] | None = None
+) -> dict[str, dict[int, str]]:
     """Map ``{path: {new_line_no: source_text}}`` across a unified diff.
 
     Lets the summary quote the actual offending line next to a finding so
     a reviewer reads it without opening the Files-changed tab. Only new-side
     (added / context) lines are captured; removed lines have no new number.
+    ``paths`` limits the map to those files; the others are never decoded.
     """
     return {
-        fd.path: _content_from_raw(fd.raw) for fd in parse_unified_diff(diff_text)
+        fd.path: _content_from_raw(fd.raw)
+        for fd in iter_file_diffs(diff_text)
+        if paths is None or fd.path in paths
     }
 
 
@@ -276,6 +423,7 @@ __all__ = [
     "FileDiff",
     "git_header_b_path",
     "iter_added_lines",
+    "iter_file_diffs",
     "new_side_content",
     "parse_unified_diff",
 ]
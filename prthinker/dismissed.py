@@ -7,11 +7,12 @@ the comment was unresolved when the PR merged).
 Storing them lets the next review skip producing the same noise. The store
 is a JSON-Lines file — easy to inspect, diff in git, and edit by hand.
 
-At review time the filter embeds each candidate finding's comment, compares
-it to every stored dismissed example's comment, and drops the finding when
-max cosine similarity ≥ `threshold`. Embedding goes through the same
-`codes.util.faiss_util.get_embedding` used by RAG, so similarity space is
-consistent.
+At review time the filter embeds the candidate findings' comments in one
+batch, scores them against every stored dismissed example's comment with
+one matrix multiply (a :class:`~prthinker.corpora_base.CommentIndex`), and
+drops a finding when its max cosine similarity ≥ `threshold`. Embedding
+goes through the same `codes.util.faiss_util` model used by RAG, so
+similarity space is consistent.
 """
 
 from __future__ import annotations
@@ -20,14 +21,11 @@ import json
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterable
+from typing import Iterable
 
-from prthinker.corpora_base import JsonlCorpusStore, embed_store_comments
+from prthinker.corpora_base import CommentIndex, JsonlCorpusStore, embed_comments
 from prthinker.schemas import InlineFinding
 
-if TYPE_CHECKING:
-    import numpy as np
-
 log = logging.getLogger(__name__)
 
 
@@ -86,43 +84,34 @@ class DismissedFilter:
         self._store = store
         self._threshold = threshold
         self._path_scoped = path_scoped
-        self._example_embeddings: list[tuple[DismissedExample, np.ndarray]] = []
-
-    def _ensure_embeddings(self) -> None:
-        if self._example_embeddings or len(self._store) == 0:
-            return
-        self._example_embeddings = embed_store_comments(self._store)
-
-    def _best_match(
-        self, finding: InlineFinding, candidate: "np.ndarray"
-    ) -> tuple[float, str]:
-        """Return the max cosine similarity and reason against stored examples."""
-        import numpy as np
-
-        best_score = 0.0
-        best_reason = ""
-        for ex, emb in self._example_embeddings:
-            if self._path_scoped and ex.path != finding.path:
-                continue
-            score = float(np.dot(candidate, emb))
-            if score > best_score:
-                best_score = score
-                best_reason = ex.reason
-        return best_score, best_reason
+        self._index: CommentIndex[DismissedExample] | None = None
+
+    def _ensure_index(self) -> CommentIndex[DismissedExample]:
+        if self._index is None:
+            self._index = CommentIndex(self._store, cache=self._store.embedding_cache())
+            self._store.on_append(self._index.add)
+        return self._index
+
+    def _best_matches(
+        self, findings: list[InlineFinding]
+    ) -> list[tuple[float, str]]:
+        """Max cosine similarity and reason per finding, from one encode call."""
+        index = self._ensure_index()
+        paths = [f.path for f in findings] if self._path_scoped else None
+        hits = index.search(embed_comments([f.comment for f in findings]), 1, paths)
+        matches: list[tuple[float, str]] = []
+        for top in hits:
+            score, row = top[0] if top else (0.0, -1)
+            matches.append((score, index.rows[row].reason) if score > 0.0 else (0.0, ""))
+        return matches
 
     def filter(self, findings: Iterable[InlineFinding]) -> list[InlineFinding]:
         items = list(findings)
         if not items or len(self._store) == 0:
             return items
 
-        self._ensure_embeddings()
-        # Lazy import keeps the runner profile (httpx + pydantic only)
-        # importable on machines without numpy / faiss.
-        from codes.util.faiss_util import get_embedding
-
         kept: list[InlineFinding] = []
-        for f in items:
-            best_score, best_reason = self._best_match(f, get_embedding(f.comment))
+        for f, (best_score, best_reason) in zip(items, self._best_matches(items)):
             if best_score >= self._threshold:
                 log.info(
                     "Dropping finding on %s:%d (sim=%.3f, reason=%s)",
@@ -132,6 +121,17 @@ class DismissedFilter:
             kept.append(f)
         return kept
 
+    def filter_grouped(
+        self, groups: dict[str, list[InlineFinding]]
+    ) -> dict[str, list[InlineFinding]]:
+        """``filter`` for several files' findings at once (one encode call)."""
+        flat = [f for findings in groups.values() for f in findings]
+        kept_ids = {id(f) for f in self.filter(flat)}
+        return {
+            key: [f for f in findings if id(f) in kept_ids]
+            for key, findings in groups.items()
+        }
+
 
 __all__ = [
     "DismissedExample",
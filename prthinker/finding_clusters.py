@@ -7,9 +7,22 @@ families of N+ semantically-similar findings, which become candidate
 project-level rules: "you've raised this finding N times — would you
 like to add it as a permanent rule?"
 
-The vector backend is pluggable but defaults to pure-NumPy brute
-force, which keeps the runner profile dependency-thin and is fast
-enough for the expected single-repo scale (< 10^5 findings).
+Two ways to cluster:
+
+- :func:`greedy_cluster` re-clusters a loaded list from scratch — one
+  vectorised similarity row per fingerprint against the seeds so far.
+- :meth:`FindingClusterStore.clusters` keeps the clustering *in the
+  store*: each cluster's normalised seed and every finding's
+  assignment are persisted per ``(repo scope, threshold)``, so only
+  findings added since the last call are assigned — in blocks, with
+  one batched nearest-seed search per block — and :meth:`add` extends
+  every registered clustering in place (:meth:`drop_clusterings`
+  retires the ones no longer queried). An org-wide store past 10^5
+  rows is clustered once instead of on every ``discover-rules``.
+
+Seed search is a NumPy matrix product, switching to a faiss HNSW
+index once a clustering has ``FAISS_MIN_ROWS`` seeds and faiss is
+installed, which keeps the runner profile dependency-thin.
 
 Per ``paper_rule.md``'s no-fabrication rule, this module ships the
 mechanism only — no claim about how often discovered rules are
@@ -24,7 +37,9 @@ import sqlite3
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, TYPE_CHECKING
+from typing import Iterable, Iterator, TYPE_CHECKING
+
+from prthinker.corpora_base import FAISS_MIN_ROWS
 
 if TYPE_CHECKING:
     import numpy as np
@@ -48,8 +63,34 @@ CREATE INDEX IF NOT EXISTS idx_findings_repo
     ON findings_index (repo, pr_number);
 CREATE INDEX IF NOT EXISTS idx_findings_norm
     ON findings_index (norm_comment);
+CREATE TABLE IF NOT EXISTS finding_clusterings (
+    scope         TEXT    NOT NULL,
+    threshold     REAL    NOT NULL,
+    last_id       INTEGER NOT NULL,
+    PRIMARY KEY (scope, threshold)
+);
+CREATE TABLE IF NOT EXISTS finding_clusters (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    scope         TEXT    NOT NULL,
+    threshold     REAL    NOT NULL,
+    seed          BLOB    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_clusters_scope
+    ON finding_clusters (scope, threshold);
+CREATE TABLE IF NOT EXISTS finding_cluster_members (
+    cluster_id    INTEGER NOT NULL,
+    finding_id    INTEGER NOT NULL,
+    PRIMARY KEY (cluster_id, finding_id)
+);
 """
 
+_FINGERPRINT_COLUMNS = (
+    "pr_number, repo, file_path, line, comment, norm_comment, embedding, ts"
+)
+# Findings assigned per batched seed search; seeds scored per matmul.
+_ASSIGN_BLOCK = 512
+_SEED_CHUNK = 16_384
+
 
 @dataclass(frozen=True)
 class FindingFingerprint:
@@ -87,14 +128,133 @@ def _normalise(comment: str) -> str:
     return " ".join(tokens)
 
 
+def _unit_rows(vectors: "np.ndarray") -> "np.ndarray":
+    """Rows scaled to unit length; zero rows stay zero (similarity 0)."""
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype="float32")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _blob_matrix(blobs: list[bytes]) -> "np.ndarray":
+    """Decode float32 embedding blobs into one ``(n, dim)`` matrix."""
+    import numpy as np
+
+    if not blobs:
+        return np.zeros((0, 0), dtype="float32")
+    return np.frombuffer(b"".join(blobs), dtype="float32").reshape(len(blobs), -1)
+
+
+class _SeedIndex:
+    """One clustering's normalised cluster seeds, in creation order.
+
+    :meth:`assign` places a block of fingerprints: each joins the most
+    similar seed at or above ``threshold``, else becomes a new seed —
+    exactly what assigning them one at a time would do.
+    """
+
+    def __init__(self, threshold: float, seeds: "np.ndarray", cluster_ids: list[int]) -> None:
+        import numpy as np
+
+        self.threshold = threshold
+        self.cluster_ids = list(cluster_ids)
+        self._matrix = np.ascontiguousarray(seeds, dtype="float32")
+        self._count = len(self.cluster_ids)
+        self._ann = None
+        if self._count >= FAISS_MIN_ROWS:
+            self._build_ann()
+
+    def _build_ann(self) -> None:
+        try:
+            import faiss
+        except ImportError:
+            return
+        self._ann = faiss.IndexHNSWFlat(
+            self._matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT
+        )
+        self._ann.add(self._matrix[: self._count])
+
+    def _nearest(self, queries: "np.ndarray") -> "tuple[np.ndarray, np.ndarray]":
+        """Best ``(similarity, seed position)`` per query; -inf / -1 if no seeds."""
+        import numpy as np
+
+        best = np.full(len(queries), -np.inf, dtype="float32")
+        where = np.full(len(queries), -1, dtype="int64")
+        if not self._count:
+            return best, where
+        if self._ann is not None:
+            scores, ids = self._ann.search(queries, 1)
+            found = ids[:, 0] >= 0
+            best[found], where[found] = scores[found, 0], ids[found, 0]
+            return best, where
+        for start in range(0, self._count, _SEED_CHUNK):
+            scores = queries @ self._matrix[start:min(start + _SEED_CHUNK, self._count)].T
+            top = scores.argmax(axis=1)
+            top_scores = scores[np.arange(len(queries)), top]
+            better = top_scores > best
+            best[better], where[better] = top_scores[better], top[better] + start
+        return best, where
+
+    def assign(self, vectors: "np.ndarray") -> list[int]:
+        """Seed position per row of ``vectors``; new seeds are appended."""
+        import numpy as np
+
+        queries = np.ascontiguousarray(_unit_rows(vectors))
+        best, where = self._nearest(queries)
+        # Rows matching no existing seed can still match a seed created
+        # earlier in this same block.
+        within = queries @ queries.T
+        first_new = self._count
+        new_rows: list[int] = []
+        positions: list[int] = []
+        for row in range(len(queries)):
+            if best[row] >= self.threshold:
+                positions.append(int(where[row]))
+                continue
+            if new_rows:
+                sims = within[row, new_rows]
+                pick = int(sims.argmax())
+                if sims[pick] >= self.threshold:
+                    positions.append(first_new + pick)
+                    continue
+            new_rows.append(row)
+            positions.append(first_new + len(new_rows) - 1)
+        if new_rows:
+            self._append(queries[new_rows])
+        return positions
+
+    def _append(self, seeds: "np.ndarray") -> None:
+        import numpy as np
+
+        needed = self._count + len(seeds)
+        if self._matrix.shape[0] < needed or self._matrix.shape[1] != seeds.shape[1]:
+            grown = np.zeros((max(needed, 2 * self._count), seeds.shape[1]), dtype="float32")
+            if self._count:
+                grown[: self._count] = self._matrix[: self._count]
+            self._matrix = grown
+        self._matrix[self._count:needed] = seeds
+        self._count = needed
+        if self._ann is not None:
+            self._ann.add(seeds)
+        elif self._count >= FAISS_MIN_ROWS:
+            self._build_ann()
+
+    def seed(self, position: int) -> "np.ndarray":
+        return self._matrix[position]
+
+
 class FindingClusterStore:
-    """SQLite store of finding fingerprints."""
+    """SQLite store of finding fingerprints and their persisted clusterings."""
 
     def __init__(self, path: Path) -> None:
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
         with self._connect() as conn:
             conn.executescript(_SCHEMA)
+        # (scope, threshold) -> (last clustered finding id, seeds); reused
+        # across calls while no other process has extended the clustering.
+        self._seed_indexes: dict[tuple[str, float], tuple[int, _SeedIndex]] = {}
 
     @contextlib.contextmanager
     def _connect(self):
@@ -116,6 +276,9 @@ class FindingClusterStore:
     ) -> None:
         """Append one fingerprint. No dedup — duplicates *are* the
         signal we're after.
+
+        Every clustering already persisted for this repo (or for all
+        repos) is extended to cover it.
         """
         norm = _normalise(comment)
         with self._connect() as conn:
@@ -130,6 +293,13 @@ class FindingClusterStore:
                     time.time(),
                 ),
             )
+            clusterings = conn.execute(
+                "SELECT scope, threshold FROM finding_clusterings "
+                "WHERE scope IN ('', ?)",
+                (repo,),
+            ).fetchall()
+        for scope, threshold in clusterings:
+            self._update_clustering(str(scope), float(threshold))
 
     def __len__(self) -> int:
         with self._connect() as conn:
@@ -139,41 +309,227 @@ class FindingClusterStore:
 
     def load(self, *, repo: str | None = None) -> list[FindingFingerprint]:
         """Load every fingerprint, optionally restricted to one repo."""
-        import numpy as np
+        # nosec B608 — only the module constant _FINGERPRINT_COLUMNS is
+        # spliced in; the repo filter is a bound parameter.
         if repo is not None:
             query = (
-                "SELECT pr_number, repo, file_path, line, comment, "
-                "norm_comment, embedding, ts FROM findings_index "
+                f"SELECT {_FINGERPRINT_COLUMNS} FROM findings_index "  # nosec B608
                 "WHERE repo = ? ORDER BY ts DESC"
             )
             args: tuple = (repo,)
         else:
             query = (
-                "SELECT pr_number, repo, file_path, line, comment, "
-                "norm_comment, embedding, ts FROM findings_index "
+                f"SELECT {_FINGERPRINT_COLUMNS} FROM findings_index "  # nosec B608
                 "ORDER BY ts DESC"
             )
             args = ()
         with self._connect() as conn:
             rows = conn.execute(query, args).fetchall()
-        out: list[FindingFingerprint] = []
-        for r in rows:
-            emb = np.frombuffer(r[6], dtype="float32")
-            out.append(FindingFingerprint(
-                pr_number=int(r[0]), repo=str(r[1]),
-                file_path=str(r[2]), line=int(r[3]),
-                comment=str(r[4]), norm_comment=str(r[5]),
-                embedding=emb, ts=float(r[7]),
+        return _fingerprints(rows)
+
+    def clusters(
+        self,
+        *,
+        repo: str | None = None,
+        similarity_threshold: float = 0.85,
+        min_cluster_size: int = 5,
+    ) -> list[FindingCluster]:
+        """Persisted clusters of size ``>= min_cluster_size``, largest first.
+
+        The first call for a ``(repo, similarity_threshold)`` pair
+        clusters the whole store and persists the result; later calls
+        only assign findings added since. Each finding joins the most
+        similar cluster seed (the finding that opened the cluster) at
+        or above the threshold, in insertion order — so, unlike
+        :func:`greedy_cluster` over a newest-first load, seeds are the
+        oldest members. The representative is still the newest member.
+        """
+        scope = repo or ""
+        self._update_clustering(scope, similarity_threshold)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT m.cluster_id, {_FINGERPRINT_COLUMNS} "  # nosec B608
+                "FROM finding_cluster_members m "
+                "JOIN findings_index f ON f.id = m.finding_id "
+                "WHERE m.cluster_id IN ("
+                "  SELECT c.id FROM finding_clusters c "
+                "  JOIN finding_cluster_members mm ON mm.cluster_id = c.id "
+                "  WHERE c.scope = ? AND c.threshold = ? "
+                "  GROUP BY c.id HAVING COUNT(*) >= ?"
+                ") ORDER BY f.ts DESC, f.id DESC",
+                (scope, similarity_threshold, max(1, min_cluster_size)),
+            ).fetchall()
+        groups: dict[int, list] = {}
+        for row in rows:
+            groups.setdefault(int(row[0]), []).append(row[1:])
+        out = []
+        for cluster_id, members in sorted(groups.items()):
+            fingerprints = _fingerprints(members)
+            out.append(FindingCluster(
+                members=fingerprints,
+                representative=fingerprints[0].comment,
+                size=len(fingerprints),
             ))
+        out.sort(key=lambda c: -c.size)
         return out
 
+    def drop_clusterings(
+        self, *, repo: str | None = None, keep_threshold: float | None = None
+    ) -> int:
+        """Forget the persisted clusterings of one repo scope.
 
-def _cosine(a: "np.ndarray", b: "np.ndarray") -> float:
-    import numpy as np
-    denom = (np.linalg.norm(a) * np.linalg.norm(b))
-    if denom == 0:
-        return 0.0
-    return float(np.dot(a, b) / denom)
+        Every threshold ever passed to :meth:`clusters` stays registered
+        and is extended by each :meth:`add`, so drop the ones no longer
+        wanted; ``keep_threshold`` survives. Returns how many were dropped.
+        """
+        scope = repo or ""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                thresholds = [
+                    float(t) for (t,) in conn.execute(
+                        "SELECT threshold FROM finding_clusterings WHERE scope = ?",
+                        (scope,),
+                    ).fetchall()
+                    if float(t) != keep_threshold
+                ]
+                for threshold in thresholds:
+                    conn.execute(
+                        "DELETE FROM finding_cluster_members WHERE cluster_id IN ("
+                        "  SELECT id FROM finding_clusters"
+                        "  WHERE scope = ? AND threshold = ?)",
+                        (scope, threshold),
+                    )
+                    conn.execute(
+                        "DELETE FROM finding_clusters WHERE scope = ? AND threshold = ?",
+                        (scope, threshold),
+                    )
+                    conn.execute(
+                        "DELETE FROM finding_clusterings WHERE scope = ? AND threshold = ?",
+                        (scope, threshold),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        for threshold in thresholds:
+            self._seed_indexes.pop((scope, threshold), None)
+        return len(thresholds)
+
+    def _update_clustering(self, scope: str, threshold: float) -> None:
+        """Assign every finding added since the clustering's ``last_id``."""
+        key = (scope, threshold)
+        with self._connect() as conn:
+            # Hold the write lock from reading last_id to the commit, so
+            # two processes never assign the same findings twice.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT last_id FROM finding_clusterings "
+                    "WHERE scope = ? AND threshold = ?",
+                    key,
+                ).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO finding_clusterings (scope, threshold, last_id) "
+                        "VALUES (?, ?, 0)",
+                        key,
+                    )
+                last_id = int(row[0]) if row is not None else 0
+                cached = self._seed_indexes.get(key)
+                if cached is not None and cached[0] == last_id:
+                    index = cached[1]
+                else:
+                    index = self._load_seeds(conn, scope, threshold)
+                for ids, vectors in self._new_findings(conn, scope, last_id):
+                    self._assign_block(conn, key, index, ids, vectors)
+                    last_id = ids[-1]
+                conn.execute(
+                    "UPDATE finding_clusterings SET last_id = ? "
+                    "WHERE scope = ? AND threshold = ?",
+                    (last_id, *key),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._seed_indexes.pop(key, None)
+                raise
+        self._seed_indexes[key] = (last_id, index)
+
+    @staticmethod
+    def _load_seeds(conn, scope: str, threshold: float) -> _SeedIndex:
+        rows = conn.execute(
+            "SELECT id, seed FROM finding_clusters "
+            "WHERE scope = ? AND threshold = ? ORDER BY id",
+            (scope, threshold),
+        ).fetchall()
+        return _SeedIndex(
+            threshold, _blob_matrix([r[1] for r in rows]), [int(r[0]) for r in rows]
+        )
+
+    @staticmethod
+    def _new_findings(
+        conn, scope: str, last_id: int
+    ) -> Iterator[tuple[list[int], "np.ndarray"]]:
+        """``(ids, embedding matrix)`` blocks of findings after ``last_id``."""
+        query = "SELECT id, embedding FROM findings_index WHERE id > ?"
+        args: tuple = (last_id,)
+        if scope:
+            query += " AND repo = ?"
+            args += (scope,)
+        cursor = conn.execute(query + " ORDER BY id", args)
+        while True:
+            rows = cursor.fetchmany(_ASSIGN_BLOCK)
+            if not rows:
+                return
+            yield [int(r[0]) for r in rows], _blob_matrix([r[1] for r in rows])
+
+    @staticmethod
+    def _assign_block(
+        conn,
+        key: tuple[str, float],
+        index: _SeedIndex,
+        ids: list[int],
+        vectors: "np.ndarray",
+    ) -> None:
+        seeded = len(index.cluster_ids)
+        positions = index.assign(vectors)
+        for position in range(seeded, max(positions, default=-1) + 1):
+            cursor = conn.execute(
+                "INSERT INTO finding_clusters (scope, threshold, seed) "
+                "VALUES (?, ?, ?)",
+                (*key, index.seed(position).tobytes()),
+            )
+            index.cluster_ids.append(int(cursor.lastrowid))
+        conn.executemany(
+            "INSERT INTO finding_cluster_members (cluster_id, finding_id) "
+            "VALUES (?, ?)",
+            [(index.cluster_ids[p], finding_id) for p, finding_id in zip(positions, ids)],
+        )
+
+
+def _fingerprints(rows: list) -> list[FindingFingerprint]:
+    """Build fingerprints from ``_FINGERPRINT_COLUMNS`` rows.
+
+    The embeddings are row views of one decoded matrix rather than one
+    ``frombuffer`` per row.
+    """
+    if not rows:
+        return []
+    blobs = [r[6] for r in rows]
+    if len({len(b) for b in blobs}) == 1:
+        embeddings = list(_blob_matrix(blobs))
+    else:
+        embeddings = [_blob_matrix([b])[0] for b in blobs]
+    return [
+        FindingFingerprint(
+            pr_number=int(r[0]), repo=str(r[1]),
+            file_path=str(r[2]), line=int(r[3]),
+            comment=str(r[4]), norm_comment=str(r[5]),
+            embedding=emb, ts=float(r[7]),
+        )
+        for r, emb in zip(rows, embeddings)
+    ]
 
 
 def greedy_cluster(
@@ -184,22 +540,26 @@ def greedy_cluster(
 ) -> list[FindingCluster]:
     """Greedy single-link clustering by cosine similarity.
 
-    O(N²) in the number of fingerprints. Fine for the expected single
-    -repo scale (10³–10⁵ findings); upgrade to FAISS / sqlite-vec if
-    your repo accumulates beyond that.
+    Each fingerprint joins the first group whose seed (first member) is
+    at least ``similarity_threshold`` similar, else opens a group. The
+    embeddings are normalised once and each fingerprint is scored
+    against all seeds in one matrix-vector product — still O(N x
+    groups); :meth:`FindingClusterStore.clusters` avoids re-clustering
+    the whole store.
     """
     if not fingerprints:
         return []
+    import numpy as np
+
+    vectors = _unit_rows(np.stack([fp.embedding for fp in fingerprints]))
+    seeds = np.empty_like(vectors)
     centroids: list[list[FindingFingerprint]] = []
-    for fp in fingerprints:
-        placed = False
-        for group in centroids:
-            sim = _cosine(group[0].embedding, fp.embedding)
-            if sim >= similarity_threshold:
-                group.append(fp)
-                placed = True
-                break
-        if not placed:
+    for fp, vector in zip(fingerprints, vectors):
+        matches = np.flatnonzero(seeds[: len(centroids)] @ vector >= similarity_threshold)
+        if len(matches):
+            centroids[int(matches[0])].append(fp)
+        else:
+            seeds[len(centroids)] = vector
             centroids.append([fp])
 
     out: list[FindingCluster] = []
@@ -216,7 +576,11 @@ def greedy_cluster(
 
 
 def format_clusters_block(clusters: Iterable[FindingCluster]) -> str:
-    """Render top-K cluster summaries as PR-comment markdown."""
+    """Render top-K cluster summaries as PR-comment markdown.
+
+    Takes either :func:`greedy_cluster` output or the precomputed
+    :meth:`FindingClusterStore.clusters`.
+    """
     items = list(clusters)
     if not items:
         return ""
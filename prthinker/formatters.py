@@ -184,7 +184,9 @@ def _format_must_fix_block(
     ]
     if not errors:
         return []
-    content_map = new_side_content(result.code_diff)
+    content_map = new_side_content(
+        result.code_diff, paths={f.path for f in errors[:_MUST_FIX_LIMIT]}
+    )
     lines = ["### 🚨 Must fix", ""]
     for finding in errors[:_MUST_FIX_LIMIT]:
         ref = _loc_ref(finding.path, finding.line, files_url)
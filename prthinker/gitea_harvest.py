@@ -19,8 +19,7 @@ GitHub-shaped with two deviations this module absorbs:
 from __future__ import annotations
 
 import logging
-from itertools import islice
-from typing import Iterable, Iterator
+from typing import Iterator
 
 import httpx
 
@@ -37,6 +36,16 @@ from prthinker.harvest import (
     _extract_suggestion_block,
     _reply_dismissal_reason,
 )
+from prthinker.harvest_engine import (
+    DEFAULT_MAX_WORKERS,
+    ClosedPr,
+    HarvestCheckpoint,
+    PrHarvest,
+    apply_harvest,
+    fan_out,
+    harvest_prs,
+    harvest_recent,
+)
 
 log = logging.getLogger(__name__)
 
@@ -54,8 +63,14 @@ def harvest(
     pr_number: int | None = None,
     max_prs: int = 50,
     base_url: str = DEFAULT_BASE_URL,
+    checkpoint: HarvestCheckpoint | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> HarvestStats:
-    """Harvest dismissed comments. If ``pr_number`` is set, harvest just that PR."""
+    """Harvest dismissed comments. If ``pr_number`` is set, harvest just that PR.
+
+    Otherwise recent closed PRs are harvested concurrently, from the
+    ``checkpoint`` mark when given (see :mod:`prthinker.harvest_engine`).
+    """
     _validate_repo(repo)
     stats = HarvestStats()
     with _client(token, base_url) as client:
@@ -63,13 +78,13 @@ def harvest(
             stats.prs_scanned = 1
             _harvest_one_pr(client, repo, pr_number, store, stats)
         else:
-            for number in _iter_recent_closed_prs(client, repo, max_prs):
-                stats.prs_scanned += 1
-                try:
-                    _harvest_one_pr(client, repo, number, store, stats)
-                except httpx.HTTPStatusError as exc:
-                    log.warning("PR #%d failed: %s", number, exc)
-                    continue
+            harvest_recent(
+                _iter_recent_closed_prs(client, repo),
+                lambda number: _collect_dismissed(client, repo, number),
+                store=store, stats=stats, found="dismissed_found",
+                label="PR #%d", scope=_scope(base_url, repo), max_prs=max_prs,
+                checkpoint=checkpoint, max_workers=max_workers,
+            )
 
     log.info(
         "Gitea harvest done: scanned %d PR(s), %d comment(s), kept %d dismissed",
@@ -86,6 +101,8 @@ def harvest_accepted(
     pr_number: int | None = None,
     max_prs: int = 50,
     base_url: str = DEFAULT_BASE_URL,
+    checkpoint: HarvestCheckpoint | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> HarvestStats:
     """Harvest accepted suggestion examples from Gitea PRs.
 
@@ -97,19 +114,20 @@ def harvest_accepted(
     _validate_repo(repo)
     stats = HarvestStats()
     with _client(token, base_url) as client:
-        numbers: Iterable[int]
         if pr_number is not None:
-            numbers = [pr_number]
+            harvest_prs(
+                [ClosedPr(pr_number)],
+                lambda number: _collect_accepted(client, repo, number),
+                store=store, stats=stats, found="accepted_found", label="PR #%d",
+            )
         else:
-            numbers = list(_iter_recent_closed_prs(client, repo, max_prs))
-
-        for number in numbers:
-            stats.prs_scanned += 1
-            try:
-                _harvest_accepted_one_pr(client, repo, number, store, stats)
-            except httpx.HTTPStatusError as exc:
-                log.warning("PR #%d failed: %s", number, exc)
-                continue
+            harvest_recent(
+                _iter_recent_closed_prs(client, repo),
+                lambda number: _collect_accepted(client, repo, number),
+                store=store, stats=stats, found="accepted_found",
+                label="PR #%d", scope=_scope(base_url, repo), max_prs=max_prs,
+                checkpoint=checkpoint, max_workers=max_workers,
+            )
 
     log.info(
         "Gitea accepted harvest done: scanned %d PR(s), %d comment(s), "
@@ -119,6 +137,11 @@ def harvest_accepted(
     return stats
 
 
+def _scope(base_url: str, repo: str) -> str:
+    """Checkpoint scope of a Gitea repo."""
+    return f"gitea:{base_url.rstrip('/')}:{repo}"
+
+
 def _validate_repo(repo: str) -> None:
     if "/" not in repo:
         raise ValueError(f"repo must be 'owner/name', got {repo!r}")
@@ -136,10 +159,8 @@ def _client(token: str, base_url: str) -> httpx.Client:
     )
 
 
-def _iter_recent_closed_prs(
-    client: httpx.Client, repo: str, max_prs: int
-) -> Iterator[int]:
-    """Yield the numbers of the ``max_prs`` most recently updated closed PRs."""
+def _iter_recent_closed_prs(client: httpx.Client, repo: str) -> Iterator[ClosedPr]:
+    """Yield closed PRs, most recently updated first."""
     pages = paginate(
         client,
         f"/repos/{repo}/pulls",
@@ -147,8 +168,8 @@ def _iter_recent_closed_prs(
         per_page=_PER_PAGE,
         size_param="limit",
     )
-    for pr in islice(pages, max_prs):
-        yield int(pr["number"])
+    for pr in pages:
+        yield ClosedPr(int(pr["number"]), str(pr.get("updated_at") or ""))
 
 
 def _fetch_review_comments(
@@ -157,20 +178,23 @@ def _fetch_review_comments(
     """Every inline comment across the PR's reviews.
 
     Gitea has no flat per-PR review-comments list; each review's
-    comments are fetched separately and concatenated.
+    comments are fetched separately (concurrently) and concatenated in
+    review order.
     """
-    comments: list[dict] = []
-    for review in paginate(
+    reviews = list(paginate(
         client, f"/repos/{repo}/pulls/{pr_number}/reviews",
         per_page=_PER_PAGE, size_param="limit",
-    ):
+    ))
+
+    def review_comments(review: dict) -> list[dict]:
         response = client.get(
             f"/repos/{repo}/pulls/{pr_number}"
             f"/reviews/{int(review['id'])}/comments",
         )
         response.raise_for_status()
-        comments.extend(response.json() or [])
-    return comments
+        return response.json() or []
+
+    return [c for batch in fan_out(review_comments, reviews) for c in batch]
 
 
 def _threads_by_position(comments: list[dict]) -> list[list[dict]]:
@@ -201,38 +225,40 @@ def _harvest_one_pr(
     store: DismissedExamplesStore,
     stats: HarvestStats,
 ) -> None:
-    comments = _fetch_review_comments(client, repo, pr_number)
-    for thread in _threads_by_position(comments):
-        stats.comments_scanned += 1
-        _harvest_dismissed_comment(
-            client, repo, thread[0], thread[1:], store, stats,
-        )
+    apply_harvest(
+        _collect_dismissed(client, repo, pr_number),
+        store=store, stats=stats, found="dismissed_found",
+    )
 
 
-def _harvest_dismissed_comment(
-    client: httpx.Client,
-    repo: str,
-    comment: dict,
-    replies: list[dict],
-    store: DismissedExamplesStore,
-    stats: HarvestStats,
-) -> None:
-    """Append the comment as a dismissed example when it is dismissed and non-empty."""
-    reason = _dismissal_reason(client, repo, comment, replies)
+def _collect_dismissed(client: httpx.Client, repo: str, pr_number: int) -> PrHarvest:
+    """The PR's dismissed threads, with reaction lookups issued concurrently."""
+    threads = _threads_by_position(_fetch_review_comments(client, repo, pr_number))
+    reasons = fan_out(
+        lambda thread: _dismissal_reason(client, repo, thread[0], thread[1:]),
+        threads,
+    )
+    rows = [
+        example
+        for thread, reason in zip(threads, reasons)
+        if (example := _dismissed_example(thread[0], reason)) is not None
+    ]
+    return PrHarvest(rows, len(threads))
+
+
+def _dismissed_example(comment: dict, reason: str | None) -> DismissedExample | None:
+    """The comment as a dismissed example when it is dismissed and non-empty."""
     if reason is None:
-        return
+        return None
     body = (comment.get("body") or "").strip()
     if not body:
-        return
-    store.append(
-        DismissedExample(
-            path=str(comment.get("path") or ""),
-            comment=body,
-            reason=reason,
-            diff_snippet=(comment.get("diff_hunk") or "").strip(),
-        )
+        return None
+    return DismissedExample(
+        path=str(comment.get("path") or ""),
+        comment=body,
+        reason=reason,
+        diff_snippet=(comment.get("diff_hunk") or "").strip(),
     )
-    stats.dismissed_found += 1
 
 
 def _dismissal_reason(
@@ -275,16 +301,25 @@ def _harvest_accepted_one_pr(
     store: AcceptedExamplesStore,
     stats: HarvestStats,
 ) -> None:
+    apply_harvest(
+        _collect_accepted(client, repo, pr_number),
+        store=store, stats=stats, found="accepted_found",
+    )
+
+
+def _collect_accepted(client: httpx.Client, repo: str, pr_number: int) -> PrHarvest:
+    """The PR's suggestion comments, if one of its commits applied suggestions."""
     if not _pr_has_apply_commit(client, repo, pr_number):
-        return
+        return PrHarvest()
 
-    for comment in _fetch_review_comments(client, repo, pr_number):
-        stats.comments_scanned += 1
+    comments = _fetch_review_comments(client, repo, pr_number)
+    rows = []
+    for comment in comments:
         body = comment.get("body") or ""
         suggestion = _extract_suggestion_block(body)
         if not suggestion:
             continue
-        store.append(
+        rows.append(
             AcceptedExample(
                 path=str(comment.get("path") or ""),
                 comment=_accepted_comment_text(body),
@@ -292,7 +327,7 @@ def _harvest_accepted_one_pr(
                 pr_number=pr_number,
             )
         )
-        stats.accepted_found += 1
+    return PrHarvest(rows, len(comments))
 
 
 def _pr_has_apply_commit(
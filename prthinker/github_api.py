@@ -11,13 +11,24 @@ We use only the GitHub REST API via httpx to avoid pulling in PyGithub.
 from __future__ import annotations
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, Mapping
 
 import httpx
 
 from prthinker.config import GitHubConfig
 from prthinker.conventional import format_inline_body
+from prthinker.diff import iter_file_diffs
+from prthinker.github_http import (
+    MAX_CONCURRENT_REQUESTS,
+    GitHubTransport,
+    cache_dir,
+    cache_for,
+    limiter_for,
+)
 from prthinker.schemas import InlineFinding
 
 log = logging.getLogger(__name__)
@@ -35,9 +46,20 @@ class _Comment:
 
 
 def _client(token: str, base_url: str = _API_ROOT) -> httpx.Client:
-    """Authenticated GitHub-API client shared by every GitHub-shaped caller."""
+    """Authenticated GitHub-API client shared by every GitHub-shaped caller.
+
+    Requests go through :class:`~prthinker.github_http.GitHubTransport`:
+    pooled connections, the on-disk ETag cache (when enabled) and the
+    token's shared rate-limit schedule.
+    """
+    directory = cache_dir()
+    transport = GitHubTransport(
+        cache=cache_for(directory) if directory is not None else None,
+        limiter=limiter_for(token, base_url),
+    )
     return httpx.Client(
         base_url=base_url.rstrip("/"),
+        transport=transport,
         headers={
             "Authorization": f"Bearer {token}",
             "Accept": "application/vnd.github+json",
@@ -58,6 +80,33 @@ def client_for(config: GitHubConfig) -> httpx.Client:
     return _client(config.token, config.base_url or _API_ROOT)
 
 
+@contextmanager
+def _client_scope(
+    config: GitHubConfig, client: httpx.Client | None
+) -> Iterator[httpx.Client]:
+    """Use the caller's pooled ``client``, or open (and close) a fresh one."""
+    if client is not None:
+        yield client
+        return
+    with client_for(config) as fresh:
+        yield fresh
+
+
+_LAST_PAGE_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="last"')
+
+
+def _last_page(response: httpx.Response) -> int | None:
+    """Page count advertised by the ``Link: <...>; rel="last"`` header."""
+    headers = getattr(response, "headers", None) or {}
+    match = _LAST_PAGE_LINK.search(headers.get("link", ""))
+    if match is None:
+        return None
+    try:
+        return int(httpx.URL(match.group(1)).params.get("page", ""))
+    except ValueError:
+        return None
+
+
 def paginate(
     client: httpx.Client,
     path: str,
@@ -71,15 +120,41 @@ def paginate(
     Requests ``page=1..n`` with ``per_page`` items each and stops on the
     first empty or short page. Gitea uses the same page scheme with the
     page-size parameter named ``limit``; ``size_param`` covers that.
+
+    When the first response carries a ``Link`` header naming the last
+    page, pages ``2..last`` are fetched concurrently, a window of
+    ``MAX_CONCURRENT_REQUESTS`` pages at a time, and yielded in order; a
+    caller that stops early (``islice``) leaves the later windows
+    unfetched. Without the header, pages are walked one at a time.
     """
-    page = 1
-    while True:
+
+    def fetch(page: int) -> httpx.Response:
         response = client.get(
             path,
             params={**(params or {}), size_param: per_page, "page": page},
         )
         response.raise_for_status()
-        batch = response.json()
+        return response
+
+    first = fetch(1)
+    batch = first.json()
+    if not batch:
+        return
+    yield from batch
+    if len(batch) < per_page:
+        return
+    last = _last_page(first)
+    if last is not None and last > 1:
+        workers = min(MAX_CONCURRENT_REQUESTS, last - 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for start in range(2, last + 1, workers):
+                window = range(start, min(start + workers, last + 1))
+                for response in pool.map(fetch, window):
+                    yield from response.json()
+        return
+    page = 2
+    while True:
+        batch = fetch(page).json()
         if not batch:
             return
         yield from batch
@@ -141,32 +216,59 @@ def _reconstruct_diff_from_files(
     return "".join(_file_patch_to_diff(f) for f in files)
 
 
-def fetch_pr_diff(config: GitHubConfig) -> str:
+def _get_pr_diff(client: httpx.Client, config: GitHubConfig) -> httpx.Response | None:
+    """GET the PR as a diff; ``None`` when GitHub rejects it as too large."""
+    response = client.get(
+        f"/repos/{config.repo}/pulls/{config.pr_number}",
+        headers={"Accept": "application/vnd.github.v3.diff"},
+    )
+    if response.status_code == _DIFF_TOO_LARGE:
+        log.warning(
+            "Diff media type rejected (406, too large) for %s#%d; "
+            "reconstructing from the files API",
+            config.repo, config.pr_number,
+        )
+        return None
+    response.raise_for_status()
+    return response
+
+
+def fetch_pr_diff(
+    config: GitHubConfig, *, client: httpx.Client | None = None
+) -> str:
     """Return the unified diff for the PR. Empty PRs return ''.
 
     A large PR makes GitHub reject the diff media type with 406; we then
     rebuild the diff from the paginated files API rather than failing the
     whole review.
     """
-    with client_for(config) as client:
-        response = client.get(
-            f"/repos/{config.repo}/pulls/{config.pr_number}",
-            headers={"Accept": "application/vnd.github.v3.diff"},
-        )
-        if response.status_code == _DIFF_TOO_LARGE:
-            log.warning(
-                "Diff media type rejected (406, too large) for %s#%d; "
-                "reconstructing from the files API",
-                config.repo, config.pr_number,
-            )
+    with _client_scope(config, client) as client:
+        response = _get_pr_diff(client, config)
+        if response is None:
             return _reconstruct_diff_from_files(client, config)
-        response.raise_for_status()
         return response.text
 
 
-def fetch_pr_head_sha(config: GitHubConfig) -> str:
+def fetch_pr_diff_bytes(
+    config: GitHubConfig, *, client: httpx.Client | None = None
+) -> bytes:
+    """:func:`fetch_pr_diff` as the response body, for :func:`iter_file_diffs`.
+
+    Callers that only parse the diff (the inline pre-filter) skip
+    decoding the whole body into a string first.
+    """
+    with _client_scope(config, client) as client:
+        response = _get_pr_diff(client, config)
+        if response is None:
+            return _reconstruct_diff_from_files(client, config).encode()
+        return response.content
+
+
+def fetch_pr_head_sha(
+    config: GitHubConfig, *, client: httpx.Client | None = None
+) -> str:
     """Return the HEAD commit SHA of the PR — required by the Checks API."""
-    with client_for(config) as client:
+    with _client_scope(config, client) as client:
         response = client.get(
             f"/repos/{config.repo}/pulls/{config.pr_number}",
         )
@@ -174,9 +276,11 @@ def fetch_pr_head_sha(config: GitHubConfig) -> str:
         return str(response.json()["head"]["sha"])
 
 
-def fetch_pr_base_branch(config: GitHubConfig) -> str:
+def fetch_pr_base_branch(
+    config: GitHubConfig, *, client: httpx.Client | None = None
+) -> str:
     """Return the PR's base branch name — used as the target for auto-fix PRs."""
-    with client_for(config) as client:
+    with _client_scope(config, client) as client:
         response = client.get(
             f"/repos/{config.repo}/pulls/{config.pr_number}",
         )
@@ -281,9 +385,11 @@ def upsert_pr_body_section(config: GitHubConfig, section: str) -> None:
         log.info("Updated PR body summary section")
 
 
-def fetch_pr_file_paths(config: GitHubConfig) -> list[str]:
+def fetch_pr_file_paths(
+    config: GitHubConfig, *, client: httpx.Client | None = None
+) -> list[str]:
     """Return every changed file path on the PR (all statuses, paginated)."""
-    with client_for(config) as client:
+    with _client_scope(config, client) as client:
         return [
             str(f["filename"])
             for f in paginate(
@@ -292,9 +398,11 @@ def fetch_pr_file_paths(config: GitHubConfig) -> list[str]:
         ]
 
 
-def fetch_pr_commit_messages(config: GitHubConfig) -> list[str]:
+def fetch_pr_commit_messages(
+    config: GitHubConfig, *, client: httpx.Client | None = None
+) -> list[str]:
     """Return every commit message on the PR, oldest first (paginated)."""
-    with client_for(config) as client:
+    with _client_scope(config, client) as client:
         return [
             (c.get("commit") or {}).get("message", "")
             for c in paginate(
@@ -508,41 +616,11 @@ def _dismiss_stale_inline_reviews(
         )
 
 
-def _parse_new_side_file_header(raw: str) -> tuple[bool, str | None]:
-    """Parse a unified diff ``+++ ...`` header.
-
-    Returns ``(is_file_header, current_path)``. ``current_path`` is
-    ``None`` when the file header points at ``/dev/null`` (deletion).
-    """
-    if not raw.startswith("+++ "):
-        return False, None
-    path = raw[4:].split("\t", 1)[0].strip()
-    if path == _DEV_NULL:
-        return True, None
-    return True, (path[2:] if path.startswith("b/") else path)
-
-
-def _parse_new_side_hunk_header(raw: str) -> tuple[bool, int]:
-    """Parse a unified diff ``@@ -... +new_start[,new_count] @@`` header.
+# A diff as text or bytes, or the new-side line map already parsed from it.
+_DiffSource = str | bytes | Mapping[str, set[int]]
 
-    Returns ``(is_hunk_header, new_start)``. ``new_start`` is ``0`` when
-    the line begins with ``@@`` but cannot be parsed (degenerate hunk);
-    the caller treats that as "stop tracking until the next valid
-    header".
-    """
-    if not raw.startswith("@@"):
-        return False, 0
-    try:
-        hunk_meta = raw.split("@@", 2)[1].strip()
-        new_part = next(
-            p for p in hunk_meta.split() if p.startswith("+")
-        )
-        return True, int(new_part[1:].split(",", 1)[0])
-    except (StopIteration, ValueError, IndexError):
-        return True, 0
 
-
-def _new_side_lines(diff_text: str) -> dict[str, set[int]]:
+def _new_side_lines(diff_text: str | bytes) -> dict[str, set[int]]:
     """Map every file in a unified diff to the new-side line numbers
     that appear inside a hunk.
 
@@ -555,36 +633,29 @@ def _new_side_lines(diff_text: str) -> dict[str, set[int]]:
     Returns ``{filename: {new_line_no, ...}}``. ``filename`` is taken
     from the ``+++ b/<path>`` header (stripped of the ``b/`` prefix).
     Files that the diff records as deleted (``+++ /dev/null``) are
-    excluded.
+    excluded. The line sets are the ones :func:`iter_file_diffs`
+    records in its single pass over the diff.
     """
-    result: dict[str, set[int]] = {}
-    current_path: str | None = None
-    new_line = 0
-    in_hunk = False
-
-    for raw in diff_text.splitlines():
-        is_file, path = _parse_new_side_file_header(raw)
-        if is_file:
-            current_path = path
-            in_hunk = False
-            continue
-        is_hunk, new_start = _parse_new_side_hunk_header(raw)
-        if is_hunk:
-            new_line = new_start - 1
-            in_hunk = new_start > 0
-            continue
-        if not in_hunk or current_path is None:
-            continue
-        # "+" and " " advance the new-side counter; "-" is an old-side
-        # deletion and is intentionally ignored.
-        if raw[:1] in ("+", " "):
-            new_line += 1
-            result.setdefault(current_path, set()).add(new_line)
-    return result
+    return {
+        fd.path: set(fd.new_lines)
+        for fd in iter_file_diffs(diff_text)
+        if fd.new_lines and not fd.is_deleted
+    }
+
+
+def _valid_lines(diff: _DiffSource) -> Mapping[str, set[int]]:
+    """The new-side line map: parsed from a diff, or passed through as is.
+
+    The helpers below take either, so a caller checking the same diff
+    more than once parses it once with :func:`new_side_lines`.
+    """
+    if isinstance(diff, Mapping):
+        return diff
+    return _new_side_lines(diff)
 
 
 def _finding_diff_miss(
-    finding: InlineFinding, valid: dict[str, set[int]]
+    finding: InlineFinding, valid: Mapping[str, set[int]]
 ) -> str | None:
     """Return why a finding is off-diff, or ``None`` if it lands on a hunk.
 
@@ -608,10 +679,10 @@ def _finding_diff_miss(
 
 
 def _filter_findings_to_diff(
-    findings: list[InlineFinding], diff_text: str
+    findings: list[InlineFinding], diff_text: _DiffSource
 ) -> list[InlineFinding]:
     """Drop findings whose ``(path, line)`` is outside any diff hunk."""
-    valid = _new_side_lines(diff_text)
+    valid = _valid_lines(diff_text)
     kept: list[InlineFinding] = []
     dropped = 0
     for f in findings:
@@ -630,7 +701,7 @@ def _filter_findings_to_diff(
 
 
 def filter_findings_to_diff(
-    findings: list[InlineFinding], diff_text: str
+    findings: list[InlineFinding], diff_text: _DiffSource
 ) -> list[InlineFinding]:
     """Platform-neutral public alias of :func:`_filter_findings_to_diff`.
 
@@ -641,7 +712,7 @@ def filter_findings_to_diff(
     return _filter_findings_to_diff(findings, diff_text)
 
 
-def new_side_lines(diff_text: str) -> dict[str, set[int]]:
+def new_side_lines(diff_text: str | bytes) -> dict[str, set[int]]:
     """Platform-neutral public alias of :func:`_new_side_lines`.
 
     Lets adapters distinguish "the diff has no addressable hunks"
@@ -652,7 +723,7 @@ def new_side_lines(diff_text: str) -> dict[str, set[int]]:
 
 
 def count_findings_on_diff(
-    findings: Iterable[InlineFinding], diff_text: str
+    findings: Iterable[InlineFinding], diff_text: _DiffSource
 ) -> int:
     """Count findings whose line(s) fall on a diff hunk (i.e. are postable).
 
@@ -662,12 +733,12 @@ def count_findings_on_diff(
     drop, so the summary comment can report an accurate count before the
     review is submitted.
     """
-    valid = _new_side_lines(diff_text)
+    valid = _valid_lines(diff_text)
     return sum(1 for f in findings if _finding_diff_miss(f, valid) is None)
 
 
 def findings_off_diff(
-    findings: Iterable[InlineFinding], diff_text: str
+    findings: Iterable[InlineFinding], diff_text: _DiffSource
 ) -> list[InlineFinding]:
     """Return findings whose line(s) fall outside any diff hunk.
 
@@ -675,7 +746,7 @@ def findings_off_diff(
     postable findings it returns the *un*-postable ones, so the summary can
     list which findings were dropped rather than only how many.
     """
-    valid = _new_side_lines(diff_text)
+    valid = _valid_lines(diff_text)
     return [f for f in findings if _finding_diff_miss(f, valid) is not None]
 
 
@@ -693,9 +764,8 @@ def _prefilter_inline_findings(
     caller already handles a 422 by logging and continuing.
     """
     try:
-        if diff_text is None:
-            diff_text = fetch_pr_diff(config)
-        return _filter_findings_to_diff(items, diff_text)
+        diff = fetch_pr_diff_bytes(config) if diff_text is None else diff_text
+        return _filter_findings_to_diff(items, diff)
     except Exception as exc:  # noqa: BLE001 — pre-filter is best-effort
         log.warning(
             "Could not pre-filter findings against diff (%s); submitting all",
@@ -809,6 +879,7 @@ def _format_inline_body(finding: InlineFinding) -> str:
 __all__ = [
     "client_for",
     "fetch_pr_diff",
+    "fetch_pr_diff_bytes",
     "fetch_pr_head_sha",
     "fetch_pr_base_branch",
     "fetch_pr_commit_messages",
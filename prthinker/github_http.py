@@ -0,0 +1,370 @@
+"""HTTP transport under every GitHub-shaped ``httpx.Client``.
+
+:func:`prthinker.github_api._client` mounts :class:`GitHubTransport`, so
+every caller — the adapter, the harvesters, auto-fix — gets the same
+behaviour without changing its request code:
+
+- **Conditional requests.** Successful GETs that carry an ``ETag`` (or
+  ``Last-Modified``) are kept in an on-disk :class:`ETagCache`; the next
+  identical GET sends ``If-None-Match`` and a ``304`` is answered from
+  the cache. GitHub does not count 304s against the primary rate limit,
+  and re-reviews of a busy PR re-read mostly unchanged pages.
+- **Rate-limit scheduling.** :class:`RateLimiter` tracks the
+  ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` headers per token
+  and API root; once the budget is spent, requests wait for the reset
+  instead of failing. Secondary-limit responses (403 / 429 with
+  ``Retry-After``, or an exhausted budget) are retried after the
+  advertised delay.
+- **Bounded concurrency.** At most ``MAX_CONCURRENT_REQUESTS`` requests
+  per client are in flight, so parallel page fetches never turn into
+  the burst GitHub's secondary limits punish.
+
+The cache is opt-in: set ``PRTHINKER_GITHUB_CACHE_DIR`` to a directory
+to enable it. Entries are keyed by method, URL, ``Accept`` and a hash of
+the credentials, so two tokens never share a cached private response —
+which also means a token minted per run (Actions' ``GITHUB_TOKEN``)
+never hits an earlier run's entries. The directory is kept within a
+byte and an age budget: stale entries are dropped, then the oldest,
+whenever the budget is exceeded. Runner-safe: httpx only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+MAX_CONCURRENT_REQUESTS = 4
+
+# ETag cache budget: entries older than the age limit are dropped, and
+# the oldest go first once the directory outgrows the byte limit.
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600.0
+
+# Longest a request waits for a rate-limit reset / Retry-After before the
+# error response is handed back to the caller instead.
+_MAX_RATE_WAIT_SECONDS = 300.0
+_MAX_RATE_RETRIES = 3
+_RATE_LIMITED = (403, 429)
+_NOT_MODIFIED = 304
+
+# Response headers replayed from the cache on a 304. Content-Encoding /
+# Content-Length are dropped: the cached body is already decoded.
+_REPLAYED_HEADERS = ("content-type", "etag", "last-modified", "link", "x-total-count")
+_META_LENGTH = struct.Struct(">I")
+
+
+def cache_dir() -> Path | None:
+    """ETag cache directory from ``PRTHINKER_GITHUB_CACHE_DIR``; None when unset."""
+    raw = os.environ.get("PRTHINKER_GITHUB_CACHE_DIR", "").strip()
+    return Path(raw).expanduser() if raw else None
+
+
+@dataclass(frozen=True)
+class _CachedResponse:
+    headers: dict[str, str]
+    body: bytes
+
+    @property
+    def validators(self) -> dict[str, str]:
+        out = {}
+        if "etag" in self.headers:
+            out["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            out["If-Modified-Since"] = self.headers["last-modified"]
+        return out
+
+
+class ETagCache:
+    """On-disk GET responses keyed by request identity, one file each.
+
+    A file is a length-prefixed JSON header block followed by the body,
+    written to a temp file and renamed into place, so concurrent runners
+    sharing the directory never read a half-written entry.
+
+    An entry older than ``max_age`` seconds is a miss; a 304 refreshes
+    its age. :meth:`prune` runs on construction and again whenever this
+    process's writes may have pushed the directory past ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        max_age: float = DEFAULT_CACHE_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._size = 0
+        self.prune()
+
+    def _path(self, request: httpx.Request) -> Path:
+        h = hashlib.sha256()
+        for part in (
+            request.method,
+            str(request.url),
+            request.headers.get("accept", ""),
+            request.headers.get("authorization", ""),
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return self._dir / f"{h.hexdigest()}.resp"
+
+    def lookup(self, request: httpx.Request) -> _CachedResponse | None:
+        path = self._path(request)
+        try:
+            if self._clock() - path.stat().st_mtime > self._max_age:
+                _unlink(path)
+                return None
+            data = path.read_bytes()
+            (length,) = _META_LENGTH.unpack_from(data)
+            headers = json.loads(data[_META_LENGTH.size:_META_LENGTH.size + length])
+        except (OSError, ValueError, struct.error):
+            return None
+        return _CachedResponse(headers, data[_META_LENGTH.size + length:])
+
+    def refresh(self, request: httpx.Request) -> None:
+        """Restart an entry's age after the server confirmed it (304)."""
+        try:
+            os.utime(self._path(request))
+        except OSError:
+            pass
+
+    def store(self, request: httpx.Request, response: httpx.Response) -> None:
+        headers = {
+            name: response.headers[name]
+            for name in _REPLAYED_HEADERS
+            if name in response.headers
+        }
+        meta = json.dumps(headers).encode("utf-8")
+        path = self._path(request)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        data = _META_LENGTH.pack(len(meta)) + meta + response.content
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as exc:
+            log.debug("GitHub response not cached at %s: %s", path, exc)
+            return
+        with self._lock:
+            # Over-counts a replaced entry; prune re-measures the directory.
+            self._size += len(data)
+            over = self._size > self._max_bytes
+        if over:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop entries past ``max_age``, then the oldest until within ``max_bytes``."""
+        now = self._clock()
+        entries = []
+        try:
+            listing = list(os.scandir(self._dir))
+        except OSError:
+            listing = []
+        for entry in listing:
+            if not entry.name.endswith((".resp", ".tmp")):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self._max_age:
+                _unlink(Path(entry.path))
+            elif entry.name.endswith(".resp"):
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        total = sum(size for _mtime, size, _path in entries)
+        for _mtime, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            _unlink(path)
+            total -= size
+        with self._lock:
+            self._size = total
+
+
+def _unlink(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass  # another runner sharing the directory got there first
+
+
+_CACHES: dict[Path, ETagCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def cache_for(directory: Path) -> ETagCache:
+    """The process-wide cache of one directory, pruned once when first used."""
+    key = Path(directory).expanduser().resolve()
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = ETagCache(key)
+        return cache
+
+
+def _header_float(response: httpx.Response, name: str) -> float | None:
+    try:
+        return float(response.headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Primary / secondary rate-limit state for one token + API root."""
+
+    def __init__(
+        self,
+        *,
+        clock: Callable[[], float] = time.time,
+        max_wait: float = _MAX_RATE_WAIT_SECONDS,
+    ) -> None:
+        self._clock = clock
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        self._remaining: float | None = None
+        self._reset_at = 0.0
+        self._blocked_until = 0.0
+
+    def delay(self) -> float:
+        """Seconds to hold the next request (0 when the budget allows it)."""
+        now = self._clock()
+        with self._lock:
+            until = self._blocked_until
+            if self._remaining is not None and self._remaining <= 0:
+                until = max(until, self._reset_at)
+        return min(max(0.0, until - now), self._max_wait)
+
+    def observe(self, response: httpx.Response) -> float | None:
+        """Record the response's limits; the retry delay if it was throttled."""
+        now = self._clock()
+        remaining = _header_float(response, "x-ratelimit-remaining")
+        reset = _header_float(response, "x-ratelimit-reset")
+        retry_after = _header_float(response, "retry-after")
+        with self._lock:
+            if remaining is not None:
+                self._remaining = remaining
+            if reset is not None:
+                self._reset_at = reset
+            if response.status_code not in _RATE_LIMITED:
+                return None
+            if retry_after is not None:
+                wait = retry_after
+            elif remaining is not None and remaining <= 0 and reset is not None:
+                wait = reset - now
+            else:
+                return None  # a plain 403 (permissions), not a rate limit
+            wait = max(wait, 1.0)
+            self._blocked_until = max(self._blocked_until, now + wait)
+        return wait if wait <= self._max_wait else None
+
+
+_LIMITERS: dict[tuple[str, str], RateLimiter] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def limiter_for(token: str, base_url: str) -> RateLimiter:
+    """The process-wide limiter shared by every client of one token."""
+    key = (hashlib.sha256(token.encode("utf-8")).hexdigest(), base_url.rstrip("/"))
+    with _LIMITERS_LOCK:
+        return _LIMITERS.setdefault(key, RateLimiter())
+
+
+class GitHubTransport(httpx.BaseTransport):
+    """Conditional-request cache + rate-limit scheduling over a transport."""
+
+    def __init__(
+        self,
+        inner: httpx.BaseTransport | None = None,
+        *,
+        cache: ETagCache | None = None,
+        limiter: RateLimiter | None = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._inner = inner or httpx.HTTPTransport()
+        self._cache = cache
+        self._limiter = limiter or RateLimiter()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        cached = None
+        if self._cache is not None and request.method == "GET":
+            cached = self._cache.lookup(request)
+            if cached is not None:
+                request.headers.update(cached.validators)
+        response = self._send(request)
+        if cached is not None and response.status_code == _NOT_MODIFIED:
+            response.close()
+            self._cache.refresh(request)
+            headers = dict(cached.headers)
+            headers.update(
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower().startswith("x-ratelimit-")
+            )
+            return httpx.Response(
+                200, headers=headers, content=cached.body, request=request
+            )
+        if (
+            self._cache is not None
+            and request.method == "GET"
+            and response.status_code == 200
+            and ("etag" in response.headers or "last-modified" in response.headers)
+        ):
+            response.read()
+            self._cache.store(request, response)
+        return response
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(_MAX_RATE_RETRIES + 1):
+            wait = self._limiter.delay()
+            if wait > 0:
+                log.info("GitHub rate limit: waiting %.0fs before %s", wait, request.url.path)
+                self._sleep(wait)
+            with self._slots:
+                response = self._inner.handle_request(request)
+            retry_in = self._limiter.observe(response)
+            if retry_in is None or attempt == _MAX_RATE_RETRIES:
+                return response
+            response.read()
+            response.close()
+            log.warning(
+                "GitHub rate-limited %s %s (%d); retrying in %.0fs",
+                request.method, request.url.path, response.status_code, retry_in,
+            )
+        return response  # pragma: no cover — the loop always returns
+
+    def close(self) -> None:
+        self._inner.close()
+
+
+__all__ = [
+    "DEFAULT_CACHE_MAX_AGE_SECONDS",
+    "DEFAULT_CACHE_MAX_BYTES",
+    "ETagCache",
+    "GitHubTransport",
+    "MAX_CONCURRENT_REQUESTS",
+    "RateLimiter",
+    "cache_dir",
+    "cache_for",
+    "limiter_for",
+]
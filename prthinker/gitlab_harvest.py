@@ -24,6 +24,7 @@ import httpx
 
 from prthinker.accepted import AcceptedExample, AcceptedExamplesStore
 from prthinker.dismissed import DismissedExample, DismissedExamplesStore
+from prthinker.github_api import paginate
 # The dismissal keywords and suggestion-block grammar are shared with
 # the GitHub harvester so both platforms learn from the same signals.
 from prthinker.harvest import (
@@ -33,6 +34,16 @@ from prthinker.harvest import (
     _SUGGESTION_RE,
     _extract_suggestion_block,
 )
+from prthinker.harvest_engine import (
+    DEFAULT_MAX_WORKERS,
+    ClosedPr,
+    HarvestCheckpoint,
+    PrHarvest,
+    apply_harvest,
+    fan_out,
+    harvest_prs,
+    harvest_recent,
+)
 
 log = logging.getLogger(__name__)
 
@@ -55,8 +66,14 @@ def harvest(
     mr_iid: int | None = None,
     max_mrs: int = 50,
     base_url: str = DEFAULT_BASE_URL,
+    checkpoint: HarvestCheckpoint | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> HarvestStats:
-    """Harvest dismissed diff notes. If ``mr_iid`` is set, harvest just that MR."""
+    """Harvest dismissed diff notes. If ``mr_iid`` is set, harvest just that MR.
+
+    Otherwise recent merged / closed MRs are harvested concurrently, from
+    the ``checkpoint`` mark when given (see :mod:`prthinker.harvest_engine`).
+    """
     project_quoted = urllib.parse.quote(str(project), safe="")
     stats = HarvestStats()
     with _client(token, base_url) as client:
@@ -64,13 +81,13 @@ def harvest(
             stats.prs_scanned = 1
             _harvest_one_mr(client, project_quoted, mr_iid, store, stats)
         else:
-            for iid in _iter_recent_closed_mrs(client, project_quoted, max_mrs):
-                stats.prs_scanned += 1
-                try:
-                    _harvest_one_mr(client, project_quoted, iid, store, stats)
-                except httpx.HTTPStatusError as exc:
-                    log.warning("MR !%d failed: %s", iid, exc)
-                    continue
+            harvest_recent(
+                _iter_recent_closed_mrs(client, project_quoted),
+                lambda iid: _collect_dismissed(client, project_quoted, iid),
+                store=store, stats=stats, found="dismissed_found",
+                label="MR !%d", scope=_scope(base_url, project), max_prs=max_mrs,
+                checkpoint=checkpoint, max_workers=max_workers,
+            )
 
     log.info(
         "GitLab harvest done: scanned %d MR(s), %d note(s), kept %d dismissed",
@@ -87,6 +104,8 @@ def harvest_accepted(
     mr_iid: int | None = None,
     max_mrs: int = 50,
     base_url: str = DEFAULT_BASE_URL,
+    checkpoint: HarvestCheckpoint | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> HarvestStats:
     """Harvest accepted suggestion examples from GitLab MRs.
 
@@ -98,19 +117,20 @@ def harvest_accepted(
     project_quoted = urllib.parse.quote(str(project), safe="")
     stats = HarvestStats()
     with _client(token, base_url) as client:
-        iids: Iterable[int]
         if mr_iid is not None:
-            iids = [mr_iid]
+            harvest_prs(
+                [ClosedPr(mr_iid)],
+                lambda iid: _collect_accepted(client, project_quoted, iid),
+                store=store, stats=stats, found="accepted_found", label="MR !%d",
+            )
         else:
-            iids = list(_iter_recent_closed_mrs(client, project_quoted, max_mrs))
-
-        for iid in iids:
-            stats.prs_scanned += 1
-            try:
-                _harvest_accepted_one_mr(client, project_quoted, iid, store, stats)
-            except httpx.HTTPStatusError as exc:
-                log.warning("MR !%d failed: %s", iid, exc)
-                continue
+            harvest_recent(
+                _iter_recent_closed_mrs(client, project_quoted),
+                lambda iid: _collect_accepted(client, project_quoted, iid),
+                store=store, stats=stats, found="accepted_found",
+                label="MR !%d", scope=_scope(base_url, project), max_prs=max_mrs,
+                checkpoint=checkpoint, max_workers=max_workers,
+            )
 
     log.info(
         "GitLab accepted harvest done: scanned %d MR(s), %d note(s), "
@@ -120,6 +140,11 @@ def harvest_accepted(
     return stats
 
 
+def _scope(base_url: str, project: str) -> str:
+    """Checkpoint scope of a GitLab project."""
+    return f"gitlab:{base_url.rstrip('/')}:{project}"
+
+
 def _client(token: str, base_url: str) -> httpx.Client:
     return httpx.Client(
         base_url=base_url.rstrip("/"),
@@ -134,28 +159,20 @@ def _client(token: str, base_url: str) -> httpx.Client:
 def _iter_pages(
     client: httpx.Client, path: str, params: dict | None = None
 ) -> Iterator[dict]:
-    """Yield every item of a paginated GitLab list endpoint."""
-    page = 1
-    while True:
-        response = client.get(
-            path,
-            params={**(params or {}), "per_page": _PER_PAGE, "page": page},
-        )
-        response.raise_for_status()
-        batch = response.json()
-        if not batch:
-            return
-        yield from batch
-        if len(batch) < _PER_PAGE:
-            return
-        page += 1
+    """Yield every item of a paginated GitLab list endpoint.
+
+    GitLab's offset pagination uses the same ``page`` / ``per_page``
+    scheme and ``Link: rel="last"`` header as GitHub, so the shared
+    :func:`~prthinker.github_api.paginate` fetches later pages
+    concurrently here too.
+    """
+    yield from paginate(client, path, params=params, per_page=_PER_PAGE)
 
 
 def _iter_recent_closed_mrs(
-    client: httpx.Client, project_quoted: str, max_mrs: int
-) -> Iterator[int]:
-    """Yield the iids of recently-updated merged / closed MRs."""
-    seen = 0
+    client: httpx.Client, project_quoted: str
+) -> Iterator[ClosedPr]:
+    """Yield merged / closed MRs, most recently updated first."""
     for mr in _iter_pages(
         client,
         f"/projects/{project_quoted}/merge_requests",
@@ -164,10 +181,7 @@ def _iter_recent_closed_mrs(
         # Open MRs have no final verdict on their notes yet.
         if mr.get("state") == "opened":
             continue
-        yield int(mr["iid"])
-        seen += 1
-        if seen >= max_mrs:
-            return
+        yield ClosedPr(int(mr["iid"]), str(mr.get("updated_at") or ""))
 
 
 def _discussions_path(project_quoted: str, mr_iid: int) -> str:
@@ -181,6 +195,17 @@ def _harvest_one_mr(
     store: DismissedExamplesStore,
     stats: HarvestStats,
 ) -> None:
+    apply_harvest(
+        _collect_dismissed(client, project_quoted, mr_iid),
+        store=store, stats=stats, found="dismissed_found",
+    )
+
+
+def _collect_dismissed(
+    client: httpx.Client, project_quoted: str, mr_iid: int
+) -> PrHarvest:
+    """The MR's dismissed diff notes, award-emoji lookups issued concurrently."""
+    threads = []
     for discussion in _iter_pages(
         client, _discussions_path(project_quoted, mr_iid)
     ):
@@ -188,40 +213,36 @@ def _harvest_one_mr(
             n for n in (discussion.get("notes") or []) if not n.get("system")
         ]
         # Only diff notes (inline findings) are dismissal candidates.
-        if not notes or notes[0].get("type") != "DiffNote":
-            continue
-        stats.comments_scanned += 1
-        _harvest_dismissed_note(
-            client, project_quoted, mr_iid, notes[0], notes[1:], store, stats,
-        )
+        if notes and notes[0].get("type") == "DiffNote":
+            threads.append(notes)
+    reasons = fan_out(
+        lambda notes: _dismissal_reason(
+            client, project_quoted, mr_iid, notes[0], notes[1:]
+        ),
+        threads,
+    )
+    rows = [
+        example
+        for notes, reason in zip(threads, reasons)
+        if (example := _dismissed_example(notes[0], reason)) is not None
+    ]
+    return PrHarvest(rows, len(threads))
 
 
-def _harvest_dismissed_note(
-    client: httpx.Client,
-    project_quoted: str,
-    mr_iid: int,
-    note: dict,
-    replies: list[dict],
-    store: DismissedExamplesStore,
-    stats: HarvestStats,
-) -> None:
-    """Append the note as a dismissed example when it is dismissed and non-empty."""
-    reason = _dismissal_reason(client, project_quoted, mr_iid, note, replies)
+def _dismissed_example(note: dict, reason: str | None) -> DismissedExample | None:
+    """The note as a dismissed example when it is dismissed and non-empty."""
     if reason is None:
-        return
+        return None
     body = (note.get("body") or "").strip()
     if not body:
-        return
-    store.append(
-        DismissedExample(
-            path=_note_path(note),
-            comment=body,
-            reason=reason,
-            # GitLab notes carry a position, not the hunk text itself.
-            diff_snippet="",
-        )
+        return None
+    return DismissedExample(
+        path=_note_path(note),
+        comment=body,
+        reason=reason,
+        # GitLab notes carry a position, not the hunk text itself.
+        diff_snippet="",
     )
-    stats.dismissed_found += 1
 
 
 def _note_path(note: dict) -> str:
@@ -269,43 +290,49 @@ def _harvest_accepted_one_mr(
     store: AcceptedExamplesStore,
     stats: HarvestStats,
 ) -> None:
+    apply_harvest(
+        _collect_accepted(client, project_quoted, mr_iid),
+        store=store, stats=stats, found="accepted_found",
+    )
+
+
+def _collect_accepted(
+    client: httpx.Client, project_quoted: str, mr_iid: int
+) -> PrHarvest:
+    """The MR's suggestion notes, if one of its commits applied suggestions."""
     if not _mr_has_apply_commit(client, project_quoted, mr_iid):
-        return
+        return PrHarvest()
 
+    result = PrHarvest()
     for discussion in _iter_pages(
         client, _discussions_path(project_quoted, mr_iid)
     ):
         for note in discussion.get("notes") or []:
             if note.get("system"):
                 continue
-            stats.comments_scanned += 1
-            _append_accepted_note(note, mr_iid, store, stats)
+            result.comments_scanned += 1
+            example = _accepted_example(note, mr_iid)
+            if example is not None:
+                result.rows.append(example)
+    return result
 
 
-def _append_accepted_note(
-    note: dict,
-    mr_iid: int,
-    store: AcceptedExamplesStore,
-    stats: HarvestStats,
-) -> None:
+def _accepted_example(note: dict, mr_iid: int) -> AcceptedExample | None:
     body = note.get("body") or ""
     suggestion = _extract_suggestion_block(body)
     if not suggestion:
-        return
+        return None
 
     # Strip the suggestion block from the comment so the embedding
     # reflects the advisory text, not the patch.
     comment_text = _SUGGESTION_RE.sub("", body).strip() or "(suggestion only)"
 
-    store.append(
-        AcceptedExample(
-            path=_note_path(note),
-            comment=comment_text,
-            suggestion=suggestion,
-            pr_number=mr_iid,
-        )
+    return AcceptedExample(
+        path=_note_path(note),
+        comment=comment_text,
+        suggestion=suggestion,
+        pr_number=mr_iid,
     )
-    stats.accepted_found += 1
 
 
 def _mr_has_apply_commit(
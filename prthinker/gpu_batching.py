@@ -0,0 +1,227 @@
+"""Continuous request batching in front of the single-GPU local backend.
+
+``gpu_serialized`` keeps two ``model.generate`` calls from overlapping,
+which is what stops the card from OOMing — but it also means the server
+decodes one sequence at a time while a queue of review jobs waits, and
+single-sequence decode leaves most of the GPU idle. :class:`GenerationBatcher`
+sits between the request threads and that lock: every caller enqueues its
+prompt, one dispatcher thread drains the queue into batches that fit a
+padded-token budget, runs each batch as ONE guarded ``generate`` and
+hands every caller its own result.
+
+The module is runner-safe (stdlib ``threading`` only) so the scheduling
+rules are unit-testable without torch, mirroring :mod:`prthinker.gpu_lock`.
+The model-specific batch function is injected by the local backend.
+
+Budget rule: a left-padded batch costs ``rows * (longest prompt + largest
+max_new_tokens)`` tokens of KV cache, so a batch is closed as soon as the
+next FIFO request would push that product past ``token_budget``. The
+head-of-queue request is always admitted, so an oversized prompt runs
+alone instead of starving; the per-request input/output limits in
+``hf_generate`` still reject prompts that could never fit.
+
+Cancellation: a request whose ``cancel_event`` fires while still queued
+is dropped without touching the GPU; one that fires mid-batch is left to
+the batch function (the HF implementation stops that row at the next
+token) and surfaces to its caller as ``ReviewCancelledError``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from prthinker.gpu_lock import gpu_serialized
+from prthinker.pipeline_types import ReviewCancelledError
+
+log = logging.getLogger(__name__)
+
+# How often a waiting caller re-checks its cancel_event while queued.
+_CANCEL_POLL_SECONDS = 0.1
+
+
+@dataclass
+class BatchItem:
+    """One queued generation request.
+
+    ``prompt_tokens`` is the caller-side token estimate the budget rule
+    uses; ``cancel_event`` is the caller's threading.Event-like object
+    (or None).
+    """
+
+    prompt: str
+    max_new_tokens: int
+    prompt_tokens: int
+    cancel_event: "object | None" = None
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+    _result: object = field(default=None, repr=False)
+    _error: BaseException | None = field(default=None, repr=False)
+
+    def cancelled(self) -> bool:
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def resolve(self, outcome: object) -> None:
+        """Store a result (or an exception instance) and wake the caller."""
+        if isinstance(outcome, BaseException):
+            self._error = outcome
+        else:
+            self._result = outcome
+        self._done.set()
+
+
+# run_batch(items) -> one outcome per item, in order. An outcome that is
+# an exception instance is raised in that item's caller only.
+BatchFn = Callable[[Sequence[BatchItem]], Sequence[object]]
+
+
+class GenerationBatcher:
+    """Collects concurrent prompts into padded-token-budgeted GPU batches.
+
+    ``run_batch`` is called on the dispatcher thread, inside
+    ``gpu_serialized``, with at most ``max_batch_size`` items.
+    ``collect_seconds`` is how long the dispatcher lingers after the first
+    arrival so requests issued at nearly the same moment (per-file workers,
+    concurrent jobs) share a batch; it is skipped once the batch is full.
+    """
+
+    def __init__(
+        self,
+        run_batch: BatchFn,
+        *,
+        count_tokens: Callable[[str], int],
+        max_batch_size: int = 8,
+        token_budget: int = 65536,
+        collect_seconds: float = 0.02,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if token_budget < 1:
+            raise ValueError("token_budget must be at least 1")
+        self._run_batch = run_batch
+        self._count_tokens = count_tokens
+        self._max_batch_size = max_batch_size
+        self._token_budget = token_budget
+        self._collect_seconds = max(0.0, collect_seconds)
+        self._pending: deque[BatchItem] = deque()
+        self._cond = threading.Condition()
+        self._dispatcher: threading.Thread | None = None
+
+    @property
+    def max_batch_size(self) -> int:
+        return self._max_batch_size
+
+    def submit(
+        self,
+        prompt: str,
+        max_new_tokens: int,
+        *,
+        cancel_event: "object | None" = None,
+    ) -> object:
+        """Queue ``prompt`` and block until its own outcome is ready.
+
+        Returns whatever ``run_batch`` produced for this item; raises the
+        exception it produced instead, or ``ReviewCancelledError`` when
+        ``cancel_event`` fires before the item was dispatched.
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReviewCancelledError("Generation cancelled before queueing")
+        item = BatchItem(
+            prompt=prompt,
+            max_new_tokens=max_new_tokens,
+            prompt_tokens=self._count_tokens(prompt),
+            cancel_event=cancel_event,
+        )
+        with self._cond:
+            self._pending.append(item)
+            self._ensure_dispatcher_locked()
+            self._cond.notify()
+        while not item._done.wait(_CANCEL_POLL_SECONDS):
+            if item.cancelled() and self._withdraw(item):
+                raise ReviewCancelledError("Generation cancelled while queued")
+        if item._error is not None:
+            raise item._error
+        return item._result
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _withdraw(self, item: BatchItem) -> bool:
+        """Remove a still-queued item; False once the dispatcher owns it."""
+        with self._cond:
+            try:
+                self._pending.remove(item)
+            except ValueError:
+                return False
+            return True
+
+    def _ensure_dispatcher_locked(self) -> None:
+        if self._dispatcher is not None and self._dispatcher.is_alive():
+            return
+        self._dispatcher = threading.Thread(
+            target=self._dispatch_forever,
+            name="prthinker-gpu-batcher",
+            daemon=True,
+        )
+        self._dispatcher.start()
+
+    def _dispatch_forever(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                full = len(self._pending) >= self._max_batch_size
+            if not full and self._collect_seconds:
+                time.sleep(self._collect_seconds)
+            with self._cond:
+                batch = self._take_batch_locked()
+            if batch:
+                self._dispatch(batch)
+
+    def _take_batch_locked(self) -> list[BatchItem]:
+        """Pop the next FIFO batch that fits the padded-token budget.
+
+        Caller holds the condition (or owns the batcher exclusively, as
+        in tests). Cancelled items met on the way are resolved with
+        ``ReviewCancelledError`` and never reach the GPU.
+        """
+        batch: list[BatchItem] = []
+        longest_prompt = 0
+        longest_new = 0
+        while self._pending and len(batch) < self._max_batch_size:
+            head = self._pending[0]
+            if head.cancelled():
+                self._pending.popleft()
+                head.resolve(ReviewCancelledError("Generation cancelled while queued"))
+                continue
+            prompt_len = max(longest_prompt, head.prompt_tokens)
+            new_len = max(longest_new, head.max_new_tokens)
+            if batch and (len(batch) + 1) * (prompt_len + new_len) > self._token_budget:
+                break
+            batch.append(self._pending.popleft())
+            longest_prompt, longest_new = prompt_len, new_len
+        return batch
+
+    def _dispatch(self, batch: list[BatchItem]) -> None:
+        """Run one batch under the GPU lock and resolve every item in it."""
+        try:
+            with gpu_serialized():
+                outcomes = list(self._run_batch(batch))
+            if len(outcomes) != len(batch):
+                raise RuntimeError(
+                    f"batch function returned {len(outcomes)} outcomes "
+                    f"for {len(batch)} prompts"
+                )
+        except Exception as exc:  # pylint: disable=broad-exception-caught  # every waiter must be released
+            log.exception("Batched generate of %d prompts failed", len(batch))
+            outcomes = [exc] * len(batch)
+        log.debug("Dispatched a batch of %d prompts", len(batch))
+        for item, outcome in zip(batch, outcomes):
+            item.resolve(outcome)
+
+
+__all__ = ["BatchItem", "GenerationBatcher"]
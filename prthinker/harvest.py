@@ -15,14 +15,23 @@ from __future__ import annotations
 import logging
 import re
 from dataclasses import dataclass
-from itertools import islice
 from typing import Iterable, Iterator
 
 import httpx
 
 from prthinker.accepted import AcceptedExample, AcceptedExamplesStore
 from prthinker.dismissed import DismissedExample, DismissedExamplesStore
-from prthinker.github_api import _client, paginate
+from prthinker.github_api import _API_ROOT, _client, paginate
+from prthinker.harvest_engine import (
+    DEFAULT_MAX_WORKERS,
+    ClosedPr,
+    HarvestCheckpoint,
+    PrHarvest,
+    apply_harvest,
+    fan_out,
+    harvest_prs,
+    harvest_recent,
+)
 
 log = logging.getLogger(__name__)
 
@@ -105,8 +114,15 @@ def harvest(
     store: DismissedExamplesStore,
     pr_number: int | None = None,
     max_prs: int = 50,
+    checkpoint: HarvestCheckpoint | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> HarvestStats:
-    """Harvest dismissed comments. If `pr_number` is set, harvest just that PR."""
+    """Harvest dismissed comments. If `pr_number` is set, harvest just that PR.
+
+    Otherwise the ``max_prs`` most recently updated closed PRs (only
+    those updated since the ``checkpoint`` mark, when given) are
+    harvested ``max_workers`` at a time.
+    """
     if "/" not in repo:
         raise ValueError(f"repo must be 'owner/name', got {repo!r}")
 
@@ -116,13 +132,13 @@ def harvest(
             stats.prs_scanned = 1
             _harvest_one_pr(client, repo, pr_number, store, stats)
         else:
-            for n in _iter_recent_closed_prs(client, repo, max_prs):
-                stats.prs_scanned += 1
-                try:
-                    _harvest_one_pr(client, repo, n, store, stats)
-                except httpx.HTTPStatusError as exc:
-                    log.warning("PR #%d failed: %s", n, exc)
-                    continue
+            harvest_recent(
+                _iter_recent_closed_prs(client, repo),
+                lambda n: _collect_dismissed(client, repo, n),
+                store=store, stats=stats, found="dismissed_found",
+                label="PR #%d", scope=_scope(repo), max_prs=max_prs,
+                checkpoint=checkpoint, max_workers=max_workers,
+            )
 
     log.info(
         "Harvest done: scanned %d PR(s), %d comment(s), kept %d dismissed",
@@ -131,17 +147,20 @@ def harvest(
     return stats
 
 
-def _iter_recent_closed_prs(
-    client: httpx.Client, repo: str, max_prs: int
-) -> Iterator[int]:
-    """Yield the numbers of the ``max_prs`` most recently updated closed PRs."""
+def _scope(repo: str) -> str:
+    """Checkpoint scope of a GitHub repo."""
+    return f"github:{_API_ROOT}:{repo}"
+
+
+def _iter_recent_closed_prs(client: httpx.Client, repo: str) -> Iterator[ClosedPr]:
+    """Yield closed PRs, most recently updated first."""
     pages = paginate(
         client,
         f"/repos/{repo}/pulls",
         params={"state": "closed", "sort": "updated", "direction": "desc"},
     )
-    for pr in islice(pages, max_prs):
-        yield int(pr["number"])
+    for pr in pages:
+        yield ClosedPr(int(pr["number"]), str(pr.get("updated_at") or ""))
 
 
 def _harvest_one_pr(
@@ -151,15 +170,28 @@ def _harvest_one_pr(
     store: DismissedExamplesStore,
     stats: HarvestStats,
 ) -> None:
+    apply_harvest(
+        _collect_dismissed(client, repo, pr_number),
+        store=store, stats=stats, found="dismissed_found",
+    )
+
+
+def _collect_dismissed(client: httpx.Client, repo: str, pr_number: int) -> PrHarvest:
+    """The PR's dismissed comments, with reaction lookups issued concurrently."""
     comments = _fetch_review_comments(client, repo, pr_number)
     by_parent = _index_replies_by_parent(comments)
-    for c in comments:
-        stats.comments_scanned += 1
-        if c.get("in_reply_to_id"):
-            # Replies themselves aren't candidate parents.
-            continue
-        replies = by_parent.get(int(c["id"]), [])
-        _harvest_dismissed_comment(client, repo, c, replies, store, stats)
+    # Replies themselves aren't candidate parents.
+    parents = [c for c in comments if not c.get("in_reply_to_id")]
+    reasons = fan_out(
+        lambda c: _dismissal_reason(client, repo, c, by_parent.get(int(c["id"]), [])),
+        parents,
+    )
+    rows = [
+        example
+        for comment, reason in zip(parents, reasons)
+        if (example := _dismissed_example(comment, reason)) is not None
+    ]
+    return PrHarvest(rows, len(comments))
 
 
 def _index_replies_by_parent(comments: list[dict]) -> dict[int, list[dict]]:
@@ -172,30 +204,19 @@ def _index_replies_by_parent(comments: list[dict]) -> dict[int, list[dict]]:
     return by_parent
 
 
-def _harvest_dismissed_comment(
-    client: httpx.Client,
-    repo: str,
-    comment: dict,
-    replies: Iterable[dict],
-    store: DismissedExamplesStore,
-    stats: HarvestStats,
-) -> None:
-    """Append the comment as a dismissed example when it is dismissed and non-empty."""
-    reason = _dismissal_reason(client, repo, comment, replies)
+def _dismissed_example(comment: dict, reason: str | None) -> DismissedExample | None:
+    """The comment as a dismissed example when it is dismissed and non-empty."""
     if reason is None:
-        return
+        return None
     body = (comment.get("body") or "").strip()
     if not body:
-        return
-    store.append(
-        DismissedExample(
-            path=comment.get("path") or "",
-            comment=body,
-            reason=reason,
-            diff_snippet=(comment.get("diff_hunk") or "").strip(),
-        )
+        return None
+    return DismissedExample(
+        path=comment.get("path") or "",
+        comment=body,
+        reason=reason,
+        diff_snippet=(comment.get("diff_hunk") or "").strip(),
     )
-    stats.dismissed_found += 1
 
 
 def _fetch_review_comments(
@@ -246,32 +267,35 @@ def harvest_accepted(
     store: AcceptedExamplesStore,
     pr_number: int | None = None,
     max_prs: int = 50,
+    checkpoint: HarvestCheckpoint | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> HarvestStats:
     """Harvest accepted suggestion examples.
 
     Heuristic: a PR has accepted suggestions if any of its commits has a
     message matching `^Apply suggestions? from code review`. For each such
     PR we keep every review comment that contains a ```suggestion``` block
-    — best-effort, with no per-suggestion attribution.
+    — best-effort, with no per-suggestion attribution. PRs are selected
+    and harvested concurrently as in :func:`harvest`.
     """
     if "/" not in repo:
         raise ValueError(f"repo must be 'owner/name', got {repo!r}")
 
     stats = HarvestStats()
     with _client(token) as client:
-        pr_numbers: Iterable[int]
         if pr_number is not None:
-            pr_numbers = [pr_number]
+            harvest_prs(
+                [ClosedPr(pr_number)], lambda n: _collect_accepted(client, repo, n),
+                store=store, stats=stats, found="accepted_found", label="PR #%d",
+            )
         else:
-            pr_numbers = list(_iter_recent_closed_prs(client, repo, max_prs))
-
-        for n in pr_numbers:
-            stats.prs_scanned += 1
-            try:
-                _harvest_accepted_one_pr(client, repo, n, store, stats)
-            except httpx.HTTPStatusError as exc:
-                log.warning("PR #%d failed: %s", n, exc)
-                continue
+            harvest_recent(
+                _iter_recent_closed_prs(client, repo),
+                lambda n: _collect_accepted(client, repo, n),
+                store=store, stats=stats, found="accepted_found",
+                label="PR #%d", scope=_scope(repo), max_prs=max_prs,
+                checkpoint=checkpoint, max_workers=max_workers,
+            )
 
     log.info(
         "Accepted harvest done: scanned %d PR(s), %d comment(s), kept %d accepted",
@@ -287,27 +311,33 @@ def _harvest_accepted_one_pr(
     store: AcceptedExamplesStore,
     stats: HarvestStats,
 ) -> None:
+    apply_harvest(
+        _collect_accepted(client, repo, pr_number),
+        store=store, stats=stats, found="accepted_found",
+    )
+
+
+def _collect_accepted(client: httpx.Client, repo: str, pr_number: int) -> PrHarvest:
+    """The PR's suggestion comments, if one of its commits applied suggestions."""
     if not _pr_has_apply_commit(client, repo, pr_number):
-        return
+        return PrHarvest()
 
-    for c in _fetch_review_comments(client, repo, pr_number):
-        stats.comments_scanned += 1
+    comments = _fetch_review_comments(client, repo, pr_number)
+    rows = []
+    for c in comments:
         body = c.get("body") or ""
         suggestion = _extract_suggestion_block(body)
         if not suggestion:
             continue
-
-        comment_text = _accepted_comment_text(body)
-
-        store.append(
+        rows.append(
             AcceptedExample(
                 path=str(c.get("path") or ""),
-                comment=comment_text,
+                comment=_accepted_comment_text(body),
                 suggestion=suggestion,
                 pr_number=pr_number,
             )
         )
-        stats.accepted_found += 1
+    return PrHarvest(rows, len(comments))
 
 
 def _pr_has_apply_commit(
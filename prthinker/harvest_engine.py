@@ -0,0 +1,306 @@
+"""Concurrent, resumable harvesting shared by the forge harvesters.
+
+:mod:`prthinker.harvest`, :mod:`prthinker.gitlab_harvest` and
+:mod:`prthinker.gitea_harvest` only know how to list closed PRs / MRs
+and how to turn one of them into corpus rows. This module runs that
+per-PR work for all three:
+
+- **Bounded concurrency.** PRs are harvested by ``max_workers`` threads
+  on the harvester's one client; inside a PR, :func:`fan_out` issues the
+  per-comment lookups (reactions, award emoji, review comments) the
+  same way. Results are applied in listing order on the calling thread,
+  so stats and corpus order do not depend on scheduling.
+- **Batched appends.** Each PR's rows reach the store with one
+  :meth:`~prthinker.corpora_base.JsonlCorpusStore.extend` call — one
+  file open per PR instead of one per row.
+- **Checkpoints.** :class:`HarvestCheckpoint` keeps, per forge + repo,
+  the ``updated_at`` mark below which everything is harvested, in a JSON
+  file beside the corpus. The listing is sorted by last update, so a
+  re-run stops at the mark and only visits PRs updated since the last
+  run. A run cut short by ``max_prs`` records the range it covered
+  instead of moving the mark, so the next run fills the gap below it. A
+  PR that failed holds the mark below its own timestamp, so the next
+  run retries it.
+
+Runner-safe: stdlib and httpx only.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, TypeVar
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = 4
+_CHECKPOINT_SUFFIX = ".harvest.json"
+
+
+@dataclass(frozen=True)
+class ClosedPr:
+    """One listed PR / MR: its number (iid) and last-update timestamp."""
+
+    number: int
+    updated_at: str = ""
+
+
+@dataclass
+class PrHarvest:
+    """Rows one PR yields for the corpus, plus how many comments it read."""
+
+    rows: list[Any] = field(default_factory=list)
+    comments_scanned: int = 0
+
+
+def fan_out(
+    fn: Callable[[T], R], items: Iterable[T], *, max_workers: int = DEFAULT_MAX_WORKERS
+) -> list[R]:
+    """``[fn(item) for item in items]`` with up to ``max_workers`` in flight.
+
+    Results keep the input order; the first exception propagates.
+    """
+    items = list(items)
+    if len(items) < 2 or max_workers < 2:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def _parse_time(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class HarvestCheckpoint:
+    """Per-scope record of which ``updated_at`` ranges are harvested, in one JSON file.
+
+    A scope names one forge + repo (e.g. ``github:https://api.github.com:o/r``).
+    Everything updated at or before its mark has been harvested. A run cut
+    short by ``max_prs`` also records the range it covered above the mark,
+    so the next run skips that range and continues into the gap below it;
+    the mark only moves once a run has walked the listing down to it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def beside(cls, corpus_path: Path) -> "HarvestCheckpoint":
+        """The checkpoint file next to a corpus (``<corpus>.harvest.json``)."""
+        corpus_path = Path(corpus_path)
+        return cls(corpus_path.with_name(corpus_path.name + _CHECKPOINT_SUFFIX))
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _state(entry: object) -> tuple[str | None, list[tuple[str, str]]]:
+        """``(mark, covered ranges)`` of one scope entry (a bare mark or a dict)."""
+        if isinstance(entry, str):
+            return (entry if _parse_time(entry) else None), []
+        if not isinstance(entry, dict):
+            return None, []
+        mark = entry.get("mark")
+        mark = mark if isinstance(mark, str) and _parse_time(mark) else None
+        covered = [
+            (str(item[0]), str(item[1]))
+            for item in entry.get("covered") or ()
+            if isinstance(item, list) and len(item) == 2
+            and _parse_time(str(item[0])) and _parse_time(str(item[1]))
+        ]
+        return mark, covered
+
+    def since(self, scope: str) -> str | None:
+        """The scope's mark (an ISO-8601 timestamp), or None before a first run."""
+        return self._state(self._read().get(scope))[0]
+
+    def unvisited(self, scope: str, prs: Iterable[ClosedPr]) -> Iterator[ClosedPr]:
+        """PRs of a newest-first listing not yet harvested, down to the mark."""
+        mark_text, covered_text = self._state(self._read().get(scope))
+        mark = _parse_time(mark_text or "")
+        covered = [(_parse_time(lo), _parse_time(hi)) for lo, hi in covered_text]
+        for pr in prs:
+            updated = _parse_time(pr.updated_at)
+            if updated is None:
+                yield pr
+                continue
+            if mark is not None and updated <= mark:
+                return
+            if not any(lo <= updated <= hi for lo, hi in covered):
+                yield pr
+
+    def advance(
+        self,
+        scope: str,
+        prs: Sequence[ClosedPr],
+        failed: Collection[int],
+        *,
+        exhausted: bool = True,
+    ) -> None:
+        """Record a run that harvested ``prs`` (newest first) except ``failed``.
+
+        ``exhausted`` says the run walked the listing down to the mark (or
+        its end). Only then may the mark rise — to the newest harvested or
+        previously covered point below every failed PR. A run cut short
+        instead records the range it covered below every failed PR.
+        """
+        stamped = [(t, pr) for pr in prs if (t := _parse_time(pr.updated_at))]
+        floor = min((t for t, pr in stamped if pr.number in failed), default=None)
+        done = [(t, pr.updated_at) for t, pr in stamped if floor is None or t < floor]
+        with self._lock:
+            marks = self._read()
+            mark, covered = self._state(marks.get(scope))
+            if exhausted:
+                points = [(_parse_time(mark), mark)] if mark else []
+                points += done
+                points += [
+                    (_parse_time(hi), hi) for _lo, hi in covered
+                    if floor is None or _parse_time(hi) < floor
+                ]
+                if points:
+                    mark = max(points, key=lambda item: item[0])[1]
+            elif done:
+                covered.append(
+                    (min(done, key=lambda item: item[0])[1],
+                     max(done, key=lambda item: item[0])[1])
+                )
+            entry = self._entry(mark, covered)
+            if entry is None or entry == marks.get(scope):
+                return
+            marks[scope] = entry
+            tmp = self._path.with_name(self._path.name + ".tmp")
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(json.dumps(marks, indent=2, sort_keys=True), encoding="utf-8")
+                os.replace(tmp, self._path)
+            except OSError as exc:
+                log.warning("harvest checkpoint not saved to %s: %s", self._path, exc)
+
+    @staticmethod
+    def _entry(mark: str | None, covered: list[tuple[str, str]]) -> object:
+        """Serialise ``(mark, covered)``: merged ranges above the mark only."""
+        floor = _parse_time(mark or "")
+        merged: list[list[str]] = []
+        for lo, hi in sorted(covered, key=lambda item: _parse_time(item[0])):
+            if floor is not None and _parse_time(hi) <= floor:
+                continue
+            if merged and _parse_time(lo) <= _parse_time(merged[-1][1]):
+                if _parse_time(hi) > _parse_time(merged[-1][1]):
+                    merged[-1][1] = hi
+                continue
+            merged.append([lo, hi])
+        if not merged:
+            return mark
+        return {"mark": mark, "covered": merged}
+
+
+def harvest_prs(
+    prs: Sequence[ClosedPr],
+    collect: Callable[[int], PrHarvest],
+    *,
+    store: Any,
+    stats: Any,
+    found: str,
+    label: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> set[int]:
+    """Run ``collect`` over ``prs`` concurrently and apply results in order.
+
+    Each PR's rows are appended to ``store`` in one batch and counted on
+    ``stats`` (``prs_scanned``, ``comments_scanned`` and the ``found``
+    counter). A PR whose requests fail with an HTTP error status is
+    logged (``label`` formats its number) and skipped; the returned set
+    holds those PR numbers.
+    """
+    failed: set[int] = set()
+
+    def run(pr: ClosedPr) -> PrHarvest | None:
+        try:
+            return collect(pr.number)
+        except httpx.HTTPStatusError as exc:
+            log.warning("%s failed: %s", label % pr.number, exc)
+            return None
+
+    workers = max(1, min(max_workers, len(prs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for pr, result in zip(prs, pool.map(run, prs)):
+            stats.prs_scanned += 1
+            if result is None:
+                failed.add(pr.number)
+                continue
+            apply_harvest(result, store=store, stats=stats, found=found)
+    return failed
+
+
+def harvest_recent(
+    listing: Iterable[ClosedPr],
+    collect: Callable[[int], PrHarvest],
+    *,
+    store: Any,
+    stats: Any,
+    found: str,
+    label: str,
+    scope: str,
+    max_prs: int,
+    checkpoint: HarvestCheckpoint | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> None:
+    """Harvest the newest ``max_prs`` PRs of a newest-first ``listing``.
+
+    With a ``checkpoint``, already harvested PRs are skipped and the
+    listing is cut at the scope's mark; the checkpoint then records the
+    run, noting whether it reached the mark or stopped at ``max_prs``.
+    """
+    if checkpoint is not None:
+        listing = checkpoint.unvisited(scope, listing)
+    prs = list(islice(listing, max_prs + 1))
+    exhausted = len(prs) <= max_prs
+    prs = prs[:max_prs]
+    failed = harvest_prs(
+        prs, collect, store=store, stats=stats, found=found, label=label,
+        max_workers=max_workers,
+    )
+    if checkpoint is not None:
+        checkpoint.advance(scope, prs, failed, exhausted=exhausted)
+
+
+def apply_harvest(result: PrHarvest, *, store: Any, stats: Any, found: str) -> None:
+    """Batch-append one PR's rows and count them on ``stats``."""
+    stats.comments_scanned += result.comments_scanned
+    if result.rows:
+        store.extend(result.rows)
+        setattr(stats, found, getattr(stats, found) + len(result.rows))
+
+
+__all__ = [
+    "ClosedPr",
+    "DEFAULT_MAX_WORKERS",
+    "HarvestCheckpoint",
+    "PrHarvest",
+    "apply_harvest",
+    "fan_out",
+    "harvest_prs",
+    "harvest_recent",
+]
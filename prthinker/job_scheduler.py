@@ -0,0 +1,246 @@
+"""Admission scheduler for the inference server's review / ask jobs.
+
+Every submitted job used to start a worker thread that immediately
+blocked on the GPU lock, so whichever thread won the lock ran next: one
+big monorepo PR could hold the card for tens of minutes while small PRs
+and interactive ``/ask`` calls queued behind it in arbitrary order.
+:class:`JobScheduler` is an explicit queue in front of the GPU. Workers
+still own their job, but they wait here for a run slot and the scheduler
+decides who gets it.
+
+Dispatch order, most significant first:
+
+1. Starved jobs — queued longer than ``max_wait_seconds`` — go first, in
+   arrival order, so nothing waits forever behind a stream of small jobs.
+2. Priority class: ``interactive`` before ``normal`` before ``bulk``.
+3. Fair share between tenants (a repository or client id): the tenant
+   with fewer running jobs, then the one that has been served fewer
+   estimated tokens during its current busy period.
+4. Shortest estimated job first (token count), then arrival order.
+
+``slots`` bounds how many dispatched jobs run at once; set it to the
+backend's ``max_concurrency()`` so batched generation still sees enough
+concurrent prompts. Runner-safe (stdlib only), like
+:mod:`prthinker.gpu_batching`.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from prthinker.pipeline_types import ReviewCancelledError
+
+PRIORITY_CLASSES = {"interactive": 0, "normal": 1, "bulk": 2}
+DEFAULT_PRIORITY = "normal"
+
+# How often a queued worker re-checks its cancel_event.
+_CANCEL_POLL_SECONDS = 0.25
+
+
+@dataclass
+class _Ticket:
+    job_id: str
+    priority: int
+    tenant: str
+    cost: int
+    seq: int
+    enqueued_at: float
+    cancel_event: "object | None" = None
+    dispatched: bool = False
+    # Set once the worker holds its slot; a dispatched ticket whose worker
+    # never got there can still be withdrawn.
+    entered: bool = False
+
+
+class JobScheduler:
+    """Priority / fair-share / shortest-job-first queue of run slots."""
+
+    def __init__(
+        self,
+        slots: int = 1,
+        *,
+        max_wait_seconds: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if slots < 1:
+            raise ValueError("slots must be at least 1")
+        if max_wait_seconds <= 0:
+            raise ValueError("max_wait_seconds must be positive")
+        self._slots = slots
+        self._max_wait = max_wait_seconds
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._queued: dict[str, _Ticket] = {}
+        self._running: dict[str, _Ticket] = {}
+        # Estimated tokens dispatched per tenant during its busy period;
+        # dropped once the tenant has nothing queued or running.
+        self._served: Counter = Counter()
+        self._seq = itertools.count()
+
+    def submit(
+        self,
+        job_id: str,
+        *,
+        priority: str = DEFAULT_PRIORITY,
+        tenant: str = "",
+        cost: int = 1,
+        cancel_event: "object | None" = None,
+    ) -> None:
+        """Queue a job; its worker then blocks in :meth:`slot` until dispatched."""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"unknown priority {priority!r}")
+        ticket = _Ticket(
+            job_id=job_id,
+            priority=PRIORITY_CLASSES[priority],
+            tenant=tenant,
+            cost=max(1, int(cost)),
+            seq=next(self._seq),
+            enqueued_at=self._clock(),
+            cancel_event=cancel_event,
+        )
+        with self._cond:
+            if job_id in self._queued or job_id in self._running:
+                raise ValueError(f"job {job_id!r} already scheduled")
+            self._queued[job_id] = ticket
+            self._dispatch_locked()
+
+    def withdraw(self, job_id: str) -> None:
+        """Drop a job whose worker will never run it (e.g. it failed to start).
+
+        Works while the job is queued and after it was dispatched, as long
+        as its worker has not entered :meth:`slot`; a dispatched job's slot
+        goes to the next queued one.
+        """
+        with self._cond:
+            if self._queued.pop(job_id, None) is None:
+                ticket = self._running.get(job_id)
+                if ticket is None or ticket.entered:
+                    return
+                del self._running[job_id]
+            self._forget_idle_tenants_locked()
+            self._dispatch_locked()
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, job_id: str) -> Iterator[None]:
+        """Wait until ``job_id`` is dispatched, hold its slot for the block.
+
+        Raises ``ReviewCancelledError`` (after leaving the queue) when the
+        job's ``cancel_event`` fires before it is dispatched, and KeyError
+        for a job that was never submitted.
+        """
+        with self._cond:
+            ticket = self._queued.get(job_id) or self._running.get(job_id)
+            if ticket is None:
+                raise KeyError(job_id)
+            while not ticket.dispatched:
+                if _is_set(ticket.cancel_event):
+                    self._queued.pop(job_id, None)
+                    self._forget_idle_tenants_locked()
+                    self._cond.notify_all()
+                    raise ReviewCancelledError(f"job {job_id} cancelled while queued")
+                self._cond.wait(timeout=_CANCEL_POLL_SECONDS)
+            ticket.entered = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running.pop(job_id, None)
+                self._forget_idle_tenants_locked()
+                self._dispatch_locked()
+
+    @contextmanager
+    def admitted(self, job_id: str, **submit_kwargs) -> Iterator[None]:
+        """``submit`` + ``slot`` in one step, for synchronous endpoints."""
+        self.submit(job_id, **submit_kwargs)
+        with self.slot(job_id):
+            yield
+
+    def position(self, job_id: str) -> tuple[int, int] | None:
+        """``(1-based queue position, queue depth)`` or None once dispatched."""
+        with self._cond:
+            if job_id not in self._queued:
+                return None
+            order = self._order_locked()
+            return order.index(job_id) + 1, len(order)
+
+    def stats(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "queued": len(self._queued),
+                "running": len(self._running),
+                "slots": self._slots,
+            }
+
+    # ---------- internals ---------------------------------------------------
+
+    def _sort_key(self, ticket: _Ticket, now: float, served: Counter, running: Counter):
+        starved = now - ticket.enqueued_at >= self._max_wait
+        if starved:
+            return (0, 0, 0, 0, 0, ticket.seq)
+        return (
+            1,
+            ticket.priority,
+            running[ticket.tenant],
+            served[ticket.tenant],
+            ticket.cost,
+            ticket.seq,
+        )
+
+    def _order_locked(self) -> list[str]:
+        """Queued job ids in the order they would be dispatched from now.
+
+        Replays the selection with a copy of the fair-share counters,
+        charging each picked job to its tenant, so positions account for
+        tenants taking turns. Running counts are held fixed (completions
+        cannot be predicted).
+        """
+        now = self._clock()
+        served = Counter(self._served)
+        running = Counter(t.tenant for t in self._running.values())
+        pending = list(self._queued.values())
+        order: list[str] = []
+        while pending:
+            best = min(pending, key=lambda t: self._sort_key(t, now, served, running))
+            pending.remove(best)
+            served[best.tenant] += best.cost
+            order.append(best.job_id)
+        return order
+
+    def _dispatch_locked(self) -> None:
+        dispatched = False
+        while self._queued and len(self._running) < self._slots:
+            now = self._clock()
+            running = Counter(t.tenant for t in self._running.values())
+            ticket = min(
+                self._queued.values(),
+                key=lambda t: self._sort_key(t, now, self._served, running),
+            )
+            del self._queued[ticket.job_id]
+            ticket.dispatched = True
+            self._running[ticket.job_id] = ticket
+            self._served[ticket.tenant] += ticket.cost
+            dispatched = True
+        if dispatched:
+            self._cond.notify_all()
+
+    def _forget_idle_tenants_locked(self) -> None:
+        active = {t.tenant for t in self._queued.values()}
+        active.update(t.tenant for t in self._running.values())
+        for tenant in list(self._served):
+            if tenant not in active:
+                del self._served[tenant]
+
+
+def _is_set(event: "object | None") -> bool:
+    is_set = getattr(event, "is_set", None)
+    return bool(is_set()) if callable(is_set) else False
+
+
+__all__ = ["DEFAULT_PRIORITY", "JobScheduler", "PRIORITY_CLASSES"]
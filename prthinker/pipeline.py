@@ -13,7 +13,10 @@ from __future__ import annotations
 import json
 import logging
 import hashlib
+import threading
+from collections.abc import MutableMapping
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from pathlib import Path
 
 from prthinker import risk_score
@@ -41,12 +44,14 @@ from prthinker.batch_review import (
     chunk_batchable,
     parse_batch_findings,
 )
+from prthinker.step_cache import StepResultCache
 from prthinker.step_planner import (
     STEP_PLAN_ADAPTIVE,
     TIER_SKIP,
     TIER_STANDARD,
     TIER_TOKEN_BUDGETS,
     TIER_TRIVIAL,
+    StepPlan,
     plan_steps,
 )
 from prthinker.steps import (
@@ -167,6 +172,7 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
         trajectory_sink: TrajectorySink | None = None,
         repo_retriever: RepoContextRetriever | None = None,
         repo_workdir: Path | None = None,
+        step_cache: MutableMapping[str, object] | None = None,
     ) -> None:
         self._backend = backend
         self._retriever = retriever
@@ -185,7 +191,11 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
         # See _DEFAULT_MAX_STEP_RESULT_CHARS — 0 disables the cap.
         self._max_step_result_chars = max(0, int(max_step_result_chars))
         self._step_dependencies = step_dependencies or {}
-        self._dag_cache: dict[str, object] = {}
+        # Results of DAG steps marked ``cache``; bounded in memory, and
+        # persistent across runs when the caller passes a path-backed store.
+        self._dag_cache: MutableMapping[str, object] = (
+            step_cache if step_cache is not None else StepResultCache()
+        )
         self._trajectory = trajectory_sink
         # Optional cross-file context retrieval (RAG-for-code). When both are
         # set, each file review is given the repository files/symbols the
@@ -193,6 +203,23 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
         self._repo_retriever = repo_retriever
         self._repo_workdir = repo_workdir
         self._import_adjacency_cache: dict[str, dict[str, set[str]]] = {}
+        # One worker pool for every DAG run of this pipeline (all files,
+        # all runs), created on first use and shut down by close().
+        self._dag_executor: ThreadPoolExecutor | None = None
+        self._dag_executor_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Shut down the step-DAG worker pool; the backend stays open."""
+        with self._dag_executor_lock:
+            executor, self._dag_executor = self._dag_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "CoTPipeline":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
     def _check_cancel(self) -> None:
         if self._cancel_event is not None and self._cancel_event.is_set():
@@ -441,6 +468,7 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
         agg = _AggregatedFiles()
         batched = self._review_trivial_batches(file_diffs, opts)
         loop_fds = [fd for fd in file_diffs if fd.path not in batched]
+        opts = replace(opts, rag_by_path=self._prefetch_rag(loop_fds, opts))
         if opts.parallelism > 1:
             with ThreadPoolExecutor(max_workers=opts.parallelism) as pool:
                 loop_results = list(
@@ -454,6 +482,40 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
             self._accumulate_file(agg, fd, by_path[fd.path], on_file_done)
         return agg
 
+    def _prefetch_rag(
+        self,
+        file_diffs: list[FileDiff],
+        opts: _PerFileOptions,
+    ) -> dict[str, list[str]]:
+        """Retrieve RAG docs for every file that will run steps, in one call.
+
+        One ``retrieve_many`` embeds all diffs in a single padded pass and
+        searches the index once, instead of one forward per file inside
+        the loop. Only retrievers that batch natively are used this way;
+        a looping ``retrieve_many`` (the remote ``/rag`` client) would just
+        serialise the calls the parallel loop makes concurrently, so those
+        keep the per-file path. Skipped, skip-tier and review-cache-hit
+        files are left out: they make no retrieval at all.
+        """
+        retrieve_many = getattr(self._retriever, "retrieve_many", None)
+        if retrieve_many is None or not getattr(self._retriever, "batches_natively", False):
+            return {}
+        fds = [fd for fd in file_diffs if self._will_retrieve(fd, opts)]
+        if len(fds) < 2:
+            return {}
+        with operation_span("retrieve", {"prthinker.file.count": len(fds)}):
+            docs = retrieve_many([fd.raw for fd in fds])
+        return {fd.path: file_docs for fd, file_docs in zip(fds, docs)}
+
+    def _will_retrieve(self, fd: FileDiff, opts: _PerFileOptions) -> bool:
+        """Whether the per-file loop would run steps (and RAG) for ``fd``."""
+        if (opts.skip_binary and fd.is_binary) or fd.is_deleted:
+            return False
+        cache_key = self._cache_key_for(fd, opts)
+        if cache_key is not None and opts.review_cache.get(cache_key) is not None:
+            return False
+        return self._plan_for(fd, opts).tier != TIER_SKIP
+
     @staticmethod
     def _accumulate_file(
         agg: _AggregatedFiles,
@@ -613,6 +675,7 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
                 reproducibility_check=opts.reproducibility_check,
             ),
             gen_budget=TIER_TOKEN_BUDGETS.get(plan_tier),
+            retrieved=opts.rag_by_path.get(fd.path),
         )
         if plan_tier:
             file_result.step_outputs["step_plan"] = plan_tier
@@ -633,12 +696,7 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
         """The step chain for one file, pruned per plan; tier '' when full."""
         if opts.step_plan != STEP_PLAN_ADAPTIVE:
             return opts.all_steps, ""
-        risk_entry = opts.risk_by_path.get(fd.path)
-        plan = plan_steps(
-            fd,
-            opts.all_steps,
-            risk=risk_entry.score if risk_entry is not None else None,
-        )
+        plan = self._plan_for(fd, opts)
         log.info(
             "step_plan: %s tier=%s steps=%s skipped=%s",
             fd.path,
@@ -648,6 +706,18 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
         )
         return plan.steps, plan.tier
 
+    @staticmethod
+    def _plan_for(fd: FileDiff, opts: _PerFileOptions) -> StepPlan:
+        """The adaptive step plan for one file (full plan when not adaptive)."""
+        if opts.step_plan != STEP_PLAN_ADAPTIVE:
+            return StepPlan(tier="", steps=opts.all_steps, skipped=())
+        risk_entry = opts.risk_by_path.get(fd.path)
+        return plan_steps(
+            fd,
+            opts.all_steps,
+            risk=risk_entry.score if risk_entry is not None else None,
+        )
+
     def _is_batchable(self, fd: FileDiff, opts: _PerFileOptions) -> bool:
         """Trivial-tier files whose whole plan is one findings pass batch
         together; anything with extra steps or special handling stays in
@@ -712,16 +782,21 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
             ),
             cancel_event=self._cancel_event,
         )
-        findings_by_path = parse_batch_findings(raw, chunk)
-        results: dict[str, FileReviewResult] = {}
-        for fd in chunk:
-            findings = suppress_phantom_undefined(
-                findings_by_path.get(fd.path, []),
+        parsed = parse_batch_findings(raw, chunk)
+        findings_by_path = {
+            fd.path: suppress_phantom_undefined(
+                parsed.get(fd.path, []),
                 diff_text=fd.raw,
                 path=fd.path,
             )
-            if self._dismissed_filter is not None and findings:
-                findings = self._dismissed_filter.filter(findings)
+            for fd in chunk
+        }
+        if self._dismissed_filter is not None:
+            # One embedding pass for every file in the chunk.
+            findings_by_path = self._dismissed_filter.filter_grouped(findings_by_path)
+        results: dict[str, FileReviewResult] = {}
+        for fd in chunk:
+            findings = findings_by_path[fd.path]
             file_result = self._stub_file_result(fd, findings)
             file_result.step_outputs["step_plan"] = TIER_TRIVIAL
             cache_key = self._cache_key_for(fd, opts)
@@ -883,10 +958,13 @@ class CoTPipeline(PipelineExecutionMixin, PipelineAggregateExtrasMixin):
         output_dir: Path | None,
         flags: "_FileRunFlags | None" = None,
         gen_budget: int | None = None,
+        retrieved: list[str] | None = None,
     ) -> FileReviewResult:
         flags = flags or _FileRunFlags()
-        with operation_span("retrieve", {"prthinker.file.path": fd.path}):
-            rag_docs = self._merge_rules(self._retriever.retrieve(fd.raw))
+        if retrieved is None:
+            with operation_span("retrieve", {"prthinker.file.path": fd.path}):
+                retrieved = self._retriever.retrieve(fd.raw)
+        rag_docs = self._merge_rules(retrieved)
         doc_ids = self._doc_ids(rag_docs)
         self._record_retrieval(fd, doc_ids)
         n_accepted_examples, positive_examples_block = self._accepted_examples(fd)
@@ -13,6 +13,7 @@ import hashlib
 import logging
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import replace
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -271,15 +272,37 @@ class PipelineExecutionMixin:
             if required_result else None,
             retries=max(0, int(config.get("retries", 0))),
             timeout_seconds=float(timeout) if timeout is not None else None,
-            cache_key=self._dag_cache_key(step_cls.name, ctx)
+            cache_key=self._dag_cache_key(step_cls, ctx)
             if config.get("cache", False) else None,
         )
 
-    def _dag_cache_key(self, name, ctx):
-        """Return a cache-key function keyed by step name, diff and prior results."""
-        return lambda results: hashlib.sha256(
-            f"{name}:{ctx.code_diff}:{sorted(results)}".encode()
-        ).hexdigest()
+    def _dag_cache_key(self, step_cls, ctx):
+        """Return a content-addressed cache-key function for one step.
+
+        The key hashes the prompt the step would render from the node's
+        dependency snapshot, plus everything else that shapes the output
+        (backend, model, generation budget, result cap). Any changed input
+        the step actually reads — diff, rules, a dependency's value —
+        changes the prompt and so misses; unchanged steps hit. A prompt
+        that cannot be rendered yields no key, leaving the error to the
+        node body where retry / fail_fast apply.
+        """
+
+        def key(results):
+            local = replace(ctx, results=dict(results))
+            try:
+                prompt = step_cls().build_prompt(local)
+            except (KeyError, ValueError):
+                return ""
+            budget = min(self._max_new_tokens, ctx.gen_budget or self._max_new_tokens)
+            identity = (
+                f"{step_cls.name}|{self._backend.backend_kind()}|"
+                f"{self._backend.model_name()}|{budget}|"
+                f"{self._max_step_result_chars}|"
+            )
+            return hashlib.sha256((identity + prompt).encode("utf-8")).hexdigest()
+
+        return key
 
     def _run_steps_dag(self, ctx, step_classes, output_dir) -> None:
         """Execute explicitly configured independent steps through typed DAG."""
@@ -292,13 +315,27 @@ class PipelineExecutionMixin:
             nodes,
             initial=ctx.results,
             cache=self._dag_cache,
-            max_workers=1 if self._stream else self._backend.max_concurrency(),
+            executor=self._dag_pool(),
         )
         ctx.results.update(
             {key: value for key, value in execution.results.items()
              if key in names and value is not None}
         )
 
+    def _dag_pool(self) -> ThreadPoolExecutor:
+        """The pipeline's long-lived step-DAG pool, sized to the backend.
+
+        Shared by every file and run, so concurrent per-file DAGs together
+        stay within ``max_concurrency()`` (one worker when streaming).
+        """
+        with self._dag_executor_lock:
+            if self._dag_executor is None:
+                self._dag_executor = ThreadPoolExecutor(
+                    max_workers=1 if self._stream else self._backend.max_concurrency(),
+                    thread_name_prefix="step-dag",
+                )
+            return self._dag_executor
+
     def _order_steps(self, step_classes: tuple[type[ReviewStep], ...]):
         """Topologically order configured steps while preserving stable order."""
         if not self._step_dependencies:
@@ -125,6 +125,8 @@ class _PerFileOptions:
     verify_timeout: float
     parallelism: int
     step_plan: str = "full"
+    # RAG docs fetched up front in one batched retrieval, keyed by path.
+    rag_by_path: dict = field(default_factory=dict)
 
 
 @dataclass
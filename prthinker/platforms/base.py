@@ -75,6 +75,21 @@ class PlatformAdapter(ABC):
         """
         return []
 
+    def prefetch(self, *, commit_messages: bool = False) -> None:  # pylint: disable=unused-argument  # overridable no-op; subclasses use commit_messages
+        """Warm the metadata the caller is about to read.
+
+        Default is a no-op; adapters that can fetch the diff, the PR
+        object and the commits concurrently override it. Fetch methods
+        must behave the same whether or not this ran.
+        """
+
+    def close(self) -> None:
+        """Release any pooled connections.
+
+        Default is a no-op; adapters that keep an HTTP client open
+        override it.
+        """
+
     def set_labels(self, labels: list[str]) -> None:  # pylint: disable=unused-argument  # overridable no-op; subclasses use labels
         """Apply the prthinker-managed labels to the PR.
 
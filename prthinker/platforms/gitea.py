@@ -439,13 +439,14 @@ class GiteaAdapter(PlatformAdapter):
                     "submitting all findings", exc,
                 )
                 return findings
-        if not new_side_lines(diff_text):
+        valid = new_side_lines(diff_text)
+        if not valid:
             log.info(
                 "Gitea: PR diff yielded no hunk lines; "
                 "submitting all findings unfiltered",
             )
             return findings
-        return filter_findings_to_diff(findings, diff_text)
+        return filter_findings_to_diff(findings, valid)
 
     def _post_review(
         self, client: httpx.Client, payload: dict[str, Any]
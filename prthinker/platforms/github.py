@@ -2,13 +2,21 @@
 
 The legacy ``prthinker.github_api`` and ``prthinker.checks`` modules
 keep working unchanged (this adapter delegates to them) so callers that
-imported the function-style API are not broken.
+imported the function-style API are not broken. Reads share one pooled
+client (see :mod:`prthinker.github_http` for its ETag cache and rate-limit
+scheduling), and :meth:`GitHubAdapter.prefetch` issues the independent
+reads of a review concurrently.
 """
 
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable
+
+import httpx
 
 from prthinker.checks import (
     CheckResult,
@@ -37,6 +45,8 @@ from prthinker.pr_labels import MANAGED_PREFIX
 from prthinker.platforms.base import PlatformAdapter
 from prthinker.schemas import InlineFinding
 
+log = logging.getLogger(__name__)
+
 _COMMENTS_PER_PAGE = 100
 
 
@@ -52,6 +62,12 @@ class GitHubAdapter(PlatformAdapter):
         # Cache the PR object so head SHA / base branch / title+body don't
         # refetch it across calls (mirrors the GitLab adapter's _mr_cache).
         self._pr_cache: dict[str, Any] | None = None
+        self._diff_cache: str | None = None
+        self._commits_cache: list[str] | None = None
+        # One pooled client for every read, so the fetches of a review
+        # share connections instead of each opening its own.
+        self._client: httpx.Client | None = None
+        self._client_lock = threading.Lock()
 
     def _gh(self, marker: str | None = None) -> GitHubConfig:
         return GitHubConfig(
@@ -62,21 +78,54 @@ class GitHubAdapter(PlatformAdapter):
             base_url=self.base_url,
         )
 
+    def _http(self) -> httpx.Client:
+        """The adapter's pooled client, opened on first use."""
+        with self._client_lock:
+            if self._client is None:
+                self._client = client_for(self._gh())
+            return self._client
+
+    def close(self) -> None:
+        """Release the pooled client's connections."""
+        with self._client_lock:
+            client, self._client = self._client, None
+        if client is not None:
+            client.close()
+
     def _pull(self) -> dict[str, Any]:
         """Fetch (and cache) the PR object from ``GET /repos/{repo}/pulls/{n}``."""
         if self._pr_cache is None:
-            with client_for(self._gh()) as client:
-                response = client.get(
-                    f"/repos/{self.repo}/pulls/{self.pr_number}"
-                )
-                response.raise_for_status()
-                self._pr_cache = response.json()
+            response = self._http().get(
+                f"/repos/{self.repo}/pulls/{self.pr_number}"
+            )
+            response.raise_for_status()
+            self._pr_cache = response.json()
         return self._pr_cache
 
+    def prefetch(self, *, commit_messages: bool = False) -> None:
+        """Fetch the diff, the PR object and (optionally) the commits at once.
+
+        The three reads are independent, so they run concurrently on the
+        pooled client and land in the caches the fetch methods read. A
+        failed read is left uncached: the later direct call retries it
+        and raises its error where the caller expects one.
+        """
+        jobs: list[Callable[[], object]] = [self.fetch_diff, self._pull]
+        if commit_messages:
+            jobs.append(self.fetch_commit_messages)
+        with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [pool.submit(job) for job in jobs]
+        for future in futures:
+            exc = future.exception()
+            if exc is not None:
+                log.debug("GitHub prefetch failed (%s); fetching on demand", exc)
+
     # ----- metadata ------------------------------------------------------
 
     def fetch_diff(self) -> str:
-        return fetch_pr_diff(self._gh())
+        if self._diff_cache is None:
+            self._diff_cache = fetch_pr_diff(self._gh(), client=self._http())
+        return self._diff_cache
 
     def fetch_head_sha(self) -> str:
         return str((self._pull().get("head") or {}).get("sha") or "")
@@ -85,10 +134,14 @@ class GitHubAdapter(PlatformAdapter):
         return str((self._pull().get("base") or {}).get("ref") or "")
 
     def fetch_commit_messages(self) -> list[str]:
-        return fetch_pr_commit_messages(self._gh())
+        if self._commits_cache is None:
+            self._commits_cache = fetch_pr_commit_messages(
+                self._gh(), client=self._http()
+            )
+        return list(self._commits_cache)
 
     def fetch_changed_paths(self) -> list[str]:
-        return fetch_pr_file_paths(self._gh())
+        return fetch_pr_file_paths(self._gh(), client=self._http())
 
     def set_labels(self, labels: list[str]) -> None:
         set_pr_labels(self._gh(), labels, managed_prefix=MANAGED_PREFIX)
@@ -165,12 +218,11 @@ class GitHubAdapter(PlatformAdapter):
         feed, ordered by ``created_at``. The marker scan and reply build
         are the base class's shared template method.
         """
-        with client_for(self._gh()) as client:
-            comments = list(paginate(
-                client,
-                f"/repos/{self.repo}/issues/{self.pr_number}/comments",
-                per_page=_COMMENTS_PER_PAGE,
-            ))
+        comments = list(paginate(
+            self._http(),
+            f"/repos/{self.repo}/issues/{self.pr_number}/comments",
+            per_page=_COMMENTS_PER_PAGE,
+        ))
         return self._replies_after_marker(comments, self.comment_marker)
 
 
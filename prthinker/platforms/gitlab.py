@@ -433,20 +433,21 @@ class GitLabAdapter(PlatformAdapter):
                     f"/merge_requests/{self.mr_iid}/raw_diffs",
                 )
                 response.raise_for_status()
-                diff_text = response.text
+                diff_text = response.content
             except httpx.HTTPError as exc:
                 log.warning(
                     "GitLab: could not fetch MR diff for pre-filtering (%s); "
                     "submitting all findings", exc,
                 )
                 return findings
-        if not new_side_lines(diff_text):
+        valid = new_side_lines(diff_text)
+        if not valid:
             log.info(
                 "GitLab: MR diff yielded no hunk lines; "
                 "submitting all findings unfiltered",
             )
             return findings
-        return filter_findings_to_diff(findings, diff_text)
+        return filter_findings_to_diff(findings, valid)
 
     def _apply_event_verdict(self, client: httpx.Client, event: str) -> None:
         """Mirror the verdict onto the MR approvals endpoint (best-effort).
@@ -0,0 +1,175 @@
+"""Shared-prefix KV cache bookkeeping for the local backend.
+
+Every CoT step for one file re-sends the same leading block — chat
+template header, repo context, global rules and RAG rules — and each
+per-file review in a PR shares at least the header and global rules.
+Re-prefilling that block five or six times per file dominates
+time-to-first-token on long prompts. :class:`PrefixCache` remembers the
+past-key-values of earlier prompts keyed by their token ids and hands the
+longest stored prefix of a new prompt back to the generator, which then
+prefills only the uncached suffix.
+
+This module is the runner-safe half (stdlib only, like
+:mod:`prthinker.gpu_lock`): it owns matching, LRU order and the VRAM
+budget, and treats the cached tensors as an opaque payload. The torch
+half — cropping a cache to a shorter prefix, passing it to
+``model.generate`` — lives in ``codes.util.hf_model_util``.
+
+Matching is on token ids, not text, so a hit is exact by construction.
+The entry a prompt hit is then re-keyed to that whole prompt (the caller
+crops the payload to match): its old tail was another step's private
+instructions, which the shared head outlives, and the newest prompt is
+the one the next step or file most likely extends.
+
+Step templates place the diff after their instructions, so the reusable
+prefix ends with the rules and repo context; each step still prefills
+its own instructions and the diff.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+# Shorter matches are a chat-template header at best; re-prefilling that
+# is cheaper than giving up a cache slot to it.
+_DEFAULT_MIN_PREFIX_TOKENS = 256
+
+
+@dataclass
+class PrefixEntry:
+    """One cached prompt prefix: its token ids and the opaque KV payload."""
+
+    tokens: tuple[int, ...]
+    payload: object
+
+    @property
+    def length(self) -> int:
+        return len(self.tokens)
+
+
+def common_prefix_length(left: tuple[int, ...], right: tuple[int, ...]) -> int:
+    """Length of the longest shared leading run of two token tuples.
+
+    Binary search over C-level tuple slice comparisons keeps a 16k-token
+    comparison to ~14 slice compares instead of a Python loop per token.
+    """
+    low, high = 0, min(len(left), len(right))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if left[:mid] == right[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+class PrefixCache:
+    """LRU store of prompt-prefix KV payloads under a byte budget.
+
+    ``bytes_per_token`` is the KV footprint of one cached token for the
+    loaded model; an entry costs ``length * bytes_per_token`` and the
+    least-recently used entries are dropped once the total exceeds
+    ``budget_bytes``. Dropping the last reference is what frees the VRAM.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int,
+        *,
+        bytes_per_token: int,
+        min_prefix_tokens: int = _DEFAULT_MIN_PREFIX_TOKENS,
+    ) -> None:
+        if budget_bytes < 1:
+            raise ValueError("budget_bytes must be positive")
+        if bytes_per_token < 1:
+            raise ValueError("bytes_per_token must be positive")
+        self._budget_bytes = budget_bytes
+        self._bytes_per_token = bytes_per_token
+        self._min_prefix_tokens = max(1, min_prefix_tokens)
+        self._entries: OrderedDict[int, PrefixEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def match(self, tokens: tuple[int, ...]) -> tuple[PrefixEntry | None, int]:
+        """Return the entry sharing the longest prefix with ``tokens``.
+
+        The matched length is capped at ``len(tokens) - 1`` because
+        generation needs at least one uncached input token to produce
+        logits from. Returns ``(None, 0)`` when no entry shares at least
+        ``min_prefix_tokens`` tokens.
+        """
+        limit = len(tokens) - 1
+        best: PrefixEntry | None = None
+        best_len = 0
+        with self._lock:
+            for entry in self._entries.values():
+                shared = min(common_prefix_length(entry.tokens, tokens), limit)
+                if shared > best_len:
+                    best, best_len = entry, shared
+            if best is None or best_len < self._min_prefix_tokens:
+                self._misses += 1
+                return None, 0
+            self._entries.move_to_end(id(best))
+            self._hits += 1
+            return best, best_len
+
+    def rekey(self, entry: PrefixEntry, tokens: tuple[int, ...]) -> None:
+        """Re-key ``entry`` to ``tokens`` and evict down to the byte budget.
+
+        Called after the caller cropped the payload to ``tokens``. An
+        identical entry already present is dropped as a duplicate, and an
+        entry that no longer fits the budget on its own is dropped.
+        """
+        with self._lock:
+            entry.tokens = tokens
+            for key, other in list(self._entries.items()):
+                if other is not entry and other.tokens == tokens:
+                    del self._entries[key]
+            if id(entry) not in self._entries:
+                return
+            if entry.length * self._bytes_per_token > self._budget_bytes:
+                del self._entries[id(entry)]
+                return
+            self._entries.move_to_end(id(entry))
+            while self._used_bytes_locked() > self._budget_bytes:
+                self._entries.popitem(last=False)
+
+    def store(self, tokens: tuple[int, ...], payload: object) -> None:
+        """Insert a new prefix entry and evict down to the byte budget."""
+        if len(tokens) < self._min_prefix_tokens:
+            return
+        if len(tokens) * self._bytes_per_token > self._budget_bytes:
+            return
+        entry = PrefixEntry(tokens=tokens, payload=payload)
+        with self._lock:
+            self._entries[id(entry)] = entry
+            while self._used_bytes_locked() > self._budget_bytes:
+                self._entries.popitem(last=False)
+
+    def discard(self, entry: PrefixEntry) -> None:
+        """Drop one entry whose payload can no longer be trusted."""
+        with self._lock:
+            self._entries.pop(id(entry), None)
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. to hand VRAM back after an OOM)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _used_bytes_locked(self) -> int:
+        return sum(e.length for e in self._entries.values()) * self._bytes_per_token
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._used_bytes_locked(),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+__all__ = ["PrefixCache", "PrefixEntry", "common_prefix_length"]
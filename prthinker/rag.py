@@ -18,23 +18,42 @@ from prthinker.schemas import RagRequest, RagResponse
 
 
 class RAGRetriever(ABC):
+    # True when ``retrieve_many`` costs about one ``retrieve`` however many
+    # prompts it gets; the per-file pipeline only prefetches through those.
+    batches_natively: bool = False
+
     @abstractmethod
     def retrieve(self, prompt: str) -> list[str]:
         ...
 
+    def retrieve_many(self, prompts: list[str]) -> list[list[str]]:
+        """Retrieve for several prompts at once, one doc list per prompt.
+
+        The default just loops ``retrieve``; implementations that can
+        batch the embedding forward and index search override it.
+        """
+        return [self.retrieve(prompt) for prompt in prompts]
+
 
 class NoOpRetriever(RAGRetriever):
     """Returns no rules — for runners without the embedding model installed."""
 
+    batches_natively = True
+
     def retrieve(self, prompt: str) -> list[str]:
         return []
 
+    def retrieve_many(self, prompts: list[str]) -> list[list[str]]:
+        return [[] for _ in prompts]
+
 
 class FaissRAGRetriever(RAGRetriever):
     """Wraps `codes.util.faiss_util.search_docs`.
 
-    The FAISS index is built once at module import time inside `faiss_util`;
-    instantiating this class is cheap after the first import.
+    `faiss_util` loads the embedding model at import and the rule index
+    lazily on the first search (or :meth:`warm`), from its persisted
+    artifact when one matches; instantiating this class is cheap after
+    the first import.
 
     ``threshold=None`` (the default) resolves to the calibrated value for
     the active embedding model (``EMB_MODEL``) — 0.32 for the default
@@ -42,6 +61,8 @@ class FaissRAGRetriever(RAGRetriever):
     Pass an explicit float to pin a specific cutoff.
     """
 
+    batches_natively = True
+
     def __init__(self, threshold: float | None = None) -> None:
         # Import is deferred so callers that pick NoOpRetriever do not pay
         # the embedding-model load cost.
@@ -57,6 +78,22 @@ class FaissRAGRetriever(RAGRetriever):
         docs, _scored = search_docs(query=prompt, threshold=self._threshold)
         return docs
 
+    def warm(self) -> None:
+        """Load (or build and persist) the rule index now, not on first use."""
+        from codes.util.faiss_util import get_index
+
+        get_index()
+
+    def retrieve_many(self, prompts: list[str]) -> list[list[str]]:
+        from codes.util.faiss_util import search_docs_many
+
+        return [
+            docs
+            for docs, _scored in search_docs_many(
+                list(prompts), threshold=self._threshold
+            )
+        ]
+
 
 class RemoteRAGRetriever(RAGRetriever):
     """Calls the FastAPI server's `/rag` endpoint — no local embedding model."""
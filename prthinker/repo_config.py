@@ -74,6 +74,8 @@ class _CacheSection(BaseModel):
     enabled: bool = False
     path: str = CACHE_DEFAULT
     ttl_days: float | None = 7.0
+    max_mb: float | None = None
+    eviction: str = "lru"  # "lru" | "lfu"
 
     model_config = ConfigDict(extra="forbid")
 
@@ -217,6 +219,8 @@ def _bookkeeping_defaults(cfg: RepoConfig) -> dict[str, Any]:
         "cache_enabled": cfg.cache.enabled,
         "cache_path": cfg.cache.path,
         "cache_ttl_days": cfg.cache.ttl_days,
+        "cache_max_mb": cfg.cache.max_mb,
+        "cache_eviction": cfg.cache.eviction,
         "telemetry_enabled": cfg.telemetry.enabled,
         "telemetry_path": cfg.telemetry.path,
         "calibration_store": cfg.calibration.path,
@@ -0,0 +1,180 @@
+"""Per-file embedding matrix behind :class:`SemanticRepoRetriever`.
+
+Semantic retrieval used to re-embed the query *and every code file* on
+each call, then rank with a pure-Python cosine over lists of floats —
+unusable beyond a few hundred files. :class:`FileEmbeddingStore` keeps
+one L2-normalised float32 row per file, keyed by path and content hash,
+so a query costs one encode, one matrix-vector product and an
+``argpartition``; :meth:`FileEmbeddingStore.sync` re-encodes only files
+whose content changed.
+
+With a ``directory`` the matrix is persisted as ``matrix.npy`` (loaded
+memory-mapped) next to a ``rows.json`` manifest naming the embedder, so
+a later run — or another process on the host — reuses it. A manifest
+written by a different embedder is ignored.
+
+numpy is imported lazily, like :mod:`prthinker.accepted`, so importing
+:mod:`prthinker.repo_retrieval` stays runner-safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Sequence
+
+if TYPE_CHECKING:
+    import numpy as np
+
+log = logging.getLogger(__name__)
+
+_MATRIX_FILE = "matrix.npy"
+_ROWS_FILE = "rows.json"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+
+
+def _normalised(vectors) -> "np.ndarray":
+    """Contiguous float32 rows scaled to unit length (zero rows stay zero)."""
+    import numpy as np
+
+    matrix = np.ascontiguousarray(np.asarray(vectors, dtype="float32"))
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class FileEmbeddingStore:
+    """path -> (content hash, unit vector) store over one work-tree.
+
+    ``model_key`` names the embedder; persisted rows from another key
+    are never reused. Thread-safe: per-file reviews query the retriever
+    from pool threads.
+    """
+
+    def __init__(self, directory: Path | None = None, *, model_key: str = "") -> None:
+        self._dir = Path(directory) if directory is not None else None
+        self._model_key = model_key
+        self._rows: list[tuple[str, str]] = []
+        self._matrix = None
+        self._lock = threading.Lock()
+        if self._dir is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _load(self) -> None:
+        import numpy as np
+
+        try:
+            manifest = json.loads((self._dir / _ROWS_FILE).read_text(encoding="utf-8"))
+            matrix = np.load(self._dir / _MATRIX_FILE, mmap_mode="r")
+        except (OSError, ValueError) as exc:
+            log.debug("semantic index at %s not loaded: %s", self._dir, exc)
+            return
+        rows = [tuple(row) for row in manifest.get("rows", [])]
+        if manifest.get("model") != self._model_key or matrix.shape[0] != len(rows):
+            log.info("semantic index at %s is stale; rebuilding", self._dir)
+            return
+        self._rows, self._matrix = rows, matrix
+
+    def sync(
+        self,
+        files: Sequence[tuple[str, str]],
+        embed: Callable[[list[str]], Sequence],
+    ) -> int:
+        """Match the store to ``files`` (``(rel, text)``); return rows encoded.
+
+        A row is reused when its content hash is unchanged — also across a
+        rename — and everything else is encoded in one ``embed`` call.
+        """
+        import numpy as np
+
+        hashes = [content_hash(text) for _rel, text in files]
+        with self._lock:
+            old_rows = {h: i for i, (_rel, h) in enumerate(self._rows)}
+            wanted = [(rel, h) for (rel, _text), h in zip(files, hashes)]
+            if wanted == self._rows:
+                return 0
+            fresh = [i for i, h in enumerate(hashes) if h not in old_rows]
+            encoded = _normalised(embed([files[i][1] for i in fresh])) if fresh else None
+            dim = (
+                encoded.shape[1] if encoded is not None
+                else self._matrix.shape[1] if self._matrix is not None else 0
+            )
+            if self._matrix is not None and self._matrix.shape[1] != dim:
+                # The embedder changed dimension under the same key; start over.
+                return self._rebuild_locked(files, hashes, embed)
+            matrix = np.empty((len(files), dim), dtype="float32")
+            reused = [pos for pos, h in enumerate(hashes) if h in old_rows]
+            if reused:
+                matrix[reused] = self._matrix[[old_rows[hashes[pos]] for pos in reused]]
+            if encoded is not None:
+                matrix[fresh] = encoded
+            self._rows, self._matrix = wanted, matrix
+            self._save_locked()
+        log.debug("semantic index: encoded %d of %d file(s)", len(fresh), len(files))
+        return len(fresh)
+
+    def _rebuild_locked(self, files, hashes, embed) -> int:
+        self._rows = [(rel, h) for (rel, _text), h in zip(files, hashes)]
+        self._matrix = _normalised(embed([text for _rel, text in files]))
+        self._save_locked()
+        return len(files)
+
+    def _save_locked(self) -> None:
+        if self._dir is None:
+            return
+        import numpy as np
+
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp = self._dir / (_MATRIX_FILE + ".tmp")
+            with open(tmp, "wb") as fh:
+                np.save(fh, self._matrix)
+            os.replace(tmp, self._dir / _MATRIX_FILE)
+            manifest = {"model": self._model_key, "rows": [list(r) for r in self._rows]}
+            tmp = self._dir / (_ROWS_FILE + ".tmp")
+            tmp.write_text(json.dumps(manifest), encoding="utf-8")
+            os.replace(tmp, self._dir / _ROWS_FILE)
+        except OSError as exc:
+            log.warning("semantic index not persisted to %s: %s", self._dir, exc)
+
+    def top_k(self, query_vector, k: int) -> list[tuple[float, str]]:
+        """The ``k`` most cosine-similar files, high-to-low (ties by path)."""
+        import numpy as np
+
+        with self._lock:
+            rows, matrix = self._rows, self._matrix
+        if not rows or k < 1:
+            return []
+        query = _normalised(query_vector)[0]
+        if query.shape[0] != matrix.shape[1]:
+            raise ValueError(
+                f"query vector has {query.shape[0]} dims, index has {matrix.shape[1]}"
+            )
+        scores = matrix @ query
+        if k < len(rows):
+            # Keep every row tied with the k-th score so the path tie-break
+            # matches a full sort.
+            kth = scores[np.argpartition(-scores, k - 1)[:k]].min()
+            candidates = np.flatnonzero(scores >= kth)
+        else:
+            candidates = np.arange(len(rows))
+        ranked = sorted(
+            ((float(scores[i]), rows[i][0]) for i in candidates),
+            key=lambda item: (-item[0], item[1]),
+        )
+        return ranked[:k]
+
+
+__all__ = ["FileEmbeddingStore", "content_hash"]
@@ -0,0 +1,278 @@
+"""Persistent inverted index behind :class:`LexicalRepoRetriever`.
+
+Indexing a work-tree — reading and tokenizing every code file, then
+computing IDF — used to happen once per retriever instance, i.e. once
+per review, and ranking scored every document against every query term.
+On a ~40k-file monorepo that dominated per-PR latency and was repeated
+for every PR against the same base commit.
+
+:class:`LexicalIndex` keeps term -> (file, tf) postings plus per-file
+length / name metadata in SQLite. :meth:`LexicalIndex.sync` takes the
+current ``(mtime_ns, size)`` of every in-scope file and re-tokenizes
+only files that are new or changed, dropping vanished ones; a query then
+reads just the postings of its own terms. With ``path=None`` the index
+lives in memory for the owner's lifetime (the old behaviour).
+
+Runner-safe: stdlib only. Tokenization stays in
+:mod:`prthinker.repo_retrieval`, which hands ``sync`` a loader callback,
+so this module never needs to know how a file is tokenized — only that
+the loader's tokenizer is identified by ``_INDEX_VERSION``.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Protocol
+
+log = logging.getLogger(__name__)
+
+# Bump when the tokenizer or schema changes: a stored index built by a
+# different tokenizer is dropped and rebuilt rather than mixed.
+_INDEX_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    rel         TEXT PRIMARY KEY,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    length      INTEGER NOT NULL,
+    basename    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_basename ON files (basename);
+CREATE TABLE IF NOT EXISTS postings (
+    term    TEXT NOT NULL,
+    rel     TEXT NOT NULL,
+    tf      INTEGER NOT NULL,
+    PRIMARY KEY (term, rel)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_rel ON postings (rel);
+CREATE TABLE IF NOT EXISTS path_terms (
+    term    TEXT NOT NULL,
+    rel     TEXT NOT NULL,
+    PRIMARY KEY (term, rel)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_path_terms_rel ON path_terms (rel);
+"""
+
+_DROP = """
+DROP TABLE IF EXISTS files;
+DROP TABLE IF EXISTS postings;
+DROP TABLE IF EXISTS path_terms;
+DELETE FROM meta;
+"""
+
+
+class IndexedFile(Protocol):
+    """What a ``sync`` loader returns for one file (``_Document`` fits)."""
+
+    body: dict[str, int]
+    path_tokens: set[str]
+    length: int
+    basename: str
+
+
+@dataclass
+class PostingsMatch:
+    """One candidate file: its tf for the query terms and name metadata.
+
+    ``path_tokens`` holds only the path tokens that matched the query's
+    identifier hints, which is all the filename boost needs.
+    """
+
+    rel: str
+    body: dict[str, int] = field(default_factory=dict)
+    length: int = 0
+    basename: str = ""
+    path_tokens: set[str] = field(default_factory=set)
+
+
+def _placeholders(values: list) -> str:
+    # Only "?" markers are spliced into SQL; the values themselves are
+    # always bound, hence the ``nosec B608`` on the IN (...) queries.
+    return ",".join("?" * len(values))
+
+
+class LexicalIndex:
+    """SQLite term -> postings store for one work-tree.
+
+    One connection guarded by a lock: per-file reviews query the repo
+    retriever from pool threads, and in-memory SQLite databases cannot
+    be shared across connections.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = Path(path) if path is not None else None
+        if self._path is not None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self._path) if self._path is not None else ":memory:",
+            check_same_thread=False,
+            timeout=30.0,
+        )
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._check_version()
+
+    def _check_version(self) -> None:
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is not None and row[0] == _INDEX_VERSION:
+            return
+        if row is not None:
+            log.info("repo index %s built by tokenizer v%s; rebuilding", self._path, row[0])
+            self._conn.executescript(_DROP)
+            self._conn.executescript(_SCHEMA)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (_INDEX_VERSION,),
+            )
+
+    def sync(
+        self,
+        stats: dict[str, tuple[int, int]],
+        load: Callable[[str], IndexedFile | None],
+    ) -> int:
+        """Bring the index in line with ``stats``; return files re-indexed.
+
+        ``stats`` maps every in-scope relative path to its current
+        ``(mtime_ns, size)``. Files whose stored pair differs (or that are
+        new) are loaded and re-tokenized; files absent from ``stats`` are
+        dropped. A loader returning None (unreadable file) leaves the file
+        out until a later sync.
+        """
+        with self._lock:
+            stored = {
+                rel: (mtime, size)
+                for rel, mtime, size in self._conn.execute(
+                    "SELECT rel, mtime_ns, size FROM files"
+                )
+            }
+            changed = [rel for rel, stat in stats.items() if stored.get(rel) != stat]
+            gone = [rel for rel in stored if rel not in stats]
+            with self._conn:
+                for rel in gone + [rel for rel in changed if rel in stored]:
+                    self._delete_locked(rel)
+                for rel in changed:
+                    doc = load(rel)
+                    if doc is not None:
+                        self._insert_locked(rel, stats[rel], doc)
+        if changed or gone:
+            log.debug(
+                "repo index: %d file(s) re-indexed, %d dropped", len(changed), len(gone)
+            )
+        return len(changed) + len(gone)
+
+    def _delete_locked(self, rel: str) -> None:
+        self._conn.execute("DELETE FROM postings WHERE rel = ?", (rel,))
+        self._conn.execute("DELETE FROM path_terms WHERE rel = ?", (rel,))
+        self._conn.execute("DELETE FROM files WHERE rel = ?", (rel,))
+
+    def _insert_locked(
+        self, rel: str, stat: tuple[int, int], doc: IndexedFile
+    ) -> None:
+        self._conn.execute(
+            "INSERT INTO files (rel, mtime_ns, size, length, basename)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (rel, stat[0], stat[1], doc.length, doc.basename),
+        )
+        self._conn.executemany(
+            "INSERT INTO postings (term, rel, tf) VALUES (?, ?, ?)",
+            ((term, rel, tf) for term, tf in doc.body.items()),
+        )
+        self._conn.executemany(
+            "INSERT INTO path_terms (term, rel) VALUES (?, ?)",
+            ((term, rel) for term in doc.path_tokens),
+        )
+
+    def corpus_stats(self) -> tuple[int, int]:
+        """``(document count, total token length)`` over the whole index."""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0) FROM files"
+            ).fetchone()
+        return int(count), int(total)
+
+    def doc_freqs(self, terms: Iterable[str]) -> dict[str, int]:
+        """Number of files containing each of ``terms`` (absent terms omitted)."""
+        terms = list(terms)
+        if not terms:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT term, COUNT(*) FROM postings"  # nosec B608
+                f" WHERE term IN ({_placeholders(terms)}) GROUP BY term",
+                terms,
+            ).fetchall()
+        return {term: int(df) for term, df in rows}
+
+    def matches(
+        self,
+        terms: Iterable[str],
+        basenames: Iterable[str] = (),
+        path_terms: Iterable[str] = (),
+    ) -> dict[str, PostingsMatch]:
+        """Every file that contains a query term or matches a name hint."""
+        terms, basenames, path_terms = list(terms), list(basenames), list(path_terms)
+        found: dict[str, PostingsMatch] = {}
+
+        def entry(rel: str) -> PostingsMatch:
+            return found.setdefault(rel, PostingsMatch(rel))
+
+        with self._lock:
+            if terms:
+                for term, rel, tf, length in self._conn.execute(
+                    "SELECT p.term, p.rel, p.tf, f.length FROM postings p"  # nosec B608
+                    " JOIN files f ON f.rel = p.rel"
+                    f" WHERE p.term IN ({_placeholders(terms)})",
+                    terms,
+                ):
+                    match = entry(rel)
+                    match.body[term] = tf
+                    match.length = length
+            if basenames:
+                for rel, basename, length in self._conn.execute(
+                    "SELECT rel, basename, length FROM files"  # nosec B608
+                    f" WHERE basename IN ({_placeholders(basenames)})",
+                    basenames,
+                ):
+                    match = entry(rel)
+                    match.basename, match.length = basename, length
+            if path_terms:
+                for term, rel in self._conn.execute(
+                    "SELECT term, rel FROM path_terms"  # nosec B608
+                    f" WHERE term IN ({_placeholders(path_terms)})",
+                    path_terms,
+                ):
+                    entry(rel).path_tokens.add(term)
+        return found
+
+    def first_paths(self, limit: int, exclude: set[str]) -> list[str]:
+        """The first ``limit`` indexed paths in sort order, skipping ``exclude``."""
+        out: list[str] = []
+        if limit <= 0:
+            return out
+        with self._lock:
+            for (rel,) in self._conn.execute("SELECT rel FROM files ORDER BY rel"):
+                if rel not in exclude:
+                    out.append(rel)
+                    if len(out) >= limit:
+                        break
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["IndexedFile", "LexicalIndex", "PostingsMatch"]
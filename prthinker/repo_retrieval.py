@@ -8,21 +8,32 @@ review pipeline can use it to gather cross-file context, and the benchmark
 harness uses it to answer repository-context-localisation datasets instead of
 asking the model to guess file paths from the issue text alone.
 
-Runner-safe: pure stdlib (``re`` / ``math`` / ``collections`` / ``pathlib``),
-no torch / faiss / transformers. The lexical strategy needs no model, so it
-runs anywhere the work-tree is checked out.
+Runner-safe: pure stdlib (``re`` / ``math`` / ``collections`` / ``pathlib``
+/ ``sqlite3``), no torch / faiss / transformers. The lexical strategy needs
+no model, so it runs anywhere the work-tree is checked out; its inverted
+index (:mod:`prthinker.repo_index`) persists under ``.git`` between runs.
 """
 
 from __future__ import annotations
 
+import heapq
+import logging
 import math
+import os
 import re
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
 from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterator, Protocol
 
+from prthinker.repo_embeddings import FileEmbeddingStore
+from prthinker.repo_index import LexicalIndex
+
+log = logging.getLogger(__name__)
+
 _CODE_SUFFIXES = frozenset({
     ".py", ".js", ".jsx", ".ts", ".tsx", ".java", ".go", ".rs",
     ".c", ".cc", ".cpp", ".h", ".hpp", ".rb", ".php",
@@ -116,18 +127,28 @@ class _Document:
     basename: str
 
 
-def _iter_code_files(workdir: Path) -> Iterator[tuple[str, str]]:
-    """Yield ``(relative_posix_path, text)`` for each in-scope code file."""
+def _iter_code_paths(workdir: Path) -> Iterator[tuple[str, Path, os.stat_result]]:
+    """Yield ``(relative_posix_path, path, stat)`` for each in-scope code file."""
     for path in workdir.rglob("*"):
         if not path.is_file() or path.suffix.lower() not in _CODE_SUFFIXES:
             continue
         try:
-            if path.stat().st_size > _MAX_FILE_BYTES:
-                continue
+            stat = path.stat()
+        except OSError:
+            continue
+        if stat.st_size > _MAX_FILE_BYTES:
+            continue
+        yield path.relative_to(workdir).as_posix(), path, stat
+
+
+def _iter_code_files(workdir: Path) -> Iterator[tuple[str, str]]:
+    """Yield ``(relative_posix_path, text)`` for each in-scope code file."""
+    for rel, path, _stat in _iter_code_paths(workdir):
+        try:
             text = path.read_text(encoding="utf-8", errors="ignore")
         except OSError:
             continue
-        yield path.relative_to(workdir).as_posix(), text
+        yield rel, text
 
 
 def _index_document(rel: str, text: str) -> _Document:
@@ -144,23 +165,35 @@ def _index_document(rel: str, text: str) -> _Document:
     )
 
 
+def _load_document(workdir: Path, rel: str) -> _Document | None:
+    """Read and index one file, or None when it cannot be read."""
+    try:
+        text = (workdir / rel).read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return None
+    return _index_document(rel, text)
+
+
+def _idf_from_freqs(doc_freq: dict[str, int], n_docs: int) -> dict[str, float]:
+    """BM25 inverse-document-frequency from per-term document counts."""
+    n_docs = n_docs or 1
+    return {
+        term: math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        for term, df in doc_freq.items()
+    }
+
+
 def _compute_idf(docs: list[_Document]) -> dict[str, float]:
     """BM25 inverse-document-frequency for every term in the corpus."""
     doc_freq: Counter = Counter()
     for doc in docs:
         for term in doc.body:
             doc_freq[term] += 1
-    n_docs = len(docs) or 1
-    return {
-        term: math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
-        for term, df in doc_freq.items()
-    }
+    return _idf_from_freqs(doc_freq, len(docs))
 
 
-def _bm25_score(
-    doc: _Document, terms: Counter, idf: dict[str, float], avg_len: float
-) -> float:
-    """BM25 relevance of one file against the weighted query terms."""
+def _bm25_score(doc, terms: Counter, idf: dict[str, float], avg_len: float) -> float:
+    """BM25 relevance of one file (``_Document`` / ``PostingsMatch``)."""
     score = 0.0
     for term, qweight in terms.items():
         freq = doc.body.get(term, 0)
@@ -171,7 +204,7 @@ def _bm25_score(
     return score
 
 
-def _filename_boost(doc: _Document, expansion: QueryExpansion) -> float:
+def _filename_boost(doc, expansion: QueryExpansion) -> float:
     """Additive boost when a file's name matches a mined path/identifier."""
     bonus = 0.0
     if doc.basename in expansion.path_hints:
@@ -198,6 +231,7 @@ class LexicalRepoRetriever(RepoContextRetriever):
         max_spans_per_file: int = _DEFAULT_MAX_SPANS,
         span_context: int = _DEFAULT_SPAN_CONTEXT,
         keep_ratio: float | None = None,
+        persist_index: bool = True,
     ) -> None:
         self._top_k = max(1, top_k)
         self._max_spans = max(0, max_spans_per_file)
@@ -207,24 +241,44 @@ class LexicalRepoRetriever(RepoContextRetriever):
         # precision is not capped by always emitting the full top_k). ``None``
         # keeps the fixed top_k behaviour.
         self._keep_ratio = keep_ratio
-        # Corpus + IDF memo keyed by workdir: retriever instances are
-        # per-review, so the work-tree is read and indexed once per
-        # retriever lifetime instead of on every query (structural
-        # expansion retrieves twice per query, iterative once per round).
-        self._index_cache: dict[Path, tuple[list[_Document], dict[str, float]]] = {}
-
-    def _corpus(self, workdir: Path) -> tuple[list[_Document], dict[str, float]]:
-        """Indexed documents + IDF for ``workdir``, built once and memoized."""
+        # Inverted index per workdir, synced once per retriever lifetime
+        # (structural expansion retrieves twice per query, iterative once
+        # per round). With ``persist_index`` a git checkout keeps it under
+        # ``.git``, so the next review only re-tokenizes changed files.
+        self._persist_index = persist_index
+        self._index_cache: dict[Path, LexicalIndex] = {}
+        self._index_lock = threading.Lock()
+
+    def _index_path(self, workdir: Path) -> Path | None:
+        """On-disk index location for ``workdir``, or None to stay in memory."""
+        git_dir = workdir / ".git"
+        if not self._persist_index or not git_dir.is_dir():
+            return None
+        return git_dir / "prthinker" / "lexical_index.sqlite"
+
+    def _open_index(self, workdir: Path) -> LexicalIndex:
+        path = self._index_path(workdir)
+        if path is not None:
+            try:
+                return LexicalIndex(path)
+            except (OSError, sqlite3.Error) as exc:
+                log.warning("repo index %s unusable (%s); indexing in memory", path, exc)
+        return LexicalIndex()
+
+    def _corpus(self, workdir: Path) -> LexicalIndex:
+        """The synced inverted index for ``workdir``, built once and memoized."""
         key = workdir.resolve()
-        cached = self._index_cache.get(key)
-        if cached is None:
-            docs = [
-                _index_document(rel, text)
-                for rel, text in _iter_code_files(workdir)
-            ]
-            cached = (docs, _compute_idf(docs))
-            self._index_cache[key] = cached
-        return cached
+        with self._index_lock:
+            index = self._index_cache.get(key)
+            if index is None:
+                index = self._open_index(key)
+                stats = {
+                    rel: (stat.st_mtime_ns, stat.st_size)
+                    for rel, _path, stat in _iter_code_paths(workdir)
+                }
+                index.sync(stats, lambda rel: _load_document(workdir, rel))
+                self._index_cache[key] = index
+        return index
 
     def retrieve(self, query: str, workdir: Path) -> RepoContext:
         """Rank the work-tree's code files against the expanded query."""
@@ -232,35 +286,54 @@ class LexicalRepoRetriever(RepoContextRetriever):
         if not workdir.is_dir():
             raise FileNotFoundError(workdir)
         expansion = expand_query(query)
-        docs, idf = self._corpus(workdir)
-        if not docs:
+        index = self._corpus(workdir)
+        n_docs, total_length = index.corpus_stats()
+        if not n_docs:
             return RepoContext()
-        scored = self._rank(docs, expansion, idf)
-        top = self._select(scored)
+        idf = _idf_from_freqs(index.doc_freqs(expansion.terms), n_docs)
+        scored = self._rank(index, expansion, idf, total_length / n_docs, self._top_k)
+        top = [
+            _load_document(workdir, rel) or _index_document(rel, "")
+            for rel in self._select(scored)
+        ]
         spans = {d.rel: self._spans(d, expansion.terms, idf) for d in top}
         symbols = {d.rel: self._symbols(d, spans[d.rel]) for d in top}
         return RepoContext(tuple(d.rel for d in top), spans, symbols)
 
     @staticmethod
     def _rank(
-        docs: list[_Document], expansion: QueryExpansion, idf: dict[str, float]
-    ) -> list[tuple[float, _Document]]:
-        """Score docs by BM25 + filename boost, sorted high-to-low (ties by path)."""
-        avg_len = sum(d.length for d in docs) / len(docs)
-        scored = [
-            (_bm25_score(d, expansion.terms, idf, avg_len) + _filename_boost(d, expansion), d)
-            for d in docs
-        ]
-        scored.sort(key=lambda item: (-item[0], item[1].rel))
-        return scored
+        index: LexicalIndex,
+        expansion: QueryExpansion,
+        idf: dict[str, float],
+        avg_len: float,
+        limit: int,
+    ) -> list[tuple[float, str]]:
+        """Top ``limit`` files by BM25 + filename boost, high-to-low (ties by path).
+
+        Only files holding a query term or matching a name hint can score
+        above zero, so just their postings are read and a heap keeps the
+        top ``limit``. Short lists are padded with zero-score files in path
+        order, as a full sort of the corpus would.
+        """
+        matches = index.matches(
+            expansion.terms, expansion.path_hints, expansion.ident_hints
+        )
+        scored = (
+            (_bm25_score(m, expansion.terms, idf, avg_len) + _filename_boost(m, expansion), rel)
+            for rel, m in matches.items()
+        )
+        top = heapq.nsmallest(limit, scored, key=lambda item: (-item[0], item[1]))
+        if len(top) < limit:
+            top += [(0.0, rel) for rel in index.first_paths(limit - len(top), set(matches))]
+        return top
 
-    def _select(self, scored: list[tuple[float, _Document]]) -> list[_Document]:
+    def _select(self, scored: list[tuple[float, str]]) -> list[str]:
         """Take the top_k, then drop the low-confidence tail below keep_ratio."""
         ranked = scored[: self._top_k]
         if not ranked or self._keep_ratio is None:
-            return [doc for _, doc in ranked]
+            return [rel for _, rel in ranked]
         threshold = self._keep_ratio * ranked[0][0]
-        kept = [doc for score, doc in ranked if score >= threshold]
+        kept = [rel for score, rel in ranked if score >= threshold]
         return kept or [ranked[0][1]]
 
     def _spans(
@@ -356,15 +429,15 @@ class Embedder(ABC):
 
     @abstractmethod
     def embed(self, texts: list[str]) -> list[list[float]]:
-        """Return one vector per input text, in order."""
+        """Return one vector per input text, in order (lists or a 2-D array)."""
 
+    def cache_key(self) -> str:
+        """Stable identity of the embedding space; ``""`` disables persistence.
 
-def _cosine(vec_a: list[float], vec_b: list[float]) -> float:
-    """Cosine similarity of two vectors (0.0 when either has zero norm)."""
-    dot = sum(x * y for x, y in zip(vec_a, vec_b))
-    norm_a = math.sqrt(sum(x * x for x in vec_a))
-    norm_b = math.sqrt(sum(y * y for y in vec_b))
-    return dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+        Stored file vectors are only reused by an embedder with the same
+        key, so a key must change whenever the vectors would.
+        """
+        return ""
 
 
 class SentenceTransformerEmbedder(Embedder):
@@ -379,13 +452,16 @@ class SentenceTransformerEmbedder(Embedder):
         self._model_name = model_name
         self._model = None
 
-    def embed(self, texts: list[str]) -> list[list[float]]:
-        """Encode texts, loading the model on the first call."""
+    def embed(self, texts: list[str]):
+        """Encode texts to a float32 matrix, loading the model on the first call."""
         if self._model is None:
             from sentence_transformers import SentenceTransformer  # noqa: PLC0415
 
             self._model = SentenceTransformer(self._model_name)
-        return [[float(x) for x in vector] for vector in self._model.encode(texts)]
+        return self._model.encode(texts, convert_to_numpy=True)
+
+    def cache_key(self) -> str:
+        return f"sentence-transformers:{self._model_name}"
 
 
 class SemanticRepoRetriever(RepoContextRetriever):
@@ -394,27 +470,57 @@ class SemanticRepoRetriever(RepoContextRetriever):
     The embedder is injected (Dependency Injection): tests supply a
     deterministic fake, production supplies a sentence-transformers model via
     the factory. Requires an embedding backend to run — no lexical fallback.
+    File vectors live in a :class:`FileEmbeddingStore` synced once per
+    workdir per retriever; with ``persist_index`` and an embedder that has
+    a ``cache_key``, a git checkout keeps them under ``.git`` so later runs
+    only encode changed files. Needs numpy at query time.
     """
 
-    def __init__(self, embedder: Embedder, *, top_k: int = _DEFAULT_TOP_K) -> None:
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        top_k: int = _DEFAULT_TOP_K,
+        persist_index: bool = True,
+    ) -> None:
         self._embedder = embedder
         self._top_k = max(1, top_k)
+        self._persist_index = persist_index
+        self._stores: dict[Path, FileEmbeddingStore] = {}
+        self._stores_lock = threading.Lock()
+
+    def _store_dir(self, workdir: Path) -> Path | None:
+        """On-disk store location for ``workdir``, or None to stay in memory."""
+        key = self._embedder.cache_key()
+        git_dir = workdir / ".git"
+        if not (self._persist_index and key and git_dir.is_dir()):
+            return None
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", key)
+        return git_dir / "prthinker" / "semantic" / slug
+
+    def _store(self, workdir: Path) -> FileEmbeddingStore:
+        """The synced embedding store for ``workdir``, built once and memoized."""
+        key = workdir.resolve()
+        with self._stores_lock:
+            store = self._stores.get(key)
+            if store is None:
+                store = FileEmbeddingStore(
+                    self._store_dir(key), model_key=self._embedder.cache_key()
+                )
+                store.sync(list(_iter_code_files(workdir)), self._embedder.embed)
+                self._stores[key] = store
+        return store
 
     def retrieve(self, query: str, workdir: Path) -> RepoContext:
-        """Embed the query and every file, ranking files by cosine similarity."""
+        """Embed the query and rank files by cosine similarity to it."""
         workdir = Path(workdir)
         if not workdir.is_dir():
             raise FileNotFoundError(workdir)
-        files = list(_iter_code_files(workdir))
-        if not files:
+        store = self._store(workdir)
+        if not len(store):
             return RepoContext()
-        vectors = self._embedder.embed([query] + [text for _, text in files])
-        query_vec = vectors[0]
-        scored = sorted(
-            ((_cosine(query_vec, vec), rel) for vec, (rel, _) in zip(vectors[1:], files)),
-            key=lambda item: (-item[0], item[1]),
-        )
-        return RepoContext(tuple(rel for _, rel in scored[: self._top_k]))
+        query_vec = self._embedder.embed([query])[0]
+        return RepoContext(tuple(rel for _, rel in store.top_k(query_vec, self._top_k)))
 
 
 # --- LLM re-ranking (RAG retrieval + model localisation) -----------------
@@ -157,9 +157,15 @@ def _gather_telemetry(inputs: ReportInputs) -> dict[str, object]:
 def _gather_cache(inputs: ReportInputs) -> dict[str, object]:
     """Read cache fill + lifetime-hit totals."""
     if not inputs.cache_path.exists():
-        return {"entries": 0, "hits": 0}
+        return {"entries": 0, "hits": 0, "bytes": 0, "hit_ratio": 0.0, "evictions": 0}
     cstats = PromptCache(inputs.cache_path).stats()
-    return {"entries": cstats.total_entries, "hits": cstats.total_hits}
+    return {
+        "entries": cstats.total_entries,
+        "hits": cstats.total_hits,
+        "bytes": cstats.bytes_stored,
+        "hit_ratio": round(cstats.hit_ratio, 4),
+        "evictions": cstats.evictions,
+    }
 
 
 def _gather_dismissed(inputs: ReportInputs) -> dict[str, object]:
@@ -225,7 +231,10 @@ def _md_cache_section(cache: dict[str, object]) -> list[str]:
         "## Cache",
         "",
         f"- entries: **{cache['entries']}**\n"
-        f"- lifetime hits: **{cache['hits']}**",
+        f"- lifetime hits: **{cache['hits']}**\n"
+        f"- hit ratio: **{float(cache.get('hit_ratio', 0.0)):.1%}**\n"
+        f"- stored: **{int(cache.get('bytes', 0)) / 1_048_576:.1f} MB**, "
+        f"evictions: **{cache.get('evictions', 0)}**",
     ]
 
 
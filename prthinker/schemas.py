@@ -18,9 +18,17 @@ Severity = Literal["info", "warning", "error"]
 SEVERITY_ORDER: tuple[str, ...] = ("error", "warning", "info")
 
 
+# Server scheduling class: interactive work is dispatched before normal
+# reviews, which go before bulk (CI matrix shard) reviews.
+JobPriority = Literal["interactive", "normal", "bulk"]
+
+
 class AskRequest(BaseModel):
     prompt: str
     max_new_tokens: int = Field(default=32768, ge=1, le=32768)
+    priority: JobPriority = "normal"
+    # Fair-share key (repository or client name); "" shares one bucket.
+    client_id: str = ""
 
 
 class RagRequest(BaseModel):
@@ -205,6 +213,9 @@ class ReviewRequest(BaseModel):
     # backward-compatible default so old runners keep working; the server
     # treats any unknown value as "full".
     step_plan: str = "full"
+    priority: JobPriority = "normal"
+    # Fair-share key (repository or client name); "" shares one bucket.
+    client_id: str = ""
 
 
 JobStatus = Literal["pending", "running", "done", "error", "cancelled"]
@@ -219,6 +230,46 @@ class ReviewJobStatusResponse(BaseModel):
     status: JobStatus
     result: "ReviewResponse | None" = None
     error: str | None = None
+    # 1-based place in the server's dispatch order and total queued jobs,
+    # set only while the job is pending.
+    queue_position: int | None = None
+    queue_depth: int | None = None
+
+
+# Upper bound on files per /review/batch job; larger PRs split into
+# several batches client-side.
+MAX_BATCH_FILES = 256
+
+
+class ReviewBatchRequest(BaseModel):
+    """Several per-file reviews submitted as one job."""
+
+    requests: list[ReviewRequest] = Field(min_length=1, max_length=MAX_BATCH_FILES)
+
+
+class ReviewBatchItem(BaseModel):
+    """One finished file of a batch job; ``index`` points into ``requests``."""
+
+    index: int
+    file_path: str | None = None
+    status: JobStatus
+    result: "ReviewResponse | None" = None
+    error: str | None = None
+
+
+class ReviewBatchStatusResponse(BaseModel):
+    """Batch progress. ``items`` holds only files finished since ``cursor``
+    was requested; pass the returned ``cursor`` back on the next poll."""
+
+    job_id: str
+    status: JobStatus
+    total: int
+    completed: int
+    cursor: int
+    items: list[ReviewBatchItem] = Field(default_factory=list)
+    error: str | None = None
+    queue_position: int | None = None
+    queue_depth: int | None = None
 
 
 class AskJobSubmitResponse(BaseModel):
@@ -230,6 +281,22 @@ class AskJobStatusResponse(BaseModel):
     status: JobStatus
     result: str | None = None
     error: str | None = None
+    queue_position: int | None = None
+    queue_depth: int | None = None
+
+
+class AskStreamStatusResponse(BaseModel):
+    """Streamed /ask output. ``items`` holds the text chunks decoded since
+    ``cursor`` was requested; pass the returned ``cursor`` back on the
+    next poll. Joined in order they are the job's ``result``."""
+
+    job_id: str
+    status: JobStatus
+    cursor: int
+    items: list[str] = Field(default_factory=list)
+    error: str | None = None
+    queue_position: int | None = None
+    queue_depth: int | None = None
 
 
 Verdict = Literal["approve", "request_changes", "comment"]
@@ -415,12 +482,14 @@ class ReviewResponse(BaseModel):
 
 
 ReviewJobStatusResponse.model_rebuild()
+ReviewBatchItem.model_rebuild()
 
 
 __all__ = [
     "ApiDriftFinding",
     "ApiDriftKind",
     "AskRequest",
+    "AskStreamStatusResponse",
     "CitationKind",
     "CounterfactualBlock",
     "CounterfactualOption",
@@ -439,7 +508,11 @@ __all__ = [
     "AskJobSubmitResponse",
     "JobStatus",
     "RagRequest",
+    "MAX_BATCH_FILES",
     "RagResponse",
+    "ReviewBatchItem",
+    "ReviewBatchRequest",
+    "ReviewBatchStatusResponse",
     "ReviewJobStatusResponse",
     "ReviewJobSubmitResponse",
     "ReviewRequest",
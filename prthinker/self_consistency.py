@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Protocol
 
 _WHITESPACE_RE = re.compile(r"\s+")
@@ -20,12 +21,67 @@ class _GenerateBackend(Protocol):
         """Return generated text for ``prompt``."""
 
 
+class _SamplingBackend(_GenerateBackend, Protocol):
+    """A backend that can return several samples of one prompt per call.
+
+    ``LocalHFBackend`` decodes them as one batch over a shared prefill;
+    ``OpenAICompatBackend`` uses the ``n`` request parameter. Fewer than
+    ``n`` samples may come back.
+    """
+
+    def generate_samples(self, prompt: str, max_new_tokens: int, n: int) -> list[str]:
+        """Return up to ``n`` (at least one) samples for ``prompt``."""
+
+
 def _normalize(text: str) -> str:
     """Return a comparison key: lowercase, collapsed whitespace, no end punctuation."""
     collapsed = _WHITESPACE_RE.sub(" ", text).strip().lower()
     return collapsed.rstrip(_TRAILING_PUNCT).strip()
 
 
+def _leader_and_runner_up(counts: Counter[str]) -> tuple[int, int]:
+    """Vote counts of the two most frequent keys (0 when absent)."""
+    top = [count for _key, count in counts.most_common(2)]
+    top += [0] * (2 - len(top))
+    return top[0], top[1]
+
+
+def _samples_to_settle(counts: Counter[str], remaining: int) -> int:
+    """Fewest further samples that could give one key an unassailable lead.
+
+    Returns 0 when the leader already beats the runner-up even if every
+    remaining sample went to the runner-up.
+    """
+    leader, runner_up = _leader_and_runner_up(counts)
+    if leader > runner_up + remaining:
+        return 0
+    # Smallest r with leader + r > runner_up + (remaining - r).
+    return min(remaining, (runner_up + remaining - leader) // 2 + 1)
+
+
+def _sample(backend: _GenerateBackend, prompt: str, n: int, max_new_tokens: int) -> list[str]:
+    """Draw ``n`` samples: one batched call if supported, else concurrent calls."""
+    sampler = getattr(backend, "generate_samples", None)
+    if callable(sampler):
+        samples = list(sampler(prompt, max_new_tokens, n))[:n]
+        if not samples:
+            raise RuntimeError("generate_samples returned no samples")
+        return samples
+    if n == 1:
+        return [backend.generate(prompt, max_new_tokens=max_new_tokens)]
+    limit = getattr(backend, "max_concurrency", None)
+    workers = min(n, max(1, int(limit()))) if callable(limit) else 1
+    if workers == 1:
+        return [backend.generate(prompt, max_new_tokens=max_new_tokens) for _ in range(n)]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="self-consistency") as pool:
+        return list(
+            pool.map(
+                lambda _: backend.generate(prompt, max_new_tokens=max_new_tokens),
+                range(n),
+            )
+        )
+
+
 def self_consistent_generate(
     backend: _GenerateBackend,
     prompt: str,
@@ -33,24 +89,33 @@ def self_consistent_generate(
     k: int = _DEFAULT_K,
     max_new_tokens: int = _DEFAULT_MAX_NEW_TOKENS,
 ) -> str:
-    """Sample ``backend`` ``k`` times and return the majority output.
+    """Sample ``backend`` up to ``k`` times and return the majority output.
 
     Outputs are grouped by a normalized key (lowercase + collapsed
     whitespace); the original text of the most frequent group is
     returned. Ties are broken by first-seen order. When ``k <= 1`` a
     single call is made and its raw output returned unchanged.
+
+    Samples are drawn in rounds sized to the fewest that could settle the
+    vote — ``k // 2 + 1`` first — and sampling stops as soon as one key
+    leads by more than the samples left to draw, which cannot change the
+    winner. A round is one ``generate_samples`` call on backends that
+    offer it (see :class:`_SamplingBackend`), otherwise concurrent
+    ``generate`` calls bounded by ``max_concurrency()``.
     """
     if k <= 1:
         return backend.generate(prompt, max_new_tokens=max_new_tokens)
 
-    samples = [
-        backend.generate(prompt, max_new_tokens=max_new_tokens)
-        for _ in range(k)
-    ]
-    counts: Counter[str] = Counter(_normalize(sample) for sample in samples)
+    counts: Counter[str] = Counter()
     first_text_by_key: dict[str, str] = {}
-    for sample in samples:
-        first_text_by_key.setdefault(_normalize(sample), sample)
+    remaining = k
+    while (size := _samples_to_settle(counts, remaining)) > 0:
+        for sample in _sample(backend, prompt, size, max_new_tokens):
+            key = _normalize(sample)
+            counts[key] += 1
+            first_text_by_key.setdefault(key, sample)
+            remaining -= 1
 
-    best_key = max(samples, key=lambda sample: counts[_normalize(sample)])
-    return first_text_by_key[_normalize(best_key)]
+    # ``max`` returns the first maximal key in insertion (first-seen) order.
+    best_key = max(first_text_by_key, key=counts.__getitem__)
+    return first_text_by_key[best_key]
@@ -0,0 +1,175 @@
+"""Bounded, optionally persistent store for step-DAG node results.
+
+``execute_detailed`` takes any ``MutableMapping`` as its node-result
+cache. A plain dict grows without bound in a long-lived server and is
+lost when a CI runner exits, so a re-run after a comment-only push paid
+for every step again. :class:`StepResultCache` is the drop-in
+replacement: an in-process LRU capped at ``max_entries``, optionally
+backed by a SQLite file that survives between runs and is itself capped
+at ``max_disk_entries`` (least-recently used rows are pruned).
+
+Keys are opaque content hashes produced by the caller — the pipeline
+hashes the rendered step prompt plus the model identity — so a hit is
+only possible when every input the step reads is unchanged; there is no
+explicit invalidation. Values must be JSON-serialisable (step outputs
+are strings).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS step_results (
+    key         TEXT PRIMARY KEY,
+    value_json  TEXT NOT NULL,
+    last_used   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_step_results_last_used
+    ON step_results (last_used);
+"""
+
+
+class StepResultCache(MutableMapping):
+    """LRU mapping of content key -> step result with optional SQLite spill.
+
+    Thread-safe: DAG nodes of concurrent per-file reviews read and write
+    it from pool workers. Each thread keeps its own SQLite connection
+    (sqlite3 connections must stay on their opening thread), like
+    :class:`prthinker.review_cache.ReviewCache`.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        max_entries: int = 256,
+        max_disk_entries: int = 20000,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_disk_entries < 1:
+            raise ValueError("max_disk_entries must be at least 1")
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._max_entries = max_entries
+        self._max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        self._path = Path(path) if path is not None else None
+        self._local = threading.local()
+        if self._path is not None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's lazily-created autocommit connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self._path), isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def __getitem__(self, key: str) -> Any:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        value = self._load(key)
+        self._remember(key, value)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        if self._path is not None:
+            self._spill(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            found = self._memory.pop(key, _MISSING) is not _MISSING
+        if self._path is not None:
+            cur = self._conn().execute("DELETE FROM step_results WHERE key = ?", (key,))
+            found = found or bool(cur.rowcount)
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._path is None:
+            with self._lock:
+                return iter(list(self._memory))
+        rows = self._conn().execute("SELECT key FROM step_results").fetchall()
+        with self._lock:
+            keys = dict.fromkeys(self._memory)
+        keys.update(dict.fromkeys(row[0] for row in rows))
+        return iter(list(keys))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Any:
+        if self._path is None:
+            raise KeyError(key)
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT value_json FROM step_results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        try:
+            value = json.loads(row[0])
+        except json.JSONDecodeError as exc:
+            log.warning("step_results row %s corrupted: %s", key[:12], exc)
+            conn.execute("DELETE FROM step_results WHERE key = ?", (key,))
+            raise KeyError(key) from exc
+        conn.execute(
+            "UPDATE step_results SET last_used = ? WHERE key = ?",
+            (time.time(), key),
+        )
+        return value
+
+    def _spill(self, key: str, value: Any) -> None:
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            log.debug("step result %s is not JSON-serialisable; memory only", key[:12])
+            return
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO step_results (key, value_json, last_used)"
+            " VALUES (?, ?, ?)",
+            (key, payload, time.time()),
+        )
+        conn.execute(
+            "DELETE FROM step_results WHERE key IN ("
+            " SELECT key FROM step_results ORDER BY last_used DESC"
+            " LIMIT -1 OFFSET ?)",
+            (self._max_disk_entries,),
+        )
+
+
+_MISSING = object()
+
+
+__all__ = ["StepResultCache"]
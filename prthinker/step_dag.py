@@ -1,11 +1,83 @@
 """Typed DAG scheduler with fan-out, retry, timeout, cache and resume."""
 
 from __future__ import annotations
-from concurrent.futures import ThreadPoolExecutor
+
+import queue
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
 from typing import Any, Callable, MutableMapping
 
+# Until a timed attempt's thread has picked it up its clock has not
+# started; re-check this often for it to begin running.
+_START_POLL_SECONDS = 0.05
+# Threads kept for timed attempts, process-wide. Past this many (all busy
+# or hung) a timed attempt queues, with its clock not yet started.
+_TIMED_WORKER_LIMIT = 32
+# Cache lookup sentinel: one read, and a cached None still counts as a hit.
+_MISS = object()
+
+
+class _TimedWorkers:
+    """Long-lived daemon threads that run timed attempts.
+
+    A timed-out attempt is abandoned, not interrupted, so its worker
+    stays busy until the body returns. A submit that finds no idle
+    worker starts one more, up to ``limit``: each abandoned body costs
+    one lasting thread instead of stalling later attempts, and finished
+    workers are reused rather than created per attempt.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._work: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._threads = 0
+        self._idle = 0
+        self._backlog = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            elif self._threads < self._limit:
+                self._threads += 1
+                threading.Thread(
+                    target=self._work_forever,
+                    name=f"dag-timed-{self._threads}",
+                    daemon=True,
+                ).start()
+            else:
+                self._backlog += 1
+            self._work.put((future, fn, args))
+        return future
+
+    def _work_forever(self) -> None:
+        while True:
+            future, fn, args = self._work.get()
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as exc:  # pylint: disable=broad-exception-caught
+                    future.set_exception(exc)  # raised in the scheduler
+            with self._lock:
+                if self._backlog:
+                    self._backlog -= 1
+                else:
+                    self._idle += 1
+
+
+_TIMED_WORKERS = _TimedWorkers(_TIMED_WORKER_LIMIT)
+
 
 @dataclass(frozen=True)
 class DagNode:
@@ -26,43 +98,6 @@ class DagExecution:
     errors: dict[str, str] = field(default_factory=dict)
 
 
-def _run_once(node: DagNode, snapshot: dict[str, Any]) -> Any:
-    """Run a node body once, enforcing its timeout via a throwaway worker."""
-    pool = ThreadPoolExecutor(max_workers=1)
-    future = pool.submit(node.run, snapshot)
-    try:
-        return future.result(timeout=node.timeout_seconds)
-    finally:
-        pool.shutdown(wait=False, cancel_futures=True)
-
-
-def _attempt(node: DagNode, snapshot: dict[str, Any]):
-    """Run one attempt, returning ``(value, None)`` or ``(None, exception)``."""
-    try:
-        return _run_once(node, snapshot), None
-    except FutureTimeoutError:
-        return None, FutureTimeoutError(f"node {node.name} timed out")
-    except Exception as exc:
-        return None, exc
-
-
-def _run_node(
-    node: DagNode, snapshot: dict[str, Any], cache: MutableMapping[str, Any] | None
-):
-    key = node.cache_key(snapshot) if node.cache_key else ""
-    cached = bool(key) and cache is not None
-    if cached and key in cache:
-        return cache[key], "cached", 1
-    last = None
-    for attempt in range(1, node.retries + 2):
-        value, last = _attempt(node, snapshot)
-        if last is None:
-            if cached:
-                cache[key] = value
-            return value, "completed", attempt
-    raise last  # type: ignore[misc]
-
-
 def _validate_dag(nodes: tuple[DagNode, ...], run: DagExecution) -> dict[str, DagNode]:
     """Return the name→node map, raising on duplicate names or missing deps."""
     pending = {n.name: n for n in nodes}
@@ -75,73 +110,197 @@ def _validate_dag(nodes: tuple[DagNode, ...], run: DagExecution) -> dict[str, Da
     return pending
 
 
-def _take_active(
-    ready: list[DagNode],
-    pending: dict[str, DagNode],
-    run: DagExecution,
-    snapshot: dict[str, Any],
-) -> list[DagNode]:
-    """Remove ready nodes from pending; record skips and return the ones to run."""
-    active = []
-    for node in ready:
-        pending.pop(node.name)
-        if node.when is not None and not node.when(snapshot):
-            run.results[node.name] = None
-            run.states[node.name] = "skipped"
+@dataclass
+class _Attempt:
+    """One submitted try of a node body, tracked by the scheduler."""
+
+    node: DagNode
+    snapshot: dict[str, Any]
+    key: str
+    number: int
+    started: float | None = None
+    finished: float | None = None
+
+    def deadline(self) -> float | None:
+        if self.node.timeout_seconds is None or self.started is None:
+            return None
+        return self.started + self.node.timeout_seconds
+
+
+class _DagScheduler:
+    """Completion-driven scheduler: a node starts once its own deps finish.
+
+    Untimed attempts run on the one shared ``executor``; the scheduler
+    thread only waits for the next completion (or the nearest timeout
+    deadline), records it, and submits whatever that completion unblocked
+    — so one slow node never holds back successors of unrelated nodes.
+    Attempts with a timeout run on :class:`_TimedWorkers` instead: a
+    timed-out attempt is abandoned, not interrupted (Python threads
+    cannot be killed), and on the shared pool it would keep a worker busy
+    until its body returned, so with one worker the retry and every other
+    node would queue behind the hung body. Its late result is ignored.
+    """
+
+    def __init__(
+        self,
+        pending: dict[str, DagNode],
+        run: DagExecution,
+        cache: MutableMapping[str, Any] | None,
+        executor: Executor,
+        fail_fast: bool,
+    ) -> None:
+        self._pending = pending
+        self._run = run
+        self._cache = cache
+        self._executor = executor
+        self._fail_fast = fail_fast
+        self._inflight: dict[Future, _Attempt] = {}
+
+    def drain(self) -> None:
+        self._start_ready()
+        while self._inflight:
+            done, _ = wait(
+                self._inflight,
+                timeout=self._wait_timeout(),
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                self._finish(self._inflight.pop(future), future)
+            self._expire(time.monotonic())
+            self._start_ready()
+        if self._pending:
+            raise ValueError("cyclic DAG dependency")
+
+    def _start_ready(self) -> None:
+        """Submit every ready node; skips and cache hits may unlock more."""
+        progressed = True
+        while progressed:
+            progressed = False
+            done = self._run.results.keys()
+            ready = [
+                n for n in self._pending.values() if set(n.depends_on) <= done
+            ]
+            for node in ready:
+                self._pending.pop(node.name)
+                snapshot = dict(self._run.results)
+                if node.when is not None and not node.when(snapshot):
+                    self._run.results[node.name] = None
+                    self._run.states[node.name] = "skipped"
+                    progressed = True
+                    continue
+                key = node.cache_key(snapshot) if node.cache_key else ""
+                cached = (
+                    self._cache.get(key, _MISS)
+                    if key and self._cache is not None
+                    else _MISS
+                )
+                if cached is not _MISS:
+                    self._record(node, cached, "cached", 1)
+                    progressed = True
+                    continue
+                self._submit(_Attempt(node, snapshot, key, 1))
+
+    def _submit(self, attempt: _Attempt) -> None:
+        if attempt.node.timeout_seconds is None:
+            future = self._executor.submit(self._call, attempt)
         else:
-            active.append(node)
-    return active
+            future = _TIMED_WORKERS.submit(self._call, attempt)
+        self._inflight[future] = attempt
 
+    @staticmethod
+    def _call(attempt: _Attempt) -> Any:
+        attempt.started = time.monotonic()
+        value = attempt.node.run(attempt.snapshot)
+        attempt.finished = time.monotonic()
+        return value
 
-def _record_result(
-    node: DagNode, future, run: DagExecution, fail_fast: bool
-) -> None:
-    """Store a completed node's outcome, re-raising on failure when fail_fast."""
-    try:
-        value, state, attempts = future.result()
-        run.results[node.name] = value
-        run.states[node.name] = state
-        run.attempts[node.name] = attempts
-    except Exception as exc:
-        run.states[node.name] = "failed"
-        run.errors[node.name] = repr(exc)
-        if fail_fast:
-            raise
-        run.results[node.name] = None
-
-
-def _run_wave(
-    active: list[DagNode],
-    snapshot: dict[str, Any],
-    cache: MutableMapping[str, Any] | None,
-    run: DagExecution,
-    max_workers: int,
-    fail_fast: bool,
-) -> None:
-    """Execute one wave of ready nodes concurrently and record their results."""
-    with ThreadPoolExecutor(
-        max_workers=max(1, min(max_workers, len(active) or 1))
-    ) as pool:
-        futures = {
-            pool.submit(_run_node, node, snapshot, cache): node for node in active
-        }
-        for future, node in futures.items():
-            _record_result(node, future, run, fail_fast)
+    def _wait_timeout(self) -> float | None:
+        """Seconds until the nearest deadline; poll while a timed node is starting."""
+        now = time.monotonic()
+        waits = []
+        for attempt in self._inflight.values():
+            if attempt.node.timeout_seconds is None:
+                continue
+            deadline = attempt.deadline()
+            waits.append(
+                _START_POLL_SECONDS if deadline is None else max(0.0, deadline - now)
+            )
+        return min(waits) if waits else None
+
+    def _expire(self, now: float) -> None:
+        for future, attempt in list(self._inflight.items()):
+            deadline = attempt.deadline()
+            if deadline is not None and now >= deadline and not future.done():
+                del self._inflight[future]
+                future.cancel()
+                self._retry_or_fail(
+                    attempt,
+                    FutureTimeoutError(f"node {attempt.node.name} timed out"),
+                )
+
+    def _finish(self, attempt: _Attempt, future: Future) -> None:
+        try:
+            value = future.result()
+        except Exception as exc:
+            self._retry_or_fail(attempt, exc)
+            return
+        deadline = attempt.deadline()
+        if deadline is not None and attempt.finished > deadline:
+            # Returned after its deadline, before the scheduler looked.
+            self._retry_or_fail(
+                attempt, FutureTimeoutError(f"node {attempt.node.name} timed out")
+            )
+            return
+        if attempt.key and self._cache is not None:
+            self._cache[attempt.key] = value
+        self._record(attempt.node, value, "completed", attempt.number)
+
+    def _retry_or_fail(self, attempt: _Attempt, exc: Exception) -> None:
+        """Resubmit while retries remain, else record the failure."""
+        node = attempt.node
+        if attempt.number <= node.retries:
+            self._submit(_Attempt(node, attempt.snapshot, attempt.key, attempt.number + 1))
+            return
+        self._run.states[node.name] = "failed"
+        self._run.errors[node.name] = repr(exc)
+        if self._fail_fast:
+            raise exc
+        self._run.results[node.name] = None
+
+    def _record(self, node: DagNode, value: Any, state: str, attempts: int) -> None:
+        self._run.results[node.name] = value
+        self._run.states[node.name] = state
+        self._run.attempts[node.name] = attempts
 
 
 def execute_detailed(
-    nodes, *, initial=None, cache=None, max_workers=4, fail_fast=True
+    nodes,
+    *,
+    initial=None,
+    cache=None,
+    max_workers=4,
+    fail_fast=True,
+    executor: Executor | None = None,
 ) -> DagExecution:
+    """Run ``nodes`` as soon as each one's dependencies have finished.
+
+    Untimed attempts share one worker pool: ``executor`` when the caller
+    owns a long-lived one, otherwise a pool of ``max_workers`` created for
+    this run; timed attempts run on process-wide reusable threads. A
+    dependency that failed under ``fail_fast=False`` or was skipped by
+    ``when`` counts as finished with a ``None`` result.
+    """
     nodes = tuple(nodes)
     run = DagExecution(dict(initial or {}))
     pending = _validate_dag(nodes, run)
-    while pending:
-        ready = [n for n in pending.values() if set(n.depends_on) <= run.results.keys()]
-        if not ready:
-            raise ValueError("cyclic DAG dependency")
-        snapshot = dict(run.results)
-        active = _take_active(ready, pending, run, snapshot)
-        _run_wave(active, snapshot, cache, run, max_workers, fail_fast)
+    pool = executor or ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(nodes) or 1))
+    )
+    try:
+        _DagScheduler(pending, run, cache, pool, fail_fast).drain()
+    finally:
+        if executor is None:
+            pool.shutdown(wait=False, cancel_futures=True)
     return run
 
 
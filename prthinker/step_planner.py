@@ -104,13 +104,7 @@ class StepPlan:
 
 def changed_line_count(fd: "FileDiff") -> int:
     """Count added plus removed lines in a file diff (headers excluded)."""
-    count = 0
-    for line in fd.raw.splitlines():
-        if line.startswith(("+++", "---")):
-            continue
-        if line.startswith(("+", "-")):
-            count += 1
-    return count
+    return fd.added_count + fd.removed_count
 
 
 def _normalized_change_sides(raw: str) -> tuple[list[str], set[str]]:
@@ -130,9 +124,14 @@ def _normalized_change_sides(raw: str) -> tuple[list[str], set[str]]:
 def is_whitespace_only_change(fd: "FileDiff") -> bool:
     """True when every added line differs from some removed line only in
     whitespace — reformatting with no content change."""
-    added, removed = _normalized_change_sides(fd.raw)
-    if not added and not removed:
+    # Pure additions / deletions are decided from the parse-time counts
+    # without decoding raw: nothing added counts as whitespace-only (as it
+    # always has), a new file with nothing removed never does.
+    if not fd.added_count:
+        return fd.removed_count > 0
+    if not fd.removed_count:
         return False
+    added, removed = _normalized_change_sides(fd.raw)
     return all(content in removed for content in added)
 
 
@@ -12,16 +12,30 @@ Token counts come from the backend's ``last_usage()`` when available
 (OpenAI / Anthropic include them in their response); we estimate from
 char counts otherwise. The schema records both so post-hoc analysis can
 filter on which call had real numbers.
+
+:meth:`TelemetrySink.record` only enqueues: a background writer thread
+drains a bounded queue and inserts each batch in one transaction, so
+telemetry stays off the inference hot path. The same transaction folds
+the new rows into ``call_rollups`` — one row per hour, backend and model
+with counts, token / cost sums and a mergeable :class:`LatencySketch` —
+and :meth:`TelemetrySink.aggregate` answers from those rollups plus the
+raw rows of a window's partial first hour instead of scanning ``calls``.
+Databases written before the rollups existed are folded in once, on the
+first :meth:`~TelemetrySink.aggregate`.
 """
 
 from __future__ import annotations
 
 import contextlib
 import itertools
+import json
 import logging
+import queue
 import sqlite3
+import threading
 import time
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from pathlib import Path
 from statistics import median
 
@@ -46,10 +60,35 @@ CREATE TABLE IF NOT EXISTS calls (
 );
 CREATE INDEX IF NOT EXISTS idx_calls_ts ON calls (timestamp);
 CREATE INDEX IF NOT EXISTS idx_calls_backend ON calls (backend);
+CREATE TABLE IF NOT EXISTS call_rollups (
+    hour              INTEGER NOT NULL,
+    backend           TEXT    NOT NULL,
+    model             TEXT    NOT NULL,
+    calls             INTEGER NOT NULL,
+    cache_hits        INTEGER NOT NULL,
+    prompt_tokens     INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    cost_usd          REAL    NOT NULL,
+    latency_sketch    TEXT    NOT NULL,
+    PRIMARY KEY (hour, backend, model)
+);
+CREATE TABLE IF NOT EXISTS telemetry_meta (
+    name   TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL
+);
 """
 
 
 _WHERE_SINCE = "WHERE timestamp >= ?"
+_HOUR = 3600
+# ``calls.id`` up to which rows are folded into ``call_rollups``.
+_ROLLED_UP_TO = "rolled_up_to"
+_FOLD_CHUNK = 50_000
+_QUEUE_MAX = 10_000
+_BATCH_MAX = 500
+# How long record() waits for room in a full queue before dropping.
+_PUT_TIMEOUT_SECONDS = 1.0
+_STOP = object()
 
 
 @dataclass
@@ -84,12 +123,312 @@ class BackendStats:
     latency_p95_ms: float
 
 
+class LatencySketch:
+    """Mergeable latency distribution: sorted ``(mean, weight)`` centroids.
+
+    A merging t-digest: past ``max_centroids`` neighbouring centroids are
+    combined, more aggressively near the median than in the tails, so
+    p95 stays sharp. Until then every centroid is one observation and
+    :meth:`p50` / :meth:`p95` are exact — identical to sorting the raw
+    latencies.
+    """
+
+    def __init__(
+        self,
+        centroids: list[tuple[float, float]] | None = None,
+        *,
+        max_centroids: int = 100,
+    ) -> None:
+        self._centroids = sorted(centroids or [])
+        self._max = max_centroids
+        self._pending: list[tuple[float, float]] = []
+
+    @classmethod
+    def from_json(cls, raw: str) -> "LatencySketch":
+        return cls([(float(m), float(w)) for m, w in json.loads(raw)])
+
+    def to_json(self) -> str:
+        self._settle()
+        return json.dumps([[round(m, 3), w] for m, w in self._centroids])
+
+    @property
+    def count(self) -> float:
+        self._settle()
+        return sum(w for _, w in self._centroids)
+
+    def add(self, value: float) -> None:
+        self._pending.append((float(value), 1.0))
+        if len(self._pending) >= self._max:
+            self._settle()
+
+    def merge(self, other: "LatencySketch") -> None:
+        other._settle()
+        self._pending.extend(other._centroids)
+        self._settle()
+
+    def _settle(self) -> None:
+        """Sort buffered observations in and compress (amortised over adds)."""
+        if not self._pending:
+            return
+        self._centroids = sorted(self._centroids + self._pending)
+        self._pending = []
+        if len(self._centroids) <= self._max:
+            return
+        total = self.count
+        out: list[tuple[float, float]] = []
+        mean, weight = self._centroids[0]
+        done = 0.0
+        for m, w in self._centroids[1:]:
+            q = (done + weight + w / 2) / total
+            if weight + w <= max(1.0, 4 * total * q * (1 - q) / self._max):
+                mean = (mean * weight + m * w) / (weight + w)
+                weight += w
+            else:
+                out.append((mean, weight))
+                done += weight
+                mean, weight = m, w
+        out.append((mean, weight))
+        self._centroids = out
+
+    def _exact(self) -> list[float] | None:
+        self._settle()
+        if all(w == 1.0 for _, w in self._centroids):
+            return [m for m, _ in self._centroids]
+        return None
+
+    def p50(self) -> float:
+        exact = self._exact()
+        if exact is not None:
+            return float(median(exact)) if exact else 0.0
+        return self._quantile(0.5)
+
+    def p95(self) -> float:
+        exact = self._exact()
+        if exact is not None:
+            return _percentile(exact, 0.95)
+        return self._quantile(0.95)
+
+    def _quantile(self, q: float) -> float:
+        """Interpolate between the centres of the centroids around rank q."""
+        target = q * (self.count - 1)
+        centres: list[tuple[float, float]] = []
+        seen = 0.0
+        for mean, weight in self._centroids:
+            centres.append((seen + (weight - 1) / 2, mean))
+            seen += weight
+        if target <= centres[0][0]:
+            return centres[0][1]
+        for (r0, m0), (r1, m1) in zip(centres, centres[1:]):
+            if target <= r1:
+                return m0 + (m1 - m0) * (target - r0) / (r1 - r0)
+        return centres[-1][1]
+
+
+@dataclass
+class _Rollup:
+    """Running totals for one (backend, model) — or one hour of it."""
+
+    calls: int = 0
+    cache_hits: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    sketch: LatencySketch = field(default_factory=LatencySketch)
+
+    def add(self, row: tuple) -> None:
+        """Fold one ``(prompt, completion, latency, cost, cache_hit)`` row."""
+        prompt, completion, latency, cost, cache_hit = row
+        self.calls += 1
+        self.cache_hits += int(cache_hit or 0)
+        self.prompt_tokens += int(prompt or 0)
+        self.completion_tokens += int(completion or 0)
+        self.cost_usd += float(cost or 0.0)
+        self.sketch.add(latency)
+
+    def merge(self, other: "_Rollup") -> None:
+        self.calls += other.calls
+        self.cache_hits += other.cache_hits
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cost_usd += other.cost_usd
+        self.sketch.merge(other.sketch)
+
+    @classmethod
+    def from_db(cls, row: tuple) -> "_Rollup":
+        calls, hits, prompt, completion, cost, sketch = row
+        return cls(calls, hits, prompt, completion, cost, LatencySketch.from_json(sketch))
+
+    def stats(self, backend: str, model: str) -> BackendStats:
+        return BackendStats(
+            backend=backend,
+            model=model,
+            calls=self.calls,
+            cache_hits=self.cache_hits,
+            prompt_tokens=self.prompt_tokens,
+            completion_tokens=self.completion_tokens,
+            cost_usd=self.cost_usd,
+            latency_p50_ms=self.sketch.p50(),
+            latency_p95_ms=self.sketch.p95(),
+        )
+
+
+def _rolled_up_to(conn: sqlite3.Connection) -> int:
+    row = conn.execute(
+        "SELECT value FROM telemetry_meta WHERE name = ?", (_ROLLED_UP_TO,)
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _fold_new_calls(conn: sqlite3.Connection, limit: int = _FOLD_CHUNK) -> int:
+    """Fold up to ``limit`` not-yet-rolled-up calls into ``call_rollups``.
+
+    Runs inside the caller's write transaction; returns how many rows it
+    folded.
+    """
+    rows = conn.execute(
+        "SELECT id, timestamp, backend, model, prompt_tokens, completion_tokens, "
+        "latency_ms, cost_usd, cache_hit FROM calls WHERE id > ? ORDER BY id LIMIT ?",
+        (_rolled_up_to(conn), limit),
+    ).fetchall()
+    if not rows:
+        return 0
+    hours: dict[tuple[int, str, str], _Rollup] = {}
+    for _id, ts, backend, model, *metrics in rows:
+        key = (int(ts // _HOUR) * _HOUR, backend, model)
+        hours.setdefault(key, _Rollup()).add(tuple(metrics))
+    for key, rollup in hours.items():
+        existing = conn.execute(
+            "SELECT calls, cache_hits, prompt_tokens, completion_tokens, cost_usd, "
+            "latency_sketch FROM call_rollups WHERE hour = ? AND backend = ? AND model = ?",
+            key,
+        ).fetchone()
+        if existing is not None:
+            merged = _Rollup.from_db(existing)
+            merged.merge(rollup)
+            rollup = merged
+        conn.execute(
+            "INSERT OR REPLACE INTO call_rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                *key, rollup.calls, rollup.cache_hits, rollup.prompt_tokens,
+                rollup.completion_tokens, rollup.cost_usd, rollup.sketch.to_json(),
+            ),
+        )
+    conn.execute(
+        "INSERT OR REPLACE INTO telemetry_meta (name, value) VALUES (?, ?)",
+        (_ROLLED_UP_TO, rows[-1][0]),
+    )
+    return len(rows)
+
+
+def _insert_calls(conn: sqlite3.Connection, batch: list[tuple[float, CallRecord]]) -> None:
+    conn.executemany(
+        "INSERT INTO calls (timestamp, backend, model, prompt_tokens, "
+        "completion_tokens, tokens_estimated, latency_ms, cost_usd, "
+        "cache_hit, error) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                ts,
+                call.backend,
+                call.model,
+                call.prompt_tokens,
+                call.completion_tokens,
+                1 if call.tokens_estimated else 0,
+                call.latency_ms,
+                call.cost_usd(),
+                1 if call.cache_hit else 0,
+                call.error,
+            )
+            for ts, call in batch
+        ],
+    )
+
+
+class _BatchWriter:
+    """Background thread draining queued calls into SQLite in batches.
+
+    Held apart from :class:`TelemetrySink` so a ``weakref.finalize`` can
+    drain it after the sink itself is gone.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._queue: queue.Queue = queue.Queue(maxsize=_QUEUE_MAX)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: tuple[float, CallRecord]) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="prthinker-telemetry", daemon=True
+                )
+                self._thread.start()
+        try:
+            self._queue.put(item, timeout=_PUT_TIMEOUT_SECONDS)
+        except queue.Full:
+            log.warning("Telemetry queue full; dropping a %s call record", item[1].backend)
+
+    def _run(self) -> None:
+        conn: sqlite3.Connection | None = None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < _BATCH_MAX:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(item is _STOP for item in batch)
+                calls = [item for item in batch if item is not _STOP]
+                try:
+                    if calls:
+                        if conn is None:
+                            conn = sqlite3.connect(str(self._path), isolation_level=None)
+                        self._write(conn, calls)
+                except sqlite3.Error as exc:
+                    log.warning("Telemetry batch of %d call(s) lost: %s", len(calls), exc)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            if conn is not None:
+                conn.close()
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, calls: list[tuple[float, CallRecord]]) -> None:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _insert_calls(conn, calls)
+            _fold_new_calls(conn, limit=max(_FOLD_CHUNK, len(calls)))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def flush(self) -> None:
+        """Block until every queued call is written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Drain the queue and stop the thread; a later submit restarts it."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+
+
 class TelemetrySink:
     def __init__(self, path: Path) -> None:
         self._path = Path(path)
         self._path.parent.mkdir(parents=True, exist_ok=True)
         with self._connect() as conn:
             conn.executescript(_SCHEMA)
+        self._writer = _BatchWriter(self._path)
+        weakref.finalize(self, self._writer.close)
 
     @contextlib.contextmanager
     def _connect(self):
@@ -100,36 +439,59 @@ class TelemetrySink:
             conn.close()
 
     def record(self, call: CallRecord) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                "INSERT INTO calls (timestamp, backend, model, prompt_tokens, "
-                "completion_tokens, tokens_estimated, latency_ms, cost_usd, "
-                "cache_hit, error) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    time.time(),
-                    call.backend,
-                    call.model,
-                    call.prompt_tokens,
-                    call.completion_tokens,
-                    1 if call.tokens_estimated else 0,
-                    call.latency_ms,
-                    call.cost_usd(),
-                    1 if call.cache_hit else 0,
-                    call.error,
-                ),
-            )
+        """Queue one call; the background writer persists it shortly after."""
+        self._writer.submit((time.time(), call))
+
+    def flush(self) -> None:
+        """Block until every recorded call is in the database."""
+        self._writer.flush()
+
+    def close(self) -> None:
+        """Write out queued calls and stop the writer thread."""
+        self._writer.close()
 
     def aggregate(self, since_seconds: float | None = None) -> list[BackendStats]:
+        self.flush()
         clause, params = self._time_filter(since_seconds)
         with self._connect() as conn:
-            rows = self._metric_rows(conn, clause, params)
-        return [
-            _stats_from_rows(backend, model, [row[2:] for row in group])
-            for (backend, model), group in itertools.groupby(
-                rows, key=lambda row: (row[0], row[1])
-            )
-        ]
+            self._catch_up(conn)
+            groups: dict[tuple[str, str], _Rollup] = {}
+            first_hour = 0
+            if params:
+                first_hour = -(-int(params[0]) // _HOUR) * _HOUR
+                partial = self._metric_rows(
+                    conn, clause + " AND timestamp < ?", (*params, first_hour)
+                )
+                for (backend, model), group in itertools.groupby(
+                    partial, key=lambda row: (row[0], row[1])
+                ):
+                    rollup = groups.setdefault((backend, model), _Rollup())
+                    for row in group:
+                        rollup.add(row[2:])
+            for backend, model, *totals in conn.execute(
+                "SELECT backend, model, calls, cache_hits, prompt_tokens, "
+                "completion_tokens, cost_usd, latency_sketch FROM call_rollups "
+                "WHERE hour >= ?",
+                (first_hour,),
+            ):
+                groups.setdefault((backend, model), _Rollup()).merge(_Rollup.from_db(totals))
+        return [groups[key].stats(*key) for key in sorted(groups)]
+
+    @staticmethod
+    def _catch_up(conn: sqlite3.Connection) -> None:
+        """Fold calls the rollups have not seen yet (e.g. a pre-rollup DB)."""
+        (newest,) = conn.execute("SELECT COALESCE(MAX(id), 0) FROM calls").fetchone()
+        if newest <= _rolled_up_to(conn):
+            return
+        folded = _FOLD_CHUNK
+        while folded == _FOLD_CHUNK:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                folded = _fold_new_calls(conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     @staticmethod
     def _time_filter(since_seconds: float | None) -> tuple[str, tuple]:
@@ -143,8 +505,8 @@ class TelemetrySink:
         conn: sqlite3.Connection, clause: str, params: tuple
     ) -> list[tuple]:
         """Fetch every call's key + metric columns ordered by (backend, model)."""
-        # nosec B608 — `clause` is one of two literal strings; the actual
-        # user-supplied value goes through a bound parameter.
+        # nosec B608 — `clause` is built from literal strings; the actual
+        # user-supplied values go through bound parameters.
         return conn.execute(
             f"SELECT backend, model, prompt_tokens, completion_tokens, "  # nosec B608
             f"latency_ms, cost_usd, cache_hit FROM calls {clause} "
@@ -153,34 +515,6 @@ class TelemetrySink:
         ).fetchall()
 
 
-def _sum_int(rows: list[tuple], idx: int) -> int:
-    """Sum one integer column, treating ``None`` cells as zero."""
-    return sum(int(r[idx] or 0) for r in rows)
-
-
-def _sum_float(rows: list[tuple], idx: int) -> float:
-    """Sum one float column, treating ``None`` cells as zero."""
-    return float(sum(float(r[idx] or 0.0) for r in rows))
-
-
-def _stats_from_rows(
-    backend: str, model: str, rows: list[tuple]
-) -> BackendStats:
-    """Fold one backend/model's metric rows into a ``BackendStats``."""
-    latencies = sorted(r[2] for r in rows)
-    return BackendStats(
-        backend=backend,
-        model=model,
-        calls=len(rows),
-        cache_hits=_sum_int(rows, 4),
-        prompt_tokens=_sum_int(rows, 0),
-        completion_tokens=_sum_int(rows, 1),
-        cost_usd=_sum_float(rows, 3),
-        latency_p50_ms=median(latencies),
-        latency_p95_ms=_percentile(latencies, 0.95),
-    )
-
-
 def _percentile(sorted_values: list[float], q: float) -> float:
     if not sorted_values:
         return 0.0
@@ -203,6 +537,7 @@ def estimate_tokens(text: str) -> int:
 __all__ = [
     "CallRecord",
     "BackendStats",
+    "LatencySketch",
     "TelemetrySink",
     "estimate_tokens",
 ]
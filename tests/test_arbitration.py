@@ -8,6 +8,8 @@ and the CLI wiring (``apply_arbitration``) driven by ``FakeBackend``s.
 from __future__ import annotations
 
 import json
+import threading
+import time
 from types import SimpleNamespace
 
 import pytest
@@ -214,9 +216,9 @@ def test_arbitrate_majority_drops_rejected_finding() -> None:
         FakeBackend([_votes("reject", "confirm")]),
     ]
     findings = [_finding(comment="real"), _finding(line=9, comment="noise")]
-    outcome = FindingArbitrator(backends, MajorityStrategy()).arbitrate(
-        findings, "diff"
-    )
+    outcome = FindingArbitrator(
+        backends, MajorityStrategy(), short_circuit=False
+    ).arbitrate(findings, "diff")
     assert [f.comment for f in outcome.kept] == ["real"]
     assert [f.comment for f in outcome.dropped] == ["noise"]
     assert outcome.tallies == {1: (2, 1), 2: (1, 2)}
@@ -254,6 +256,92 @@ def test_arbitrate_passes_budget_and_prompt() -> None:
     assert max_new_tokens == 77
 
 
+def test_is_final_once_pending_votes_cannot_flip_the_verdict() -> None:
+    majority = MajorityStrategy()
+    assert majority.is_final(confirms=2, rejects=0, pending=1)
+    assert majority.is_final(confirms=1, rejects=0, pending=1)  # ties keep
+    assert not majority.is_final(confirms=0, rejects=1, pending=1)
+    assert UnanimousStrategy().is_final(confirms=0, rejects=1, pending=5)
+    assert AnyConfirmStrategy().is_final(confirms=1, rejects=0, pending=5)
+    # A zero-vote finding fails open, so a lone pending reject still matters.
+    assert not AnyConfirmStrategy().is_final(confirms=0, rejects=0, pending=1)
+
+
+class _SlowBackend(FakeBackend):
+    """Answers ``answer(prompt)`` after ``delay`` seconds unless cancelled first."""
+
+    def __init__(self, answer, *, delay: float, concurrency: int = 1) -> None:
+        super().__init__()
+        self._answer = answer
+        self._delay = delay
+        self._concurrency = concurrency
+        self.cancelled = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def max_concurrency(self) -> int:
+        return self._concurrency
+
+    def generate(self, prompt, max_new_tokens, *, cancel_event=None):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            deadline = time.monotonic() + self._delay
+            while time.monotonic() < deadline:
+                if cancel_event is not None and cancel_event.is_set():
+                    with self._lock:
+                        self.cancelled += 1
+                    raise RuntimeError("cancelled")
+                time.sleep(0.005)
+            super().generate(prompt, max_new_tokens)
+            return self._answer(prompt)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_arbitrate_cancels_arbiters_once_verdicts_are_final() -> None:
+    slow = _SlowBackend(lambda prompt: _votes("confirm"), delay=5.0)
+    backends = [FakeBackend([_votes("reject")]), FakeBackend([_votes("reject")]), slow]
+    started = time.monotonic()
+    outcome = FindingArbitrator(backends, MajorityStrategy()).arbitrate(
+        [_finding()], "diff"
+    )
+    assert time.monotonic() - started < 2.0
+    assert len(outcome.dropped) == 1
+    assert outcome.tallies == {1: (0, 2)}
+    deadline = time.monotonic() + 2.0
+    while slow.cancelled == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slow.cancelled == 1
+
+
+def test_arbitrate_chunks_long_lists_and_maps_ids_back() -> None:
+    def odd_lines_are_real(prompt: str) -> str:
+        lines = [int(row.split(":")[1].split(" ")[0])
+                 for row in prompt.splitlines() if ". [warning] a.py:" in row]
+        return _votes(*("confirm" if n % 2 else "reject" for n in lines))
+
+    backend = _SlowBackend(odd_lines_are_real, delay=0.05, concurrency=2)
+    findings = [_finding(line=n, comment=f"f{n}") for n in range(1, 6)]
+    outcome = FindingArbitrator(
+        [backend], MajorityStrategy(), chunk_size=2
+    ).arbitrate(findings, "diff")
+
+    assert len(backend.calls) == 3
+    assert all("1. [warning]" in prompt and "3. [" not in prompt for prompt, _ in backend.calls)
+    assert backend.peak == 2
+    assert outcome.tallies == {1: (1, 0), 2: (0, 1), 3: (1, 0), 4: (0, 1), 5: (1, 0)}
+    assert [f.line for f in outcome.kept] == [1, 3, 5]
+
+
+def test_arbitrate_rejects_non_positive_chunk_size() -> None:
+    with pytest.raises(ValueError, match="chunk_size"):
+        FindingArbitrator([FakeBackend()], MajorityStrategy(), chunk_size=0)
+
+
 # ----- CLI wiring (apply_arbitration) ----------------------------------------
 
 
@@ -4,12 +4,20 @@ from __future__ import annotations
 
 import dataclasses
 import json
+import threading
+import time
 from pathlib import Path
 
+import pytest
+
+from prthinker.backends.base import Usage
 from prthinker.benchmark import (
     BenchmarkCase,
     BenchmarkOutcome,
+    CaseStats,
+    OutcomeLog,
     run_cases,
+    run_fingerprint,
     load_cases,
     write_run_bundle,
     write_outcomes,
@@ -152,3 +160,118 @@ def test_write_run_bundle_hashes_inputs_and_outputs(tmp_path: Path) -> None:
     assert manifest["outcomes"]["count"] == 1
     assert manifest["backend"] == "fake"
     assert manifest["seed"] == 7
+
+
+class _ConcurrentBackend(FakeBackend):
+    """Echoes the prompt after a delay; tracks peak in-flight calls."""
+
+    def __init__(self, *, fail_on: str | None = None) -> None:
+        super().__init__()
+        self.fail_on = fail_on
+        self.in_flight = self.peak = 0
+        self._lock = threading.Lock()
+
+    def max_concurrency(self) -> int:
+        return 4
+
+    def generate(self, prompt: str, max_new_tokens: int, *, cancel_event=None) -> str:
+        with self._lock:
+            self.calls.append((prompt, max_new_tokens))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.01 * (len(self.calls) % 3))
+        with self._lock:
+            self.in_flight -= 1
+        if prompt == self.fail_on:
+            raise RuntimeError("backend crashed")
+        return f"out-{prompt}"
+
+
+def _cases(n: int) -> list[BenchmarkCase]:
+    return [BenchmarkCase(case_id=f"c{i}", prompt=str(i)) for i in range(n)]
+
+
+def test_run_cases_runs_concurrently_and_keeps_input_order() -> None:
+    backend = _ConcurrentBackend()
+
+    outcomes = run_cases(backend, _cases(8))
+
+    assert [o.raw_output for o in outcomes] == [f"out-{i}" for i in range(8)]
+    assert 1 < backend.peak <= 4
+
+
+def test_crashed_run_resumes_without_rerunning_finished_cases(tmp_path: Path) -> None:
+    outcome_log = OutcomeLog(tmp_path / "run")
+    with pytest.raises(RuntimeError):
+        run_cases(_ConcurrentBackend(fail_on="5"), _cases(8), outcome_log=outcome_log)
+    finished = set(outcome_log.completed())
+    assert finished and "c5" not in finished
+
+    backend = _ConcurrentBackend()
+    outcomes = run_cases(backend, _cases(8), outcome_log=outcome_log)
+
+    assert [o.raw_output for o in outcomes] == [f"out-{i}" for i in range(8)]
+    assert {f"c{prompt}" for prompt, _ in backend.calls}.isdisjoint(finished)
+
+
+def test_outcome_log_survives_a_torn_last_row(tmp_path: Path) -> None:
+    outcome_log = OutcomeLog(tmp_path)
+    outcome_log.record(BenchmarkOutcome("a", "x"), CaseStats("a", 0.1))
+    with outcome_log.outcomes_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"case_id": "b", "raw_')
+
+    outcome_log.record(BenchmarkOutcome("c", "z"), CaseStats("c", 0.2))
+
+    assert sorted(outcome_log.completed()) == ["a", "c"]
+
+
+def test_outcome_log_resumes_only_a_matching_fingerprint(tmp_path: Path) -> None:
+    cases = tmp_path / "cases.jsonl"
+    cases.write_text('{"case_id":"a","prompt":"p"}\n', encoding="utf-8")
+    fingerprint = run_fingerprint(cases, backend="fake", model="m1", max_new_tokens=64)
+    outcome_log = OutcomeLog(tmp_path / "run")
+    outcome_log.begin(fingerprint)
+    outcome_log.record(BenchmarkOutcome("a", "x"), CaseStats("a", 0.1))
+
+    OutcomeLog(tmp_path / "run").begin(dict(fingerprint))
+    for change in ({"model": "m2"}, {"backend": "other"}, {"max_new_tokens": 128}):
+        with pytest.raises(ValueError, match="different run"):
+            OutcomeLog(tmp_path / "run").begin(fingerprint | change)
+    cases.write_text('{"case_id":"a","prompt":"edited"}\n', encoding="utf-8")
+    edited = run_fingerprint(cases, backend="fake", model="m1", max_new_tokens=64)
+    with pytest.raises(ValueError, match="different run"):
+        OutcomeLog(tmp_path / "run").begin(edited)
+
+    outcome_log.clear()
+    outcome_log.begin(edited)
+    assert outcome_log.completed() == {}
+
+
+def test_outcome_log_without_fingerprint_is_not_resumed(tmp_path: Path) -> None:
+    write_outcomes([BenchmarkOutcome("a", "x")], tmp_path / "outcomes.jsonl")
+    with pytest.raises(ValueError, match="different run"):
+        OutcomeLog(tmp_path).begin({"model": "m"})
+
+
+def test_run_bundle_lists_latency_and_tokens_per_case(tmp_path: Path) -> None:
+    cases = tmp_path / "cases.jsonl"
+    cases.write_text(
+        '{"case_id":"a","prompt":"p"}\n{"case_id":"b","prompt":"q"}\n',
+        encoding="utf-8",
+    )
+    backend = FakeBackend(["ra", "rb"], usage_per_call=[Usage(10, 3), Usage(12, 5)])
+    outcome_log = OutcomeLog(tmp_path / "run")
+    outcomes = run_cases(backend, load_cases(cases), outcome_log=outcome_log)
+
+    manifest_path = write_run_bundle(
+        cases, outcomes, tmp_path / "run", backend="fake", model="fake-1",
+        case_stats=outcome_log.case_stats(),
+    )
+
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    stats = manifest["case_stats"]
+    assert [(s["case_id"], s["prompt_tokens"], s["completion_tokens"]) for s in stats] == [
+        ("a", 10, 3), ("b", 12, 5),
+    ]
+    assert all(s["latency_seconds"] >= 0 for s in stats)
+    assert manifest["outcomes"]["count"] == 2
@@ -1,5 +1,8 @@
 import json
 from pathlib import Path
+
+import pytest
+
 from prthinker.cli import main
 from tests.conftest import FakeBackend
 
@@ -71,3 +74,28 @@ def test_benchmark_run_writes_bundle(tmp_path: Path, capsys, monkeypatch):
     payload = json.loads(capsys.readouterr().out)
     assert payload["cases"] == 1
     assert (tmp_path / "run" / "manifest.json").exists()
+
+
+def test_benchmark_run_refuses_to_resume_another_models_outcomes(
+    tmp_path: Path, capsys, monkeypatch
+):
+    cases = tmp_path / "cases.jsonl"
+    cases.write_text('{"case_id":"x","prompt":"review"}\n', encoding="utf-8")
+    monkeypatch.setattr(
+        "prthinker.cli_review._build_config",
+        lambda _args: type("Config", (), {"max_new_tokens": 32})(),
+    )
+    first = FakeBackend(["old"])
+    monkeypatch.setattr("prthinker.backends.create_backend", lambda _config: first)
+    assert main(["benchmark", "run", str(cases), str(tmp_path / "run")]) == 0
+
+    second = FakeBackend(["new"], model="another-model")
+    monkeypatch.setattr("prthinker.backends.create_backend", lambda _config: second)
+    with pytest.raises(SystemExit, match="--no-resume"):
+        main(["benchmark", "run", str(cases), str(tmp_path / "run")])
+    assert second.calls == []
+
+    args = ["benchmark", "run", str(cases), str(tmp_path / "run"), "--no-resume"]
+    assert main(args) == 0
+    outcomes = (tmp_path / "run" / "outcomes.jsonl").read_text(encoding="utf-8")
+    assert json.loads(outcomes)["raw_output"] == "new"
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import sqlite3
+import threading
 import time
 
+import pytest
+
 from prthinker.backends.base import Usage
 from prthinker.backends.wrappers import CachingBackend, InstrumentedBackend
-from prthinker.cache import PromptCache
+from prthinker.cache import PromptCache, _hash_key
 from prthinker.telemetry import CallRecord, TelemetrySink
 from prthinker.pricing import estimate_cost
 
@@ -56,6 +60,222 @@ def test_caching_backend_only_calls_inner_once(tmp_cache_path) -> None:
     assert wrapped.last_cache_hit is True
 
 
+def test_cache_serves_hot_entries_from_memory(tmp_cache_path, monkeypatch) -> None:
+    cache = PromptCache(tmp_cache_path)
+    cache.put("fake", "m", "p", 1, "hot")
+
+    def no_sqlite():
+        raise AssertionError("memory hit must not touch SQLite")
+
+    monkeypatch.setattr(cache, "_connection", no_sqlite)
+    assert [cache.get("fake", "m", "p", 1) for _ in range(3)] == ["hot"] * 3
+    monkeypatch.undo()
+    # Write-behind hit counters land on the next stats() call.
+    assert cache.stats().total_hits == 3
+
+
+def test_cache_memory_tier_is_bounded(tmp_cache_path) -> None:
+    cache = PromptCache(tmp_cache_path, memory_entries=2)
+    for prompt in ("a", "b", "c"):
+        cache.put("fake", "m", prompt, 1, prompt.upper())
+    assert len(cache._memory) == 2
+    # The evicted entry is still answered from SQLite.
+    assert cache.get("fake", "m", "a", 1) == "A"
+
+
+def _big(tag: str, kb: int = 8) -> str:
+    return (f"{tag} finding: consider the edge case. " * 40 * kb)[: kb * 1024]
+
+
+def test_cache_compresses_large_responses(tmp_cache_path) -> None:
+    cache = PromptCache(tmp_cache_path, memory_entries=0)
+    cache.put("fake", "m", "p", 1, _big("a", kb=64))
+
+    assert cache.get("fake", "m", "p", 1) == _big("a", kb=64)
+    assert 0 < cache.stats().bytes_stored < 64 * 1024 // 4
+
+
+def _budgeted(tmp_cache_path, eviction: str) -> PromptCache:
+    cache = PromptCache(tmp_cache_path, memory_entries=0, eviction=eviction)
+    cache.put("fake", "m", "probe", 1, _big("probe"))
+    entry = cache.stats().bytes_stored
+    cache.close()
+    tmp_cache_path.unlink()
+    return PromptCache(
+        tmp_cache_path, memory_entries=0, eviction=eviction, max_bytes=int(entry * 3.5),
+    )
+
+
+def test_budgeted_cache_evicts_least_recently_used(tmp_cache_path) -> None:
+    cache = _budgeted(tmp_cache_path, "lru")
+    for prompt in ("a", "b", "c"):
+        cache.put("fake", "m", prompt, 1, _big(prompt))
+        time.sleep(0.01)
+    cache.get("fake", "m", "a", 1)
+    time.sleep(0.01)
+    cache.put("fake", "m", "d", 1, _big("d"))
+
+    assert cache.get("fake", "m", "b", 1) is None
+    assert all(cache.get("fake", "m", p, 1) for p in ("a", "c", "d"))
+    assert cache.stats().evictions >= 1
+
+
+def test_budgeted_cache_evicts_least_frequently_used(tmp_cache_path) -> None:
+    cache = _budgeted(tmp_cache_path, "lfu")
+    for prompt in ("a", "b", "c"):
+        cache.put("fake", "m", prompt, 1, _big(prompt))
+    for _ in range(3):
+        cache.get("fake", "m", "a", 1)
+        cache.get("fake", "m", "c", 1)
+    cache.put("fake", "m", "d", 1, _big("d"))
+
+    stats = cache.stats()
+    assert cache.get("fake", "m", "b", 1) is None
+    assert cache.get("fake", "m", "a", 1) and cache.get("fake", "m", "c", 1)
+    assert stats.bytes_stored <= cache._max_bytes
+
+
+def test_cache_stats_report_hit_ratio(tmp_cache_path) -> None:
+    cache = PromptCache(tmp_cache_path)
+    cache.put("fake", "m", "p", 1, "r")
+    cache.get("fake", "m", "p", 1)
+    cache.get("fake", "m", "missing", 1)
+
+    cache.close()
+    stats = PromptCache(tmp_cache_path).stats()
+    assert (stats.lookups, stats.lookup_hits) == (2, 1)
+    assert stats.hit_ratio == 0.5
+
+
+def test_cache_upgrades_a_pre_budget_database(tmp_cache_path) -> None:
+    conn = sqlite3.connect(tmp_cache_path)
+    conn.executescript(
+        "CREATE TABLE prompt_cache (key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+        " created_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0);"
+    )
+    conn.execute(
+        "INSERT INTO prompt_cache VALUES (?, 'old answer', ?, 4)",
+        (_hash_key("fake", "m", "p", 1), time.time()),
+    )
+    conn.commit()
+    conn.close()
+
+    cache = PromptCache(tmp_cache_path)
+
+    assert cache.get("fake", "m", "p", 1) == "old answer"
+    stats = cache.stats()
+    assert stats.bytes_stored == len("old answer")
+    assert stats.total_hits == 5
+
+
+def test_cache_reuses_one_connection_per_thread(tmp_cache_path) -> None:
+    cache = PromptCache(tmp_cache_path, memory_entries=0)
+    cache.put("fake", "m", "p", 1, "r")
+    for _ in range(5):
+        cache.get("fake", "m", "p", 1)
+    worker = threading.Thread(target=cache.get, args=("fake", "m", "p", 1))
+    worker.start()
+    worker.join()
+
+    assert len(cache._connections) == 2
+
+
+class _SlowBackend(FakeBackend):
+    """Blocks in generate until released; optionally fails the first call."""
+
+    def __init__(self, *, fail_first: bool = False) -> None:
+        super().__init__()
+        self.release = threading.Event()
+        self.fail_first = fail_first
+        self._calls_lock = threading.Lock()
+
+    def generate(self, prompt, max_new_tokens, *, cancel_event=None):
+        with self._calls_lock:
+            self.calls.append((prompt, max_new_tokens))
+            first = len(self.calls) == 1
+        self.release.wait(5)
+        if first and self.fail_first:
+            raise RuntimeError("upstream 500")
+        return f"text:{prompt}"
+
+
+def _concurrently(fn, n: int) -> tuple[list, list, list]:
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(fn())
+        except Exception as exc:  # noqa: BLE001 - collected for assertions
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_caching_backend_coalesces_identical_concurrent_misses(tmp_cache_path) -> None:
+    backend = _SlowBackend()
+    wrapped = CachingBackend(backend, PromptCache(tmp_cache_path))
+
+    threads, results, errors = _concurrently(lambda: wrapped.generate("p", 10), 6)
+    time.sleep(0.05)
+    backend.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert results == ["text:p"] * 6
+    assert len(backend.calls) == 1
+
+
+def test_caching_backend_waiter_takes_over_when_leader_fails(tmp_cache_path) -> None:
+    backend = _SlowBackend(fail_first=True)
+    wrapped = CachingBackend(backend, PromptCache(tmp_cache_path))
+
+    threads, results, errors = _concurrently(lambda: wrapped.generate("p", 10), 3)
+    time.sleep(0.05)
+    backend.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert [str(exc) for exc in errors] == ["upstream 500"]
+    assert results == ["text:p"] * 2
+    assert len(backend.calls) == 2
+
+
+def test_cancelled_waiter_stops_waiting_on_the_leader(tmp_cache_path) -> None:
+    from prthinker.pipeline_types import ReviewCancelledError
+
+    backend = _SlowBackend()
+    wrapped = CachingBackend(backend, PromptCache(tmp_cache_path))
+    leader, _, _ = _concurrently(lambda: wrapped.generate("p", 10), 1)
+    time.sleep(0.05)
+
+    cancel = threading.Event()
+    cancel.set()
+    started = time.monotonic()
+    with pytest.raises(ReviewCancelledError):
+        wrapped.generate("p", 10, cancel_event=cancel)
+    assert time.monotonic() - started < 1
+    backend.release.set()
+    leader[0].join()
+    assert len(backend.calls) == 1
+
+
+def test_abandoned_stream_caches_nothing(tmp_cache_path) -> None:
+    backend = FakeBackend(["partial"])
+    wrapped = CachingBackend(backend, PromptCache(tmp_cache_path))
+
+    stream = wrapped.stream_generate("p", 10)
+    next(stream)
+    stream.close()
+
+    with pytest.raises(StopIteration):
+        next(stream)
+    assert wrapped.generate("p", 10) == "fake response"
+
+
 # ----- TelemetrySink + pricing -------------------------------------------
 
 def test_telemetry_records_and_aggregates(tmp_telemetry_path) -> None:
@@ -121,3 +341,37 @@ def test_instrumented_backend_records_per_call(
     assert rows[0].cache_hits == 1
     # First call had usage 100/50, so cost was recorded.
     assert rows[0].cost_usd > 0
+
+
+class _SamplingBackend(FakeBackend):
+    def generate_samples(self, prompt, max_new_tokens, n, *, cancel_event=None):
+        self.calls.append((prompt, max_new_tokens))
+        return [f"sample-{i}" for i in range(n)]
+
+
+def test_wrappers_forward_generate_samples_with_telemetry(
+    tmp_telemetry_path, tmp_cache_path
+) -> None:
+    from prthinker.self_consistency import _sample
+
+    inner = _SamplingBackend()
+    sink = TelemetrySink(tmp_telemetry_path)
+    backend = InstrumentedBackend(
+        CachingBackend(inner, PromptCache(tmp_cache_path)), sink
+    )
+
+    assert _sample(backend, "p", 3, 100) == ["sample-0", "sample-1", "sample-2"]
+    assert _sample(backend, "p", 2, 100) == ["sample-0", "sample-1"]
+    assert len(inner.calls) == 2  # one batched call each, never cached
+    rows = sink.aggregate()
+    assert rows[0].calls == 2 and rows[0].cache_hits == 0
+
+
+def test_wrappers_do_not_claim_generate_samples_the_backend_lacks(
+    tmp_telemetry_path, tmp_cache_path
+) -> None:
+    backend = InstrumentedBackend(
+        CachingBackend(FakeBackend(), PromptCache(tmp_cache_path)),
+        TelemetrySink(tmp_telemetry_path),
+    )
+    assert getattr(backend, "generate_samples", None) is None
@@ -9,6 +9,7 @@ from pathlib import Path
 import pytest
 
 from prthinker import cli_commands
+from prthinker.harvest_engine import HarvestCheckpoint
 from prthinker.pipeline import FileReviewResult, ReviewResult
 
 
@@ -59,6 +60,7 @@ class _FakeAdapter:
         self.fetch_head_sha_error: Exception | None = None
         self.submit_inline_error: Exception | None = None
         self.gate_handle = object()
+        self.closed = False
 
     def fetch_head_sha(self) -> str:
         self.calls.append(("fetch_head_sha", None))
@@ -72,6 +74,9 @@ class _FakeAdapter:
         self.calls.append(("open_gate", head_sha))
         return self.gate_handle
 
+    def close(self) -> None:
+        self.closed = True
+
     def upsert_summary_comment(self, body: str) -> int:
         self.calls.append(("upsert_summary_comment", body))
         return 123
@@ -279,6 +284,7 @@ def test_cmd_post_status_upserts_placeholder(monkeypatch) -> None:
     assert rc == 0
     posted = [c for c in adapter.calls if c[0] == "upsert_summary_comment"]
     assert posted and "Review in progress" in posted[0][1]
+    assert adapter.closed
 
 
 def test_maybe_write_job_summary(tmp_path: Path, monkeypatch) -> None:
@@ -561,7 +567,7 @@ def _fake_stats():
 def test_cmd_harvest_dispatches_to_gitlab(monkeypatch, capsys) -> None:
     seen = {}
 
-    def _fake(project, token, *, store, mr_iid, max_mrs, base_url):
+    def _fake(project, token, *, store, mr_iid, max_mrs, base_url, checkpoint):
         seen.update(project=project, token=token, mr_iid=mr_iid,
                     max_mrs=max_mrs, base_url=base_url)
         del store
@@ -581,9 +587,9 @@ def test_cmd_harvest_dispatches_to_gitlab(monkeypatch, capsys) -> None:
 def test_cmd_harvest_github_stays_on_github_path(monkeypatch) -> None:
     called = {}
 
-    def _fake(repo, token, *, store, pr_number, max_prs):
+    def _fake(repo, token, *, store, pr_number, max_prs, checkpoint):
         called.update(repo=repo, token=token, pr_number=pr_number,
-                      max_prs=max_prs)
+                      max_prs=max_prs, checkpoint=checkpoint)
         del store
         return _fake_stats()
 
@@ -591,6 +597,19 @@ def test_cmd_harvest_github_stays_on_github_path(monkeypatch) -> None:
     rc = cli_commands._cmd_harvest(_harvest_args())
     assert rc == 0
     assert called["repo"] == "g/p"
+    assert isinstance(called["checkpoint"], HarvestCheckpoint)
+
+
+def test_cmd_harvest_full_rescan_skips_the_checkpoint(monkeypatch) -> None:
+    called = {}
+
+    def _fake(**kwargs):
+        called.update(kwargs)
+        return _fake_stats()
+
+    monkeypatch.setattr(cli_commands, "harvest", _fake)
+    cli_commands._cmd_harvest(_harvest_args(full_rescan=True))
+    assert called["checkpoint"] is None
 
 
 def test_cmd_harvest_rejects_unsupported_platform() -> None:
@@ -601,7 +620,7 @@ def test_cmd_harvest_rejects_unsupported_platform() -> None:
 def test_cmd_harvest_dispatches_to_gitea(monkeypatch, capsys) -> None:
     seen = {}
 
-    def _fake(repo, token, *, store, pr_number, max_prs, base_url):
+    def _fake(repo, token, *, store, pr_number, max_prs, base_url, checkpoint):
         seen.update(repo=repo, token=token, pr_number=pr_number,
                     max_prs=max_prs, base_url=base_url)
         del store
@@ -620,7 +639,7 @@ def test_cmd_harvest_dispatches_to_gitea(monkeypatch, capsys) -> None:
 def test_cmd_harvest_accepted_gitea_honours_base_url(monkeypatch) -> None:
     seen = {}
 
-    def _fake(repo, token, *, store, pr_number, max_prs, base_url):
+    def _fake(repo, token, *, store, pr_number, max_prs, base_url, checkpoint):
         seen.update(repo=repo, base_url=base_url)
         del token, store, pr_number, max_prs
         return _fake_stats()
@@ -642,7 +661,7 @@ def test_cmd_harvest_requires_repo_and_token() -> None:
 def test_cmd_harvest_accepted_dispatches_to_gitlab(monkeypatch) -> None:
     seen = {}
 
-    def _fake(project, token, *, store, mr_iid, max_mrs, base_url):
+    def _fake(project, token, *, store, mr_iid, max_mrs, base_url, checkpoint):
         seen.update(project=project, base_url=base_url)
         del token, store, mr_iid, max_mrs
         return _fake_stats()
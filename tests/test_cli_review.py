@@ -841,3 +841,80 @@ def test_review_request_step_plan_defaults_to_full() -> None:
     request = ReviewRequest.model_validate({"code_diff": "+x"})
     assert request.step_plan == "full"
     assert ReviewRequest(code_diff="+x", step_plan="adaptive").step_plan == "adaptive"
+
+
+def test_server_review_request_carries_priority_and_repo(monkeypatch) -> None:
+    from prthinker.cli_review import _server_review_request
+    from prthinker.config import BackendKind, Config, RemoteBackendConfig
+
+    monkeypatch.setenv("GITHUB_REPOSITORY", "acme/widgets")
+    config = Config(
+        backend=BackendKind.REMOTE,
+        remote=RemoteBackendConfig(url="https://srv.example"),
+    )
+    request = _server_review_request(config, "+diff", [], priority="bulk")
+    assert request.priority == "bulk"
+    assert request.client_id == "acme/widgets"
+    assert _server_review_request(config, "+diff", []).priority == "normal"
+
+
+def test_remote_backend_config_carries_scheduling_fields(monkeypatch) -> None:
+    import argparse
+
+    from prthinker.cli_review_helpers import _remote_backend_config
+    from prthinker.schemas import AskRequest
+
+    monkeypatch.setenv("GITHUB_REPOSITORY", "acme/widgets")
+    args = argparse.Namespace(
+        remote_url="https://srv.example",
+        remote_timeout=60.0,
+        remote_api_key=None,
+        target_file="src/a.py",
+    )
+    _kind, remote = _remote_backend_config(args)
+    assert remote.priority == "bulk"
+    assert remote.client_id == "acme/widgets"
+    assert AskRequest(prompt="x").priority == "normal"
+
+
+def test_per_file_server_review_batches_and_keeps_diff_order() -> None:
+    import argparse
+
+    from prthinker.cli_review import _review_per_file_via_server
+    from prthinker.config import BackendKind, Config, RemoteBackendConfig
+    from prthinker.schemas import ReviewResponse, StepOutput
+
+    diff = "".join(
+        f"diff --git a/{name} b/{name}\n--- a/{name}\n+++ b/{name}\n"
+        "@@ -1 +1 @@\n-old\n+new\n"
+        for name in ("a.py", "b.py", "c.py")
+    )
+
+    class _BatchClient:
+        def __init__(self) -> None:
+            self.batches: list[list[str]] = []
+
+        def review(self, request):
+            raise AssertionError("expected a single batch job")
+
+        def review_batch(self, requests):
+            self.batches.append([r.file_path for r in requests])
+            # Finish in reverse order, as a server may.
+            for index in reversed(range(len(requests))):
+                yield index, ReviewResponse(
+                    code_diff="",
+                    rag_docs=[],
+                    steps=[StepOutput(name="s", output=requests[index].file_path)],
+                )
+
+    client = _BatchClient()
+    config = Config(
+        backend=BackendKind.REMOTE,
+        remote=RemoteBackendConfig(url="https://srv.example"),
+    )
+    args = argparse.Namespace(target_file="", exclude_globs="")
+    result = _review_per_file_via_server(client, args, config, diff, [])
+
+    assert client.batches == [["a.py", "b.py", "c.py"]]
+    assert [f.path for f in result.per_file] == ["a.py", "b.py", "c.py"]
+    assert list(result.step_outputs) == ["a.py::s", "b.py::s", "c.py::s"]
@@ -10,7 +10,7 @@ from types import SimpleNamespace
 
 import pytest
 
-from prthinker.corpora_base import JsonlCorpusStore, embed_store_comments
+from prthinker.corpora_base import CommentIndex, JsonlCorpusStore, embed_store_comments
 
 
 @dataclass
@@ -129,24 +129,90 @@ def test_append_creates_parent_directories(tmp_path: Path) -> None:
 @pytest.fixture
 def fake_faiss(monkeypatch):
     """Install a deterministic ``codes.util.faiss_util`` stub."""
-    calls: list[str] = []
+    pytest.importorskip("numpy")
+    calls: list[list[str]] = []
 
-    def get_embedding(text: str):
-        calls.append(text)
-        return f"vec:{text}"
+    def get_embeddings(texts: list[str]):
+        calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
 
-    module = SimpleNamespace(get_embedding=get_embedding)
+    module = SimpleNamespace(get_embeddings=get_embeddings)
     monkeypatch.setitem(sys.modules, "codes.util.faiss_util", module)
     return calls
 
 
 def test_embed_store_comments_pairs_rows_in_order(fake_faiss) -> None:
-    rows = [SimpleNamespace(comment="one"), SimpleNamespace(comment="two")]
+    rows = [SimpleNamespace(comment="one"), SimpleNamespace(comment="three")]
     pairs = embed_store_comments(rows)
-    assert pairs == [(rows[0], "vec:one"), (rows[1], "vec:two")]
-    assert fake_faiss == ["one", "two"]
+    assert [row for row, _vec in pairs] == rows
+    assert [list(vec) for _row, vec in pairs] == [[3.0, 1.0], [5.0, 1.0]]
+    assert fake_faiss == [["one", "three"]]  # one batched encode
 
 
 def test_embed_store_comments_empty_input(fake_faiss) -> None:
     assert embed_store_comments([]) == []
     assert fake_faiss == []
+
+
+# ----- CommentIndex ---------------------------------------------------------
+
+
+def _indexed(vectors: dict[str, list[float]], monkeypatch, rows, **kwargs):
+    pytest.importorskip("numpy")
+
+    def get_embeddings(texts):
+        return [vectors[text] for text in texts]
+
+    monkeypatch.setitem(
+        sys.modules,
+        "codes.util.faiss_util",
+        SimpleNamespace(get_embeddings=get_embeddings),
+    )
+    return CommentIndex(rows, **kwargs)
+
+
+def test_comment_index_ranks_rows_best_first_with_stable_ties(monkeypatch) -> None:
+    rows = [
+        SimpleNamespace(path="a.py", comment="x"),
+        SimpleNamespace(path="b.py", comment="y"),
+        SimpleNamespace(path="a.py", comment="x2"),
+    ]
+    index = _indexed(
+        {"x": [1.0, 0.0], "y": [0.6, 0.8], "x2": [1.0, 0.0]}, monkeypatch, rows
+    )
+    hits = index.search([[1.0, 0.0], [0.0, 1.0]], 2)
+    assert hits == [[(1.0, 0), (1.0, 2)], [(pytest.approx(0.8), 1), (0.0, 0)]]
+
+
+def test_comment_index_path_scope_masks_other_files(monkeypatch) -> None:
+    rows = [
+        SimpleNamespace(path="a.py", comment="x"),
+        SimpleNamespace(path="b.py", comment="y"),
+    ]
+    index = _indexed({"x": [1.0, 0.0], "y": [0.0, 1.0]}, monkeypatch, rows)
+    hits = index.search([[1.0, 0.0]] * 3, 5, ["b.py", None, "missing.py"])
+    assert hits == [[(0.0, 1)], [(1.0, 0), (0.0, 1)], []]
+
+
+def test_comment_index_large_corpus_without_faiss_searches_exactly(monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "faiss", None)  # import faiss -> ImportError
+    rows = [SimpleNamespace(path="a.py", comment="x")]
+    index = _indexed({"x": [1.0, 0.0]}, monkeypatch, rows, faiss_min_rows=1)
+    assert index.search([[1.0, 0.0]], 1) == [[(1.0, 0)]]
+
+
+def test_comment_index_add_grows_buffers_geometrically(monkeypatch) -> None:
+    vectors = {f"c{n}": [float(n), 1.0] for n in range(100)}
+    index = _indexed(vectors, monkeypatch, [])
+    buffers = set()
+    for n in range(100):
+        index.add(SimpleNamespace(path=f"p{n % 3}.py", comment=f"c{n}"))
+        buffers.add(id(index._matrix))
+
+    assert len(index) == 100 and len(buffers) <= 8
+    rebuilt = _indexed(vectors, monkeypatch, list(index.rows))
+    queries = [[1.0, 0.0], [0.0, 1.0]]
+    assert index.search(queries, 3) == rebuilt.search(queries, 3)
+    assert index.search(queries, 2, ["p1.py", None]) == rebuilt.search(
+        queries, 2, ["p1.py", None]
+    )
@@ -0,0 +1,160 @@
+"""Tests for the corpora's on-disk embedding sidecar."""
+
+from __future__ import annotations
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from prthinker.corpus_embeddings import CorpusEmbeddingCache
+from prthinker.dismissed import (
+    DismissedExample,
+    DismissedExamplesStore,
+    DismissedFilter,
+)
+from prthinker.schemas import InlineFinding
+
+np = pytest.importorskip("numpy")
+
+
+class _Encoder:
+    """Deterministic encoder recording every batch it was asked for."""
+
+    def __init__(self, dim: int = 4) -> None:
+        self.dim = dim
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.array([self.vector(text) for text in texts], dtype="float32")
+
+    def vector(self, text: str) -> np.ndarray:
+        rng = np.random.default_rng(sum(text.encode()))
+        vec = rng.standard_normal(self.dim).astype("float32")
+        return vec / np.linalg.norm(vec)
+
+
+def _cache(tmp_path, model_key: str = "emb-a") -> CorpusEmbeddingCache:
+    return CorpusEmbeddingCache(tmp_path / "corpus.jsonl", model_key=model_key)
+
+
+def test_second_process_encodes_nothing(tmp_path):
+    encoder = _Encoder()
+    first = _cache(tmp_path).embed(["a", "b", "c"], encoder)
+
+    again = _cache(tmp_path).embed(["c", "a", "b"], encoder)
+
+    assert len(encoder.calls) == 1
+    np.testing.assert_allclose(again, first[[2, 0, 1]])
+
+
+def test_only_new_texts_are_encoded_and_appended(tmp_path):
+    encoder = _Encoder()
+    _cache(tmp_path).embed(["a", "b"], encoder)
+    size = (tmp_path / "corpus.jsonl.emb.bin").stat().st_size
+
+    out = _cache(tmp_path).embed(["a", "b", "new"], encoder)
+
+    assert encoder.calls[-1] == ["new"]
+    assert (tmp_path / "corpus.jsonl.emb.bin").stat().st_size == size * 3 // 2
+    np.testing.assert_allclose(out[2], encoder.vector("new"))
+
+
+def test_other_model_rebuilds_the_sidecar(tmp_path):
+    encoder = _Encoder()
+    _cache(tmp_path, "emb-a").embed(["a", "b"], encoder)
+
+    _cache(tmp_path, "emb-b").embed(["a", "b"], encoder)
+    _cache(tmp_path, "emb-b").embed(["a", "b"], encoder)
+
+    assert encoder.calls == [["a", "b"], ["a", "b"]]
+
+
+def test_dimension_change_under_same_model_re_encodes_everything(tmp_path):
+    _cache(tmp_path).embed(["a"], _Encoder(dim=4))
+    wider = _Encoder(dim=8)
+
+    out = _cache(tmp_path).embed(["a", "b"], wider)
+
+    assert wider.calls[-1] == ["a", "b"]
+    assert out.shape == (2, 8)
+    assert _cache(tmp_path).embed(["a", "b"], wider).shape == (2, 8)
+    assert len(wider.calls) == 2
+
+
+def test_torn_trailing_record_is_ignored(tmp_path):
+    encoder = _Encoder()
+    _cache(tmp_path).embed(["a", "b"], encoder)
+    records = tmp_path / "corpus.jsonl.emb.bin"
+    records.write_bytes(records.read_bytes()[:-3])
+
+    out = _cache(tmp_path).embed(["a", "b"], encoder)
+
+    assert encoder.calls[-1] == ["b"]
+    np.testing.assert_allclose(out[1], encoder.vector("b"))
+    _cache(tmp_path).embed(["a", "b"], encoder)
+    assert len(encoder.calls) == 2
+
+
+def test_appends_extend_the_row_map_instead_of_rescanning(tmp_path, monkeypatch):
+    from prthinker import corpus_embeddings
+
+    scanned: list[int] = []
+    real = corpus_embeddings._record_rows
+    monkeypatch.setattr(
+        corpus_embeddings, "_record_rows",
+        lambda records, start=0: scanned.append(len(records)) or real(records, start),
+    )
+    encoder = _Encoder()
+    cache = _cache(tmp_path)
+    for text in ["a", "b", "c", "d"]:
+        cache.embed([text], encoder)
+    cache.embed(["a", "d"], encoder)
+    assert scanned == [] and len(encoder.calls) == 4
+
+    other = _cache(tmp_path)
+    other.embed(["e"], encoder)
+    out = cache.embed(["e", "d"], encoder)
+
+    # A fresh cache loads all four; this one reads only the appended record.
+    assert scanned == [4, 1]
+    assert encoder.calls[-1] == ["e"]
+    np.testing.assert_allclose(out, encoder(["e", "d"]))
+
+
+def test_unwritable_sidecar_still_returns_vectors(tmp_path):
+    blocker = tmp_path / "blocked"
+    blocker.write_text("not a directory")
+    cache = CorpusEmbeddingCache(blocker / "corpus.jsonl", model_key="emb-a")
+
+    out = cache.embed(["a"], _Encoder())
+
+    assert out.shape == (1, 4)
+
+
+@pytest.fixture
+def fake_faiss(monkeypatch):
+    encoder = _Encoder()
+    monkeypatch.setitem(
+        sys.modules, "codes.util.faiss_util", SimpleNamespace(get_embeddings=encoder)
+    )
+    return encoder
+
+
+def test_filter_reuses_sidecar_and_follows_appends(tmp_path, fake_faiss):
+    path = tmp_path / "dismissed.jsonl"
+    store = DismissedExamplesStore(path)
+    store.append(DismissedExample("a.py", "old nit", "noise"))
+    DismissedFilter(store).filter([InlineFinding(path="a.py", line=1, comment="q")])
+
+    store = DismissedExamplesStore(path)
+    flt = DismissedFilter(store)
+    kept = flt.filter([InlineFinding(path="a.py", line=1, comment="old nit")])
+    assert kept == []
+    # Corpus, first query, second query: the restart encoded no corpus row.
+    assert fake_faiss.calls == [["old nit"], ["q"], ["old nit"]]
+
+    store.append(DismissedExample("b.py", "fresh nit", "noise"))
+    assert fake_faiss.calls[-1] == ["fresh nit"]
+    assert flt.filter([InlineFinding(path="b.py", line=2, comment="fresh nit")]) == []
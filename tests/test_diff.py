@@ -12,6 +12,7 @@ from prthinker.diff import (
     FileDiff,
     _iter_new_side,
     iter_added_lines,
+    iter_file_diffs,
     new_side_content,
     parse_unified_diff,
 )
@@ -226,3 +227,84 @@ def test_content_sha256_headerless_plus_lines_still_hash() -> None:
     raw = "+added\n context\n-removed\n+++ b/x\n"
     expected = hashlib.sha256(b"added\ncontext").hexdigest()
     assert FileDiff(path="x", raw=raw).content_sha256() == expected
+
+
+# ----- streaming single-pass parse (iter_file_diffs) ---------------------
+
+_TWO_FILES = _PINNED_DIFF + (
+    "diff --git a/b.py b/b.py\n"
+    "--- a/b.py\n"
+    "+++ b/b.py\n"
+    "@@ -3,2 +3,2 @@\n"
+    "-old\n"
+    "+new\n"
+    "\\ No newline at end of file\n"
+    "@@ -20 +20,2 @@\n"
+    " keep\n"
+    "+more\n"
+)
+
+
+def _summary(files: list[FileDiff]) -> list[tuple]:
+    return [
+        (fd.path, fd.raw, sorted(fd.new_lines), fd.content_sha256(),
+         fd.added_count, fd.removed_count, fd.hunk_offsets)
+        for fd in files
+    ]
+
+
+def test_iter_file_diffs_accepts_text_bytes_and_files(tmp_path) -> None:
+    expected = _summary(parse_unified_diff(_TWO_FILES))
+    path = tmp_path / "pr.diff"
+    path.write_bytes(_TWO_FILES.encode())
+
+    assert _summary(list(iter_file_diffs(_TWO_FILES.encode()))) == expected
+    with path.open("rb") as fh:  # memory-mapped
+        assert _summary(list(iter_file_diffs(fh))) == expected
+    with path.open(encoding="utf-8") as fh:
+        assert _summary(list(iter_file_diffs(fh))) == expected
+
+
+def test_parsed_file_records_counts_offsets_and_hash() -> None:
+    first, second = parse_unified_diff(_TWO_FILES)
+    assert first.content_sha256() == _PINNED_SHA
+    assert sorted(second.new_lines) == [3, 20, 21]
+    assert (second.added_count, second.removed_count) == (2, 1)
+    # Offsets are into the file's own diff text, at each '@@' header.
+    assert [second.raw[o:o + 2] for o in second.hunk_offsets] == ["@@", "@@"]
+
+
+def test_text_diff_spans_the_callers_string_and_caches_raw() -> None:
+    first, _second = parse_unified_diff(_TWO_FILES)
+    buffer, _start, _end = first.__dict__["_span"]
+    assert buffer is _TWO_FILES  # not an encoded copy
+    raw = first.raw
+    assert first.raw is raw  # sliced once, then kept
+    assert first.__dict__["_span"] is None
+
+
+def test_parsed_file_hash_matches_hand_built_raw() -> None:
+    for fd in parse_unified_diff(_TWO_FILES):
+        rebuilt = FileDiff(path=fd.path, raw=fd.raw)
+        assert rebuilt.content_sha256() == fd.content_sha256()
+        assert (rebuilt.added_count, rebuilt.removed_count) == (
+            fd.added_count, fd.removed_count,
+        )
+
+
+def test_crlf_diff_hashes_like_lf() -> None:
+    [lf] = parse_unified_diff(_PINNED_DIFF)
+    [crlf] = parse_unified_diff(_PINNED_DIFF.replace("\n", "\r\n"))
+    assert crlf.content_sha256() == lf.content_sha256()
+    assert crlf.new_lines == lf.new_lines
+
+
+def test_assigning_raw_replaces_the_buffer_span() -> None:
+    [fd] = parse_unified_diff(_PINNED_DIFF)
+    fd.raw = "+only\n"
+    assert fd.raw == "+only\n"
+    assert fd.content_sha256() == hashlib.sha256(b"only").hexdigest()
+
+
+def test_new_side_content_can_limit_paths() -> None:
+    assert list(new_side_content(_TWO_FILES, paths={"b.py"})) == ["b.py"]
@@ -22,10 +22,10 @@ def fake_faiss(monkeypatch):
     """Install a deterministic ``codes.util.faiss_util`` stub via embeddings map."""
     embeddings: dict[str, np.ndarray] = {}
 
-    def get_embedding(text: str) -> np.ndarray:
-        return embeddings[text]
+    def get_embeddings(texts: list[str]) -> np.ndarray:
+        return np.array([embeddings[text] for text in texts])
 
-    module = SimpleNamespace(get_embedding=get_embedding)
+    module = SimpleNamespace(get_embeddings=get_embeddings)
     monkeypatch.setitem(sys.modules, "codes.util.faiss_util", module)
     return embeddings
 
@@ -116,3 +116,21 @@ def test_filter_picks_best_match_across_examples(tmp_path, fake_faiss):
     fake_faiss["candidate"] = _unit(1.0, 0.0)  # exact match to "strong"
     flt = DismissedFilter(store, threshold=0.95)
     assert flt.filter([_finding("a.py", 1, "candidate")]) == []
+
+
+def test_filter_encodes_all_findings_in_one_call(tmp_path, fake_faiss, monkeypatch):
+    store = _store_with(tmp_path, [DismissedExample("a.py", "noise", "r")])
+    fake_faiss.update(noise=_unit(1.0, 0.0), dup=_unit(1.0, 0.0), real=_unit(0.0, 1.0))
+    module = sys.modules["codes.util.faiss_util"]
+    batches: list[list[str]] = []
+    encode = module.get_embeddings
+    monkeypatch.setattr(
+        module, "get_embeddings", lambda texts: batches.append(list(texts)) or encode(texts)
+    )
+    flt = DismissedFilter(store, threshold=0.85)
+
+    keep = _finding("b.py", 2, "real")
+    grouped = flt.filter_grouped({"a.py": [_finding("a.py", 1, "dup")], "b.py": [keep]})
+
+    assert grouped == {"a.py": [], "b.py": [keep]}
+    assert batches == [["noise"], ["dup", "real"]]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import threading
+import time
 from typing import Iterator
 
 import pytest
@@ -20,11 +22,17 @@ class _StubBackend(InferenceBackend):
         raises: bool = False,
         kind: str = "stub",
         model: str = "stub-1",
+        delay: float = 0.0,
+        gate: threading.Event | None = None,
     ) -> None:
         self._output = output
         self._raises = raises
         self._kind = kind
         self._model = model
+        self._delay = delay
+        # A gate blocks generate until it opens or the call is cancelled.
+        self._gate = gate
+        self.seen_cancel: list[object] = []
 
     def generate(
         self,
@@ -33,7 +41,13 @@ class _StubBackend(InferenceBackend):
         *,
         cancel_event: object | None = None,
     ) -> str:
-        del prompt, max_new_tokens, cancel_event
+        del prompt, max_new_tokens
+        self.seen_cancel.append(cancel_event)
+        time.sleep(self._delay)
+        while self._gate is not None and not self._gate.is_set():
+            if cancel_event is not None and cancel_event.is_set():
+                raise RuntimeError("cancelled")
+            time.sleep(0.01)
         if self._raises:
             raise ValueError("stub failure")
         return self._output
@@ -42,6 +56,9 @@ class _StubBackend(InferenceBackend):
         self, prompt: str, max_new_tokens: int
     ) -> Iterator[str]:
         del prompt, max_new_tokens
+        time.sleep(self._delay)
+        if self._raises:
+            raise ValueError("stub failure")
         yield f"stream:{self._output}"
 
     def backend_kind(self) -> str:
@@ -60,9 +77,26 @@ def test_longest_policy_picks_longest() -> None:
     assert _run(backends, "longest") == "abcd"
 
 
-def test_first_policy_picks_first() -> None:
-    backends = (_StubBackend("first"), _StubBackend("second-longer"))
-    assert _run(backends, "first") == "first"
+def test_first_policy_picks_first_to_arrive() -> None:
+    backends = (_StubBackend("slow", delay=0.2), _StubBackend("fast"))
+    assert _run(backends, "first") == "fast"
+
+
+def test_first_policy_cancels_the_rest() -> None:
+    slow = _StubBackend("slow", gate=threading.Event())
+    backends = (slow, _StubBackend("fast"))
+    assert _run(backends, "first") == "fast"
+    deadline = time.monotonic() + 5
+    while not slow.seen_cancel and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slow.seen_cancel[0].is_set()
+
+
+def test_members_run_concurrently() -> None:
+    backends = tuple(_StubBackend(str(i), delay=0.2) for i in range(3))
+    started = time.monotonic()
+    assert _run(backends, "longest") in {"0", "1", "2"}
+    assert time.monotonic() - started < 0.5
 
 
 def test_majority_picks_modal_output() -> None:
@@ -74,6 +108,16 @@ def test_majority_picks_modal_output() -> None:
     assert _run(backends, "majority") == "yes"
 
 
+def test_majority_returns_once_quorum_agrees() -> None:
+    never = threading.Event()
+    backends = (
+        _StubBackend("yes"),
+        _StubBackend("yes "),
+        _StubBackend("no", gate=never),
+    )
+    assert _run(backends, "majority") == "yes"
+
+
 def test_majority_tie_resolves_to_earliest() -> None:
     backends = (_StubBackend("alpha"), _StubBackend("beta"))
     assert _run(backends, "majority") == "alpha"
@@ -103,11 +147,55 @@ def test_empty_backends_raises_value_error() -> None:
         EnsembleBackend((), policy="first")
 
 
-def test_stream_delegates_to_first_backend() -> None:
+def test_stream_comes_from_first_member_to_answer() -> None:
+    backend = EnsembleBackend(
+        (_StubBackend("a", delay=0.2), _StubBackend("b")), policy="first"
+    )
+    assert list(backend.stream_generate("p", 8)) == ["stream:b"]
+
+
+def test_stream_skips_failing_member() -> None:
+    backend = EnsembleBackend(
+        (_StubBackend(raises=True), _StubBackend("b", delay=0.05)),
+        policy="first",
+    )
+    assert list(backend.stream_generate("p", 8)) == ["stream:b"]
+
+
+def test_stream_all_fail_raises() -> None:
     backend = EnsembleBackend(
-        (_StubBackend("a"), _StubBackend("b")), policy="first"
+        (_StubBackend(raises=True), _StubBackend(raises=True)), policy="first"
     )
-    assert list(backend.stream_generate("p", 8)) == ["stream:a"]
+    with pytest.raises(RuntimeError, match="failed to stream"):
+        list(backend.stream_generate("p", 8))
+
+
+def test_member_concurrency_is_bounded_across_calls() -> None:
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    class _Counting(_StubBackend):
+        def generate(self, prompt, max_new_tokens, *, cancel_event=None):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return "x"
+
+    ensemble = EnsembleBackend((_Counting(),), policy="longest")
+    assert ensemble.max_concurrency() == 1
+    callers = [
+        threading.Thread(target=ensemble.generate, args=("p", 8)) for _ in range(4)
+    ]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join(timeout=5)
+    assert peak == 1
 
 
 def test_backend_kind_and_model_name() -> None:
@@ -62,6 +62,7 @@ def server_module():
         _install_fake_module(
             "codes.util.faiss_util",
             search_docs=lambda *a, **k: [],
+            get_index=lambda: None,
             # rag.py resolves threshold=None to this calibrated default;
             # the server passes an explicit 0.7 so the value is inert here.
             RECOMMENDED_THRESHOLD=0.7,
@@ -121,14 +122,22 @@ def test_cancel_if_idle_skips_recent_job(server_module):
     assert not job.cancel_event.is_set()
 
 
-def test_cancel_if_idle_skips_non_running(server_module):
-    """A non-running job is never cancelled even if old."""
+def test_cancel_if_idle_skips_finished(server_module):
+    """A finished job is never cancelled even if old."""
     now = time.time()
-    job = _FakeJob(status="pending", last_polled_at=now - 10_000)
+    job = _FakeJob(status="done", last_polled_at=now - 10_000)
     server_module._cancel_if_idle("jid", job, now, "Review")
     assert not job.cancel_event.is_set()
 
 
+def test_cancel_if_idle_cancels_abandoned_queued_job(server_module):
+    """A queued job nobody polls is cancelled before it reaches the GPU."""
+    now = time.time()
+    job = _FakeJob(status="pending", last_polled_at=now - 10_000)
+    server_module._cancel_if_idle("jid", job, now, "Review")
+    assert job.cancel_event.is_set()
+
+
 def test_cancel_if_idle_skips_already_cancelled(server_module):
     """An already-cancelled job is a no-op (no error, stays set)."""
     now = time.time()
@@ -231,6 +240,26 @@ def test_start_job_worker_rolls_back_failed_start(server_module):
     assert table == {}
 
 
+def test_failed_worker_start_frees_its_dispatched_slot(server_module, monkeypatch):
+    from prthinker.job_scheduler import JobScheduler
+
+    scheduler = JobScheduler(slots=1)
+    monkeypatch.setattr(server_module, "_scheduler", scheduler)
+    scheduler.submit("job")  # free slot: dispatched at once
+
+    class _BrokenThread:
+        def start(self):
+            raise RuntimeError("cannot start")
+
+    with pytest.raises(RuntimeError):
+        server_module._start_job_worker(
+            _BrokenThread(), threading.Lock(), {"job": _FakeJob()}, "job",
+        )
+    assert scheduler.stats()["running"] == 0
+    with scheduler.admitted("next"):
+        assert scheduler.stats()["running"] == 1
+
+
 def test_release_gpu_memory_serializes_cuda_empty_cache(
     server_module, monkeypatch,
 ):
@@ -386,6 +415,7 @@ class TestWorkersFailFast:
         job = server_module._Job()
         with server_module._JOBS_LOCK:
             server_module._JOBS["jid"] = job
+        server_module._scheduler.submit("jid")
         try:
             server_module._run_review_job("jid", object())
         finally:
@@ -410,6 +440,7 @@ class TestWorkersFailFast:
         job = server_module._AskJob()
         with server_module._ASK_JOBS_LOCK:
             server_module._ASK_JOBS["jid"] = job
+        server_module._scheduler.submit("jid")
         try:
             server_module._run_ask_job(
                 "jid", server_module.AskRequest(prompt="p", max_new_tokens=8))
@@ -418,3 +449,95 @@ class TestWorkersFailFast:
                 server_module._ASK_JOBS.pop("jid", None)
         assert job.status == "error"
         assert calls == [boom]
+
+
+def test_streamed_ask_publishes_chunks_for_cursor_polls(server_module, monkeypatch):
+    """Each decoded chunk is visible to /ask/stream/result as it arrives."""
+    import asyncio
+
+    monkeypatch.setattr(server_module, "_release_gpu_memory", lambda: None)
+
+    class _StreamingBackend:
+        def stream_generate(self, prompt, max_new_tokens=0, cancel_event=None):
+            yield "Found "
+            yield "a bug"
+
+    monkeypatch.setattr(server_module, "_backend", _StreamingBackend())
+    job = server_module._AskJob()
+    with server_module._ASK_JOBS_LOCK:
+        server_module._ASK_JOBS["sjid"] = job
+    server_module._scheduler.submit("sjid")
+    try:
+        server_module._run_ask_job(
+            "sjid",
+            server_module.AskRequest(prompt="p", max_new_tokens=8),
+            stream=True,
+        )
+        resp = asyncio.run(server_module.ask_stream_result("sjid", cursor=1))
+    finally:
+        with server_module._ASK_JOBS_LOCK:
+            server_module._ASK_JOBS.pop("sjid", None)
+    assert job.status == "done"
+    assert job.result == "Found a bug"
+    assert resp.items == ["a bug"]
+    assert resp.cursor == 2
+
+
+def test_mark_running_only_promotes_pending_jobs(server_module):
+    """A dispatched job becomes running with a fresh idle-sweeper clock."""
+    table = {
+        "queued": _FakeJob(status="pending", last_polled_at=0.0),
+        "gone": _FakeJob(status="cancelled"),
+    }
+    lock = threading.Lock()
+
+    server_module._mark_running(lock, table, "queued")
+    server_module._mark_running(lock, table, "gone")
+    server_module._mark_running(lock, table, "missing")
+
+    assert table["queued"].status == "running"
+    assert table["queued"].last_polled_at > 0.0
+    assert table["gone"].status == "cancelled"
+
+
+def test_hold_until_returns_when_job_settles(server_module):
+    """A long poll wakes as soon as the job turns terminal."""
+    import asyncio
+
+    table = {"job": _FakeJob(status="running")}
+    settled = server_module._job_settled(table, "job")
+    checks: list[bool] = []
+
+    def has_news() -> bool:
+        # Thread.start is stubbed in this module, so the "worker" finishing
+        # is simulated on the third check instead.
+        checks.append(True)
+        if len(checks) == 3:
+            table["job"].status = "done"
+        return settled()
+
+    started = time.monotonic()
+    asyncio.run(server_module._hold_until(threading.Lock(), has_news, 5.0))
+    assert time.monotonic() - started < 2.0
+    assert len(checks) == 3
+
+
+def test_hold_until_gives_up_after_wait(server_module):
+    import asyncio
+
+    table = {"job": _FakeJob(status="running")}
+    started = time.monotonic()
+    asyncio.run(server_module._hold_until(
+        threading.Lock(), server_module._job_settled(table, "job"), 0.2,
+    ))
+    assert time.monotonic() - started < 1.0
+
+
+def test_estimate_tokens_never_touches_the_tokenizer(server_module, monkeypatch):
+    class _Explodes:
+        def __call__(self, *a, **k):
+            raise AssertionError("tokenized on the request thread")
+
+    monkeypatch.setattr(server_module, "_backend", types.SimpleNamespace(_tokenizer=_Explodes()))
+    assert server_module._estimate_tokens("x" * 4000) == 1000
+    assert server_module._estimate_tokens("") == 1
@@ -6,6 +6,7 @@ is exercised without invoking any real embedding model.
 
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 
 import pytest
@@ -133,3 +134,120 @@ def test_format_clusters_block_includes_size_and_rep() -> None:
     assert "Recurring findings" in block
     assert "noisy log statement" in block
     assert "| 4 |" in block
+
+
+# ----- persisted incremental clustering ----------------------------------
+
+def _add(store: FindingClusterStore, comment: str, embedding, *, repo="o/r", file="a.py"):
+    store.add(
+        pr_number=1, repo=repo, file_path=file, line=1,
+        comment=comment, embedding=embedding,
+    )
+
+
+def test_store_clusters_match_similarity_groups(tmp_path: Path) -> None:
+    store = FindingClusterStore(tmp_path / "c.sqlite")
+    for i in range(4):
+        _add(store, f"a{i}", _emb(1, 0.01 * i, 0))
+    for i in range(2):
+        _add(store, f"b{i}", _emb(0, 1, 0))
+    _add(store, "lonely", _emb(0, 0, 1))
+
+    out = store.clusters(similarity_threshold=0.9, min_cluster_size=2)
+
+    assert [c.size for c in out] == [4, 2]
+    assert out[0].representative == "a3"  # newest member
+    assert {m.comment for m in out[1].members} == {"b0", "b1"}
+
+
+def test_store_clusters_persist_and_add_updates_in_place(tmp_path: Path) -> None:
+    path = tmp_path / "c.sqlite"
+    store = FindingClusterStore(path)
+    for i in range(3):
+        _add(store, f"a{i}", _emb(1, 0, 0))
+    assert [c.size for c in store.clusters(similarity_threshold=0.9, min_cluster_size=3)] == [3]
+
+    _add(store, "a3", _emb(1, 0.01, 0))
+    _add(store, "b0", _emb(0, 1, 0))
+    with sqlite3.connect(path) as conn:
+        members = conn.execute("SELECT COUNT(*) FROM finding_cluster_members").fetchone()[0]
+        seeds = conn.execute("SELECT COUNT(*) FROM finding_clusters").fetchone()[0]
+    assert (members, seeds) == (5, 2)
+
+    reopened = FindingClusterStore(path)
+    out = reopened.clusters(similarity_threshold=0.9, min_cluster_size=1)
+    assert [c.size for c in out] == [4, 1]
+    assert out[0].representative == "a3"
+
+
+def test_store_clusters_are_scoped_per_repo_and_threshold(tmp_path: Path) -> None:
+    store = FindingClusterStore(tmp_path / "c.sqlite")
+    for repo in ("o/a", "o/a", "o/b"):
+        _add(store, repo, _emb(1, 0, 0), repo=repo)
+    _add(store, "near", _emb(1, 0.5, 0), repo="o/a")
+
+    assert [c.size for c in store.clusters(repo="o/a", similarity_threshold=0.99,
+                                           min_cluster_size=1)] == [2, 1]
+    assert [c.size for c in store.clusters(repo="o/a", similarity_threshold=0.5,
+                                           min_cluster_size=1)] == [3]
+    assert [c.size for c in store.clusters(similarity_threshold=0.99,
+                                           min_cluster_size=1)] == [3, 1]
+
+
+def test_drop_clusterings_keeps_only_the_wanted_threshold(tmp_path: Path) -> None:
+    path = tmp_path / "c.sqlite"
+    store = FindingClusterStore(path)
+    _add(store, "a", _emb(1, 0, 0))
+    for threshold in (0.5, 0.8, 0.9):
+        store.clusters(similarity_threshold=threshold, min_cluster_size=1)
+    store.clusters(repo="o/r", similarity_threshold=0.5, min_cluster_size=1)
+
+    assert store.drop_clusterings(keep_threshold=0.8) == 2
+    _add(store, "b", _emb(1, 0, 0))
+    with sqlite3.connect(path) as conn:
+        kept = conn.execute(
+            "SELECT scope, threshold, last_id FROM finding_clusterings ORDER BY scope"
+        ).fetchall()
+        seeds = conn.execute("SELECT COUNT(*) FROM finding_clusters").fetchone()[0]
+    assert kept == [("", 0.8, 2), ("o/r", 0.5, 2)]
+    assert seeds == 2
+    assert [c.size for c in store.clusters(similarity_threshold=0.9,
+                                           min_cluster_size=1)] == [2]
+
+
+def test_block_assignment_equals_one_at_a_time(tmp_path: Path) -> None:
+    rng = np.random.default_rng(7)
+    centres = rng.standard_normal((6, 8))
+    vectors = [
+        (centres[i % 6] + 0.05 * rng.standard_normal(8)).astype("float32")
+        for i in range(60)
+    ]
+    batched = FindingClusterStore(tmp_path / "batched.sqlite")
+    for i, v in enumerate(vectors):
+        batched.add(pr_number=1, repo="o/r", file_path="a.py", line=i, comment=f"c{i}",
+                    embedding=v)
+    one_by_one = FindingClusterStore(tmp_path / "single.sqlite")
+    one_by_one.clusters(similarity_threshold=0.9, min_cluster_size=1)
+    for i, v in enumerate(vectors):
+        one_by_one.add(pr_number=1, repo="o/r", file_path="a.py", line=i,
+                       comment=f"c{i}", embedding=v)
+
+    def grouping(store):
+        return sorted(
+            sorted(m.line for m in c.members)
+            for c in store.clusters(similarity_threshold=0.9, min_cluster_size=1)
+        )
+
+    assert grouping(batched) == grouping(one_by_one)
+    assert len(grouping(batched)) == 6
+
+
+def test_format_clusters_block_reads_precomputed_clusters(tmp_path: Path) -> None:
+    store = FindingClusterStore(tmp_path / "c.sqlite")
+    for i in range(3):
+        _add(store, "noisy log", _emb(1, 0, 0), file=f"f{i}.py")
+
+    block = format_clusters_block(store.clusters(min_cluster_size=3))
+
+    assert "| 3 |" in block
+    assert "noisy log" in block
@@ -97,6 +97,35 @@ def test_accepted_store_round_trip(tmp_jsonl) -> None:
     assert ex.pr_number == 42
 
 
+def test_accepted_retriever_ranks_by_similarity_above_threshold(
+    tmp_jsonl, monkeypatch
+) -> None:
+    import sys
+    from types import SimpleNamespace
+
+    import pytest
+
+    pytest.importorskip("numpy")
+    from prthinker.accepted import AcceptedExamplesRetriever
+
+    vectors = {
+        "close": [1.0, 0.0], "near": [0.8, 0.6], "far": [0.0, 1.0], "q": [1.0, 0.0],
+    }
+    monkeypatch.setitem(
+        sys.modules,
+        "codes.util.faiss_util",
+        SimpleNamespace(get_embeddings=lambda texts: [vectors[t] for t in texts]),
+    )
+    store = AcceptedExamplesStore(tmp_jsonl)
+    for path, comment in (("b.py", "far"), ("a.py", "near"), ("b.py", "close")):
+        store.append(AcceptedExample(path=path, comment=comment, suggestion=""))
+
+    unscoped = AcceptedExamplesRetriever(store, k=3, threshold=0.5)
+    assert [ex.comment for ex in unscoped.top_k("q")] == ["close", "near"]
+    scoped = AcceptedExamplesRetriever(store, k=3, threshold=0.5, path_scoped=True)
+    assert [ex.comment for ex in scoped.top_k("q", path="a.py")] == ["near"]
+
+
 # ----- rules-dir loader ---------------------------------------------------
 
 def test_rules_dir_returns_sorted_markdown_files(tmp_rules_dir) -> None:
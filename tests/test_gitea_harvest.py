@@ -32,6 +32,9 @@ class _CapturingStore:
     def append(self, example: Any) -> None:
         self.appended.append(example)
 
+    def extend(self, examples: list[Any]) -> None:
+        self.appended.extend(examples)
+
 
 def _comment(
     comment_id: int,
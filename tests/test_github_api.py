@@ -25,6 +25,7 @@ class _Resp:
             self.text = text
         else:
             self.text = "" if json_data is None else str(json_data)
+        self.content = self.text.encode()
 
     def json(self):
         return self._json
@@ -293,7 +294,7 @@ def _reviews(*ids: int) -> _Resp:
 
 
 def test_inline_review_posts_then_dismisses_excluding_new(monkeypatch):
-    monkeypatch.setattr(github_api, "fetch_pr_diff", lambda _c: _DIFF)
+    monkeypatch.setattr(github_api, "fetch_pr_diff_bytes", lambda _c: _DIFF.encode())
     # Prior review 888 has a comment (id 5); the new review 999 has one
     # (id 7) — exclude must keep 7 and only delete 5.
     pr_comments = _Resp(json_data=[
@@ -317,7 +318,7 @@ def test_inline_review_posts_then_dismisses_excluding_new(monkeypatch):
 
 
 def test_inline_review_422_leaves_prior_comments_intact(monkeypatch):
-    monkeypatch.setattr(github_api, "fetch_pr_diff", lambda _c: _DIFF)
+    monkeypatch.setattr(github_api, "fetch_pr_diff_bytes", lambda _c: _DIFF.encode())
     client = _ScriptedClient({"POST": [_Resp(status=422)]})
     monkeypatch.setattr(github_api, "client_for", lambda _cfg: client)
     with pytest.raises(RuntimeError, match="422"):
@@ -327,7 +328,7 @@ def test_inline_review_422_leaves_prior_comments_intact(monkeypatch):
 
 
 def test_inline_review_skips_when_all_off_diff(monkeypatch):
-    monkeypatch.setattr(github_api, "fetch_pr_diff", lambda _c: _DIFF)
+    monkeypatch.setattr(github_api, "fetch_pr_diff_bytes", lambda _c: _DIFF.encode())
     client = _ScriptedClient({})
     monkeypatch.setattr(github_api, "client_for", lambda _cfg: client)
     # line 999 is off every hunk → filtered out → no POST at all.
@@ -345,6 +346,24 @@ def test_fetch_pr_diff_returns_text_on_200(monkeypatch):
     assert github_api.fetch_pr_diff(_CFG) == "diff --git a/x b/x\n"
 
 
+def test_fetch_pr_diff_bytes_returns_the_body_and_parses(monkeypatch):
+    client = _ScriptedClient({"GET": [_Resp(text=_DIFF)]})
+    monkeypatch.setattr(github_api, "client_for", lambda _cfg: client)
+    body = github_api.fetch_pr_diff_bytes(_CFG)
+    assert body == _DIFF.encode()
+    assert github_api.new_side_lines(body) == github_api.new_side_lines(_DIFF)
+
+
+def test_diff_helpers_accept_a_parsed_line_map() -> None:
+    valid = github_api.new_side_lines(_DIFF)
+    findings = [_finding(line=1), _finding(line=999)]
+    assert github_api.filter_findings_to_diff(findings, valid) == (
+        github_api.filter_findings_to_diff(findings, _DIFF)
+    )
+    assert github_api.count_findings_on_diff(findings, valid) == 1
+    assert github_api.findings_off_diff(findings, valid) == [findings[1]]
+
+
 def test_fetch_pr_diff_406_reconstructs_from_files(monkeypatch):
     files = [
         {"filename": "a.py", "status": "modified",
@@ -623,9 +642,9 @@ def test_format_file_diff_rename_keeps_both_paths():
 
 def test_inline_review_uses_provided_diff_text(monkeypatch):
     def _boom(_config):
-        raise AssertionError("fetch_pr_diff must not be called")
+        raise AssertionError("fetch_pr_diff_bytes must not be called")
 
-    monkeypatch.setattr(github_api, "fetch_pr_diff", _boom)
+    monkeypatch.setattr(github_api, "fetch_pr_diff_bytes", _boom)
     client = _ScriptedClient({
         "POST": [_Resp(json_data={"id": 999})],
         "GET": [_reviews(999)],
@@ -639,9 +658,9 @@ def test_inline_review_uses_provided_diff_text(monkeypatch):
 
 def test_inline_review_provided_diff_text_still_filters(monkeypatch):
     def _boom(_config):
-        raise AssertionError("fetch_pr_diff must not be called")
+        raise AssertionError("fetch_pr_diff_bytes must not be called")
 
-    monkeypatch.setattr(github_api, "fetch_pr_diff", _boom)
+    monkeypatch.setattr(github_api, "fetch_pr_diff_bytes", _boom)
     client = _ScriptedClient({})
     monkeypatch.setattr(github_api, "client_for", lambda _cfg: client)
     # Off-hunk line filtered by the provided diff -> nothing to post.
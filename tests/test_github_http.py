@@ -0,0 +1,219 @@
+"""Tests for the GitHub transport: ETag cache, rate limits, parallel pages."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any
+
+import httpx
+import pytest
+
+from prthinker import github_api
+from prthinker.github_http import (
+    ETagCache,
+    GitHubTransport,
+    RateLimiter,
+    cache_dir,
+    cache_for,
+)
+from prthinker.platforms import github as github_platform
+from prthinker.platforms.github import GitHubAdapter
+
+
+class _Server:
+    """``httpx.MockTransport`` handler scripted per request."""
+
+    def __init__(self, handler) -> None:
+        self.handler = handler
+        self.requests: list[httpx.Request] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests.append(request)
+        return self.handler(request)
+
+
+def _client(server: _Server, tmp_path, **kwargs: Any) -> httpx.Client:
+    transport = GitHubTransport(
+        httpx.MockTransport(server),
+        cache=ETagCache(tmp_path),
+        limiter=kwargs.pop("limiter", RateLimiter()),
+        sleep=kwargs.pop("sleep", lambda _s: None),
+    )
+    return httpx.Client(
+        base_url="https://api.example",
+        headers={"Authorization": kwargs.pop("auth", "Bearer t")},
+        transport=transport,
+    )
+
+
+def _etag_handler(request: httpx.Request) -> httpx.Response:
+    if request.headers.get("if-none-match") == '"v1"':
+        return httpx.Response(304, headers={"X-RateLimit-Remaining": "41"})
+    return httpx.Response(200, json={"n": 1}, headers={"ETag": '"v1"'})
+
+
+def test_304_is_answered_from_the_cache(tmp_path):
+    server = _Server(_etag_handler)
+    with _client(server, tmp_path) as client:
+        first = client.get("/repos/o/r/pulls/1")
+    with _client(server, tmp_path) as client:
+        again = client.get("/repos/o/r/pulls/1")
+
+    assert again.status_code == 200
+    assert again.json() == first.json() == {"n": 1}
+    assert again.headers["x-ratelimit-remaining"] == "41"
+    assert "if-none-match" not in server.requests[0].headers
+    assert server.requests[1].headers["if-none-match"] == '"v1"'
+
+
+def test_cache_entries_are_per_token_and_accept(tmp_path):
+    server = _Server(_etag_handler)
+    with _client(server, tmp_path) as client:
+        client.get("/repos/o/r/pulls/1")
+        client.get("/repos/o/r/pulls/1", headers={"Accept": "application/vnd.github.v3.diff"})
+    with _client(server, tmp_path, auth="Bearer other") as client:
+        client.get("/repos/o/r/pulls/1")
+
+    assert all("if-none-match" not in r.headers for r in server.requests)
+
+
+def test_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv("PRTHINKER_GITHUB_CACHE_DIR", raising=False)
+    assert cache_dir() is None
+    monkeypatch.setenv("PRTHINKER_GITHUB_CACHE_DIR", "")
+    assert cache_dir() is None
+    monkeypatch.setenv("PRTHINKER_GITHUB_CACHE_DIR", str(tmp_path))
+    assert cache_dir() == tmp_path
+    assert cache_for(tmp_path) is cache_for(tmp_path)
+
+
+def _store(cache: ETagCache, path: str, size: int) -> None:
+    request = httpx.Request("GET", f"https://api.example{path}")
+    cache.store(request, httpx.Response(200, content=b"x" * size, headers={"ETag": '"e"'}))
+
+
+def test_cache_prunes_the_oldest_entries_past_its_byte_budget(tmp_path):
+    cache = ETagCache(tmp_path, max_bytes=2500)
+    start = time.time() - 60
+    for n in range(3):
+        _store(cache, f"/r/{n}", 1000)
+        entry = cache._path(httpx.Request("GET", f"https://api.example/r/{n}"))
+        os.utime(entry, (start + n, start + n))
+
+    kept = [
+        n for n in range(3)
+        if cache.lookup(httpx.Request("GET", f"https://api.example/r/{n}")) is not None
+    ]
+    assert kept == [1, 2]
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.resp")) <= 2500
+
+
+def test_cache_entries_expire_unless_revalidated(tmp_path):
+    now = [10_000.0]
+    cache = ETagCache(tmp_path, max_age=60, clock=lambda: now[0])
+    stale = httpx.Request("GET", "https://api.example/stale")
+    fresh = httpx.Request("GET", "https://api.example/fresh")
+    _store(cache, "/stale", 10)
+    _store(cache, "/fresh", 10)
+    os.utime(cache._path(stale), (now[0] - 120, now[0] - 120))
+    os.utime(cache._path(fresh), (now[0] - 120, now[0] - 120))
+    cache.refresh(fresh)  # as on a 304
+    now[0] = os.stat(cache._path(fresh)).st_mtime + 30
+
+    assert cache.lookup(stale) is None
+    assert not cache._path(stale).exists()
+    assert cache.lookup(fresh) is not None
+
+    ETagCache(tmp_path, max_age=60, clock=lambda: now[0] + 3600)
+    assert list(tmp_path.glob("*.resp")) == []
+
+
+def test_rate_limited_response_is_retried_after_the_advertised_delay(tmp_path):
+    replies = iter([
+        httpx.Response(429, headers={"Retry-After": "7"}),
+        httpx.Response(200, json=[]),
+    ])
+    slept: list[float] = []
+    server = _Server(lambda _r: next(replies))
+    with _client(server, tmp_path, sleep=slept.append) as client:
+        response = client.get("/repos/o/r/pulls/1/files")
+
+    assert response.status_code == 200
+    assert len(server.requests) == 2
+    assert slept and slept[0] >= 6
+
+
+def test_plain_403_is_not_retried(tmp_path):
+    server = _Server(lambda _r: httpx.Response(403, json={"message": "no"}))
+    with _client(server, tmp_path) as client:
+        assert client.get("/repos/o/r").status_code == 403
+    assert len(server.requests) == 1
+
+
+def test_exhausted_budget_waits_for_the_reset(tmp_path):
+    now = [1000.0]
+    limiter = RateLimiter(clock=lambda: now[0])
+    server = _Server(lambda _r: httpx.Response(
+        200, json={}, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1030"},
+    ))
+    slept: list[float] = []
+    with _client(server, tmp_path, limiter=limiter, sleep=slept.append) as client:
+        client.get("/a")
+        client.get("/b")
+
+    assert slept == [30.0]
+
+
+def _paged_handler(pages: int, per_page: int):
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        items = [{"n": (page - 1) * per_page + i} for i in range(per_page)]
+        last = f'<https://api.example/x?per_page={per_page}&page={pages}>; rel="last"'
+        return httpx.Response(200, json=items, headers={"Link": last})
+    return handler
+
+
+def test_paginate_fetches_linked_pages_in_parallel_and_in_order(tmp_path):
+    server = _Server(_paged_handler(pages=5, per_page=2))
+    with _client(server, tmp_path) as client:
+        items = list(github_api.paginate(client, "/x", per_page=2))
+
+    assert [item["n"] for item in items] == list(range(10))
+    assert sorted(int(r.url.params["page"]) for r in server.requests) == [1, 2, 3, 4, 5]
+
+
+def test_adapter_prefetch_warms_diff_pull_and_commits(monkeypatch, tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/commits"):
+            return httpx.Response(200, json=[{"commit": {"message": "m"}}])
+        if "diff" in request.headers.get("accept", ""):
+            return httpx.Response(200, text="diff --git a/x b/x\n")
+        return httpx.Response(200, json={"head": {"sha": "abc"}, "title": "T"})
+
+    server = _Server(handler)
+    monkeypatch.setattr(github_platform, "client_for", lambda _c: _client(server, tmp_path))
+    adapter = GitHubAdapter(repo="o/r", token="t", pr_number=3)  # nosec B106 - test fixture token, not a credential
+
+    adapter.prefetch(commit_messages=True)
+    seen = len(server.requests)
+
+    assert adapter.fetch_diff().startswith("diff --git")
+    assert adapter.fetch_head_sha() == "abc"
+    assert adapter.fetch_commit_messages() == ["m"]
+    assert len(server.requests) == seen == 3
+    adapter.close()
+
+
+def test_adapter_prefetch_failure_resurfaces_on_direct_call(monkeypatch, tmp_path):
+    server = _Server(lambda _r: httpx.Response(500))
+    monkeypatch.setattr(github_platform, "client_for", lambda _c: _client(server, tmp_path))
+    adapter = GitHubAdapter(repo="o/r", token="t", pr_number=3)  # nosec B106 - test fixture token, not a credential
+
+    adapter.prefetch()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        adapter.fetch_diff()
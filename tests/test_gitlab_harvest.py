@@ -30,6 +30,9 @@ class _CapturingStore:
     def append(self, example: Any) -> None:
         self.appended.append(example)
 
+    def extend(self, examples: list[Any]) -> None:
+        self.appended.extend(examples)
+
 
 def _diff_note(
     note_id: int,
@@ -0,0 +1,201 @@
+"""Tests for the request batcher in front of the single-GPU local backend.
+
+The batcher is stdlib-only, so the scheduling rules (coalescing, the
+padded-token budget, per-caller results and cancellation) are exercised
+with a fake batch function instead of torch, plus a torch-free check
+that ``LocalHFBackend`` routes through it when batching is enabled.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from prthinker.gpu_batching import BatchItem, GenerationBatcher
+from prthinker.pipeline_types import ReviewCancelledError
+
+
+def _run_concurrently(batcher, prompts, max_new_tokens=8):
+    results: dict[str, object] = {}
+
+    def call(prompt: str) -> None:
+        try:
+            results[prompt] = batcher.submit(prompt, max_new_tokens)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            results[prompt] = exc
+
+    threads = [threading.Thread(target=call, args=(p,)) for p in prompts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_prompts_share_one_batch_and_get_their_own_result() -> None:
+    sizes: list[int] = []
+
+    def run_batch(items):
+        sizes.append(len(items))
+        return [item.prompt.upper() for item in items]
+
+    batcher = GenerationBatcher(
+        run_batch, count_tokens=len, max_batch_size=4, collect_seconds=0.2,
+    )
+    results = _run_concurrently(batcher, ["a", "b", "c", "d"])
+    assert results == {"a": "A", "b": "B", "c": "C", "d": "D"}
+    assert sizes == [4]
+
+
+def test_per_item_exception_is_raised_only_in_its_caller() -> None:
+    def run_batch(items):
+        return [
+            ValueError("too long") if item.prompt == "bad" else item.prompt
+            for item in items
+        ]
+
+    batcher = GenerationBatcher(
+        run_batch, count_tokens=len, max_batch_size=2, collect_seconds=0.2,
+    )
+    results = _run_concurrently(batcher, ["ok", "bad"])
+    assert results["ok"] == "ok"
+    assert isinstance(results["bad"], ValueError)
+
+
+def test_batch_function_failure_releases_every_waiter() -> None:
+    def run_batch(items):
+        raise RuntimeError("CUDA OOM")
+
+    batcher = GenerationBatcher(run_batch, count_tokens=len, max_batch_size=2)
+    with pytest.raises(RuntimeError, match="CUDA OOM"):
+        batcher.submit("prompt", 8)
+
+
+def _queued(batcher, *items: BatchItem) -> None:
+    batcher._pending.extend(items)
+
+
+def test_take_batch_respects_padded_token_budget() -> None:
+    batcher = GenerationBatcher(
+        lambda items: [], count_tokens=len, max_batch_size=8, token_budget=100,
+    )
+    _queued(
+        batcher,
+        BatchItem("a", max_new_tokens=10, prompt_tokens=10),
+        BatchItem("b", max_new_tokens=10, prompt_tokens=10),
+        # Third row would make the batch 3 * (30 + 10) = 120 > 100.
+        BatchItem("c", max_new_tokens=10, prompt_tokens=30),
+    )
+    first = batcher._take_batch_locked()
+    assert [item.prompt for item in first] == ["a", "b"]
+    assert [item.prompt for item in batcher._take_batch_locked()] == ["c"]
+
+
+def test_oversized_head_request_still_runs_alone() -> None:
+    batcher = GenerationBatcher(
+        lambda items: [], count_tokens=len, max_batch_size=8, token_budget=10,
+    )
+    _queued(
+        batcher,
+        BatchItem("huge", max_new_tokens=50, prompt_tokens=500),
+        BatchItem("small", max_new_tokens=1, prompt_tokens=1),
+    )
+    assert [item.prompt for item in batcher._take_batch_locked()] == ["huge"]
+
+
+def test_take_batch_drops_cancelled_items_without_dispatching() -> None:
+    batcher = GenerationBatcher(lambda items: [], count_tokens=len)
+    cancelled = threading.Event()
+    cancelled.set()
+    dropped = BatchItem("gone", max_new_tokens=4, prompt_tokens=1, cancel_event=cancelled)
+    kept = BatchItem("kept", max_new_tokens=4, prompt_tokens=1)
+    _queued(batcher, dropped, kept)
+    assert batcher._take_batch_locked() == [kept]
+    assert isinstance(dropped._error, ReviewCancelledError)
+
+
+def test_submit_with_set_cancel_event_never_queues() -> None:
+    calls: list[int] = []
+    batcher = GenerationBatcher(
+        lambda items: calls.append(len(items)) or [], count_tokens=len,
+    )
+    event = threading.Event()
+    event.set()
+    with pytest.raises(ReviewCancelledError):
+        batcher.submit("prompt", 8, cancel_event=event)
+    assert calls == []
+
+
+def test_cancel_while_queued_withdraws_the_request() -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    def run_batch(items):
+        started.set()
+        release.wait(timeout=5)
+        return [item.prompt for item in items]
+
+    batcher = GenerationBatcher(
+        run_batch, count_tokens=len, max_batch_size=1, collect_seconds=0,
+    )
+    blocker = threading.Thread(target=batcher.submit, args=("first", 8))
+    blocker.start()
+    assert started.wait(timeout=5)
+
+    cancel = threading.Event()
+    outcome: list[object] = []
+
+    def waiter() -> None:
+        try:
+            outcome.append(batcher.submit("second", 8, cancel_event=cancel))
+        except ReviewCancelledError as exc:
+            outcome.append(exc)
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    cancel.set()
+    thread.join(timeout=5)
+    release.set()
+    blocker.join(timeout=5)
+    assert isinstance(outcome[0], ReviewCancelledError)
+    assert batcher.pending_count() == 0
+
+
+def test_invalid_limits_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        GenerationBatcher(lambda items: [], count_tokens=len, max_batch_size=0)
+    with pytest.raises(ValueError):
+        GenerationBatcher(lambda items: [], count_tokens=len, token_budget=0)
+
+
+def test_local_backend_routes_through_batcher(monkeypatch) -> None:
+    from prthinker.backends.local import LocalHFBackend
+
+    fake = types.ModuleType("codes.util.hf_model_util")
+    fake.hf_generate_batch = lambda prompts, *a, **k: [
+        (p[::-1], "") for p in prompts
+    ]
+    monkeypatch.setitem(sys.modules, "codes.util.hf_model_util", fake)
+
+    backend = object.__new__(LocalHFBackend)
+    backend._model = object()
+    backend._tokenizer = object()
+    backend._batcher = GenerationBatcher(
+        backend._generate_batch, count_tokens=len, max_batch_size=4,
+    )
+    assert backend.generate("abc", 8) == "cba"
+    assert backend.max_concurrency() == 4
+
+
+def test_local_backend_budgets_without_touching_the_tokenizer() -> None:
+    from prthinker.backends.local import LocalHFBackend
+
+    backend = object.__new__(LocalHFBackend)
+    backend._tokenizer = None  # any use would raise
+    assert LocalHFBackend._count_tokens("x" * 300) == 100
+    assert backend._count_tokens("") == 1
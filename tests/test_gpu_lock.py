@@ -124,3 +124,28 @@ def test_nowait_releases_even_when_body_raises() -> None:
         pass
     with gpu_serialized_nowait() as acquired:
         assert acquired is True  # lock was not wedged by the raise
+
+
+def test_local_backend_stream_holds_the_lock_until_closed(monkeypatch) -> None:
+    import sys
+
+    from prthinker.backends.local import LocalHFBackend
+
+    def _fake_stream(*_args, **_kwargs):
+        yield "first "
+        yield "second"
+
+    fake_qwen3 = types.ModuleType("codes.util.hf_model_util")
+    fake_qwen3.hf_generate_stream = _fake_stream
+    monkeypatch.setitem(sys.modules, "codes.util.hf_model_util", fake_qwen3)
+
+    backend = object.__new__(LocalHFBackend)
+    backend._model = object()
+    backend._tokenizer = object()
+    stream = backend.stream_generate("prompt", 8)
+    assert next(stream) == "first "
+    with gpu_serialized_nowait() as acquired:
+        assert acquired is False  # still decoding: the GPU stays reserved
+    stream.close()
+    with gpu_serialized_nowait() as acquired:
+        assert acquired is True  # closing the stream released it
@@ -20,6 +20,9 @@ class _CapturingStore:
     def append(self, example: Any) -> None:
         self.appended.append(example)
 
+    def extend(self, examples: list[Any]) -> None:
+        self.appended.extend(examples)
+
 
 class _FakeResponse:
     """Scripted httpx.Response stand-in."""
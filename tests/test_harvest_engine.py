@@ -0,0 +1,182 @@
+"""Tests for the shared concurrent / resumable harvesting engine."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from prthinker import harvest as gh_harvest
+from prthinker.dismissed import DismissedExample, DismissedExamplesStore
+from prthinker.harvest import HarvestStats
+from prthinker.harvest_engine import (
+    ClosedPr,
+    HarvestCheckpoint,
+    PrHarvest,
+    fan_out,
+    harvest_prs,
+    harvest_recent,
+)
+
+_SCOPE = "github:https://api.github.com:o/r"
+
+
+class _BatchStore:
+    def __init__(self) -> None:
+        self.batches: list[list[Any]] = []
+
+    def extend(self, rows: list[Any]) -> None:
+        self.batches.append(list(rows))
+
+
+def test_fan_out_keeps_input_order_under_concurrency():
+    def slow(n: int) -> int:
+        time.sleep(0.01 * (5 - n))
+        return n * 10
+
+    assert fan_out(slow, range(5)) == [0, 10, 20, 30, 40]
+
+
+def test_harvest_prs_applies_in_order_and_skips_failures():
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def collect(number: int) -> PrHarvest:
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        if number == 3:
+            request = httpx.Request("GET", "http://test")
+            raise httpx.HTTPStatusError(
+                "boom", request=request, response=httpx.Response(500, request=request)
+            )
+        return PrHarvest([f"row-{number}"], comments_scanned=2)
+
+    store, stats = _BatchStore(), HarvestStats()
+    failed = harvest_prs(
+        [ClosedPr(n) for n in range(1, 6)], collect,
+        store=store, stats=stats, found="dismissed_found", label="PR #%d",
+    )
+
+    assert failed == {3}
+    assert store.batches == [["row-1"], ["row-2"], ["row-4"], ["row-5"]]
+    assert (stats.prs_scanned, stats.comments_scanned, stats.dismissed_found) == (5, 8, 4)
+    assert peak[0] > 1
+
+
+def test_checkpoint_cuts_listing_at_the_mark(tmp_path):
+    checkpoint = HarvestCheckpoint(tmp_path / "c.json")
+    listing = [
+        ClosedPr(3, "2026-03-03T00:00:00Z"),
+        ClosedPr(2, "2026-02-02T00:00:00Z"),
+        ClosedPr(1, "2026-01-01T00:00:00Z"),
+    ]
+    checkpoint.advance(_SCOPE, listing[1:], failed=())
+
+    assert checkpoint.since(_SCOPE) == "2026-02-02T00:00:00Z"
+    assert [pr.number for pr in checkpoint.unvisited(_SCOPE, listing)] == [3]
+    assert list(HarvestCheckpoint(tmp_path / "c.json").unvisited("other", listing)) == listing
+
+
+def test_failed_pr_holds_the_mark_below_it(tmp_path):
+    checkpoint = HarvestCheckpoint.beside(tmp_path / "dismissed.jsonl")
+    prs = [
+        ClosedPr(3, "2026-03-03T00:00:00Z"),
+        ClosedPr(2, "2026-02-02T00:00:00.000Z"),
+        ClosedPr(1, "2026-01-01T00:00:00Z"),
+    ]
+
+    checkpoint.advance(_SCOPE, prs, failed={2})
+
+    assert (tmp_path / "dismissed.jsonl.harvest.json").exists()
+    assert [pr.number for pr in checkpoint.unvisited(_SCOPE, prs)] == [3, 2]
+
+
+def test_capped_run_leaves_the_gap_below_it_for_the_next_run(tmp_path):
+    checkpoint = HarvestCheckpoint(tmp_path / "c.json")
+    listing = [ClosedPr(n, f"2026-01-{n:02d}T00:00:00Z") for n in range(10, 0, -1)]
+
+    def run(max_prs: int) -> list[int]:
+        store = _BatchStore()
+        harvest_recent(
+            listing, lambda n: PrHarvest([n]), store=store, stats=HarvestStats(),
+            found="dismissed_found", label="PR #%d", scope=_SCOPE,
+            max_prs=max_prs, checkpoint=checkpoint,
+        )
+        return [row for batch in store.batches for row in batch]
+
+    assert run(3) == [10, 9, 8]
+    assert checkpoint.since(_SCOPE) is None
+    listing.insert(0, ClosedPr(11, "2026-01-11T00:00:00Z"))
+    assert run(4) == [11, 7, 6, 5]
+    assert run(10) == [4, 3, 2, 1]
+    assert checkpoint.since(_SCOPE) == "2026-01-11T00:00:00Z"
+    assert run(10) == []
+
+
+class _GitHubClient:
+    """Scripted GitHub: closed-PR listing plus one thumbed-down comment per PR."""
+
+    def __init__(self, prs: list[dict]) -> None:
+        self.prs = prs
+        self.visited: list[int] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "_GitHubClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+    def get(self, path: str, params: dict | None = None) -> httpx.Response:
+        page = (params or {}).get("page", 1)
+        request = httpx.Request("GET", "http://test")
+        if path.endswith("/pulls"):
+            return httpx.Response(200, json=self.prs if page == 1 else [], request=request)
+        number = int(path.split("/pulls/")[1].split("/")[0])
+        with self._lock:
+            self.visited.append(number)
+        comments = [{"id": number, "body": f"nit {number}", "reactions": {"-1": 1}}]
+        return httpx.Response(200, json=comments if page == 1 else [], request=request)
+
+
+def test_rerun_only_visits_prs_updated_since_last_run(monkeypatch, tmp_path):
+    corpus = tmp_path / "dismissed.jsonl"
+    client = _GitHubClient([
+        {"number": 2, "updated_at": "2026-02-02T00:00:00Z"},
+        {"number": 1, "updated_at": "2026-01-01T00:00:00Z"},
+    ])
+    monkeypatch.setattr(gh_harvest, "_client", lambda token: client)
+
+    def run() -> HarvestStats:
+        return gh_harvest.harvest(
+            "o/r", "tok", store=DismissedExamplesStore(corpus),
+            checkpoint=HarvestCheckpoint.beside(corpus),
+        )
+
+    assert run().dismissed_found == 2
+    client.prs.insert(0, {"number": 3, "updated_at": "2026-03-03T00:00:00Z"})
+    client.visited.clear()
+    stats = run()
+
+    assert client.visited == [3]
+    assert stats.prs_scanned == 1
+    assert [row.comment for row in DismissedExamplesStore(corpus)] == [
+        "nit 2", "nit 1", "nit 3",
+    ]
+
+
+def test_store_extend_writes_one_batch_and_fires_hooks(tmp_path):
+    store = DismissedExamplesStore(tmp_path / "d.jsonl")
+    seen: list[str] = []
+    store.on_append(lambda row: seen.append(row.comment))
+
+    store.extend([DismissedExample("a.py", "x", "r"), DismissedExample("b.py", "y", "r")])
+
+    assert seen == ["x", "y"]
+    assert [row.comment for row in DismissedExamplesStore(tmp_path / "d.jsonl")] == ["x", "y"]
@@ -0,0 +1,202 @@
+"""Tests for the server's priority / fair-share job scheduler.
+
+The scheduler is stdlib-only, so the dispatch rules are exercised
+directly: one job holds the single run slot, the rest queue behind it,
+and ``position`` reports the order they would be dispatched in.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from prthinker.job_scheduler import JobScheduler
+from prthinker.pipeline_types import ReviewCancelledError
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _busy(scheduler: JobScheduler, job_id: str = "hold", **kwargs):
+    """Submit ``job_id`` and enter its slot; returns the open context.
+
+    Keep the returned context referenced: collecting it closes the
+    generator, which releases the slot.
+    """
+    scheduler.submit(job_id, **kwargs)
+    ctx = scheduler.slot(job_id)
+    ctx.__enter__()
+    return ctx
+
+
+def _order(scheduler: JobScheduler, job_ids) -> list[str]:
+    return sorted(job_ids, key=lambda jid: scheduler.position(jid)[0])
+
+
+def test_interactive_jumps_ahead_of_normal_and_bulk() -> None:
+    scheduler = JobScheduler()
+    _hold = _busy(scheduler)
+    scheduler.submit("bulk", priority="bulk")
+    scheduler.submit("normal", priority="normal")
+    scheduler.submit("ask", priority="interactive")
+
+    assert _order(scheduler, ["bulk", "normal", "ask"]) == ["ask", "normal", "bulk"]
+    assert scheduler.position("bulk") == (3, 3)
+
+
+def test_shortest_estimated_job_first_within_a_class() -> None:
+    scheduler = JobScheduler()
+    _hold = _busy(scheduler)
+    scheduler.submit("big", cost=5000)
+    scheduler.submit("small", cost=200)
+    scheduler.submit("medium", cost=1200)
+
+    assert _order(scheduler, ["big", "small", "medium"]) == ["small", "medium", "big"]
+
+
+def test_tenants_take_turns_instead_of_one_draining_first() -> None:
+    scheduler = JobScheduler()
+    _hold = _busy(scheduler, tenant="other")
+    for i in range(3):
+        scheduler.submit(f"a{i}", tenant="repo-a", cost=100)
+    scheduler.submit("b0", tenant="repo-b", cost=100)
+
+    # repo-b's single job is dispatched after repo-a's first, not its last.
+    assert scheduler.position("b0")[0] == 2
+
+
+def test_running_jobs_count_against_their_tenant() -> None:
+    scheduler = JobScheduler()
+    _hold = _busy(scheduler, tenant="repo-a")
+    scheduler.submit("a1", tenant="repo-a", cost=10)
+    scheduler.submit("b1", tenant="repo-b", cost=1000)
+
+    assert _order(scheduler, ["a1", "b1"]) == ["b1", "a1"]
+
+
+def test_starved_job_goes_first_regardless_of_class() -> None:
+    clock = _Clock()
+    scheduler = JobScheduler(max_wait_seconds=60, clock=clock)
+    _hold = _busy(scheduler)
+    scheduler.submit("old-bulk", priority="bulk", cost=9000)
+    clock.now = 30
+    scheduler.submit("ask", priority="interactive", cost=10)
+    assert _order(scheduler, ["old-bulk", "ask"]) == ["ask", "old-bulk"]
+
+    clock.now = 61
+    assert _order(scheduler, ["old-bulk", "ask"]) == ["old-bulk", "ask"]
+
+
+def test_releasing_a_slot_dispatches_the_next_job() -> None:
+    scheduler = JobScheduler()
+    hold = _busy(scheduler)
+    scheduler.submit("bulk", priority="bulk")
+    scheduler.submit("ask", priority="interactive")
+
+    hold.__exit__(None, None, None)
+
+    assert scheduler.position("ask") is None
+    assert scheduler.position("bulk") == (1, 1)
+    assert scheduler.stats() == {"queued": 1, "running": 1, "slots": 1}
+
+
+def test_free_slots_dispatch_immediately() -> None:
+    scheduler = JobScheduler(slots=2)
+    scheduler.submit("a")
+    scheduler.submit("b")
+
+    assert scheduler.position("a") is None
+    assert scheduler.position("b") is None
+    with scheduler.slot("a"):
+        pass
+    assert scheduler.stats()["running"] == 1
+
+
+def test_queued_worker_waits_until_dispatched() -> None:
+    scheduler = JobScheduler()
+    hold = _busy(scheduler)
+    scheduler.submit("next")
+    started = threading.Event()
+
+    def worker() -> None:
+        with scheduler.slot("next"):
+            started.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert not started.wait(0.1)
+    hold.__exit__(None, None, None)
+    thread.join(timeout=5)
+    assert started.is_set()
+    assert scheduler.stats() == {"queued": 0, "running": 0, "slots": 1}
+
+
+def test_cancel_while_queued_leaves_the_queue() -> None:
+    scheduler = JobScheduler()
+    _hold = _busy(scheduler)
+    cancel = threading.Event()
+    scheduler.submit("queued", cancel_event=cancel)
+    cancel.set()
+
+    with pytest.raises(ReviewCancelledError):
+        with scheduler.slot("queued"):
+            pass
+    assert scheduler.position("queued") is None
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_withdraw_drops_a_queued_job() -> None:
+    scheduler = JobScheduler()
+    _hold = _busy(scheduler)
+    scheduler.submit("gone")
+    scheduler.withdraw("gone")
+
+    assert scheduler.position("gone") is None
+    with pytest.raises(KeyError):
+        with scheduler.slot("gone"):
+            pass
+
+
+def test_withdraw_frees_a_dispatched_slot_never_entered() -> None:
+    scheduler = JobScheduler()
+    scheduler.submit("orphan")  # free slot: dispatched at once
+    scheduler.submit("waiting")
+    scheduler.withdraw("orphan")
+
+    assert scheduler.stats() == {"queued": 0, "running": 1, "slots": 1}
+    with scheduler.slot("waiting"):
+        pass
+    assert scheduler.stats()["running"] == 0
+
+
+def test_withdraw_leaves_an_entered_slot_alone() -> None:
+    scheduler = JobScheduler()
+    _hold = _busy(scheduler)
+    scheduler.withdraw("hold")
+    assert scheduler.stats()["running"] == 1
+
+
+def test_admitted_holds_a_slot_for_the_block() -> None:
+    scheduler = JobScheduler()
+    with scheduler.admitted("sync", priority="interactive"):
+        assert scheduler.stats()["running"] == 1
+    assert scheduler.stats()["running"] == 0
+
+
+def test_invalid_arguments_raise_value_error() -> None:
+    with pytest.raises(ValueError):
+        JobScheduler(slots=0)
+    with pytest.raises(ValueError):
+        JobScheduler(max_wait_seconds=0)
+    scheduler = JobScheduler()
+    with pytest.raises(ValueError, match="priority"):
+        scheduler.submit("x", priority="urgent")
+    scheduler.submit("x")
+    with pytest.raises(ValueError, match="already scheduled"):
+        scheduler.submit("x")
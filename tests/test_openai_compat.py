@@ -177,3 +177,30 @@ def test_iter_sse_deltas_empty_input() -> None:
     from prthinker.backends.openai_compat import iter_sse_deltas
 
     assert list(iter_sse_deltas([], lambda _u: None)) == []
+
+
+def test_generate_samples_requests_n_choices_in_one_call() -> None:
+    import json
+
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": "a"}}, {"message": {"content": "b"}}],
+            "usage": {"prompt_tokens": 7, "completion_tokens": 4},
+        })
+
+    backend = _make_backend(httpx.MockTransport(handler))
+
+    assert backend.generate_samples("hi", 16, 3) == ["a", "b"]
+    assert len(seen) == 1 and seen[0]["n"] == 3
+    assert backend.last_usage() == Usage(7, 4)
+
+
+def test_generate_samples_empty_choices_raises() -> None:
+    transport = httpx.MockTransport(lambda req: httpx.Response(200, json={"choices": []}))
+    backend = _make_backend(transport)
+
+    with pytest.raises(RuntimeError, match="OpenAI-compat"):
+        backend.generate_samples("hi", 16, 2)
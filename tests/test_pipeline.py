@@ -173,3 +173,109 @@ def test_doc_ids_are_short_stable_sha256_prefixes() -> None:
     ]
     assert all(len(doc_id) == 16 for doc_id in ids)
     assert CoTPipeline._doc_ids([]) == []
+
+
+class _BatchRetriever(NoOpRetriever):
+    def __init__(self) -> None:
+        self.single: list[str] = []
+        self.batches: list[list[str]] = []
+
+    def retrieve(self, prompt: str) -> list[str]:
+        self.single.append(prompt)
+        return []
+
+    def retrieve_many(self, prompts: list[str]) -> list[list[str]]:
+        self.batches.append(list(prompts))
+        return [[f"rule for {p.split()[2]}"] for p in prompts]
+
+
+def test_per_file_retrieves_rag_docs_for_all_files_in_one_batch() -> None:
+    retriever = _BatchRetriever()
+    pipeline = CoTPipeline(backend=FakeBackend(["x"] * 20), retriever=retriever)
+    diff = (
+        "diff --git a/a.py b/a.py\n"
+        "--- a/a.py\n+++ b/a.py\n@@ -1 +1,2 @@\n x\n+y\n"
+        "diff --git a/b.py b/b.py\n"
+        "--- a/b.py\n+++ b/b.py\n@@ -1 +1,2 @@\n z\n+w\n"
+    )
+    result = pipeline.run_per_file(diff, PerFileReviewOptions(inline_review=False))
+    assert len(retriever.batches) == 1 and len(retriever.batches[0]) == 2
+    assert retriever.single == []
+    assert [fr.rag_docs for fr in result.per_file] == [
+        ["rule for a/a.py"], ["rule for a/b.py"],
+    ]
+
+
+class _LoopingRetriever(_BatchRetriever):
+    # Like RemoteRAGRetriever: retrieve_many is one request per prompt.
+    batches_natively = False
+
+
+def test_per_file_does_not_prefetch_through_a_looping_retriever() -> None:
+    retriever = _LoopingRetriever()
+    pipeline = CoTPipeline(backend=FakeBackend(["x"] * 20), retriever=retriever)
+    diff = (
+        "diff --git a/a.py b/a.py\n"
+        "--- a/a.py\n+++ b/a.py\n@@ -1 +1,2 @@\n x\n+y\n"
+        "diff --git a/b.py b/b.py\n"
+        "--- a/b.py\n+++ b/b.py\n@@ -1 +1,2 @@\n z\n+w\n"
+    )
+    pipeline.run_per_file(diff, PerFileReviewOptions(inline_review=False))
+    assert retriever.batches == []
+    assert len(retriever.single) == 2
+
+
+class _HitForPath:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def get(self, key):
+        return [] if key.file_path == self.path else None
+
+    def put(self, *args, **kwargs) -> None:
+        pass
+
+
+def test_prefetch_skips_skip_tier_and_review_cache_hits() -> None:
+    retriever = _BatchRetriever()
+    pipeline = CoTPipeline(backend=FakeBackend(["x"] * 40), retriever=retriever)
+    added = "".join(f"+line {n}\n" for n in range(10))
+    diff = "".join(
+        f"diff --git a/{path} b/{path}\n"
+        f"--- a/{path}\n+++ b/{path}\n@@ -1 +1,11 @@\n x\n{added}"
+        for path in ("a.py", "b.py", "cached.py", "poetry.lock")
+    )
+    pipeline.run_per_file(
+        diff,
+        PerFileReviewOptions(
+            inline_review=True,
+            step_plan="adaptive",
+            review_cache=_HitForPath("cached.py"),
+            cache_repo="o/r",
+            cache_pr_number=7,
+        ),
+    )
+    assert len(retriever.batches) == 1
+    assert [p.split()[2] for p in retriever.batches[0]] == ["a/a.py", "a/b.py"]
+    assert retriever.single == []
+
+
+def test_faiss_retriever_retrieve_many_uses_batched_search(monkeypatch) -> None:
+    import sys
+    from types import SimpleNamespace
+
+    from prthinker.rag import FaissRAGRetriever
+
+    seen: dict[str, object] = {}
+
+    def search_docs_many(queries, k=15, threshold=None):
+        seen.update(queries=queries, threshold=threshold)
+        return [([q.upper()], [{"doc": q.upper(), "score": 1.0}]) for q in queries]
+
+    module = SimpleNamespace(
+        RECOMMENDED_THRESHOLD=0.5, search_docs_many=search_docs_many,
+    )
+    monkeypatch.setitem(sys.modules, "codes.util.faiss_util", module)
+    retriever = FaissRAGRetriever()
+    assert retriever.retrieve_many(["a", "b"]) == [["A"], ["B"]]
+    assert seen == {"queries": ["a", "b"], "threshold": 0.5}
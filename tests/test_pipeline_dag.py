@@ -26,3 +26,16 @@ def test_pipeline_uses_typed_dag_config():
     )
     result = pipeline.run("diff --git a/a.py b/a.py\n+x=1")
     assert result.step_outputs == {"first_summary": "ok", "linter": "ok"}
+
+
+def test_pipeline_reuses_one_dag_pool_until_closed():
+    config = {"first_summary": {"depends_on": []}, "linter": {"depends_on": []}}
+    with CoTPipeline(
+        Backend(), NoOpRetriever(), steps=("first_summary", "linter"),
+        step_dependencies=config,
+    ) as pipeline:
+        pipeline.run("diff --git a/a.py b/a.py\n+x=1")
+        pool = pipeline._dag_executor
+        pipeline.run("diff --git a/a.py b/a.py\n+x=2")
+        assert pool is not None and pipeline._dag_executor is pool
+    assert pipeline._dag_executor is None
@@ -275,8 +275,11 @@ def test_cmd_pr_summary_upserts_marked_comment(
 
     _patch_backend(monkeypatch, ["## PR Summary\n\nAppends y."])
     adapter = _SummaryAdapter()
+    closed: list[bool] = []
+    adapter.close = lambda: closed.append(True)
     _patch_adapter(monkeypatch, adapter)
     assert _cmd_pr_summary(_cmd_args()) == 0
+    assert closed == [True]
     assert len(adapter.marked) == 1
     body, marker = adapter.marked[0]
     assert marker == pr_summary.DEFAULT_MARKER
@@ -0,0 +1,119 @@
+"""Tests for the shared-prefix KV cache bookkeeping (torch-free)."""
+
+from __future__ import annotations
+
+import sys
+import types
+
+import pytest
+
+from prthinker.prefix_cache import PrefixCache, common_prefix_length
+
+
+def _tokens(*runs: tuple[int, int]) -> tuple[int, ...]:
+    out: list[int] = []
+    for value, count in runs:
+        out.extend([value] * count)
+    return tuple(out)
+
+
+def test_common_prefix_length() -> None:
+    assert common_prefix_length((1, 2, 3), (1, 2, 4)) == 2
+    assert common_prefix_length((1, 2), (1, 2, 3)) == 2
+    assert common_prefix_length((), (1,)) == 0
+    assert common_prefix_length((5,), (6,)) == 0
+
+
+def test_match_returns_longest_shared_prefix() -> None:
+    cache = PrefixCache(10_000, bytes_per_token=1, min_prefix_tokens=3)
+    cache.store(_tokens((1, 4), (2, 4)), "a")
+    cache.store(_tokens((1, 4), (3, 4)), "b")
+    entry, matched = cache.match(_tokens((1, 4), (3, 2), (9, 5)))
+    assert entry.payload == "b"
+    assert matched == 6
+
+
+def test_match_below_minimum_is_a_miss() -> None:
+    cache = PrefixCache(10_000, bytes_per_token=1, min_prefix_tokens=5)
+    cache.store(_tokens((1, 10)), "a")
+    assert cache.match(_tokens((1, 3), (2, 10))) == (None, 0)
+    assert cache.stats()["misses"] == 1
+
+
+def test_match_leaves_one_uncached_token() -> None:
+    cache = PrefixCache(10_000, bytes_per_token=1, min_prefix_tokens=2)
+    prompt = _tokens((1, 8))
+    cache.store(prompt, "a")
+    _, matched = cache.match(prompt)
+    assert matched == len(prompt) - 1
+
+
+def test_rekey_follows_the_latest_prompt_and_drops_duplicates() -> None:
+    cache = PrefixCache(10_000, bytes_per_token=1, min_prefix_tokens=2)
+    cache.store(_tokens((1, 4), (7, 5)), "dup")
+    cache.store(_tokens((1, 4), (2, 4)), "long")
+    prompt = _tokens((1, 4), (2, 2), (7, 3))
+    entry, matched = cache.match(prompt)
+    assert (entry.payload, matched) == ("long", 6)
+    cache.rekey(entry, prompt)
+    assert entry.tokens == prompt
+    # The longer prompt is kept whole, not shrunk to the shared head.
+    assert cache.match(prompt + (5,)) == (entry, len(prompt))
+    cache.rekey(entry, _tokens((1, 4), (7, 5)))
+    assert cache.stats()["entries"] == 1
+
+
+def test_rekey_evicts_down_to_budget() -> None:
+    cache = PrefixCache(18, bytes_per_token=1, min_prefix_tokens=2)
+    cache.store(_tokens((1, 8)), "other")
+    cache.store(_tokens((2, 8)), "grows")
+    entry, _ = cache.match(_tokens((2, 8), (3, 4)))
+    cache.rekey(entry, _tokens((2, 8), (3, 4)))
+    assert cache.stats() == {"entries": 1, "bytes": 12, "hits": 1, "misses": 0}
+    cache.rekey(entry, _tokens((2, 30)))
+    assert cache.stats()["entries"] == 0
+
+
+def test_store_evicts_least_recently_used_over_budget() -> None:
+    cache = PrefixCache(20, bytes_per_token=1, min_prefix_tokens=2)
+    cache.store(_tokens((1, 10)), "old")
+    cache.store(_tokens((2, 10)), "recent")
+    cache.match(_tokens((1, 10), (0, 1)))  # touch "old"
+    cache.store(_tokens((3, 10)), "new")
+    assert cache.match(_tokens((2, 10), (0, 1))) == (None, 0)
+    assert cache.match(_tokens((1, 10), (0, 1)))[0].payload == "old"
+    assert cache.stats()["bytes"] == 20
+
+
+def test_store_skips_entries_larger_than_budget() -> None:
+    cache = PrefixCache(5, bytes_per_token=1, min_prefix_tokens=2)
+    cache.store(_tokens((1, 10)), "too big")
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalid_budget_rejected() -> None:
+    with pytest.raises(ValueError):
+        PrefixCache(0, bytes_per_token=1)
+    with pytest.raises(ValueError):
+        PrefixCache(1, bytes_per_token=0)
+
+
+def test_local_backend_passes_prefix_cache_to_hf_generate(monkeypatch) -> None:
+    from prthinker.backends.local import LocalHFBackend
+
+    seen: dict[str, object] = {}
+
+    def fake_generate(*args, **kwargs):
+        seen.update(kwargs)
+        return "ok", ""
+
+    fake = types.ModuleType("codes.util.hf_model_util")
+    fake.hf_generate = fake_generate
+    monkeypatch.setitem(sys.modules, "codes.util.hf_model_util", fake)
+
+    backend = object.__new__(LocalHFBackend)
+    backend._model = object()
+    backend._tokenizer = object()
+    backend._prefix_cache = PrefixCache(1024, bytes_per_token=1)
+    assert backend.generate("prompt", 8) == "ok"
+    assert seen["prefix_cache"] is backend._prefix_cache
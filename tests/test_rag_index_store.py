@@ -0,0 +1,79 @@
+"""Tests for codes.util.rag_index_store (pure bookkeeping, no ML deps)."""
+
+import os
+from pathlib import Path
+
+from codes.util.rag_index_store import (
+    DEFAULT_INDEX_DIR,
+    artifact_stem,
+    doc_hash,
+    doc_set_hash,
+    find_donor,
+    index_dir,
+    model_slug,
+    plan_reuse,
+    read_manifest,
+    write_manifest,
+)
+
+
+def test_index_dir_defaults_and_can_be_disabled(monkeypatch) -> None:
+    monkeypatch.delenv("RAG_INDEX_DIR", raising=False)
+    assert index_dir() == DEFAULT_INDEX_DIR
+    monkeypatch.setenv("RAG_INDEX_DIR", "/tmp/rag")
+    assert index_dir() == Path("/tmp/rag")
+    monkeypatch.setenv("RAG_INDEX_DIR", "")
+    assert index_dir() is None
+
+
+def test_artifact_stem_keys_model_set_and_dim() -> None:
+    hashes = [doc_hash("a"), doc_hash("b")]
+    stem = artifact_stem("Qwen/Qwen3-Embedding-4B", doc_set_hash(hashes), 2560)
+    assert stem.startswith("Qwen_Qwen3-Embedding-4B-")
+    assert stem.endswith("-d2560")
+    assert model_slug("org/model name") == "org_model_name"
+
+
+def test_doc_set_hash_is_order_sensitive() -> None:
+    a, b = doc_hash("a"), doc_hash("b")
+    assert doc_set_hash([a, b]) != doc_set_hash([b, a])
+
+
+def test_manifest_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "m.json"
+    write_manifest(path, "m", 4, ["h1", "h2"])
+    manifest = read_manifest(path)
+    assert manifest["doc_hashes"] == ["h1", "h2"]
+    assert manifest["set_hash"] == doc_set_hash(["h1", "h2"])
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_read_manifest_rejects_garbage(tmp_path: Path) -> None:
+    path = tmp_path / "m.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert read_manifest(path) is None
+    assert read_manifest(tmp_path / "missing.json") is None
+
+
+def test_find_donor_picks_newest_matching_artifact(tmp_path: Path) -> None:
+    for name, hashes, mtime in (("old", ["a"], 100), ("new", ["a", "b"], 200)):
+        stem = artifact_stem("org/m", doc_set_hash(hashes), 8)
+        manifest = tmp_path / f"{stem}.json"
+        write_manifest(manifest, "org/m", 8, hashes)
+        (tmp_path / f"{stem}.faiss").write_bytes(name.encode())
+        os.utime(manifest, (mtime, mtime))
+    # Other dimension / missing index never donate.
+    write_manifest(tmp_path / "org_m-x-d16.json", "org/m", 16, ["a"])
+    write_manifest(tmp_path / "org_m-y-d8.json", "org/m", 8, ["z"])
+    os.utime(tmp_path / "org_m-y-d8.json", (300, 300))
+
+    index_path, manifest = find_donor(tmp_path, "org/m", 8)
+    assert index_path.read_bytes() == b"new"
+    assert manifest["doc_hashes"] == ["a", "b"]
+    assert find_donor(tmp_path, "other/m", 8) is None
+
+
+def test_plan_reuse_embeds_only_new_documents() -> None:
+    reuse, embed = plan_reuse(["a", "b", "c"], ["c", "x", "a", "y"])
+    assert reuse == {0: 2, 2: 0}
+    assert embed == [1, 3]
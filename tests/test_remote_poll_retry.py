@@ -30,10 +30,11 @@ class _ScriptedClient:
         self._kind = kind
         self.cancel_calls: list[str] = []
         self.get_calls: list[str] = []
+        self.submit_bodies: list[dict | None] = []
 
     def post(self, path: str, json: dict | None = None) -> httpx.Response:
-        del json
         if path == f"/{self._kind}/submit":
+            self.submit_bodies.append(json)
             req = httpx.Request("POST", "http://test" + path)
             return httpx.Response(200, request=req, json=self._submit_payload)
         if path.startswith(f"/{self._kind}/cancel/"):
@@ -89,9 +90,9 @@ def _make_client(get_responses: Iterable[Any]) -> remote_mod.RemotePipelineClien
 
 
 def _make_ask_backend(
-    get_responses: Iterable[Any],
+    get_responses: Iterable[Any], **config: Any,
 ) -> remote_mod.RemoteHttpBackend:
-    cfg = RemoteBackendConfig(url="http://test", timeout_seconds=600.0)
+    cfg = RemoteBackendConfig(url="http://test", timeout_seconds=600.0, **config)
     backend = remote_mod.RemoteHttpBackend(cfg)
     _inject(backend, _ScriptedClient(get_responses, {"job_id": "x"}, kind="ask"))
     return backend
@@ -169,12 +170,24 @@ def test_ask_submits_and_polls_returning_text(_no_sleep):
     out = backend.generate("hello", max_new_tokens=64)
     assert out == "generated summary"
     assert backend._job._client.get_calls == [
-        "/ask/result/x",
-        "/ask/result/x",
+        "/ask/result/x?wait=20",
+        "/ask/result/x?wait=20",
     ]
     assert backend._job._client.cancel_calls == []
 
 
+def test_ask_forwards_scheduling_priority_and_client(_no_sleep):
+    backend = _make_ask_backend(
+        [_ok_done_response("ok", kind="ask")],
+        priority="bulk",
+        client_id="acme/widgets",
+    )
+    backend.generate("hello", max_new_tokens=64)
+    body = backend._job._client.submit_bodies[0]
+    assert body["priority"] == "bulk"
+    assert body["client_id"] == "acme/widgets"
+
+
 def test_ask_transient_502_retried_then_succeeds(_no_sleep):
     backend = _make_ask_backend(
         [
@@ -225,3 +238,173 @@ def test_ask_cancelled_status_raises_and_cancels(_no_sleep):
     with pytest.raises(RuntimeError, match="cancelled server-side"):
         backend.generate("p", max_new_tokens=8)
     assert backend._job._client.cancel_calls == ["/ask/cancel/x"]
+
+
+# --- /ask/stream job (RemoteHttpBackend.stream_generate) -------------------
+
+
+def _stream_poll(status: str, cursor: int, items: list[str]) -> httpx.Response:
+    return httpx.Response(
+        200,
+        request=httpx.Request("GET", "http://test/ask/stream/result/x"),
+        json={"job_id": "x", "status": status, "cursor": cursor, "items": items},
+    )
+
+
+def _make_stream_backend(get_responses: Iterable[Any]) -> remote_mod.RemoteHttpBackend:
+    cfg = RemoteBackendConfig(url="http://test", timeout_seconds=600.0)
+    backend = remote_mod.RemoteHttpBackend(cfg)
+    _inject(backend, _ScriptedClient(get_responses, {"job_id": "x"}, kind="ask/stream"))
+    return backend
+
+
+def test_ask_stream_relays_chunks_as_they_decode(_no_sleep):
+    backend = _make_stream_backend(
+        [
+            _stream_poll("pending", 0, []),
+            _stream_poll("running", 2, ["Found ", "a "]),
+            _stream_poll("done", 3, ["bug"]),
+        ]
+    )
+    assert list(backend.stream_generate("p", max_new_tokens=8)) == ["Found ", "a ", "bug"]
+    scripted = backend._job._client
+    assert scripted.get_calls == [
+        "/ask/stream/result/x?cursor=0&wait=20",
+        "/ask/stream/result/x?cursor=0&wait=20",
+        "/ask/stream/result/x?cursor=2&wait=20",
+    ]
+    assert scripted.cancel_calls == []
+
+
+def test_ask_stream_closed_early_cancels_the_job(_no_sleep):
+    backend = _make_stream_backend([_stream_poll("running", 1, ["looks wrong"])])
+    stream = backend.stream_generate("p", max_new_tokens=8)
+    assert next(stream) == "looks wrong"
+    stream.close()
+    assert backend._job._client.cancel_calls == ["/ask/stream/cancel/x"]
+
+
+def test_ask_stream_falls_back_to_one_chunk_on_old_server(_no_sleep):
+    class _OldServer(_ScriptedClient):
+        def post(self, path: str, json: dict | None = None) -> httpx.Response:
+            if path == "/ask/stream/submit":
+                return httpx.Response(
+                    404, request=httpx.Request("POST", "http://test" + path)
+                )
+            return super().post(path, json)
+
+    backend = remote_mod.RemoteHttpBackend(
+        RemoteBackendConfig(url="http://test", timeout_seconds=600.0)
+    )
+    _inject(
+        backend,
+        _OldServer([_ok_done_response("whole text", kind="ask")], {"job_id": "x"}, kind="ask"),
+    )
+    assert list(backend.stream_generate("p", max_new_tokens=8)) == ["whole text"]
+
+
+# --- /review/batch job (RemotePipelineClient.review_batch) -----------------
+
+
+def _batch_poll(status: str, cursor: int, items: list[dict]) -> httpx.Response:
+    return httpx.Response(
+        200,
+        request=httpx.Request("GET", "http://test/review/batch/result/x"),
+        json={
+            "job_id": "x",
+            "status": status,
+            "total": 3,
+            "completed": cursor,
+            "cursor": cursor,
+            "items": items,
+        },
+    )
+
+
+def _batch_item(index: int, status: str = "done") -> dict:
+    item = {"index": index, "file_path": f"f{index}.py", "status": status}
+    if status == "done":
+        item["result"] = _minimal_review_payload()
+    else:
+        item["error"] = "boom"
+    return item
+
+
+def _make_batch_client(get_responses: Iterable[Any]) -> remote_mod.RemotePipelineClient:
+    cfg = RemoteBackendConfig(url="http://test", timeout_seconds=600.0)
+    client = remote_mod.RemotePipelineClient(cfg)
+    _inject(client, _ScriptedClient(get_responses, {"job_id": "x"}, kind="review/batch"))
+    return client
+
+
+def test_review_batch_streams_items_as_they_finish(_no_sleep):
+    client = _make_batch_client(
+        [
+            _batch_poll("pending", 0, []),
+            _batch_poll("running", 1, [_batch_item(2)]),
+            _http_status_response(502, kind="review/batch"),
+            _batch_poll("done", 3, [_batch_item(0), _batch_item(1)]),
+        ]
+    )
+    requests = [_make_request() for _ in range(3)]
+    got = [index for index, _resp in client.review_batch(requests)]
+    assert got == [2, 0, 1]
+    scripted = client._job._client
+    assert scripted.get_calls == [
+        "/review/batch/result/x?cursor=0&wait=20",
+        "/review/batch/result/x?cursor=0&wait=20",
+        "/review/batch/result/x?cursor=1&wait=20",
+        "/review/batch/result/x?cursor=1&wait=20",
+    ]
+    assert scripted.cancel_calls == []
+
+
+def test_review_batch_failed_file_raises_and_cancels(_no_sleep):
+    client = _make_batch_client(
+        [_batch_poll("running", 1, [_batch_item(0, status="error")])]
+    )
+    with pytest.raises(RuntimeError, match="f0.py"):
+        list(client.review_batch([_make_request()]))
+    assert client._job._client.cancel_calls == ["/review/batch/cancel/x"]
+
+
+def test_review_batch_falls_back_to_per_file_jobs_on_old_server(_no_sleep):
+    class _OldServer(_ScriptedClient):
+        def post(self, path: str, json: dict | None = None) -> httpx.Response:
+            if path == "/review/batch/submit":
+                return httpx.Response(
+                    404, request=httpx.Request("POST", "http://test" + path)
+                )
+            return super().post(path, json)
+
+    client = remote_mod.RemotePipelineClient(
+        RemoteBackendConfig(url="http://test", timeout_seconds=600.0)
+    )
+    payload = _minimal_review_payload()
+    _inject(
+        client,
+        _OldServer(
+            [_ok_done_response(payload), _ok_done_response(payload)],
+            {"job_id": "x"},
+        ),
+    )
+    got = [index for index, _resp in client.review_batch([_make_request()] * 2)]
+    assert got == [0, 1]
+
+
+def test_polls_are_long_polls_paced_only_when_server_answers_at_once(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(remote_mod.time, "sleep", sleeps.append)
+    pending = httpx.Response(
+        200,
+        request=httpx.Request("GET", "http://test/review/result/x"),
+        json={"status": "pending"},
+    )
+    client = _make_client([pending, _ok_done_response(_minimal_review_payload())])
+    client.review(_make_request())
+
+    assert client._job._client.get_calls == ["/review/result/x?wait=20"] * 2
+    # The first poll goes out at once; the instant "pending" (an older
+    # server ignoring ?wait) is paced to the classic poll interval.
+    assert sleeps[0] == 0.0
+    assert sleeps[1] == pytest.approx(remote_mod._POLL_INTERVAL_SECONDS, abs=0.5)
@@ -0,0 +1,71 @@
+"""Tests for the SQLite inverted index behind the lexical repo retriever."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections import Counter
+from types import SimpleNamespace
+
+from prthinker.repo_index import LexicalIndex
+
+
+def _doc(body: dict[str, int], basename: str, path_tokens=()):
+    return SimpleNamespace(
+        body=Counter(body),
+        path_tokens=set(path_tokens),
+        length=sum(body.values()),
+        basename=basename,
+    )
+
+
+_DOCS = {
+    "a.py": _doc({"token": 2, "alpha": 1}, "a.py", {"alpha"}),
+    "b.py": _doc({"token": 1}, "b.py"),
+    "c.py": _doc({"gamma": 3}, "c.py", {"gamma"}),
+}
+
+
+def test_sync_loads_only_new_or_changed_files() -> None:
+    index = LexicalIndex()
+    loaded: list[str] = []
+
+    def load(rel):
+        loaded.append(rel)
+        return _DOCS[rel]
+
+    stats = {"a.py": (1, 10), "b.py": (1, 10), "c.py": (1, 10)}
+    assert index.sync(stats, load) == 3
+    loaded.clear()
+    assert index.sync({"a.py": (1, 10), "b.py": (2, 11)}, load) == 2
+    assert loaded == ["b.py"]
+    assert index.corpus_stats() == (2, 4)
+    assert index.doc_freqs(["token", "gamma"]) == {"token": 2}
+
+
+def test_matches_collects_postings_and_name_hints() -> None:
+    index = LexicalIndex()
+    index.sync({rel: (1, 1) for rel in _DOCS}, _DOCS.get)
+    found = index.matches(["token"], basenames=["c.py"], path_terms=["alpha"])
+    assert found["a.py"].body == {"token": 2}
+    assert found["a.py"].path_tokens == {"alpha"}
+    assert found["b.py"].length == 1
+    assert found["c.py"].basename == "c.py" and not found["c.py"].body
+    assert index.first_paths(2, exclude={"a.py"}) == ["b.py", "c.py"]
+
+
+def test_unreadable_file_is_retried_on_next_sync() -> None:
+    index = LexicalIndex()
+    index.sync({"a.py": (1, 1)}, lambda rel: None)
+    assert index.corpus_stats() == (0, 0)
+    index.sync({"a.py": (1, 1)}, _DOCS.get)
+    assert index.corpus_stats()[0] == 1
+
+
+def test_index_built_by_other_tokenizer_version_is_rebuilt(tmp_path) -> None:
+    path = tmp_path / "idx.sqlite"
+    LexicalIndex(path).sync({"a.py": (1, 1)}, _DOCS.get)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE meta SET value = 'old' WHERE key = 'version'")
+    conn.close()
+    assert LexicalIndex(path).corpus_stats() == (0, 0)
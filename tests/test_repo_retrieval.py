@@ -241,6 +241,66 @@ def test_semantic_retriever_missing_workdir_raises(tmp_path):
         SemanticRepoRetriever(_KeywordEmbedder()).retrieve("q", tmp_path / "nope")
 
 
+class _CountingEmbedder(_KeywordEmbedder):
+    def __init__(self, key: str = "keyword-v1") -> None:
+        self.calls: list[list[str]] = []
+        self._key = key
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return super().embed(texts)
+
+    def cache_key(self) -> str:
+        return self._key
+
+
+def test_semantic_retriever_encodes_files_once_per_workdir(tmp_path):
+    repo = _make_repo(tmp_path, {
+        "widget.py": "widget widget\n",
+        "parser.py": "parser\n",
+        "network.py": "network\n",
+    })
+    embedder = _CountingEmbedder()
+    retriever = SemanticRepoRetriever(embedder, top_k=1)
+    assert retriever.retrieve("widget bug", repo).files == ("widget.py",)
+    assert retriever.retrieve("parser bug", repo).files == ("parser.py",)
+    # One corpus encode, then one single-text encode per query.
+    assert [len(call) for call in embedder.calls] == [3, 1, 1]
+
+
+def test_semantic_index_persists_and_reencodes_only_changed_files(tmp_path):
+    repo = _make_repo(tmp_path, {
+        "widget.py": "widget widget\n",
+        "parser.py": "parser\n",
+    })
+    (repo / ".git").mkdir()
+    SemanticRepoRetriever(_CountingEmbedder()).retrieve("widget", repo)
+    assert list((repo / ".git" / "prthinker" / "semantic").iterdir())
+
+    (repo / "parser.py").write_text("network network\n", encoding="utf-8")
+    embedder = _CountingEmbedder()
+    result = SemanticRepoRetriever(embedder, top_k=1).retrieve("network", repo)
+    assert result.files == ("parser.py",)
+    assert embedder.calls[0] == ["network network\n"]  # widget.py reused
+
+    other = _CountingEmbedder(key="keyword-v2")
+    SemanticRepoRetriever(other).retrieve("network", repo)
+    assert len(other.calls[0]) == 2  # different embedding space: re-encode
+
+
+def test_file_embedding_store_top_k_breaks_ties_by_path():
+    from prthinker.repo_embeddings import FileEmbeddingStore
+
+    store = FileEmbeddingStore()
+    files = [("c.py", "c"), ("a.py", "a"), ("b.py", "b"), ("d.py", "d")]
+    vectors = {"a": [1.0, 0.0], "b": [2.0, 0.0], "c": [1.0, 0.0], "d": [0.0, 1.0]}
+    assert store.sync(files, lambda texts: [vectors[t] for t in texts]) == 4
+    assert store.top_k([3.0, 0.0], 2) == [(1.0, "a.py"), (1.0, "b.py")]
+    assert [rel for _, rel in store.top_k([0.0, 1.0], 10)] == [
+        "d.py", "a.py", "b.py", "c.py",
+    ]
+
+
 def test_factory_semantic_accepts_injected_embedder():
     retriever = create_repo_retriever("semantic", embedder=_KeywordEmbedder())
     assert isinstance(retriever, SemanticRepoRetriever)
@@ -508,13 +568,13 @@ def test_lexical_retriever_indexes_worktree_once(tmp_path, monkeypatch):
         "b.py": "def beta():\n    return token\n",
     })
     walks = []
-    real_iter = rr._iter_code_files
+    real_iter = rr._iter_code_paths
 
     def _counting_iter(workdir):
         walks.append(workdir)
         return real_iter(workdir)
 
-    monkeypatch.setattr(rr, "_iter_code_files", _counting_iter)
+    monkeypatch.setattr(rr, "_iter_code_paths", _counting_iter)
     retriever = LexicalRepoRetriever()
     first = retriever.retrieve("token", repo)
     second = retriever.retrieve("alpha token", repo)
@@ -528,13 +588,13 @@ def test_lexical_retriever_memo_is_per_workdir(tmp_path, monkeypatch):
     repo_a = _make_repo(tmp_path / "a", {"a.py": "def fa():\n    return token\n"})
     repo_b = _make_repo(tmp_path / "b", {"b.py": "def fb():\n    return token\n"})
     walks = []
-    real_iter = rr._iter_code_files
+    real_iter = rr._iter_code_paths
 
     def _counting_iter(workdir):
         walks.append(workdir)
         return real_iter(workdir)
 
-    monkeypatch.setattr(rr, "_iter_code_files", _counting_iter)
+    monkeypatch.setattr(rr, "_iter_code_paths", _counting_iter)
     retriever = LexicalRepoRetriever()
     assert retriever.retrieve("token", repo_a).files == ("a.py",)
     assert retriever.retrieve("token", repo_b).files == ("b.py",)
@@ -549,19 +609,73 @@ def test_structural_expansion_reuses_base_index(tmp_path, monkeypatch):
         "pkg/other.py": "def add(a, b):\n    return a + b\n",
     })
     walks = []
-    real_iter = rr._iter_code_files
+    real_iter = rr._iter_code_paths
 
     def _counting_iter(workdir):
         walks.append(workdir)
         return real_iter(workdir)
 
-    monkeypatch.setattr(rr, "_iter_code_files", _counting_iter)
+    monkeypatch.setattr(rr, "_iter_code_paths", _counting_iter)
     base = LexicalRepoRetriever()
     result = StructuralExpansionRetriever(base).retrieve("WidgetRenderer render", repo)
     assert result.files
     assert len(walks) == 1  # both retrieval rounds share one corpus walk
 
 
+def test_persisted_index_reindexes_only_changed_files(tmp_path, monkeypatch):
+    import os
+
+    import prthinker.repo_retrieval as rr
+
+    repo = _make_repo(tmp_path, {
+        "a.py": "def alpha():\n    return token\n",
+        "b.py": "def beta():\n    return token\n",
+        "c.py": "def gamma():\n    return other\n",
+    })
+    (repo / ".git").mkdir()
+    assert LexicalRepoRetriever().retrieve("token", repo).files[:2] == ("a.py", "b.py")
+    assert (repo / ".git" / "prthinker" / "lexical_index.sqlite").exists()
+
+    (repo / "b.py").write_text("def beta():\n    return gadget\n", encoding="utf-8")
+    os.utime(repo / "b.py", ns=(1, 1))
+    (repo / "c.py").unlink()
+    loaded = []
+    real_load = rr._load_document
+
+    def _counting_load(workdir, rel):
+        loaded.append(rel)
+        return real_load(workdir, rel)
+
+    monkeypatch.setattr(rr, "_load_document", _counting_load)
+    fresh = LexicalRepoRetriever(top_k=1)
+    assert fresh.retrieve("gadget", repo).files == ("b.py",)
+    assert loaded == ["b.py", "b.py"]  # re-index + span read; a.py untouched
+    assert fresh.retrieve("gamma", repo).files == ("a.py",)  # c.py dropped
+
+
+def test_indexed_ranking_matches_full_corpus_bm25(tmp_path):
+    import prthinker.repo_retrieval as rr
+
+    repo = _make_repo(tmp_path, {
+        "pkg/parser.py": "def parse_token(stream):\n    return token_stream\n",
+        "pkg/lexer.py": "def lex(stream):\n    token = stream.next\n    return token\n",
+        "pkg/util.py": "def helper():\n    return 1\n",
+        "docs/build.py": "def build():\n    return parser\n",
+    })
+    query = "TokenStream bug in parser.py when parse_token sees a stream"
+    docs = [rr._index_document(rel, text) for rel, text in rr._iter_code_files(repo)]
+    idf = rr._compute_idf(docs)
+    expansion = rr.expand_query(query)
+    avg_len = sum(d.length for d in docs) / len(docs)
+    expected = sorted(
+        ((rr._bm25_score(d, expansion.terms, idf, avg_len)
+          + rr._filename_boost(d, expansion), d.rel) for d in docs),
+        key=lambda item: (-item[0], item[1]),
+    )
+    result = LexicalRepoRetriever(top_k=len(docs)).retrieve(query, repo)
+    assert result.files == tuple(rel for _, rel in expected)
+
+
 # --------------------------------------------------------------------------
 # enrich_context_spans reads only the context files
 # --------------------------------------------------------------------------
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import threading
+import time
+
 from prthinker.self_consistency import _normalize, self_consistent_generate
 
 
@@ -50,3 +53,62 @@ def test_normalization_groups_variants() -> None:
 def test_normalize_helper() -> None:
     assert _normalize("  Yes \n there ") == "yes there"
     assert _normalize("YES") == _normalize("yes")
+
+
+def test_stops_once_majority_is_unassailable() -> None:
+    backend = _ScriptedBackend(["a", "A.", "a", "b", "b"])
+    result = self_consistent_generate(backend, "p", k=5)
+    assert result == "a"
+    assert backend.calls == 3
+
+
+class _BatchedBackend(_ScriptedBackend):
+    """Serves whole rounds through ``generate_samples``."""
+
+    def __init__(self, outputs: list[str]) -> None:
+        super().__init__(outputs)
+        self.rounds: list[int] = []
+
+    def generate_samples(self, prompt: str, max_new_tokens: int, n: int) -> list[str]:
+        self.rounds.append(n)
+        return [self.generate(prompt, max_new_tokens) for _ in range(n)]
+
+
+def test_batched_rounds_request_only_what_can_settle_the_vote() -> None:
+    backend = _BatchedBackend(["x", "y", "x", "x", "y"])
+    result = self_consistent_generate(backend, "p", k=5)
+    assert result == "x"
+    # 2-1 after the first round; one more "x" puts it out of reach.
+    assert backend.rounds == [3, 1]
+
+
+def test_short_batched_round_keeps_sampling() -> None:
+    class _OneAtATime(_BatchedBackend):
+        def generate_samples(self, prompt, max_new_tokens, n):
+            self.rounds.append(n)
+            return [self.generate(prompt, max_new_tokens)]
+
+    backend = _OneAtATime(["x", "y", "y"])
+    assert self_consistent_generate(backend, "p", k=3) == "y"
+    assert backend.calls == 3
+
+
+def test_samples_run_concurrently_up_to_max_concurrency() -> None:
+    lock = threading.Lock()
+    state = {"in_flight": 0, "peak": 0}
+
+    class _SlowBackend:
+        def max_concurrency(self) -> int:
+            return 3
+
+        def generate(self, prompt: str, max_new_tokens: int) -> str:
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.05)
+            with lock:
+                state["in_flight"] -= 1
+            return "same"
+
+    assert self_consistent_generate(_SlowBackend(), "p", k=5) == "same"
+    assert state["peak"] == 3
@@ -0,0 +1,91 @@
+"""Tests for the bounded, optionally persistent step-DAG result cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from prthinker.backends.base import InferenceBackend
+from prthinker.pipeline import CoTPipeline
+from prthinker.rag import NoOpRetriever
+from prthinker.step_cache import StepResultCache
+
+
+def test_memory_lru_is_bounded():
+    cache = StepResultCache(max_entries=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1  # touch a so b is least recently used
+    cache["c"] = 3
+    assert "b" not in cache
+    assert cache["a"] == 1 and cache["c"] == 3
+    assert len(cache) == 2
+
+
+def test_disk_spill_survives_a_new_instance(tmp_path):
+    path = tmp_path / "steps.sqlite"
+    StepResultCache(path)["key"] = "step output"
+    reopened = StepResultCache(path)
+    assert "key" in reopened
+    assert reopened["key"] == "step output"
+
+
+def test_disk_is_bounded_by_recency(tmp_path):
+    path = tmp_path / "steps.sqlite"
+    cache = StepResultCache(path, max_entries=1, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache[key] = key
+    assert sorted(StepResultCache(path)) == ["b", "c"]
+
+
+def test_delete_and_missing_key(tmp_path):
+    cache = StepResultCache(tmp_path / "steps.sqlite")
+    cache["a"] = "x"
+    del cache["a"]
+    with pytest.raises(KeyError):
+        cache["a"]
+    with pytest.raises(KeyError):
+        del cache["a"]
+
+
+def test_invalid_bounds_rejected():
+    with pytest.raises(ValueError):
+        StepResultCache(max_entries=0)
+
+
+class _CountingBackend(InferenceBackend):
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    def generate(self, prompt, max_new_tokens, *, cancel_event=None):
+        self.prompts.append(prompt)
+        return f"out{len(self.prompts)}"
+
+
+def _pipeline(backend, cache):
+    return CoTPipeline(
+        backend,
+        NoOpRetriever(),
+        steps=("first_summary", "linter"),
+        step_dependencies={
+            "first_summary": {"depends_on": [], "cache": True},
+            "linter": {"depends_on": ["first_summary"], "cache": True},
+        },
+        step_cache=cache,
+    )
+
+
+def test_rerun_with_unchanged_inputs_skips_cached_steps(tmp_path):
+    path = tmp_path / "steps.sqlite"
+    diff = "diff --git a/a.py b/a.py\n+x=1"
+    first = _CountingBackend()
+    _pipeline(first, StepResultCache(path)).run(diff)
+    assert len(first.prompts) == 2
+
+    second = _CountingBackend()
+    result = _pipeline(second, StepResultCache(path)).run(diff)
+    assert second.prompts == []
+    assert result.step_outputs == {"first_summary": "out1", "linter": "out2"}
+
+    changed = _CountingBackend()
+    _pipeline(changed, StepResultCache(path)).run(diff + "\n+y=2")
+    assert len(changed.prompts) == 2
@@ -37,3 +37,136 @@ def test_dag_timeout_is_reported():
         execute_detailed(
             [DagNode("slow", lambda _: time.sleep(0.05), timeout_seconds=0.001)]
         )
+
+
+def test_successor_starts_without_waiting_for_unrelated_slow_node():
+    import threading
+
+    successor_ran = threading.Event()
+
+    def slow(_):
+        # Under wave barriers "after_fast" could not start until this
+        # returned, so the wait would always time out.
+        return successor_ran.wait(timeout=5)
+
+    nodes = [
+        DagNode("slow", slow),
+        DagNode("fast", lambda _: 1),
+        DagNode("after_fast", lambda r: successor_ran.set() or r["fast"] + 1, ("fast",)),
+    ]
+    run = execute_detailed(nodes, max_workers=2)
+    assert run.results == {"slow": True, "fast": 1, "after_fast": 2}
+
+
+def test_timed_out_attempt_is_retried():
+    calls = {"n": 0}
+
+    def slow_then_fast(_):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            time.sleep(0.2)
+        return calls["n"]
+
+    run = execute_detailed(
+        [DagNode("a", slow_then_fast, retries=1, timeout_seconds=0.05)],
+        max_workers=2,
+    )
+    assert run.states["a"] == "completed" and run.attempts["a"] == 2
+
+
+def test_failure_without_fail_fast_unblocks_dependents():
+    def boom(_):
+        raise RuntimeError("boom")
+
+    run = execute_detailed(
+        [DagNode("a", boom), DagNode("b", lambda r: r["a"], ("a",))],
+        fail_fast=False,
+    )
+    assert run.states == {"a": "failed", "b": "completed"}
+    assert run.results["b"] is None and "boom" in run.errors["a"]
+
+
+def test_cyclic_dependencies_are_rejected():
+    with pytest.raises(ValueError, match="cyclic"):
+        execute_detailed(
+            [DagNode("a", lambda _: 1, ("b",)), DagNode("b", lambda _: 1, ("a",))]
+        )
+
+
+def test_caller_owned_executor_is_reused_and_left_open():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for value in (1, 2):
+            run = execute_detailed([DagNode("a", lambda _, v=value: v)], executor=pool)
+            assert run.results["a"] == value
+        assert pool.submit(lambda: "open").result() == "open"
+
+
+def test_hung_timed_attempt_does_not_hold_the_only_worker():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    release = threading.Event()
+    calls = {"n": 0}
+
+    def hangs_once(_):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            release.wait(timeout=5)
+        return "retried"
+
+    nodes = [
+        DagNode("hung", hangs_once, retries=1, timeout_seconds=0.1),
+        DagNode("other", lambda _: "ran"),
+    ]
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        try:
+            run = execute_detailed(nodes, executor=pool)
+        finally:
+            release.set()
+    assert time.monotonic() - started < 2
+    assert run.results == {"hung": "retried", "other": "ran"}
+    assert run.attempts["hung"] == 2
+
+
+def test_timed_attempts_reuse_threads_and_replace_only_hung_ones():
+    import threading
+
+    from prthinker.step_dag import _TimedWorkers
+
+    workers = _TimedWorkers(limit=2)
+    names = {workers.submit(lambda: threading.current_thread().name).result(timeout=5)
+             for _ in range(5)}
+    assert len(names) == 1
+
+    release = threading.Event()
+    hung = [workers.submit(release.wait, 5) for _ in range(2)]
+    queued = workers.submit(lambda: "queued")  # both threads hung: waits
+    time.sleep(0.05)
+    assert not queued.done()
+    release.set()
+    assert [f.result(timeout=5) for f in hung] == [True, True]
+    assert queued.result(timeout=5) == "queued"
+    assert workers._threads == 2
+
+
+def test_cache_hit_reads_the_cache_once():
+    from collections import UserDict
+
+    class _CountingCache(UserDict):
+        reads = 0
+
+        def __getitem__(self, key):
+            type(self).reads += 1
+            return super().__getitem__(key)
+
+        def __contains__(self, key):
+            type(self).reads += 1
+            return super().__contains__(key)
+
+    cache = _CountingCache({"a": None})
+    run = execute_detailed([DagNode("a", lambda _: 1, cache_key=lambda _: "a")], cache=cache)
+    assert run.states["a"] == "cached" and run.results["a"] is None
+    assert _CountingCache.reads == 1
@@ -140,6 +140,16 @@ def test_content_change_is_not_whitespace_only():
     assert is_whitespace_only_change(fd) is False
 
 
+def test_pure_deletion_is_skip():
+    fd = _diff("mod.py", added=0, removed=4)
+    assert is_whitespace_only_change(fd) is True
+    assert classify_depth(fd) == TIER_SKIP
+
+
+def test_pure_addition_is_not_whitespace_only():
+    assert is_whitespace_only_change(_diff("mod.py", added=4)) is False
+
+
 def test_empty_diff_is_not_whitespace_only():
     assert is_whitespace_only_change(FileDiff(path="a.py", raw="")) is False
 
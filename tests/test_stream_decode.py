@@ -0,0 +1,79 @@
+"""Tests for the torch-free incremental content decoder."""
+
+from __future__ import annotations
+
+from codes.util.stream_decode import ContentStreamDecoder
+
+_THINK_END = 99
+
+
+class _ByteTokenizer:
+    """Duck-typed tokenizer: each id is a byte string, 99 is ``</think>``."""
+
+    def __init__(self, pieces: list[bytes]) -> None:
+        self._pieces = pieces
+
+    def decode(self, ids, skip_special_tokens: bool = False) -> str:
+        raw = b"".join(
+            b"</think>" if i == _THINK_END else self._pieces[i]
+            for i in ids
+            if not (skip_special_tokens and i == _THINK_END)
+        )
+        return raw.decode("utf-8", errors="replace")
+
+
+def _stream(decoder: ContentStreamDecoder, ids: list[int]) -> list[str]:
+    chunks = [decoder.push([i]) for i in ids]
+    chunks.append(decoder.finish())
+    return [c for c in chunks if c]
+
+
+def _tokenizer(text: str) -> tuple[_ByteTokenizer, list[int]]:
+    """One id per byte of ``text`` (so multi-byte characters split)."""
+    raw = text.encode("utf-8")
+    return _ByteTokenizer([bytes([b]) for b in raw]), list(range(len(raw)))
+
+
+def test_reasoning_is_held_back_and_content_streams_by_word() -> None:
+    tok, ids = _tokenizer("plan it\n\nfound a bug\n")
+    thinking, content = ids[:9], ids[9:]
+    decoder = ContentStreamDecoder(tok, _THINK_END)
+
+    chunks = _stream(decoder, thinking + [_THINK_END] + content)
+
+    assert chunks == ["found ", "a ", "bug"]
+
+
+def test_join_matches_the_one_shot_strip() -> None:
+    text = "\n\nfirst line\nsecond  line\n\nthird\n\n"
+    tok, ids = _tokenizer(text)
+    decoder = ContentStreamDecoder(tok, None)
+
+    assert "".join(_stream(decoder, ids)) == text.strip("\n")
+
+
+def test_generation_without_marker_is_released_as_content_at_the_end() -> None:
+    tok, ids = _tokenizer("no reasoning here")
+    decoder = ContentStreamDecoder(tok, _THINK_END)
+
+    assert [decoder.push([i]) for i in ids] == [""] * len(ids)
+    assert decoder.finish() == "no reasoning here"
+
+
+def test_multibyte_character_is_never_split() -> None:
+    tok, ids = _tokenizer("naïve café ok")
+    decoder = ContentStreamDecoder(tok, None)
+
+    chunks = _stream(decoder, ids)
+
+    assert chunks == ["naïve ", "café ", "ok"]
+    assert all("\ufffd" not in chunk for chunk in chunks)
+
+
+def test_several_ids_per_push() -> None:
+    tok, ids = _tokenizer("one two three")
+    decoder = ContentStreamDecoder(tok, None)
+
+    assert decoder.push(ids[:9]) == "one two "
+    assert decoder.push(ids[9:]) == ""
+    assert decoder.finish() == "three"
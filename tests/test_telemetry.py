@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import threading
 import time
 
 import pytest
 
-from prthinker.telemetry import CallRecord, TelemetrySink, _stats_from_rows
+from prthinker.telemetry import (
+    CallRecord,
+    LatencySketch,
+    TelemetrySink,
+    _BatchWriter,
+    _Rollup,
+)
 
 
 @pytest.fixture
@@ -106,13 +113,12 @@ def test_time_filter_since_yields_clause_and_param() -> None:
     assert len(params) == 1
 
 
-def test_stats_from_rows_handles_none_token_columns() -> None:
+def test_rollup_add_handles_none_token_columns() -> None:
     # rows: (prompt_tokens, completion_tokens, latency_ms, cost_usd, cache_hit)
-    rows = [
-        (None, None, 200.0, None, 1),
-        (5, 3, 100.0, 0.5, 0),
-    ]
-    stats = _stats_from_rows("openai", "m", rows)
+    rollup = _Rollup()
+    rollup.add((None, None, 200.0, None, 1))
+    rollup.add((5, 3, 100.0, 0.5, 0))
+    stats = rollup.stats("openai", "m")
     assert stats.calls == 2
     assert stats.cache_hits == 1
     assert stats.prompt_tokens == 5
@@ -120,3 +126,82 @@ def test_stats_from_rows_handles_none_token_columns() -> None:
     assert stats.cost_usd == 0.5
     assert stats.latency_p50_ms == 150.0
     assert stats.latency_p95_ms == 200.0
+
+
+def test_sketch_is_exact_until_it_compresses() -> None:
+    sketch = LatencySketch()
+    for value in (300.0, 100.0, 200.0, 400.0):
+        sketch.add(value)
+    assert sketch.p50() == 250.0
+    assert sketch.p95() == 400.0
+
+
+def test_compressed_sketch_stays_close_to_true_quantiles() -> None:
+    values = [float(v) for v in range(1, 10_001)]
+    sketch, other = LatencySketch(), LatencySketch()
+    for value in values[::2]:
+        sketch.add(value)
+    for value in values[1::2]:
+        other.add(value)
+    sketch.merge(LatencySketch.from_json(other.to_json()))
+
+    assert sketch.count == 10_000
+    assert abs(sketch.p50() - 5000.5) < 100
+    assert abs(sketch.p95() - 9500.0) < 50
+
+
+def test_aggregate_answers_from_rollups(sink) -> None:
+    sink.record(_rec(latency=100.0, cache_hit=True))
+    sink.record(_rec(latency=300.0))
+    sink.flush()
+    with sink._connect() as conn:
+        conn.execute("DELETE FROM calls")
+
+    (only,) = sink.aggregate()
+    assert (only.calls, only.cache_hits, only.prompt_tokens) == (2, 1, 20)
+    assert only.latency_p50_ms == 200.0
+
+
+def test_pre_rollup_rows_are_folded_once(sink) -> None:
+    with sink._connect() as conn:
+        conn.executemany(
+            "INSERT INTO calls (timestamp, backend, model, prompt_tokens, "
+            "completion_tokens, tokens_estimated, latency_ms, cost_usd, "
+            "cache_hit, error) VALUES (?, 'legacy', 'm', 1, 1, 0, ?, NULL, 0, NULL)",
+            [(time.time() - 7200 * i, 10.0 * i) for i in range(1, 4)],
+        )
+    assert sink.aggregate()[0].calls == 3
+    with sink._connect() as conn:
+        conn.execute("DELETE FROM calls")
+    assert sink.aggregate()[0].calls == 3
+
+
+def test_window_reads_its_partial_first_hour_from_raw_rows(sink) -> None:
+    now = time.time()
+    with sink._connect() as conn:
+        conn.executemany(
+            "INSERT INTO calls (timestamp, backend, model, prompt_tokens, "
+            "completion_tokens, tokens_estimated, latency_ms, cost_usd, "
+            "cache_hit, error) VALUES (?, 'x', 'm', 1, 1, 0, 5.0, NULL, 0, NULL)",
+            [(now - 4 * 3600 - 1,), (now - 4 * 3600 + 60,), (now,)],
+        )
+    (stats,) = sink.aggregate(since_seconds=4 * 3600)
+    assert stats.calls == 2
+
+
+def test_record_is_written_by_the_background_thread(sink, monkeypatch) -> None:
+    caller = threading.get_ident()
+    writers: list[int] = []
+    original = _BatchWriter._write
+
+    def spy(conn, calls):
+        writers.append(threading.get_ident())
+        original(conn, calls)
+
+    monkeypatch.setattr(_BatchWriter, "_write", staticmethod(spy))
+    for _ in range(20):
+        sink.record(_rec())
+    sink.close()
+
+    assert writers and caller not in writers
+    assert sink.aggregate()[0].calls == 20